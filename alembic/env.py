@@ -20,6 +20,16 @@ config.set_main_option("sqlalchemy.url", settings.database_url)
 
 target_metadata = Base.metadata
 
+# copy_writer 的常驻 UNLOGGED 暂存表前缀（app.data.copy_writer.STAGING_PREFIX），运行时按需创建
+STAGING_PREFIX = "_stg_"
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """autogenerate 时忽略数据库中的暂存表，避免生成 DROP TABLE _stg_*。"""
+    if type_ == "table" and reflected and compare_to is None and name.startswith(STAGING_PREFIX):
+        return False
+    return True
+
 
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
@@ -28,6 +38,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -35,7 +46,9 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection, target_metadata=target_metadata, include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
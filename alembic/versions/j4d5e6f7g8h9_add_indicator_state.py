@@ -0,0 +1,49 @@
+"""add indicator_state table for incremental indicator updates
+
+Revision ID: j4d5e6f7g8h9
+Revises: 9c1d2e3f4a5b
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "j4d5e6f7g8h9"
+down_revision: Union[str, Sequence[str], None] = "9c1d2e3f4a5b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATE_FLOAT_COLUMNS = [
+    "ema12", "ema26", "macd_dea",
+    "kdj_k", "kdj_d",
+    "rsi6_gain", "rsi6_loss", "rsi12_gain", "rsi12_loss", "rsi24_gain", "rsi24_loss",
+    "atr14", "obv",
+]
+
+
+def upgrade() -> None:
+    """新建 indicator_state 表：保存各标的技术指标递推状态。"""
+    op.create_table(
+        "indicator_state",
+        sa.Column("target_table", sa.String(32), primary_key=True),
+        sa.Column("ts_code", sa.String(16), primary_key=True),
+        sa.Column("trade_date", sa.Date, nullable=False),
+        sa.Column("adj_factor", sa.Numeric(16, 6), nullable=True),
+        sa.Column("bar_count", sa.Integer, nullable=False),
+        *[sa.Column(col, sa.Float, nullable=True) for col in STATE_FLOAT_COLUMNS],
+        sa.Column("window_close", postgresql.ARRAY(sa.Float), nullable=False),
+        sa.Column("window_high", postgresql.ARRAY(sa.Float), nullable=False),
+        sa.Column("window_low", postgresql.ARRAY(sa.Float), nullable=False),
+        sa.Column("window_vol", postgresql.ARRAY(sa.Float), nullable=False),
+        sa.Column("updated_at", sa.DateTime, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    """回滚：删除 indicator_state 表。"""
+    op.drop_table("indicator_state")
@@ -0,0 +1,41 @@
+"""add strategy_hit_daily table for incremental hit stats
+
+Revision ID: k5e6f7g8h9i0
+Revises: j4d5e6f7g8h9
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "k5e6f7g8h9i0"
+down_revision: Union[str, Sequence[str], None] = "j4d5e6f7g8h9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """新建 strategy_hit_daily 表：按策略、选股日、周期累计已到期选股收益。"""
+    op.create_table(
+        "strategy_hit_daily",
+        sa.Column("strategy_name", sa.String(64), primary_key=True),
+        sa.Column("pick_date", sa.Date, primary_key=True),
+        sa.Column("period", sa.String(8), primary_key=True),
+        sa.Column("pick_count", sa.Integer, nullable=False),
+        sa.Column("win_count", sa.Integer, nullable=False),
+        sa.Column("return_sum", sa.Numeric(20, 4), nullable=False),
+        sa.Column("best_return", sa.Numeric(10, 4), nullable=True),
+        sa.Column("worst_return", sa.Numeric(10, 4), nullable=True),
+        sa.Column("refreshed_at", sa.DateTime, server_default=sa.func.now()),
+    )
+    op.create_index("idx_picks_updated_at", "strategy_picks", ["updated_at"])
+
+
+def downgrade() -> None:
+    """回滚：删除 strategy_hit_daily 表。"""
+    op.drop_index("idx_picks_updated_at", table_name="strategy_picks")
+    op.drop_table("strategy_hit_daily")
@@ -0,0 +1,89 @@
+"""add market_snapshot_daily table shared by strategy pipelines
+
+Revision ID: l6f7g8h9i0j1
+Revises: k5e6f7g8h9i0
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "l6f7g8h9i0j1"
+down_revision: Union[str, Sequence[str], None] = "k5e6f7g8h9i0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """新建 market_snapshot_daily 表：每只股票每个交易日一行的选股特征快照。"""
+    op.create_table(
+        "market_snapshot_daily",
+        sa.Column("ts_code", sa.String(16), primary_key=True),
+        sa.Column("trade_date", sa.Date, primary_key=True),
+        sa.Column("name", sa.String(32), nullable=True),
+        sa.Column("industry", sa.String(50), nullable=True),
+        sa.Column("market", sa.String(16), nullable=True),
+        sa.Column("list_status", sa.String(4), nullable=True),
+        sa.Column("list_date", sa.Date, nullable=True),
+        sa.Column("open", sa.Float, nullable=True),
+        sa.Column("high", sa.Float, nullable=True),
+        sa.Column("low", sa.Float, nullable=True),
+        sa.Column("close", sa.Float, nullable=True),
+        sa.Column("vol", sa.Float, nullable=True),
+        sa.Column("amount", sa.Float, nullable=True),
+        sa.Column("pct_chg", sa.Float, nullable=True),
+        sa.Column("ma5", sa.Float, nullable=True),
+        sa.Column("ma10", sa.Float, nullable=True),
+        sa.Column("ma20", sa.Float, nullable=True),
+        sa.Column("ma60", sa.Float, nullable=True),
+        sa.Column("macd_dif", sa.Float, nullable=True),
+        sa.Column("macd_dea", sa.Float, nullable=True),
+        sa.Column("macd_hist", sa.Float, nullable=True),
+        sa.Column("rsi6", sa.Float, nullable=True),
+        sa.Column("rsi12", sa.Float, nullable=True),
+        sa.Column("boll_upper", sa.Float, nullable=True),
+        sa.Column("boll_mid", sa.Float, nullable=True),
+        sa.Column("boll_lower", sa.Float, nullable=True),
+        sa.Column("vol_ma5", sa.Float, nullable=True),
+        sa.Column("vol_ma10", sa.Float, nullable=True),
+        sa.Column("vol_ratio", sa.Float, nullable=True),
+        sa.Column("atr14", sa.Float, nullable=True),
+        sa.Column("high_20", sa.Float, nullable=True),
+        sa.Column("high_60", sa.Float, nullable=True),
+        sa.Column("ma5_prev", sa.Float, nullable=True),
+        sa.Column("ma20_prev", sa.Float, nullable=True),
+        sa.Column("ma60_prev", sa.Float, nullable=True),
+        sa.Column("macd_dif_prev", sa.Float, nullable=True),
+        sa.Column("atr14_prev", sa.Float, nullable=True),
+        sa.Column("rsi6_prev", sa.Float, nullable=True),
+        sa.Column("rsi12_prev", sa.Float, nullable=True),
+        sa.Column("close_prev", sa.Float, nullable=True),
+        sa.Column("open_prev", sa.Float, nullable=True),
+        sa.Column("pct_chg_prev", sa.Float, nullable=True),
+        sa.Column("turnover_rate", sa.Float, nullable=True),
+        sa.Column("pe_ttm", sa.Float, nullable=True),
+        sa.Column("pb", sa.Float, nullable=True),
+        sa.Column("dividend_yield", sa.Float, nullable=True),
+        sa.Column("roe", sa.Float, nullable=True),
+        sa.Column("eps", sa.Float, nullable=True),
+        sa.Column("revenue_yoy", sa.Float, nullable=True),
+        sa.Column("profit_yoy", sa.Float, nullable=True),
+        sa.Column("current_ratio", sa.Float, nullable=True),
+        sa.Column("quick_ratio", sa.Float, nullable=True),
+        sa.Column("debt_ratio", sa.Float, nullable=True),
+        sa.Column("gross_margin", sa.Float, nullable=True),
+        sa.Column("net_margin", sa.Float, nullable=True),
+        sa.Column("ocf_per_share", sa.Float, nullable=True),
+        sa.Column("built_at", sa.DateTime, server_default=sa.func.now()),
+    )
+    op.create_index("idx_market_snapshot_trade_date", "market_snapshot_daily", ["trade_date"])
+
+
+def downgrade() -> None:
+    """回滚：删除 market_snapshot_daily 表。"""
+    op.drop_index("idx_market_snapshot_trade_date", table_name="market_snapshot_daily")
+    op.drop_table("market_snapshot_daily")
@@ -0,0 +1,32 @@
+"""add prev_state to indicator_state for same-date reruns
+
+Revision ID: m7g8h9i0j1k2
+Revises: l6f7g8h9i0j1
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "m7g8h9i0j1k2"
+down_revision: Union[str, Sequence[str], None] = "l6f7g8h9i0j1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """indicator_state 新增 prev_state：上一根 K 线的递推状态，供同一日期重跑时推进。"""
+    op.add_column(
+        "indicator_state",
+        sa.Column("prev_state", postgresql.JSONB(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """删除 prev_state 列。"""
+    op.drop_column("indicator_state", "prev_state")
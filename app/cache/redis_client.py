@@ -13,6 +13,16 @@ logger = logging.getLogger(__name__)
 _redis_client: Optional[aioredis.Redis] = None
 
 
+def redis_url() -> str:
+    """按配置拼接 Redis 连接 URL。"""
+    if settings.redis_password:
+        return (
+            f"redis://:{settings.redis_password}"
+            f"@{settings.redis_host}:{settings.redis_port}/{settings.redis_db}"
+        )
+    return f"redis://{settings.redis_host}:{settings.redis_port}/{settings.redis_db}"
+
+
 async def init_redis() -> None:
     """初始化 Redis 异步连接。
 
@@ -21,14 +31,8 @@ async def init_redis() -> None:
     """
     global _redis_client
     try:
-        url = f"redis://{settings.redis_host}:{settings.redis_port}/{settings.redis_db}"
-        if settings.redis_password:
-            url = (
-                f"redis://:{settings.redis_password}"
-                f"@{settings.redis_host}:{settings.redis_port}/{settings.redis_db}"
-            )
         _redis_client = aioredis.from_url(
-            url,
+            redis_url(),
             decode_responses=False,
             socket_timeout=5.0,
             socket_connect_timeout=2.0,
@@ -45,14 +45,26 @@ class Settings(BaseSettings):
     tushare_retry_count: int = 3                   # API 调用失败重试次数
     tushare_retry_interval: float = 1.0            # 重试间隔（秒）
     tushare_qps_limit: int = 400                   # 每分钟最大请求数（官方限制 500，留余量）
+    tushare_max_concurrency: int = 8               # 每个接口最大在途请求数
+    tushare_rate_limit_backend: str = "file"       # 限流状态共享后端：local/file/redis
+    tushare_rate_limit_dir: str = "data/rate_limit"  # file 后端状态目录
+    tushare_cache_mode: str = "off"                # 响应缓存模式：off/on/record/replay
+    tushare_cache_dir: str = "data/tushare_cache"  # 响应缓存目录
 
     # --- ETL ---
     etl_batch_size: int = 5000
     etl_commit_interval: int = 10
+    etl_daily_mode: str = "sql"             # stock_daily ETL 方式：sql（数据库内 INSERT ... SELECT）/ python
+    copy_parallel_shards: int = 4           # 大批量 COPY 按 ts_code 哈希拆分的并行连接数
+    copy_shard_min_rows: int = 200000       # 行数达到该值才拆分并行写入
 
     # --- Daily Sync ---
     daily_sync_batch_size: int = 100        # 批量同步每批股票数
     daily_sync_concurrency: int = 10        # 批量同步并发数
+    raw_sync_concurrency: int = 4           # sync_raw_tables 同时执行的 (表, 日期) 单元数
+    backfill_fetch_workers: int = 2         # 多日期补数流水线：并发拉取的日期数
+    backfill_write_workers: int = 2         # 多日期补数流水线：并发写入（COPY + ETL）的日期数
+    backfill_queue_size: int = 4            # 已拉取待写入的日期上限（背压，限制内存）
 
     # --- Data Integrity Check ---
     data_integrity_check_enabled: bool = True   # 启动时是否检查数据完整性
@@ -121,6 +133,12 @@ class Settings(BaseSettings):
     timescale_enabled: bool = True               # 是否启用 TimescaleDB（未安装时自动降级）
     timescale_compress_after_days: int = 30      # 压缩阈值天数（超过此天数的 chunk 自动压缩）
 
+    # --- Columnar Store (本地列式镜像，需要 pyarrow) ---
+    columnar_store_enabled: bool = False         # 盘后链路是否增量同步 Parquet 镜像
+    columnar_store_dir: str = "data/columnar"    # 镜像根目录（相对项目根目录）
+    columnar_recheck_months: int = 2             # 每次同步按月比对校验值的最近月份数（更早分区靠显式失效或 --verify）
+    panel_cache_dir: str = "data/panel_cache"    # 优化器/回测内存映射面板缓存目录
+
     # --- Cache (Redis) ---
     cache_tech_ttl: int = 90000                 # 技术指标缓存 TTL（秒），默认 25 小时
     cache_pipeline_result_ttl: int = 172800     # 选股结果缓存 TTL（秒），默认 48 小时
@@ -130,6 +148,9 @@ class Settings(BaseSettings):
     # --- CORS ---
     cors_origins: list[str] = ["http://localhost:5173"]  # 允许跨域的前端地址
 
+    # --- Strategy Pipeline V2 (选股管道) ---
+    pipeline_trigger_workers: int = 1                      # Layer 2 并发执行 trigger 的线程数（1=串行，仅在基准显示收益时调大）
+
     # --- Market Optimization (全市场参数优化) ---
     market_opt_enabled: bool = True                        # 是否启用每周全市场参数优化
     market_opt_cron: str = "0 10 * * 6"                    # cron 表达式（默认周六 10:00）
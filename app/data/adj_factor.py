@@ -8,9 +8,16 @@ Tushare adj_factor 接口返回除权除息日的累积前复权因子。
   除权日 2024-12-20, foreAdjustFactor=0.964356
   → 2024-06-19 ~ 2024-12-19 的所有交易日 adj_factor = 0.949509
   → 2024-12-20 ~ 下一个除权日前 的所有交易日 adj_factor = 0.964356
+
+批量更新时先把全部 (ts_code, 区间, 因子) 写入一张临时表，再按标的分块
+以一条区间 JOIN 的 UPDATE 回写 stock_daily。只改写因子确实变化的行，
+并据此得出因子发生变化的标的，失效其技术指标递推状态（indicator_state），
+下次增量计算时全历史重算；被改写的日期区间同时标记到本地列式镜像与行情面板缓存，
+下次同步/更新时重新拉取。
 """
 
 import logging
+from collections.abc import Mapping
 from datetime import date as date_type
 
 from sqlalchemy import text
@@ -18,6 +25,52 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 logger = logging.getLogger(__name__)
 
+# 每条 UPDATE 覆盖的标的数（控制单条语句的扫描与锁范围）
+ADJ_UPDATE_CHUNK = 500
+
+_STAGE_TABLE = "_adj_factor_intervals"
+
+# 区间用 daterange 表示：[除权日, 下一个除权日)，NULL 边界为无界；
+# fill_only 区间为第一个除权日之前，只填充尚无因子的行
+_CREATE_STAGE_SQL = f"""
+    CREATE TEMP TABLE {_STAGE_TABLE} (
+        ts_code   varchar(16)   NOT NULL,
+        span      daterange     NOT NULL,
+        factor    numeric(16,6) NOT NULL,
+        fill_only boolean       NOT NULL
+    ) ON COMMIT DROP
+"""
+
+_STAGE_INSERT_SQL = f"""
+    INSERT INTO {_STAGE_TABLE} (ts_code, span, factor, fill_only)
+    SELECT u.ts_code, daterange(u.start_date, u.end_date, '[)'), u.factor, u.fill_only
+    FROM unnest(
+        CAST(:ts_codes AS text[]),
+        CAST(:start_dates AS date[]),
+        CAST(:end_dates AS date[]),
+        CAST(:factors AS float8[]),
+        CAST(:fill_only AS boolean[])
+    ) AS u(ts_code, start_date, end_date, factor, fill_only)
+"""
+
+# 一条区间 JOIN 回写一批标的；因子未变的行不改写，按标的返回改写行数与日期范围
+_RANGE_UPDATE_SQL = f"""
+    WITH upd AS (
+        UPDATE stock_daily d
+        SET adj_factor = i.factor,
+            updated_at = NOW()
+        FROM {_STAGE_TABLE} i
+        WHERE i.ts_code = ANY(CAST(:codes AS text[]))
+          AND d.ts_code = i.ts_code
+          AND i.span @> d.trade_date
+          AND (NOT i.fill_only OR d.adj_factor IS NULL)
+          AND d.adj_factor IS DISTINCT FROM i.factor
+        RETURNING d.ts_code, d.trade_date
+    )
+    SELECT ts_code, COUNT(*) AS n, MIN(trade_date) AS first_date, MAX(trade_date) AS last_date
+    FROM upd GROUP BY ts_code
+"""
+
 
 def _to_date(val: str | date_type) -> date_type:
     """将字符串或 date 对象统一转为 date。"""
@@ -26,6 +79,101 @@ def _to_date(val: str | date_type) -> date_type:
     return date_type.fromisoformat(str(val))
 
 
+def build_intervals(ts_code: str, records: list[dict]) -> list[tuple]:
+    """将除权日记录展开为因子区间。
+
+    Args:
+        ts_code: 股票代码
+        records: 除权日记录，每个 dict 含 trade_date 和 adj_factor（顺序不限）
+
+    Returns:
+        [(ts_code, start_date, end_date, factor, fill_only), ...]，
+        start_date 含、end_date 不含，None 表示无界
+    """
+    if not records:
+        return []
+    ordered = sorted(records, key=lambda r: _to_date(r["trade_date"]))
+    starts = [_to_date(r["trade_date"]) for r in ordered]
+    intervals = [
+        (ts_code, start, starts[i + 1] if i + 1 < len(starts) else None, float(rec["adj_factor"]), False)
+        for i, (start, rec) in enumerate(zip(starts, ordered))
+    ]
+    # 第一个除权日之前的交易日使用第一个因子（仅填充空值）
+    intervals.append((ts_code, None, starts[0], float(ordered[0]["adj_factor"]), True))
+    return intervals
+
+
+async def batch_update_adj_factors(
+    session_factory: async_sessionmaker[AsyncSession],
+    records_by_code: Mapping[str, list[dict]],
+    chunk_size: int = ADJ_UPDATE_CHUNK,
+    invalidate: bool = True,
+) -> dict:
+    """按除权日区间批量填充多只股票的 stock_daily.adj_factor。
+
+    全部区间一次写入临时表，再按 chunk_size 个标的一批执行区间 JOIN 更新，
+    整体在一个事务内完成。
+
+    Args:
+        session_factory: 异步数据库会话工厂
+        records_by_code: {ts_code: 除权日记录列表}，记录格式同 batch_update_adj_factor
+        chunk_size: 每条 UPDATE 覆盖的标的数
+        invalidate: 是否失效因子变化标的的技术指标递推状态
+
+    Returns:
+        {"updated": 改写行数, "changed_codes": [因子变化的标的], "invalidated": 失效状态数}
+    """
+    intervals = [iv for code, recs in records_by_code.items() for iv in build_intervals(code, recs)]
+    if not intervals:
+        return {"updated": 0, "changed_codes": [], "invalidated": 0}
+
+    codes = sorted({iv[0] for iv in intervals})
+    changed: dict[str, int] = {}
+    spans: list[tuple[date_type, date_type]] = []
+
+    async with session_factory() as session:
+        await session.execute(text(_CREATE_STAGE_SQL))
+        columns = list(zip(*intervals))
+        await session.execute(text(_STAGE_INSERT_SQL), {
+            "ts_codes": list(columns[0]),
+            "start_dates": list(columns[1]),
+            "end_dates": list(columns[2]),
+            "factors": list(columns[3]),
+            "fill_only": list(columns[4]),
+        })
+        for i in range(0, len(codes), chunk_size):
+            result = await session.execute(text(_RANGE_UPDATE_SQL), {"codes": codes[i : i + chunk_size]})
+            for row in result.fetchall():
+                changed[row.ts_code] = int(row.n)
+                spans.append((row.first_date, row.last_date))
+        await session.commit()
+
+    if spans:
+        from app.data.columnar_store import invalidate_columnar_range
+        from app.data.panel_cache import invalidate_panel_cache
+
+        first = min(s for s, _ in spans)
+        invalidate_columnar_range(
+            first, max(e for _, e in spans), datasets=["stock_daily", "technical_daily"],
+        )
+        invalidate_panel_cache(first)
+
+    changed_codes = sorted(changed)
+    invalidated = 0
+    if invalidate and changed_codes:
+        from app.data.indicator_state import invalidate_indicator_state
+        from app.models.technical import TechnicalDaily
+
+        invalidated = await invalidate_indicator_state(session_factory, TechnicalDaily, changed_codes)
+
+    updated = sum(changed.values())
+    logger.info(
+        "[adj_factor] %d 个标的、%d 个区间：因子变化 %d 个标的，改写 %d 行，失效递推状态 %d 条",
+        len(codes), len(intervals), len(changed_codes), updated, invalidated,
+    )
+    return {"updated": updated, "changed_codes": changed_codes, "invalidated": invalidated}
+
+
 async def batch_update_adj_factor(
     session_factory: async_sessionmaker[AsyncSession],
     ts_code: str,
@@ -40,78 +188,9 @@ async def batch_update_adj_factor(
                  每个 dict 含 trade_date (str) 和 adj_factor (Decimal)
 
     Returns:
-        更新的行数
+        更新的行数（因子未变化的行不计入）
     """
     if not records:
         return 0
-
-    # 按日期升序排列
-    sorted_records = sorted(records, key=lambda r: r["trade_date"])
-
-    total_updated = 0
-
-    async with session_factory() as session:
-        for i, rec in enumerate(sorted_records):
-            start_date = _to_date(rec["trade_date"])
-            adj_factor = float(rec["adj_factor"])
-
-            # 区间结束日期：下一个除权日的前一天，或无穷大
-            if i + 1 < len(sorted_records):
-                # 更新从当前除权日到下一个除权日前一天
-                end_date = _to_date(sorted_records[i + 1]["trade_date"])
-                stmt = text("""
-                    UPDATE stock_daily
-                    SET adj_factor = :adj_factor,
-                        updated_at = NOW()
-                    WHERE ts_code = :ts_code
-                      AND trade_date >= :start_date
-                      AND trade_date < :end_date
-                """)
-                result = await session.execute(stmt, {
-                    "ts_code": ts_code,
-                    "adj_factor": adj_factor,
-                    "start_date": start_date,
-                    "end_date": end_date,
-                })
-            else:
-                # 最后一个除权日：更新到所有后续交易日
-                stmt = text("""
-                    UPDATE stock_daily
-                    SET adj_factor = :adj_factor,
-                        updated_at = NOW()
-                    WHERE ts_code = :ts_code
-                      AND trade_date >= :start_date
-                """)
-                result = await session.execute(stmt, {
-                    "ts_code": ts_code,
-                    "adj_factor": adj_factor,
-                    "start_date": start_date,
-                })
-
-            total_updated += result.rowcount
-
-        # 第一个除权日之前的交易日也需要填充（使用第一个因子）
-        if sorted_records:
-            first_date = _to_date(sorted_records[0]["trade_date"])
-            first_factor = float(sorted_records[0]["adj_factor"])
-            stmt = text("""
-                UPDATE stock_daily
-                SET adj_factor = :adj_factor,
-                    updated_at = NOW()
-                WHERE ts_code = :ts_code
-                  AND trade_date < :first_date
-                  AND adj_factor IS NULL
-            """)
-            result = await session.execute(stmt, {
-                "ts_code": ts_code,
-                "adj_factor": first_factor,
-                "first_date": first_date,
-            })
-            total_updated += result.rowcount
-
-        await session.commit()
-
-    if total_updated > 0:
-        logger.debug("更新 %s 复权因子: %d 行", ts_code, total_updated)
-
-    return total_updated
+    result = await batch_update_adj_factors(session_factory, {ts_code: records})
+    return result["updated"]
@@ -1,7 +1,7 @@
 """批量日线数据同步模块（按日期模式）。
 
-Tushare 支持按日期获取全市场数据，每个交易日只需 3 次 API 调用。
-本模块提供按日期循环的批量同步功能。
+Tushare 支持按日期获取全市场数据，每个交易日只需 4 次 API 调用。
+本模块提供按日期的批量同步功能，拉取与写入通过 date_pipeline 流水线重叠执行。
 
 使用示例：
     from app.data.batch import batch_sync_daily
@@ -86,34 +86,35 @@ async def _sync_loop(
     trade_dates: list[date],
     start_time: float,
 ) -> dict[str, Any]:
-    """执行逐日同步循环。"""
+    """执行多日期同步流水线：拉取（fetch_raw_daily）与写入（write_raw_daily + etl_daily）重叠。
+
+    单个日期失败不影响其他日期；各阶段吞吐与瓶颈见返回值的 stages。
+    """
+    from app.data.date_pipeline import run_date_pipeline
+
     total = len(trade_dates)
-    success_count = 0
-    failed_count = 0
-    failed_dates: list[date] = []
+    done = 0
 
-    for idx, td in enumerate(trade_dates, 1):
+    async def _write(td: date, frames: dict) -> dict:
+        nonlocal done
         td_start = time.monotonic()
-        try:
-            # 1. 拉取原始数据到 raw 表
-            raw_counts = await manager.sync_raw_daily(td)
-            # 2. ETL 清洗到 stock_daily
-            etl_result = await manager.etl_daily(td)
-
-            td_elapsed = time.monotonic() - td_start
-            logger.info(
-                "[批量同步] %d/%d %s: raw=%s, etl=%d, 耗时 %.1fs",
-                idx, total, td, raw_counts, etl_result["inserted"], td_elapsed,
-            )
-            success_count += 1
-        except Exception as e:
-            td_elapsed = time.monotonic() - td_start
-            logger.warning(
-                "[批量同步] %d/%d %s 失败 (%.1fs): %s",
-                idx, total, td, td_elapsed, e,
-            )
-            failed_count += 1
-            failed_dates.append(td)
+        # 1. 写入 raw 表
+        raw_counts = await manager.write_raw_daily(td, frames)
+        # 2. ETL 清洗到 stock_daily
+        etl_result = await manager.etl_daily(td)
+        done += 1
+        logger.info(
+            "[批量同步] %d/%d %s: raw=%s, etl=%d, 写入耗时 %.1fs",
+            done, total, td, raw_counts, etl_result["inserted"], time.monotonic() - td_start,
+        )
+        return etl_result
+
+    pipeline = await run_date_pipeline(
+        trade_dates, manager.fetch_raw_daily, _write, label="批量同步",
+    )
+    success_count = len(pipeline["results"])
+    failed_dates = sorted(pipeline["errors"])
+    failed_count = len(failed_dates)
 
     elapsed = time.monotonic() - start_time
     avg_time = elapsed / total if total > 0 else 0
@@ -127,4 +128,5 @@ async def _sync_loop(
         "failed": failed_count,
         "failed_dates": failed_dates,
         "elapsed_seconds": round(elapsed, 1),
+        "stages": pipeline["stages"],
     }
@@ -152,7 +152,8 @@ def sync_daily() -> None:
 
 
 @cli.command("compute-indicators")
-def compute_indicators() -> None:
+@click.option("--workers", default=1, type=int, help="Worker processes (>1 enables process pool)")
+def compute_indicators(workers: int) -> None:
     """全量计算所有上市股票的技术指标并写入 technical_daily 表。"""
     from app.data.indicator import compute_all_stocks
 
@@ -165,6 +166,7 @@ def compute_indicators() -> None:
         result = await compute_all_stocks(
             async_session_factory,
             progress_callback=_progress,
+            workers=workers,
         )
         click.echo(
             f"全量计算完成: "
@@ -208,6 +210,114 @@ def update_indicators(target_date: str | None) -> None:
     asyncio.run(_run())
 
 
+@cli.command("sync-columnar")
+@click.option("--dataset", "datasets", multiple=True, help="Dataset name (repeatable), defaults to all")
+@click.option("--start", default=None, help="Resync from date (YYYY-MM-DD), defaults to store watermark")
+@click.option("--check", is_flag=True, help="Only compare store watermark with the database")
+@click.option("--verify", is_flag=True, help="Checksum every historical partition (full table scan)")
+def sync_columnar(datasets: tuple[str, ...], start: str | None, check: bool, verify: bool) -> None:
+    """增量同步本地列式镜像（Parquet），或检查镜像与数据库水位是否一致。
+
+    默认只校验最近 COLUMNAR_RECHECK_MONTHS 个月的分区；--verify 对全部历史分区做完整校验。
+    """
+    from app.data.columnar_store import check_columnar_watermark, sync_columnar_store
+
+    async def _run() -> None:
+        names = list(datasets) or None
+        if not check:
+            result = await sync_columnar_store(
+                async_session_factory,
+                datasets=names,
+                start_date=date.fromisoformat(start) if start else None,
+                verify=verify,
+            )
+            for name, info in result.items():
+                click.echo(f"{name}: {info['start']} ~ {info['end']}，写入 {info['rows']} 行")
+        status = await check_columnar_watermark(async_session_factory, datasets=names, verify=verify)
+        for name, info in status.items():
+            flag = "一致" if info["in_sync"] else "不一致"
+            click.echo(
+                f"{name}: {flag} db={info['db_max_date']}({info['db_rows']}) "
+                f"store={info['store_max_date']}({info['store_rows']})"
+            )
+            if info["stale_partitions"]:
+                click.echo(f"  不一致分区：{', '.join(info['stale_partitions'])}")
+
+    asyncio.run(_run())
+
+
+@cli.command("build-snapshot")
+@click.option("--start", required=True, help="Start date (YYYY-MM-DD)")
+@click.option("--end", default=None, help="End date (YYYY-MM-DD), defaults to --start")
+def build_snapshot(start: str, end: str | None) -> None:
+    """构建（或重建）每日市场快照 market_snapshot_daily。"""
+    from app.data.market_snapshot import build_market_snapshot_range
+
+    manager = _build_manager()
+
+    async def _run() -> None:
+        start_date = date.fromisoformat(start)
+        end_date = date.fromisoformat(end) if end else start_date
+        trade_dates = await manager.get_trade_calendar(start_date, end_date)
+        result = await build_market_snapshot_range(async_session_factory, trade_dates)
+        click.echo(
+            f"市场快照：{len(trade_dates)} 个交易日，成功 {result['success']}，"
+            f"失败 {result['failed']}，共 {result['rows']} 行"
+        )
+        if result["failed_dates"]:
+            click.echo(f"失败日期：{', '.join(str(d) for d in result['failed_dates'])}")
+
+    asyncio.run(_run())
+
+
+@cli.command("verify-etl-daily")
+@click.option("--start", required=True, help="Start date (YYYY-MM-DD)")
+@click.option("--end", default=None, help="End date (YYYY-MM-DD), defaults to start")
+def verify_etl_daily(start: str, end: str | None) -> None:
+    """逐行比对 stock_daily 的 SQL ETL 与 Python transform 结果（只读）。"""
+    manager = _build_manager()
+
+    async def _run() -> None:
+        report = await manager.verify_etl_daily(
+            date.fromisoformat(start), date.fromisoformat(end) if end else None,
+        )
+        click.echo(
+            f"SQL {report['sql_rows']} 行，Python {report['python_rows']} 行，"
+            f"差异 {report['mismatches']} 处"
+        )
+        for diff in report["samples"]:
+            click.echo(f"  {diff}")
+
+    asyncio.run(_run())
+
+
+@cli.command("tushare-limits")
+def tushare_limits() -> None:
+    """查看 Tushare 各接口的自适应限流状态与最近一分钟配额利用率（跨进程共享）。"""
+    from app.data.rate_limiter import AdaptiveRateLimiter
+    from app.data.tushare import TushareClient
+
+    async def _run() -> None:
+        limiter = AdaptiveRateLimiter(
+            default_rate=settings.tushare_qps_limit,
+            api_rates=TushareClient._API_RATE_LIMITS,
+            max_concurrency=settings.tushare_max_concurrency,
+            api_concurrency=TushareClient._API_CONCURRENCY,
+            backend=settings.tushare_rate_limit_backend,
+        )
+        snap = await limiter.snapshot()
+        if not snap:
+            click.echo("暂无限流记录")
+        for api, info in sorted(snap.items(), key=lambda kv: -kv[1]["utilization"]):
+            click.echo(
+                f"{api}: {info['used_last_minute']}/{info['ceiling']:.0f} 次/分钟 "
+                f"(利用率 {info['utilization']:.0%})，当前速率 {info['rate']:.0f}，"
+                f"限流 {info['throttled']} 次"
+            )
+
+    asyncio.run(_run())
+
+
 @cli.command("sync-adj-factor")
 @click.option("--force", is_flag=True, help="强制刷新所有股票的复权因子（忽略已有数据）")
 def sync_adj_factor(force: bool) -> None:
@@ -257,6 +367,14 @@ def backfill_daily(start: str, end: str) -> None:
             manager=manager,
         )
 
+        # 补入的历史交易日落在镜像水位之前，标记本地列式镜像与行情面板缓存待重新拉取
+        if result["success"]:
+            from app.data.columnar_store import invalidate_columnar_range
+            from app.data.panel_cache import invalidate_panel_cache
+
+            invalidate_columnar_range(min(missing_dates), max(missing_dates))
+            invalidate_panel_cache(min(missing_dates))
+
         overall_elapsed = int(time.monotonic() - overall_start)
         overall_minutes = overall_elapsed // 60
         overall_seconds = overall_elapsed % 60
@@ -286,6 +404,34 @@ def _generate_quarter_periods(start_date: date, end_date: date) -> list[str]:
     return periods
 
 
+@cli.command("backfill-raw")
+@click.option("--group", default="p0", help="Table group (p0/p1/p2/p3/p5/all)")
+@click.option("--start", required=True, help="Start date (YYYY-MM-DD)")
+@click.option("--end", required=True, help="End date (YYYY-MM-DD)")
+@click.option("--codes", default="", help="Comma-separated ts_codes with missing history (default: whole market)")
+def backfill_raw(group: str, start: str, end: str, codes: str) -> None:
+    """补齐 raw 表历史数据，按缺口形状自动选择逐日或逐代码区间拉取。"""
+    manager = _build_manager()
+    code_list = [c.strip() for c in codes.split(",") if c.strip()] or None
+
+    async def _run() -> None:
+        result = await manager.sync_raw_tables(
+            group, date.fromisoformat(start), date.fromisoformat(end), mode="full", codes=code_list,
+        )
+        for table, info in (result or {}).items():
+            status = "✓" if info["error"] is None else f"✗ {info['error'][:80]}"
+            click.echo(f"{table}: {info['rows']} 行 {status}")
+        # 日线组（daily/adj_factor/daily_basic）补数后标记本地列式镜像与行情面板缓存待重新拉取
+        if (result or {}).get("raw_tushare_daily", {}).get("rows"):
+            from app.data.columnar_store import invalidate_columnar_range
+            from app.data.panel_cache import invalidate_panel_cache
+
+            invalidate_columnar_range(date.fromisoformat(start), date.fromisoformat(end))
+            invalidate_panel_cache(date.fromisoformat(start))
+
+    asyncio.run(_run())
+
+
 @cli.command("init-tushare")
 @click.option("--start", default=None, help="开始日期 (YYYY-MM-DD)，默认为 settings.data_start_date")
 @click.option("--end", default=None, help="结束日期 (YYYY-MM-DD)，默认为今天")
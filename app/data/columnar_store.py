@@ -0,0 +1,567 @@
+"""本地列式行情镜像（Parquet）。
+
+将 stock_daily、technical_daily、daily_basic、adj_factor 按年/月分区镜像为
+Parquet 文件，供回测、参数优化等分析型场景按列批量读取，不占用数据库连接池。
+
+目录结构（hive 分区）：
+    {columnar_store_dir}/{dataset}/year=YYYY/month=MM/data.parquet
+    {columnar_store_dir}/{dataset}/_manifest.json   # 镜像水位（最新交易日、各分区行数与列和）
+
+- sync_columnar_store：盘后 ETL 后增量追加（从镜像水位的下一天开始），
+  同一月份重复写入时按 (ts_code, trade_date) 去重保留最新；随后只对最近
+  columnar_recheck_months 个月比对数据库与镜像的行数和各数值列之和（按 trade_date
+  索引的有界扫描），不一致的分区与被显式失效的分区整月重写
+- invalidate_columnar_range：复权因子重算、补数等改写历史行情的路径调用，
+  在清单中标记受影响的月份，下次同步时整月重写（只写本地清单，不访问数据库）
+- read_columns / read_frame：按日期区间 + 标的集合读取列数组
+- check_columnar_watermark：与数据库最新交易日、最近月份的分区校验值及待重写分区比对；
+  verify=True（CLI sync-columnar --verify）时对全部历史分区做完整校验（全表扫描）
+
+依赖 pyarrow（可选依赖，uv sync --extra columnar）。
+"""
+
+import json
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Float, Numeric, Table, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.models.market import StockDaily
+from app.models.raw import RawTushareAdjFactor, RawTushareDailyBasic
+from app.models.technical import TechnicalDaily
+
+logger = logging.getLogger(__name__)
+
+_MANIFEST = "_manifest.json"
+
+
+@dataclass(frozen=True)
+class MirrorDataset:
+    """镜像数据集定义。
+
+    Attributes:
+        name: 数据集名称（目录名）
+        table: 源表
+        date_is_text: 源表 trade_date 是否为 YYYYMMDD 文本（raw 表）
+    """
+
+    name: str
+    table: Table
+    date_is_text: bool = False
+
+    @property
+    def value_columns(self) -> list[str]:
+        """镜像的数值列（源表中的 Numeric/Float 列）。"""
+        return [
+            c.name for c in self.table.columns
+            if isinstance(c.type, (Numeric, Float)) and c.name not in ("ts_code", "trade_date")
+        ]
+
+
+DATASETS: dict[str, MirrorDataset] = {
+    "stock_daily": MirrorDataset("stock_daily", StockDaily.__table__),
+    "technical_daily": MirrorDataset("technical_daily", TechnicalDaily.__table__),
+    "daily_basic": MirrorDataset("daily_basic", RawTushareDailyBasic.__table__, date_is_text=True),
+    "adj_factor": MirrorDataset("adj_factor", RawTushareAdjFactor.__table__, date_is_text=True),
+}
+
+
+def _require_pyarrow():
+    """导入 pyarrow，未安装时给出明确提示。"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError("列式镜像需要 pyarrow，请执行 uv sync --extra columnar") from e
+    return pyarrow
+
+
+def _root(root: str | Path | None) -> Path:
+    return Path(root or settings.columnar_store_dir)
+
+
+def _schema(dataset: MirrorDataset):
+    pa = _require_pyarrow()
+    return pa.schema(
+        [("ts_code", pa.string()), ("trade_date", pa.date32())]
+        + [(col, pa.float64()) for col in dataset.value_columns]
+    )
+
+
+def _partition_path(root: Path, dataset: str, year: int, month: int) -> Path:
+    return root / dataset / f"year={year}" / f"month={month:02d}" / "data.parquet"
+
+
+def _partition_key(year: int, month: int) -> str:
+    return f"{year}-{month:02d}"
+
+
+def _partition_stats(dataset: MirrorDataset, df: pd.DataFrame) -> dict:
+    """分区校验值：行数与各数值列之和（空值不计）。"""
+    return {"rows": len(df), "sums": {c: float(df[c].sum()) for c in dataset.value_columns}}
+
+
+def _stats_match(a: dict | None, b: dict | None) -> bool:
+    """两个分区校验值是否一致；列和按浮点容差比较（数据库端为精确 Numeric 求和）。"""
+    if a is None or b is None:
+        return a is b
+    if a["rows"] != b["rows"]:
+        return False
+    return all(
+        math.isclose(a["sums"].get(c, 0.0), v, rel_tol=1e-12, abs_tol=1e-6)
+        for c, v in b["sums"].items()
+    )
+
+
+def _stale_partitions(db_stats: dict[str, dict], store_stats: dict[str, dict]) -> list[str]:
+    """行数或列和与数据库不一致的分区键（含数据库已无数据、镜像仍有的分区）。"""
+    return sorted(
+        key for key in set(db_stats) | set(store_stats)
+        if not _stats_match(db_stats.get(key), store_stats.get(key))
+    )
+
+
+def read_manifest(dataset: str, root: str | Path | None = None) -> dict:
+    """读取数据集镜像水位，不存在时返回空字典。"""
+    path = _root(root) / dataset / _MANIFEST
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write_manifest(dataset: str, root: Path, manifest: dict) -> None:
+    path = root / dataset / _MANIFEST
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def invalidate_columnar_range(
+    start: date,
+    end: date,
+    datasets: list[str] | None = None,
+    root: str | Path | None = None,
+) -> dict[str, list[str]]:
+    """标记 [start, end] 涉及的月份分区待重写（数据库中的历史数据已被改写）。
+
+    只修改本地清单，不访问数据库；镜像尚未建立的数据集跳过。
+    供改写历史行情的写入路径调用，清单写入失败只记录告警，不向调用方抛出。
+
+    Args:
+        start: 改写区间起始日
+        end: 改写区间结束日
+        datasets: 数据集名称列表，None 表示全部
+        root: 镜像根目录
+
+    Returns:
+        {dataset: 新标记的分区键列表}
+    """
+    root = _root(root)
+    keys = [_partition_key(d.year, d.month) for d, _ in _month_ranges(start, end)]
+    marked: dict[str, list[str]] = {}
+    for name in datasets or list(DATASETS):
+        try:
+            manifest = read_manifest(name, root)
+            if not manifest:
+                continue
+            pending = set(manifest.get("invalidated", []))
+            marked[name] = sorted(set(keys) - pending)
+            if marked[name]:
+                manifest["invalidated"] = sorted(pending | set(keys))
+                _write_manifest(name, root, manifest)
+        except (OSError, ValueError) as e:
+            logger.warning("[列式镜像] %s 标记失效分区失败：%s", name, e)
+    if any(marked.values()):
+        logger.info("[列式镜像] 标记待重写分区：%s ~ %s，%s", start, end, marked)
+    return marked
+
+
+# ============================================================
+# 写入
+# ============================================================
+
+
+def write_partitions(
+    dataset: MirrorDataset,
+    df: pd.DataFrame,
+    root: str | Path | None = None,
+    replace: bool = False,
+    stats: dict[str, dict] | None = None,
+) -> int:
+    """将长表按月分区写入镜像，与已有分区合并去重（保留新数据）。
+
+    Args:
+        dataset: 数据集定义
+        df: 包含 ts_code, trade_date(date) 和数值列的 DataFrame
+        root: 镜像根目录，默认 settings.columnar_store_dir
+        replace: 为 True 时 df 视为所涉月份的完整数据，直接覆盖已有分区
+        stats: 传入时按分区键（YYYY-MM）记录写入后分区的行数与列和
+
+    Returns:
+        写入（含合并后）的新增行数
+    """
+    _require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if df.empty:
+        return 0
+    root = _root(root)
+    schema = _schema(dataset)
+    columns = schema.names
+    df = df[columns]
+    dates = pd.to_datetime(df["trade_date"])
+
+    for (year, month), part in df.groupby([dates.dt.year, dates.dt.month]):
+        path = _partition_path(root, dataset.name, int(year), int(month))
+        if path.exists() and not replace:
+            existing = pq.read_table(path).to_pandas()
+            part = pd.concat([existing, part], ignore_index=True)
+            part = part.drop_duplicates(["ts_code", "trade_date"], keep="last")
+        part = part.sort_values(["trade_date", "ts_code"]).reset_index(drop=True)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        pq.write_table(pa.Table.from_pandas(part, schema=schema, preserve_index=False), tmp)
+        os.replace(tmp, path)
+        if stats is not None:
+            stats[_partition_key(int(year), int(month))] = _partition_stats(dataset, part)
+
+    return len(df)
+
+
+async def _fetch_range(
+    session_factory: async_sessionmaker[AsyncSession],
+    dataset: MirrorDataset,
+    start: date,
+    end: date,
+) -> pd.DataFrame:
+    """从数据库读取 [start, end] 区间的数据并转换为镜像列类型。"""
+    cols = ["ts_code", "trade_date", *dataset.value_columns]
+    params = (
+        {"start": start.strftime("%Y%m%d"), "end": end.strftime("%Y%m%d")}
+        if dataset.date_is_text else {"start": start, "end": end}
+    )
+    sql = text(
+        f"SELECT {', '.join(cols)} FROM {dataset.table.name} "
+        f"WHERE trade_date BETWEEN :start AND :end"
+    )
+    async with session_factory() as session:
+        result = await session.execute(sql, params)
+        rows = result.all()
+
+    df = pd.DataFrame(rows, columns=cols)
+    if df.empty:
+        return df
+    if dataset.date_is_text:
+        df["trade_date"] = pd.to_datetime(df["trade_date"], format="%Y%m%d").dt.date
+    for col in dataset.value_columns:
+        df[col] = pd.to_numeric(df[col]).astype(float)
+    return df
+
+
+async def _db_watermark(
+    session_factory: async_sessionmaker[AsyncSession],
+    dataset: MirrorDataset,
+) -> tuple[date | None, int]:
+    """数据库中的最新交易日及当日行数。"""
+    table_name = dataset.table.name
+    async with session_factory() as session:
+        max_date = (await session.execute(
+            text(f"SELECT MAX(trade_date) FROM {table_name}")
+        )).scalar()
+        if max_date is None:
+            return None, 0
+        count = (await session.execute(
+            text(f"SELECT COUNT(*) FROM {table_name} WHERE trade_date = :d"), {"d": max_date},
+        )).scalar()
+    if dataset.date_is_text:
+        max_date = datetime.strptime(max_date, "%Y%m%d").date()
+    return max_date, int(count or 0)
+
+
+async def _db_partition_stats(
+    session_factory: async_sessionmaker[AsyncSession],
+    dataset: MirrorDataset,
+    since: date | None = None,
+) -> dict[str, dict]:
+    """数据库中按月分组的行数与各数值列之和（与镜像分区一一对应）。
+
+    Args:
+        since: 只统计该日及之后的月份（走 trade_date 索引）；None 表示全表扫描
+    """
+    month_expr = (
+        "SUBSTRING(trade_date, 1, 4) || '-' || SUBSTRING(trade_date, 5, 2)"
+        if dataset.date_is_text else "TO_CHAR(trade_date, 'YYYY-MM')"
+    )
+    cols = dataset.value_columns
+    sums = "".join(f", CAST(SUM({c}) AS float8)" for c in cols)
+    where, params = "", {}
+    if since is not None:
+        where = "WHERE trade_date >= :since "
+        params = {"since": since.strftime("%Y%m%d") if dataset.date_is_text else since}
+    async with session_factory() as session:
+        result = await session.execute(text(
+            f"SELECT {month_expr} AS ym, COUNT(*){sums} "
+            f"FROM {dataset.table.name} {where}GROUP BY 1"
+        ), params)
+        rows = result.all()
+    return {
+        r[0]: {"rows": int(r[1]), "sums": {c: float(v or 0.0) for c, v in zip(cols, r[2:])}}
+        for r in rows
+    }
+
+
+def _recheck_since(db_max: date, months: int | None = None) -> date:
+    """比对窗口起始日：db_max 所在月往前共 months 个自然月的第一天。"""
+    months = settings.columnar_recheck_months if months is None else months
+    index = db_max.year * 12 + db_max.month - 1 - max(months - 1, 0)
+    return date(index // 12, index % 12 + 1, 1)
+
+
+async def _stale_in_window(
+    session_factory: async_sessionmaker[AsyncSession],
+    dataset: MirrorDataset,
+    partitions: dict[str, dict],
+    since: date | None,
+) -> list[str]:
+    """比对窗口内（since 为 None 时全部）数据库与镜像分区校验值，返回不一致的分区键。"""
+    db_stats = await _db_partition_stats(session_factory, dataset, since)
+    if since is not None:
+        first = _partition_key(since.year, since.month)
+        partitions = {k: v for k, v in partitions.items() if k >= first}
+    return _stale_partitions(db_stats, partitions)
+
+
+def _month_ranges(start: date, end: date) -> list[tuple[date, date]]:
+    """将 [start, end] 切分为自然月区间。"""
+    ranges = []
+    cur = start
+    while cur <= end:
+        next_month = (cur.replace(day=1) + timedelta(days=32)).replace(day=1)
+        ranges.append((cur, min(end, next_month - timedelta(days=1))))
+        cur = next_month
+    return ranges
+
+
+async def sync_columnar_store(
+    session_factory: async_sessionmaker[AsyncSession],
+    datasets: list[str] | None = None,
+    start_date: date | None = None,
+    root: str | Path | None = None,
+    verify: bool = False,
+) -> dict:
+    """增量同步数据库到本地列式镜像。
+
+    默认从镜像水位的下一天同步到数据库最新交易日；指定 start_date 时从该日
+    开始重新同步（已有数据按主键覆盖）。按自然月分批读取数据库以控制内存。
+
+    增量追加后，对最近 columnar_recheck_months 个月比对数据库与镜像分区的行数和列和
+    （按 trade_date 索引的有界 GROUP BY），不一致的分区连同 invalidate_columnar_range
+    标记的分区从数据库整月重写（数据库中已无数据的月份删除分区文件）。
+    verify=True 时对全部历史做完整比对（全表扫描，供手工校验）。
+    旧版清单没有分区校验值，首次同步时按 verify=True 整体比对一遍。
+
+    Args:
+        session_factory: 异步数据库会话工厂
+        datasets: 数据集名称列表，None 表示全部
+        start_date: 起始日期，None 表示从镜像水位（无水位时为 data_start_date）开始
+        root: 镜像根目录
+        verify: 是否对全部历史分区做完整校验
+
+    Returns:
+        {dataset: {"start": ..., "end": ..., "rows": N, "elapsed_seconds": T}}
+    """
+    _require_pyarrow()
+    root = _root(root)
+    result: dict[str, dict] = {}
+
+    for name in datasets or list(DATASETS):
+        ds = DATASETS[name]
+        step_start = time.monotonic()
+        manifest = read_manifest(name, root)
+        db_max, _ = await _db_watermark(session_factory, ds)
+        if db_max is None:
+            result[name] = {"start": None, "end": None, "rows": 0, "elapsed_seconds": 0.0}
+            continue
+
+        if start_date is not None:
+            start = start_date
+        elif manifest.get("max_trade_date"):
+            start = date.fromisoformat(manifest["max_trade_date"]) + timedelta(days=1)
+        else:
+            start = date.fromisoformat(settings.data_start_date)
+
+        full_check = verify or (bool(manifest) and "partitions" not in manifest)
+        partitions: dict[str, dict] = manifest.get("partitions", {})
+        rows = 0
+        for range_start, range_end in _month_ranges(start, db_max):
+            df = await _fetch_range(session_factory, ds, range_start, range_end)
+            rows += write_partitions(ds, df, root, stats=partitions)
+
+        # 历史分区改写：窗口内校验值不一致的月份 + 显式失效的月份，整月重写
+        since = None if full_check else _recheck_since(db_max)
+        invalidated = set(manifest.get("invalidated", []))
+        stale = await _stale_in_window(session_factory, ds, partitions, since)
+        rewritten = sorted(set(stale) | invalidated)
+        for key in rewritten:
+            year, month = (int(x) for x in key.split("-"))
+            month_start = date(year, month, 1)
+            month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+            df = await _fetch_range(session_factory, ds, month_start, month_end)
+            if df.empty:
+                _partition_path(root, name, year, month).unlink(missing_ok=True)
+                partitions.pop(key, None)
+                continue
+            rows += write_partitions(ds, df, root, replace=True, stats=partitions)
+
+        # 同步期间新增的失效标记保留到下次
+        pending = set(read_manifest(name, root).get("invalidated", [])) - set(rewritten)
+        store_max = max(db_max, date.fromisoformat(manifest["max_trade_date"])) \
+            if manifest.get("max_trade_date") else db_max
+        _write_manifest(name, root, {
+            "max_trade_date": store_max.isoformat(),
+            "rows": sum(p["rows"] for p in partitions.values()),
+            "partitions": dict(sorted(partitions.items())),
+            "invalidated": sorted(pending),
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+        })
+        elapsed = round(time.monotonic() - step_start, 2)
+        result[name] = {
+            "start": start.isoformat(), "end": db_max.isoformat(),
+            "rows": rows, "rewritten_partitions": rewritten, "elapsed_seconds": elapsed,
+        }
+        logger.info(
+            "[列式镜像] %s：%s ~ %s，写入 %d 行（重写历史分区 %d 个），耗时 %.1fs",
+            name, start, db_max, rows, len(rewritten), elapsed,
+        )
+
+    return result
+
+
+# ============================================================
+# 读取
+# ============================================================
+
+
+def read_frame(
+    dataset: str,
+    start_date: date,
+    end_date: date,
+    codes: list[str] | None = None,
+    columns: list[str] | None = None,
+    root: str | Path | None = None,
+) -> pd.DataFrame:
+    """按日期区间和标的集合读取镜像数据。
+
+    Args:
+        dataset: 数据集名称（stock_daily/technical_daily/daily_basic/adj_factor）
+        start_date: 起始日期（含）
+        end_date: 结束日期（含）
+        codes: 标的列表，None 表示全部
+        columns: 数值列列表，None 表示全部；ts_code 与 trade_date 总是返回
+        root: 镜像根目录
+
+    Returns:
+        按 trade_date, ts_code 排序的 DataFrame
+    """
+    _require_pyarrow()
+    import pyarrow.dataset as pads
+
+    path = _root(root) / dataset
+    value_columns = DATASETS[dataset].value_columns if columns is None else columns
+    wanted = ["ts_code", "trade_date", *value_columns]
+    if not path.exists():
+        return pd.DataFrame(columns=wanted)
+
+    ds = pads.dataset(path, format="parquet", partitioning="hive")
+    flt = (
+        (pads.field("year") >= start_date.year) & (pads.field("year") <= end_date.year)
+        & (pads.field("trade_date") >= start_date) & (pads.field("trade_date") <= end_date)
+    )
+    if codes is not None:
+        flt = flt & pads.field("ts_code").isin(codes)
+    table = ds.to_table(columns=wanted, filter=flt)
+    return table.to_pandas(date_as_object=True).sort_values(
+        ["trade_date", "ts_code"], ignore_index=True,
+    )
+
+
+def read_columns(
+    dataset: str,
+    start_date: date,
+    end_date: date,
+    codes: list[str] | None = None,
+    columns: list[str] | None = None,
+    root: str | Path | None = None,
+) -> dict[str, np.ndarray]:
+    """按日期区间和标的集合读取镜像数据，返回列数组。
+
+    Returns:
+        {"ts_code": object 数组, "trade_date": datetime64[D] 数组, 数值列: float64 数组}
+    """
+    df = read_frame(dataset, start_date, end_date, codes, columns, root)
+    out = {col: df[col].to_numpy() for col in df.columns}
+    out["trade_date"] = np.asarray(df["trade_date"], dtype="datetime64[D]")
+    return out
+
+
+async def check_columnar_watermark(
+    session_factory: async_sessionmaker[AsyncSession],
+    datasets: list[str] | None = None,
+    root: str | Path | None = None,
+    verify: bool = False,
+) -> dict[str, dict]:
+    """比对镜像与数据库：最新交易日及当日行数，以及分区的行数与列和。
+
+    默认只比对最近 columnar_recheck_months 个月的分区（有界扫描），并把已被
+    invalidate_columnar_range 标记、尚未重写的分区计为不一致；verify=True 时
+    比对全部历史分区（全表扫描）。不一致的分区在下次 sync_columnar_store 时整月重写。
+
+    Returns:
+        {dataset: {"db_max_date", "store_max_date", "db_rows", "store_rows",
+                   "stale_partitions", "in_sync"}}
+    """
+    result: dict[str, dict] = {}
+    for name in datasets or list(DATASETS):
+        db_max, db_rows = await _db_watermark(session_factory, DATASETS[name])
+        manifest = read_manifest(name, root)
+        store_max = (
+            date.fromisoformat(manifest["max_trade_date"])
+            if manifest.get("max_trade_date") else None
+        )
+        store_rows = (
+            len(read_frame(name, store_max, store_max, columns=[], root=root))
+            if store_max else 0
+        )
+        stale: list[str] = []
+        if db_max is not None:
+            since = None if verify else _recheck_since(db_max)
+            stale = await _stale_in_window(
+                session_factory, DATASETS[name], manifest.get("partitions", {}), since,
+            )
+        stale = sorted(set(stale) | set(manifest.get("invalidated", [])))
+        in_sync = db_max == store_max and db_rows == store_rows and not stale
+        result[name] = {
+            "db_max_date": db_max.isoformat() if db_max else None,
+            "store_max_date": store_max.isoformat() if store_max else None,
+            "db_rows": db_rows,
+            "store_rows": store_rows,
+            "stale_partitions": stale,
+            "in_sync": in_sync,
+        }
+        if not in_sync:
+            logger.warning(
+                "[列式镜像] %s 与数据库不一致：db=%s(%d 行)，store=%s(%d 行)，不一致分区 %s",
+                name, db_max, db_rows, store_max, store_rows, stale,
+            )
+    return result
@@ -1,22 +1,38 @@
 """PostgreSQL COPY 协议批量写入模块。
 
 使用 asyncpg 的 copy_records_to_table() 实现高性能批量写入，
-采用临时表 + COPY + UPSERT 三步法保证幂等性。
+采用暂存表 + COPY + UPSERT 三步法保证幂等性。
 
-写入流程：
-1. 创建与目标表同结构的临时表（ON COMMIT DROP）
-2. 通过 COPY 协议将数据写入临时表
-3. 从临时表 INSERT INTO 目标表（ON CONFLICT DO UPDATE/NOTHING）
+写入流程（copy_insert）：
+1. 首次使用时创建与目标表同结构的 UNLOGGED 暂存表 _stg_{table}_{n}，之后复用
+2. 每批在一个事务内 TRUNCATE 暂存表，通过 COPY 协议写入
+3. 从暂存表 INSERT INTO 目标表（ON CONFLICT DO UPDATE/NOTHING）后提交
+
+大批量写入（>= copy_shard_min_rows）按 ts_code 哈希拆成 copy_parallel_shards 个
+分片，每个分片占用一个连接和一张暂存表，COPY 与合并并行执行。
 
 性能提升约 10 倍（相比逐行 INSERT）。
+
+列式写入（copy_upsert_frame）直接接受 DataFrame / numpy 数组，按 CSV 格式
+整批 COPY，不构建逐行 dict/tuple；目标范围为空时可跳过暂存表直接 COPY，
+否则与 copy_insert 一样经常驻暂存表合并。
+copy_insert 也接受 DataFrame，按列构建 COPY 记录（raw 表列式写入路径），
+写入前由 project_frame 完成列投影与主键去重。
 """
 
+import asyncio
+import io
 import logging
 import time
+from collections.abc import Mapping
 from typing import Literal
 
+import numpy as np
+import pandas as pd
+from asyncpg.exceptions import DuplicateTableError, UndefinedColumnError, UndefinedTableError, UniqueViolationError
 from sqlalchemy import Table
 
+from app.config import settings
 from app.database import get_raw_connection
 
 logger = logging.getLogger(__name__)
@@ -24,24 +40,37 @@ logger = logging.getLogger(__name__)
 # 单次 COPY 最大行数（控制内存使用）
 COPY_BATCH_SIZE = 50000
 
+# copy_insert 常驻暂存表前缀（UNLOGGED，不写 WAL，跨批次/跨调用复用）
+STAGING_PREFIX = "_stg_"
+
+# 本进程已确认存在的暂存表 / 正在使用的暂存表
+_staging_ready: set[str] = set()
+_busy_slots: set[str] = set()
+
 
 async def copy_insert(
     table: Table,
-    rows: list[dict],
+    rows: list[dict] | pd.DataFrame,
     conflict: Literal["update", "nothing"] = "nothing",
     batch_size: int = COPY_BATCH_SIZE,
+    shards: int | None = None,
+    report: list[dict] | None = None,
 ) -> int:
     """使用 COPY 协议批量写入数据到目标表。
 
-    采用临时表 + COPY + UPSERT 三步法，兼顾高性能和幂等性。
+    采用常驻 UNLOGGED 暂存表 + COPY + UPSERT 三步法，兼顾高性能和幂等性。
+    传入 DataFrame 时按列构建 COPY 记录（见 frame_records），不经过逐行 dict。
+    行数达到 copy_shard_min_rows 时按 ts_code 哈希拆分，多个连接并行 COPY 与合并。
 
     Args:
         table: SQLAlchemy Table 对象
-        rows: 待写入的数据行列表
+        rows: 待写入的数据行列表，或列名与表列一致的 DataFrame（NaN 写为 NULL）
         conflict: 冲突处理策略
             - "update": ON CONFLICT DO UPDATE（适用于 raw 表）
             - "nothing": ON CONFLICT DO NOTHING（适用于业务表）
         batch_size: 单次 COPY 最大行数，默认 50000
+        shards: 并行分片数，None 时按配置与行数自动决定，1 为单连接写入
+        report: 传入列表时追加每批统计（shard/rows/copy_s/merge_s/rows_per_s）
 
     Returns:
         处理的总行数
@@ -49,119 +78,399 @@ async def copy_insert(
     Raises:
         Exception: COPY 操作失败时抛出，调用方应捕获并降级
     """
-    if not rows:
+    is_frame = isinstance(rows, pd.DataFrame)
+    if (rows.empty if is_frame else not rows):
         return 0
 
     total = len(rows)
     start = time.monotonic()
     table_name = table.name
-
-    # 获取列信息：排除有 server_default 且数据中未提供值的列（COPY 不触发 DEFAULT）
-    all_columns = [c.name for c in table.columns]
     pk_cols = [c.name for c in table.primary_key.columns]
 
     # 检查第一行数据中实际提供了哪些列
-    provided_keys = set(rows[0].keys()) if rows else set()
+    provided_keys = set(rows.columns) if is_frame else set(rows[0].keys())
     # server_default 列：如果数据中未提供，则排除（如 fetched_at, created_at, updated_at）
     columns = [
         c.name for c in table.columns
         if c.name in provided_keys or c.server_default is None
     ]
+    merge_sql = _merge_sql(
+        table_name, columns, pk_cols, conflict,
+        touch=_touch_columns([c.name for c in table.columns], columns),
+    )
 
-    processed = 0
+    if shards is None:
+        shards = 1
+        if total >= settings.copy_shard_min_rows:
+            shards = max(1, min(settings.copy_parallel_shards, settings.db_pool_size))
+    parts = _shard_rows(rows, _shard_key(pk_cols, provided_keys), shards) if shards > 1 else [rows]
 
-    async with get_raw_connection() as raw_conn:
-        # 分批处理
-        for offset in range(0, total, batch_size):
-            batch = rows[offset : offset + batch_size]
-            batch_start = time.monotonic()
-
-            # 将 dict 列表转为 tuple 列表（按列顺序）
-            records = [
-                tuple(row.get(col) for col in columns)
-                for row in batch
-            ]
-
-            tmp_table = f"_tmp_{table_name}"
-
-            # 1. 创建临时表（不使用 ON COMMIT DROP，因为 asyncpg 连接可能在自动提交模式）
-            await raw_conn.execute(
-                f'DROP TABLE IF EXISTS "{tmp_table}"'
+    # 各分片占用一张独立的暂存表（_stg_{table}_{n}）
+    slots = [_acquire_slot(table_name) for _ in parts]
+    stats: list[dict] = []
+    try:
+        results = await asyncio.gather(
+            *(
+                _copy_shard(table_name, slots[index], part, columns, merge_sql, batch_size, index, stats)
+                for index, part in enumerate(parts)
+            ),
+            return_exceptions=True,
+        )
+    finally:
+        _busy_slots.difference_update(slots)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    processed = sum(results)
+    if report is not None:
+        report.extend(stats)
+
+    elapsed = time.monotonic() - start
+    rate = processed / elapsed if elapsed > 0 else 0
+    logger.info(
+        "[COPY] %s: 共 %d 行（%d 个分片, %d 批）, 耗时 %.2fs（合并 %.2fs）, %.0f 行/秒",
+        table_name, processed, len(parts), len(stats), elapsed,
+        sum(s["merge_s"] for s in stats), rate,
+    )
+    return processed
+
+
+def _merge_sql(
+    table_name: str,
+    columns: list[str],
+    pk_cols: list[str],
+    conflict: Literal["update", "nothing"],
+    touch: tuple[str, ...] = (),
+) -> str:
+    """生成从暂存表合并到目标表的 INSERT ... SELECT ... ON CONFLICT 语句（暂存表名以 {staging} 占位）。
+
+    touch 中的列在 DO UPDATE 时刷新为 NOW()（见 _touch_columns）。
+    """
+    col_list = ", ".join(f'"{c}"' for c in columns)
+    sql = (
+        f'INSERT INTO "{table_name}" ({col_list}) '
+        f'SELECT {col_list} FROM "{{staging}}" '
+    )
+    if not pk_cols:
+        return sql
+
+    pk_list = ", ".join(f'"{c}"' for c in pk_cols)
+    update_cols = [c for c in columns if c not in pk_cols and c != "fetched_at"]
+    if conflict == "update" and update_cols:
+        # ON CONFLICT DO UPDATE（raw 表模式）
+        set_clause = ", ".join(f'"{c}" = EXCLUDED."{c}"' for c in update_cols)
+        set_clause += "".join(f', "{c}" = NOW()' for c in touch if c not in update_cols)
+        return sql + f"ON CONFLICT ({pk_list}) DO UPDATE SET {set_clause}"
+    # ON CONFLICT DO NOTHING（业务表模式）
+    return sql + f"ON CONFLICT ({pk_list}) DO NOTHING"
+
+
+def _touch_columns(table_cols: list[str], columns: list[str]) -> tuple[str, ...]:
+    """冲突更新时需刷新为 NOW() 的时间戳列。
+
+    updated_at 未由数据提供时刷新；fetched_at 从不取 EXCLUDED 值，存在即刷新，
+    使下游（如 market_snapshot 新鲜度检查）能感知 raw 行被重新拉取覆盖。
+    """
+    return tuple(
+        c for c in ("updated_at", "fetched_at")
+        if c in table_cols and (c == "fetched_at" or c not in columns)
+    )
+
+
+def _shard_key(pk_cols: list[str], provided: set[str]) -> str | None:
+    """分片键：优先 ts_code，否则取第一个主键列；数据中不存在时返回 None（不分片）。"""
+    for key in ("ts_code", *pk_cols):
+        if key in provided:
+            return key
+    return None
+
+
+def _shard_rows(
+    rows: list[dict] | pd.DataFrame, key: str | None, shards: int,
+) -> list[list[dict] | pd.DataFrame]:
+    """按分片键哈希把数据拆成至多 shards 份，同一键值的行落在同一分片。
+
+    分片之间的主键集合互不相交，并行合并时不会争用同一行锁。
+    """
+    if key is None:
+        return [rows]
+    if isinstance(rows, pd.DataFrame):
+        bucket = (pd.util.hash_pandas_object(rows[key], index=False).to_numpy() % shards).astype(np.int64)
+        parts = [rows[bucket == i] for i in range(shards)]
+        return [p for p in parts if not p.empty]
+    buckets: list[list[dict]] = [[] for _ in range(shards)]
+    for row in rows:
+        buckets[hash(row.get(key)) % shards].append(row)
+    return [b for b in buckets if b]
+
+
+def _acquire_slot(table_name: str) -> str:
+    """占用一个本进程内空闲的暂存表名（_stg_{table}_{n}），并发写入同一张表时各用一张。"""
+    slot = 0
+    while f"{STAGING_PREFIX}{table_name}_{slot}" in _busy_slots:
+        slot += 1
+    staging = f"{STAGING_PREFIX}{table_name}_{slot}"
+    _busy_slots.add(staging)
+    return staging
+
+
+async def _ensure_staging(raw_conn, table_name: str, staging: str, recreate: bool = False) -> None:
+    """确保 UNLOGGED 暂存表存在（结构同目标表）；recreate=True 时先删除重建（目标表结构变更后）。"""
+    if staging in _staging_ready and not recreate:
+        return
+    if recreate:
+        await raw_conn.execute(f'DROP TABLE IF EXISTS "{staging}"')
+    try:
+        await raw_conn.execute(
+            f'CREATE UNLOGGED TABLE IF NOT EXISTS "{staging}" '
+            f'(LIKE "{table_name}" INCLUDING DEFAULTS)'
+        )
+    except (DuplicateTableError, UniqueViolationError):
+        # 其他进程同时创建，表已存在即可
+        pass
+    _staging_ready.add(staging)
+
+
+async def _copy_batch(
+    raw_conn, staging: str, records: list[tuple] | pd.DataFrame, columns: list[str], merge_sql: str,
+) -> dict:
+    """单批写入：同一事务内 TRUNCATE 暂存表 → COPY → 合并到目标表。
+
+    records 为 DataFrame 时按 CSV 格式整批 COPY（copy_upsert_frame），否则按记录 COPY。
+    TRUNCATE 持有暂存表排他锁直到提交，多个进程复用同一暂存表时自动串行。
+    """
+    copy_start = time.monotonic()
+    await raw_conn.execute("BEGIN")
+    try:
+        await raw_conn.execute(f'TRUNCATE "{staging}"')
+        if isinstance(records, pd.DataFrame):
+            await raw_conn.copy_to_table(
+                staging, source=_frame_to_csv(records), columns=columns, format="csv",
             )
-            await raw_conn.execute(
-                f'CREATE TEMP TABLE "{tmp_table}" '
-                f'(LIKE "{table_name}" INCLUDING DEFAULTS)'
+        else:
+            await raw_conn.copy_records_to_table(staging, records=records, columns=columns)
+        merge_start = time.monotonic()
+        await raw_conn.execute(merge_sql.format(staging=staging))
+        merge_s = time.monotonic() - merge_start
+        await raw_conn.execute("COMMIT")
+    except Exception:
+        await raw_conn.execute("ROLLBACK")
+        raise
+    elapsed = time.monotonic() - copy_start
+    return {
+        "rows": len(records),
+        "copy_s": elapsed - merge_s,
+        "merge_s": merge_s,
+        "rows_per_s": len(records) / elapsed if elapsed > 0 else 0,
+    }
+
+
+async def _copy_batch_retry(
+    raw_conn, table_name: str, staging: str, records: list[tuple] | pd.DataFrame,
+    columns: list[str], merge_sql: str,
+) -> dict:
+    """_copy_batch，暂存表由旧版表结构创建或已被删除时重建后重试一次。"""
+    try:
+        return await _copy_batch(raw_conn, staging, records, columns, merge_sql)
+    except (UndefinedColumnError, UndefinedTableError):
+        logger.info("[COPY] %s: 暂存表 %s 不可用，重建", table_name, staging)
+        await _ensure_staging(raw_conn, table_name, staging, recreate=True)
+        return await _copy_batch(raw_conn, staging, records, columns, merge_sql)
+
+
+async def _copy_shard(
+    table_name: str,
+    staging: str,
+    rows: list[dict] | pd.DataFrame,
+    columns: list[str],
+    merge_sql: str,
+    batch_size: int,
+    shard: int,
+    stats: list[dict],
+) -> int:
+    """在一个独立连接上经暂存表 staging 分批写入一个分片，每批统计追加到 stats。"""
+    is_frame = isinstance(rows, pd.DataFrame)
+    processed = 0
+    async with get_raw_connection() as raw_conn:
+        await _ensure_staging(raw_conn, table_name, staging)
+        for offset in range(0, len(rows), batch_size):
+            if is_frame:
+                records = frame_records(rows.iloc[offset : offset + batch_size], columns)
+            else:
+                # 将 dict 列表转为 tuple 列表（按列顺序）
+                records = [
+                    tuple(row.get(col) for col in columns)
+                    for row in rows[offset : offset + batch_size]
+                ]
+
+            batch = await _copy_batch_retry(raw_conn, table_name, staging, records, columns, merge_sql)
+
+            batch["shard"] = shard
+            stats.append(batch)
+            processed += batch["rows"]
+            logger.debug(
+                "[COPY] %s: 分片 %d 批次 %d 行, COPY %.2fs, 合并 %.2fs, %.0f 行/秒",
+                table_name, shard, batch["rows"], batch["copy_s"], batch["merge_s"], batch["rows_per_s"],
             )
+    return processed
 
-            try:
-                # 2. COPY 数据到临时表
-                await raw_conn.copy_records_to_table(
-                    tmp_table,
-                    records=records,
-                    columns=columns,
-                )
 
-                # 3. 从临时表 UPSERT 到目标表
-                col_list = ", ".join(f'"{c}"' for c in columns)
-                insert_sql = (
-                    f'INSERT INTO "{table_name}" ({col_list}) '
-                    f'SELECT {col_list} FROM "{tmp_table}" '
-                )
+def frame_records(frame: pd.DataFrame, columns: list[str]) -> list[tuple]:
+    """按列构建 COPY 记录：每列一次性转为 Python 对象数组（NaN/NaT → None）后 zip 成行。
 
-                if conflict == "update" and pk_cols:
-                    # ON CONFLICT DO UPDATE（raw 表模式）
-                    pk_list = ", ".join(f'"{c}"' for c in pk_cols)
-                    update_cols = [
-                        c for c in columns
-                        if c not in pk_cols and c != "fetched_at"
-                    ]
-                    if update_cols:
-                        set_clause = ", ".join(
-                            f'"{c}" = EXCLUDED."{c}"' for c in update_cols
-                        )
-                        insert_sql += (
-                            f"ON CONFLICT ({pk_list}) "
-                            f"DO UPDATE SET {set_clause}"
-                        )
-                    else:
-                        insert_sql += (
-                            f"ON CONFLICT ({pk_list}) DO NOTHING"
-                        )
-                elif pk_cols:
-                    # ON CONFLICT DO NOTHING（业务表模式）
-                    pk_list = ", ".join(f'"{c}"' for c in pk_cols)
-                    insert_sql += (
-                        f"ON CONFLICT ({pk_list}) DO NOTHING"
-                    )
+    frame 中不存在的列写为 NULL。比逐行 dict → tuple 少一次完整的 Python 对象往返。
+    """
+    arrays = []
+    for col in columns:
+        if col not in frame.columns:
+            arrays.append([None] * len(frame))
+            continue
+        series = frame[col]
+        values = series.to_numpy(dtype=object)
+        missing = series.isna().to_numpy()
+        if missing.any():
+            values[missing] = None
+        arrays.append(values)
+    return list(zip(*arrays))
 
-                await raw_conn.execute(insert_sql)
 
-                # 清理临时表（ON COMMIT DROP 在事务提交时清理，
-                # 但显式 DROP 确保同一事务内多批次不冲突）
-                await raw_conn.execute(f'DROP TABLE IF EXISTS "{tmp_table}"')
+def project_frame(table: Table, frame: pd.DataFrame) -> pd.DataFrame:
+    """按目标表投影 DataFrame：只保留表中存在的列，过滤主键为空的行，按主键去重（保留最后一条）。
 
-                batch_elapsed = time.monotonic() - batch_start
-                processed += len(batch)
+    全部为向量化操作，与逐行写入路径的列过滤 / 主键去重语义一致；NaN 不需要
+    预先清洗，写入时由 CSV 编码为 NULL。
+    """
+    columns = [c.name for c in table.columns if c.name in frame.columns]
+    pk_cols = [c.name for c in table.primary_key.columns]
+    if any(c not in frame.columns for c in pk_cols):
+        return frame.iloc[0:0][columns]
+    frame = frame[columns]
+    if pk_cols:
+        frame = frame[frame[pk_cols].notna().all(axis=1)]
+        frame = frame.drop_duplicates(pk_cols, keep="last")
+    return frame
 
-                logger.debug(
-                    "[COPY] %s: 批次 %d 行, 耗时 %.2fs, %.0f 行/秒",
-                    table_name,
-                    len(batch),
-                    batch_elapsed,
-                    len(batch) / batch_elapsed if batch_elapsed > 0 else 0,
+
+def _frame_to_csv(frame: pd.DataFrame) -> io.BytesIO:
+    """将 DataFrame 编码为无表头 CSV（NaN/None 写为空字段，即 NULL）。"""
+    buf = io.BytesIO()
+    frame.to_csv(buf, header=False, index=False, na_rep="", date_format="%Y-%m-%d")
+    buf.seek(0)
+    return buf
+
+
+async def _target_range_empty(raw_conn, table_name: str, frame: pd.DataFrame, pk_cols: list[str]) -> bool:
+    """判断目标表中是否已有本批数据覆盖范围内的行。
+
+    主键为 (ts_code, trade_date) 时只检查本批标的 + 日期范围（走主键索引），
+    否则检查整张表是否为空。
+    """
+    if {"ts_code", "trade_date"} <= set(pk_cols) and {"ts_code", "trade_date"} <= set(frame.columns):
+        dates = pd.to_datetime(frame["trade_date"])
+        exists = await raw_conn.fetchval(
+            f'SELECT EXISTS (SELECT 1 FROM "{table_name}" '
+            f"WHERE ts_code = ANY($1::text[]) AND trade_date BETWEEN $2 AND $3)",
+            frame["ts_code"].unique().tolist(),
+            dates.min().date(),
+            dates.max().date(),
+        )
+    else:
+        exists = await raw_conn.fetchval(f'SELECT EXISTS (SELECT 1 FROM "{table_name}")')
+    return not exists
+
+
+async def copy_upsert_frame(
+    table: Table,
+    data: pd.DataFrame | Mapping[str, np.ndarray],
+    conflict: Literal["update", "nothing"] = "update",
+    mode: Literal["auto", "merge", "direct"] = "auto",
+    batch_size: int = COPY_BATCH_SIZE,
+) -> int:
+    """列式 COPY 写入：直接接受 DataFrame 或 {列名: 数组}，不构建逐行 dict。
+
+    每批数据编码为 CSV 后通过 copy_to_table 写入，写入方式：
+    - "merge": 与 copy_insert 共用常驻 UNLOGGED 暂存表（_stg_{table}_{n}），
+      事务内 TRUNCATE → COPY → INSERT ... ON CONFLICT 合并（幂等）
+    - "direct": 直接 COPY 到目标表（目标范围为空时最快，有冲突会失败）
+    - "auto": 每批检查目标范围是否为空，为空走 direct，否则走 merge；
+      direct 遇到主键冲突（并发写入）时自动改走 merge
+
+    Args:
+        table: SQLAlchemy Table 对象
+        data: DataFrame 或 {列名: numpy 数组/序列}，NaN 写为 NULL
+        conflict: 合并时的冲突处理策略（"update" 时同时刷新 updated_at）
+        mode: 写入方式
+        batch_size: 单次 COPY 最大行数，默认 50000
+
+    Returns:
+        处理的总行数
+
+    Raises:
+        Exception: COPY 操作失败时抛出，调用方应捕获并降级
+    """
+    frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame(dict(data))
+    if frame.empty:
+        return 0
+
+    start = time.monotonic()
+    table_name = table.name
+    pk_cols = [c.name for c in table.primary_key.columns]
+    table_cols = [c.name for c in table.columns]
+    columns = [c for c in table_cols if c in frame.columns]
+    frame = frame[columns]
+    total = len(frame)
+
+    merge_sql = _merge_sql(
+        table_name, columns, pk_cols, conflict,
+        touch=_touch_columns(table_cols, columns),
+    )
+
+    processed = 0
+    direct_batches = 0
+    staging: str | None = None
+
+    async with get_raw_connection() as raw_conn:
+        try:
+            for offset in range(0, total, batch_size):
+                batch = frame.iloc[offset : offset + batch_size]
+                batch_start = time.monotonic()
+
+                use_direct = mode == "direct" or (
+                    mode == "auto" and await _target_range_empty(raw_conn, table_name, batch, pk_cols)
                 )
 
-            except Exception:
-                # 确保临时表被清理
-                await raw_conn.execute(
-                    f'DROP TABLE IF EXISTS "{tmp_table}"'
+                if use_direct:
+                    try:
+                        await raw_conn.copy_to_table(
+                            table_name, source=_frame_to_csv(batch), columns=columns, format="csv",
+                        )
+                        direct_batches += 1
+                    except UniqueViolationError:
+                        if mode == "direct":
+                            raise
+                        logger.info("[COPY] %s: 直接写入遇到主键冲突，改用暂存表合并", table_name)
+                        use_direct = False
+
+                if not use_direct:
+                    if staging is None:
+                        staging = _acquire_slot(table_name)
+                        await _ensure_staging(raw_conn, table_name, staging)
+                    await _copy_batch_retry(raw_conn, table_name, staging, batch, columns, merge_sql)
+
+                processed += len(batch)
+                batch_elapsed = time.monotonic() - batch_start
+                logger.debug(
+                    "[COPY] %s: 批次 %d 行（%s）, 耗时 %.2fs",
+                    table_name, len(batch), "direct" if use_direct else "merge", batch_elapsed,
                 )
-                raise
+        finally:
+            if staging is not None:
+                _busy_slots.discard(staging)
 
     elapsed = time.monotonic() - start
     rate = processed / elapsed if elapsed > 0 else 0
     logger.info(
-        "[COPY] %s: 共 %d 行, 耗时 %.2fs, %.0f 行/秒",
-        table_name, processed, elapsed, rate,
+        "[COPY] %s: 列式写入 %d 行（直接 COPY %d 批）, 耗时 %.2fs, %.0f 行/秒",
+        table_name, processed, direct_batches, elapsed, rate,
     )
     return processed
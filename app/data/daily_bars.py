@@ -0,0 +1,121 @@
+"""日线行情的列式表示与向量化复权。
+
+DataManager.get_daily_bars_columnar 只查询所需列，把结果转置为按列的 NumPy 数组，
+对全部标的一次性计算复权系数，不逐行构造 ORM 对象或 dict，也不逐标的做掩码赋值：
+
+- qfq（前复权）：price × adj_factor / 该标的区间内最新的 adj_factor
+- hfq（后复权）：price × adj_factor
+
+最新因子按标的分组取最后一个非空值（groupby-transform），
+区间内因子全部为空的标的保持原价。
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+# get_daily_bars 默认返回的列（顺序即输出顺序）
+BAR_COLUMNS: tuple[str, ...] = (
+    "ts_code", "trade_date", "open", "high", "low",
+    "close", "vol", "amount", "pct_chg", "turnover_rate",
+)
+# 需要复权的价格列
+PRICE_COLUMNS: tuple[str, ...] = ("open", "high", "low", "close")
+# 原样保留（不转 float）的列
+_OBJECT_COLUMNS = ("ts_code", "trade_date")
+# 空值按 0 处理的列
+_ZERO_FILL_COLUMNS = ("vol", "amount")
+
+
+def rows_to_columns(rows: Sequence[Sequence], names: Sequence[str]) -> dict[str, np.ndarray]:
+    """将查询结果行转置为列数组：数值列为 float64（NULL → NaN，成交量/额 NULL → 0）。
+
+    Args:
+        rows: 查询结果行（元组序列），列顺序与 names 一致
+        names: 列名
+
+    Returns:
+        {列名: np.ndarray}
+    """
+    if not rows:
+        return {
+            name: np.array([], dtype=object if name in _OBJECT_COLUMNS else float)
+            for name in names
+        }
+    columns: dict[str, np.ndarray] = {}
+    for name, values in zip(names, zip(*rows)):
+        if name in _OBJECT_COLUMNS:
+            arr = np.empty(len(values), dtype=object)
+            arr[:] = values
+        else:
+            arr = np.array(values, dtype=float)
+            if name in _ZERO_FILL_COLUMNS:
+                arr = np.nan_to_num(arr, nan=0.0)
+        columns[name] = arr
+    return columns
+
+
+def adjustment_ratio(codes: np.ndarray, factors: np.ndarray, adj: str | None) -> np.ndarray | None:
+    """计算每行价格的复权系数。
+
+    Args:
+        codes: 每行的标的代码
+        factors: 每行的复权因子（float64，缺失为 NaN）
+        adj: "qfq"、"hfq"，其他值表示不复权
+
+    Returns:
+        与输入等长的系数数组；不复权时返回 None。
+        因子全部为空（或 qfq 最新因子为 0）的标的系数为 1；
+        其他标的中因子缺失的行系数为 NaN
+    """
+    if adj not in ("qfq", "hfq") or len(factors) == 0:
+        return None
+    latest = pd.Series(factors).groupby(codes, sort=False).transform("last").to_numpy()
+    if adj == "qfq":
+        usable = ~np.isnan(latest) & (latest != 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = factors / latest
+    else:
+        usable = ~np.isnan(latest)
+        ratio = factors.copy()
+    ratio[~usable] = 1.0
+    return ratio
+
+
+def apply_adjustment(columns: dict[str, np.ndarray], adj: str | None) -> dict[str, np.ndarray]:
+    """对列数组原地复权，并移除 adj_factor 列。
+
+    Args:
+        columns: rows_to_columns 的结果，需含 ts_code 与 adj_factor
+        adj: "qfq"、"hfq"，其他值表示不复权（保留 adj_factor 列）
+
+    Returns:
+        复权后的列数组（同一个 dict）
+    """
+    if adj not in ("qfq", "hfq") or "adj_factor" not in columns:
+        return columns
+    ratio = adjustment_ratio(columns["ts_code"], columns.pop("adj_factor"), adj)
+    if ratio is not None:
+        for col in PRICE_COLUMNS:
+            if col in columns:
+                columns[col] = columns[col] * ratio
+    return columns
+
+
+def columns_to_arrow(columns: dict[str, np.ndarray]):
+    """列数组 → pyarrow Table（NaN 转为 null，trade_date 为 date32）。需要 pyarrow。"""
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise RuntimeError("Arrow 输出需要 pyarrow，请执行 uv sync --extra columnar") from e
+
+    arrays = {}
+    for name, values in columns.items():
+        if name == "trade_date":
+            arrays[name] = pa.array(values.tolist(), type=pa.date32())
+        elif name == "ts_code":
+            arrays[name] = pa.array(values.tolist(), type=pa.string())
+        else:
+            arrays[name] = pa.array(values, from_pandas=True)
+    return pa.table(arrays)
@@ -0,0 +1,173 @@
+"""多日期补数流水线：拉取与写入重叠执行。
+
+逐日串行补数时，网络（Tushare 拉取）与数据库（COPY + ETL）从不同时忙碌，
+一年补数耗时约为两者之和。本模块把每个日期拆成两个阶段：
+
+- fetch：fetchers 个拉取任务按日期顺序取任务，结果放入有界队列
+- write：writers 个写入任务从队列取出已拉取的日期，写 raw 表并 ETL
+
+队列满时拉取任务阻塞（背压），内存中最多同时存在
+queue_size + fetchers + writers 个日期的数据；Tushare 的频率限制由
+TushareClient 的限流器负责。总耗时趋近 max(拉取耗时, 写入耗时)。
+
+每个阶段统计处理数、工作耗时与等待耗时：拉取阶段等待（队列满）说明写入是瓶颈，
+写入阶段等待（队列空）说明拉取是瓶颈。
+
+使用示例：
+    result = await run_date_pipeline(
+        dates,
+        fetch=manager.fetch_raw_daily,
+        write=lambda td, frames: manager.write_raw_daily(td, frames),
+    )
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import date
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+def _new_stage() -> dict:
+    return {"items": 0, "failed": 0, "busy_s": 0.0, "wait_s": 0.0}
+
+
+def _stage_summary(stage: dict, elapsed: float) -> dict:
+    """阶段统计：处理数、工作/等待耗时与吞吐（日期/秒，按墙钟时间计）。"""
+    return {
+        "items": stage["items"],
+        "failed": stage["failed"],
+        "busy_s": round(stage["busy_s"], 2),
+        "wait_s": round(stage["wait_s"], 2),
+        "per_second": round(stage["items"] / elapsed, 3) if elapsed > 0 else 0.0,
+    }
+
+
+async def run_date_pipeline(
+    dates: list[date],
+    fetch: Callable[[date], Awaitable[Any]],
+    write: Callable[[date, Any], Awaitable[Any]],
+    *,
+    fetchers: int | None = None,
+    writers: int | None = None,
+    queue_size: int | None = None,
+    stop_on_error: bool = False,
+    label: str = "补数流水线",
+) -> dict[str, Any]:
+    """以有界生产者/消费者流水线处理多个日期。
+
+    Args:
+        dates: 待处理日期（拉取按此顺序发起）
+        fetch: 拉取阶段，fetch(td) 返回该日期的数据
+        write: 写入阶段，write(td, data) 返回该日期的写入结果
+        fetchers: 并发拉取数，默认 settings.backfill_fetch_workers
+        writers: 并发写入数，默认 settings.backfill_write_workers
+        queue_size: 已拉取待写入的日期上限，默认 settings.backfill_queue_size
+        stop_on_error: 任一日期失败后不再发起新的拉取（已在途的日期照常完成）
+        label: 日志标签
+
+    Returns:
+        {
+            "results": {date: write 返回值},
+            "errors": {date: Exception},
+            "stages": {"fetch": {...}, "write": {...}},
+            "elapsed_seconds": float,
+        }
+    """
+    from app.config import settings
+
+    fetchers = max(1, fetchers or settings.backfill_fetch_workers)
+    writers = max(1, writers or settings.backfill_write_workers)
+    queue_size = max(1, queue_size or settings.backfill_queue_size)
+
+    start = time.monotonic()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    pending = iter(dates)
+    stop = asyncio.Event()
+    results: dict[date, Any] = {}
+    errors: dict[date, Exception] = {}
+    stages = {"fetch": _new_stage(), "write": _new_stage()}
+    total = len(dates)
+
+    def _fail(stage: str, td: date, exc: Exception) -> None:
+        stages[stage]["failed"] += 1
+        errors[td] = exc
+        logger.warning("[%s] %s %s 阶段失败: %s", label, td, stage, exc)
+        if stop_on_error:
+            stop.set()
+
+    async def _fetcher() -> None:
+        stage = stages["fetch"]
+        for td in pending:
+            if stop.is_set():
+                break
+            t0 = time.monotonic()
+            try:
+                data = await fetch(td)
+            except Exception as e:
+                stage["busy_s"] += time.monotonic() - t0
+                _fail("fetch", td, e)
+                continue
+            t1 = time.monotonic()
+            stage["busy_s"] += t1 - t0
+            # 队列满时在此阻塞，直到写入阶段腾出位置
+            await queue.put((td, data))
+            stage["wait_s"] += time.monotonic() - t1
+            stage["items"] += 1
+
+    async def _writer() -> None:
+        stage = stages["write"]
+        while True:
+            t0 = time.monotonic()
+            item = await queue.get()
+            t1 = time.monotonic()
+            stage["wait_s"] += t1 - t0
+            if item is _DONE:
+                return
+            td, data = item
+            del item
+            try:
+                results[td] = await write(td, data)
+                stage["items"] += 1
+                logger.debug("[%s] %d/%d %s 写入完成，耗时 %.1fs", label, len(results), total, td,
+                             time.monotonic() - t1)
+            except Exception as e:
+                _fail("write", td, e)
+            finally:
+                stage["busy_s"] += time.monotonic() - t1
+
+    writer_tasks = [asyncio.create_task(_writer()) for _ in range(writers)]
+    try:
+        await asyncio.gather(*(_fetcher() for _ in range(fetchers)))
+        for _ in writer_tasks:
+            await queue.put(_DONE)
+        await asyncio.gather(*writer_tasks)
+    finally:
+        for task in writer_tasks:
+            task.cancel()
+
+    elapsed = time.monotonic() - start
+    summary = {name: _stage_summary(stage, elapsed) for name, stage in stages.items()}
+    # 拉取等待队列 → 写入慢；写入等待队列 → 拉取慢（写入等待按并发数折算到单个任务）
+    fetch_blocked = summary["fetch"]["wait_s"] / fetchers
+    write_idle = summary["write"]["wait_s"] / writers
+    bottleneck = "write" if fetch_blocked > write_idle else "fetch"
+    logger.info(
+        "[%s] %d 个日期，成功 %d，失败 %d，耗时 %.1fs；拉取 %.2f 日/秒（工作 %.1fs，背压等待 %.1fs），"
+        "写入 %.2f 日/秒（工作 %.1fs，空闲等待 %.1fs），瓶颈：%s",
+        label, total, len(results), len(errors), elapsed,
+        summary["fetch"]["per_second"], summary["fetch"]["busy_s"], summary["fetch"]["wait_s"],
+        summary["write"]["per_second"], summary["write"]["busy_s"], summary["write"]["wait_s"],
+        bottleneck,
+    )
+    return {
+        "results": results,
+        "errors": errors,
+        "stages": {**summary, "bottleneck": bottleneck},
+        "elapsed_seconds": round(elapsed, 1),
+    }
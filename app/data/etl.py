@@ -1,13 +1,14 @@
 import logging
 from datetime import date, datetime
-from decimal import Decimal, InvalidOperation
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
 
 import pandas as pd
-from sqlalchemy import Table
+from sqlalchemy import Table, func, text
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.data.etl_columnar import transform_rows
 
 logger = logging.getLogger(__name__)
 
@@ -110,52 +111,111 @@ def transform_tushare_daily(
 
     注意：Tushare daily 的 amount 单位是千元，需要乘以 1000 转换为元。
     """
-    # 构建 adj_factor 和 daily_basic 的查找表
-    adj_map: dict[str, Decimal | None] = {}
-    for r in raw_adj_factor:
-        key = f"{r.get('ts_code')}_{r.get('trade_date')}"
-        adj_map[key] = parse_decimal(r.get("adj_factor"))
+    return transform_rows("daily", raw_daily, raw_adj_factor, raw_daily_basic)
+
+
+# raw_tushare_daily + adj_factor + daily_basic → stock_daily 的服务端 SQL 版本，
+# 与 transform_tushare_daily 语义一致：amount 千元 → 元，vol/amount 缺失记 0，
+# vol = 0 且 amount = 0 时 trade_status = '0'。trade_date 为 'YYYYMMDD' 字符串区间。
+DAILY_SELECT_SQL = """
+    SELECT d.ts_code,
+           to_date(d.trade_date, 'YYYYMMDD') AS trade_date,
+           d.open, d.high, d.low, d.close, d.pre_close, d.pct_chg,
+           COALESCE(d.vol, 0) AS vol,
+           COALESCE(d.amount * 1000, 0) AS amount,
+           a.adj_factor,
+           b.turnover_rate,
+           CASE WHEN d.vol = 0 AND COALESCE(d.amount * 1000, 0) = 0
+                THEN '0' ELSE '1' END AS trade_status,
+           'tushare' AS data_source
+    FROM raw_tushare_daily d
+    LEFT JOIN raw_tushare_adj_factor a
+        ON a.ts_code = d.ts_code AND a.trade_date = d.trade_date
+    LEFT JOIN raw_tushare_daily_basic b
+        ON b.ts_code = d.ts_code AND b.trade_date = d.trade_date
+    WHERE d.trade_date BETWEEN :start AND :end
+      AND d.trade_date ~ '^[0-9]{8}$'
+"""
+
+_DAILY_COLUMNS = (
+    "ts_code", "trade_date", "open", "high", "low", "close", "pre_close", "pct_chg",
+    "vol", "amount", "adj_factor", "turnover_rate", "trade_status", "data_source",
+)
+
+ETL_DAILY_SQL = (
+    f"INSERT INTO stock_daily ({', '.join(_DAILY_COLUMNS)})"
+    + DAILY_SELECT_SQL
+    + "ON CONFLICT (ts_code, trade_date) DO UPDATE SET "
+    + ", ".join(f"{c} = EXCLUDED.{c}" for c in _DAILY_COLUMNS[2:])
+)
+
+
+async def etl_daily_sql(session: AsyncSession, start: str, end: str) -> int:
+    """在数据库内一次 INSERT ... SELECT 完成 stock_daily ETL（不经过 Python）。
 
-    basic_map: dict[str, Decimal | None] = {}
-    for r in raw_daily_basic:
-        key = f"{r.get('ts_code')}_{r.get('trade_date')}"
-        basic_map[key] = parse_decimal(r.get("turnover_rate"))
+    Args:
+        session: 数据库会话
+        start: 起始交易日（YYYYMMDD）
+        end: 结束交易日（YYYYMMDD）
 
-    cleaned: list[dict] = []
-    for raw in raw_daily:
-        trade_date = parse_date(raw.get("trade_date"))
-        if trade_date is None:
-            continue
+    Returns:
+        写入（插入或更新）的行数
+    """
+    result = await session.execute(text(ETL_DAILY_SQL), {"start": start, "end": end})
+    await session.commit()
+    return result.rowcount or 0
 
-        ts_code = raw.get("ts_code", "")
-        key = f"{ts_code}_{raw.get('trade_date')}"
 
-        vol = parse_decimal(raw.get("vol"))
-        # amount 千元 → 元
-        amount_raw = parse_decimal(raw.get("amount"))
-        amount = amount_raw * 1000 if amount_raw is not None else Decimal("0")
+def _quantize(value, scale: int | None):
+    """按目标列精度舍入（与 PostgreSQL NUMERIC 写入时的四舍五入一致）。"""
+    if value is None or scale is None:
+        return value
+    value = Decimal(str(value))
+    if not value.is_finite():
+        return str(value)  # NaN != NaN，转为字符串比较
+    return value.quantize(Decimal(1).scaleb(-scale), rounding=ROUND_HALF_UP)
 
-        trade_status = "1"
-        if vol is not None and vol == 0 and amount == 0:
-            trade_status = "0"
 
-        cleaned.append({
-            "ts_code": ts_code,
-            "trade_date": trade_date,
-            "open": parse_decimal(raw.get("open")),
-            "high": parse_decimal(raw.get("high")),
-            "low": parse_decimal(raw.get("low")),
-            "close": parse_decimal(raw.get("close")),
-            "pre_close": parse_decimal(raw.get("pre_close")),
-            "pct_chg": parse_decimal(raw.get("pct_chg")),
-            "vol": vol or Decimal("0"),
-            "amount": amount,
-            "adj_factor": adj_map.get(key),
-            "turnover_rate": basic_map.get(key),
-            "trade_status": trade_status,
-            "data_source": "tushare",
-        })
-    return cleaned
+def compare_daily_rows(
+    sql_rows: list[dict], py_rows: list[dict], table: Table
+) -> list[dict]:
+    """逐行比较 SQL ETL 与 transform_tushare_daily 的结果（按目标列精度舍入后）。
+
+    Args:
+        sql_rows: DAILY_SELECT_SQL 的查询结果
+        py_rows: transform_tushare_daily 的输出
+        table: 目标表（stock_daily），用于读取各列精度
+
+    Returns:
+        差异列表 [{ts_code, trade_date, column, sql, python}]，
+        仅一侧存在的行 column 为 "<missing>"
+    """
+    scales = {
+        c.name: getattr(c.type, "scale", None) for c in table.columns
+    }
+
+    def _norm(row: dict) -> dict:
+        return {c: _quantize(row.get(c), scales.get(c)) for c in _DAILY_COLUMNS}
+
+    sql_map = {(r["ts_code"], r["trade_date"]): _norm(r) for r in sql_rows}
+    py_map = {(r["ts_code"], r["trade_date"]): _norm(r) for r in py_rows}
+
+    diffs: list[dict] = []
+    for key in sorted(set(sql_map) | set(py_map)):
+        s, p = sql_map.get(key), py_map.get(key)
+        if s is None or p is None:
+            diffs.append({
+                "ts_code": key[0], "trade_date": key[1], "column": "<missing>",
+                "sql": s is not None, "python": p is not None,
+            })
+            continue
+        for col in _DAILY_COLUMNS[2:]:
+            if s[col] != p[col]:
+                diffs.append({
+                    "ts_code": key[0], "trade_date": key[1], "column": col,
+                    "sql": s[col], "python": p[col],
+                })
+    return diffs
 
 
 async def batch_insert(
@@ -217,10 +277,10 @@ async def batch_insert(
         batch = rows[i : i + batch_size]
         stmt = pg_insert(table).values(batch)
         if pk_cols and update_cols:
-            stmt = stmt.on_conflict_do_update(
-                index_elements=pk_cols,
-                set_={col: getattr(stmt.excluded, col) for col in update_cols},
-            )
+            set_ = {col: getattr(stmt.excluded, col) for col in update_cols}
+            if "fetched_at" in table.columns:
+                set_["fetched_at"] = func.now()
+            stmt = stmt.on_conflict_do_update(index_elements=pk_cols, set_=set_)
         elif pk_cols:
             stmt = stmt.on_conflict_do_nothing()
         await session.execute(stmt)
@@ -241,48 +301,7 @@ def transform_tushare_fina_indicator(raw_rows: list[dict]) -> list[dict]:
     Returns:
         finance_indicator 表格式的清洗数据
     """
-    cleaned: list[dict] = []
-    for raw in raw_rows:
-        ts_code = raw.get("ts_code", "")
-        if not ts_code:
-            continue
-
-        end_date = parse_date(raw.get("end_date"))
-        ann_date = parse_date(raw.get("ann_date"))
-        if end_date is None or ann_date is None:
-            continue
-
-        # 从 raw 表的 100+ 字段中提取核心指标
-        cleaned.append({
-            "ts_code": ts_code,
-            "end_date": end_date,
-            "ann_date": ann_date,
-            "report_type": _safe_str(raw.get("update_flag", "")),  # 更新标志作为报告类型
-            # 每股指标
-            "eps": parse_decimal(raw.get("eps")),
-            "ocf_per_share": parse_decimal(raw.get("ocfps")),
-            # 盈利能力
-            "roe": parse_decimal(raw.get("roe")),
-            "roe_diluted": parse_decimal(raw.get("roe_dt")),
-            "gross_margin": parse_decimal(raw.get("grossprofit_margin")),
-            "net_margin": parse_decimal(raw.get("netprofit_margin")),
-            # 同比增长率
-            "revenue_yoy": parse_decimal(raw.get("or_yoy")),
-            "profit_yoy": parse_decimal(raw.get("netprofit_yoy")),
-            # 估值指标（从 raw_tushare_daily_basic 获取，这里暂时为 None）
-            "pe_ttm": None,
-            "pb": None,
-            "ps_ttm": None,
-            "total_mv": None,
-            "circ_mv": None,
-            # 偿债能力
-            "current_ratio": parse_decimal(raw.get("current_ratio")),
-            "quick_ratio": parse_decimal(raw.get("quick_ratio")),
-            "debt_ratio": parse_decimal(raw.get("debt_to_assets")),
-            # 数据源
-            "data_source": "tushare",
-        })
-    return cleaned
+    return transform_rows("fina_indicator", raw_rows)
 
 
 # =====================================================================
@@ -328,28 +347,7 @@ def transform_tushare_index_daily(raw_rows: list[dict]) -> list[dict]:
     Returns:
         清洗后的数据行列表
     """
-    cleaned = []
-    for raw in raw_rows:
-        trade_date = parse_date(raw["trade_date"])
-        if trade_date is None:
-            continue
-        # 过滤 OHLC 不完整的行（如指数首日仅有基准值，open/high/low 为 NULL）
-        if raw.get("open") is None or raw.get("high") is None or raw.get("low") is None:
-            continue
-        cleaned.append({
-            "ts_code": raw["ts_code"],
-            "trade_date": trade_date,
-            "open": parse_decimal(raw.get("open")),
-            "high": parse_decimal(raw.get("high")),
-            "low": parse_decimal(raw.get("low")),
-            "close": parse_decimal(raw.get("close")),
-            "pre_close": parse_decimal(raw.get("pre_close")),
-            "change": parse_decimal(raw.get("change")),
-            "pct_chg": parse_decimal(raw.get("pct_chg")),
-            "vol": parse_decimal(raw.get("vol")) or Decimal("0"),
-            "amount": parse_decimal(raw.get("amount")) or Decimal("0"),
-        })
-    return cleaned
+    return transform_rows("index_daily", raw_rows)
 
 
 def transform_tushare_index_weight(raw_rows: list[dict]) -> list[dict]:
@@ -361,15 +359,7 @@ def transform_tushare_index_weight(raw_rows: list[dict]) -> list[dict]:
     Returns:
         清洗后的数据行列表
     """
-    cleaned = []
-    for raw in raw_rows:
-        cleaned.append({
-            "index_code": raw["index_code"],
-            "con_code": raw["con_code"],
-            "trade_date": parse_date(raw["trade_date"]),
-            "weight": parse_decimal(raw.get("weight")),
-        })
-    return cleaned
+    return transform_rows("index_weight", raw_rows)
 
 
 def transform_tushare_industry_classify(raw_rows: list[dict]) -> list[dict]:
@@ -425,120 +415,7 @@ def transform_tushare_index_technical(raw_rows: list[dict]) -> list[dict]:
     Returns:
         清洗后的数据行列表
     """
-    cleaned = []
-    for raw in raw_rows:
-        cleaned.append({
-            "ts_code": raw["ts_code"],
-            "trade_date": parse_date(raw["trade_date"]),
-            # 均线指标（MA）
-            "ma5": parse_decimal(raw.get("ma_bfq_5")),
-            "ma10": parse_decimal(raw.get("ma_bfq_10")),
-            "ma20": parse_decimal(raw.get("ma_bfq_20")),
-            "ma60": parse_decimal(raw.get("ma_bfq_60")),
-            "ma120": parse_decimal(raw.get("ma_bfq_90")),  # idx_factor_pro 无 120，用 90 近似
-            "ma250": parse_decimal(raw.get("ma_bfq_250")),
-            # MACD 指标
-            "macd_dif": parse_decimal(raw.get("macd_dif_bfq")),
-            "macd_dea": parse_decimal(raw.get("macd_dea_bfq")),
-            "macd_hist": parse_decimal(raw.get("macd_bfq")),
-            # KDJ 指标
-            "kdj_k": parse_decimal(raw.get("kdj_k_bfq")),
-            "kdj_d": parse_decimal(raw.get("kdj_d_bfq")),
-            "kdj_j": parse_decimal(raw.get("kdj_bfq")),
-            # RSI 指标
-            "rsi6": parse_decimal(raw.get("rsi_bfq_6")),
-            "rsi12": parse_decimal(raw.get("rsi_bfq_12")),
-            "rsi24": parse_decimal(raw.get("rsi_bfq_24")),
-            # 布林带指标
-            "boll_upper": parse_decimal(raw.get("boll_upper_bfq")),
-            "boll_mid": parse_decimal(raw.get("boll_mid_bfq")),
-            "boll_lower": parse_decimal(raw.get("boll_lower_bfq")),
-            # 成交量指标（raw 表无均线，保留 None）
-            "vol_ma5": None,
-            "vol_ma10": None,
-            "vol_ratio": None,
-            # 其他基础指标
-            "atr14": parse_decimal(raw.get("atr_bfq")),
-            "cci14": parse_decimal(raw.get("cci_bfq")),
-            "willr14": parse_decimal(raw.get("wr_bfq")),
-            "wr": parse_decimal(raw.get("wr_bfq")),
-            "cci": parse_decimal(raw.get("cci_bfq")),
-            "bias": parse_decimal(raw.get("bias1_bfq")),
-            "obv": parse_decimal(raw.get("obv_bfq")),
-            # DMI 趋向指标
-            "dmi_pdi": parse_decimal(raw.get("dmi_pdi_bfq")),
-            "dmi_mdi": parse_decimal(raw.get("dmi_mdi_bfq")),
-            "dmi_adx": parse_decimal(raw.get("dmi_adx_bfq")),
-            "dmi_adxr": parse_decimal(raw.get("dmi_adxr_bfq")),
-            # MTM 动量指标
-            "mtm": parse_decimal(raw.get("mtm_bfq")),
-            "mtmma": parse_decimal(raw.get("mtmma_bfq")),
-            # ROC 变动率
-            "roc": parse_decimal(raw.get("roc_bfq")),
-            "maroc": parse_decimal(raw.get("maroc_bfq")),
-            # PSY 心理线
-            "psy": parse_decimal(raw.get("psy_bfq")),
-            "psyma": parse_decimal(raw.get("psyma_bfq")),
-            # TRIX 三重指数平滑
-            "trix": parse_decimal(raw.get("trix_bfq")),
-            "trma": parse_decimal(raw.get("trma_bfq")),
-            # EMV 简易波动指标
-            "emv": parse_decimal(raw.get("emv_bfq")),
-            "maemv": parse_decimal(raw.get("maemv_bfq")),
-            # VR 成交量变异率
-            "vr": parse_decimal(raw.get("vr_bfq")),
-            # BRAR 情绪指标
-            "brar_ar": parse_decimal(raw.get("brar_ar_bfq")),
-            "brar_br": parse_decimal(raw.get("brar_br_bfq")),
-            # CR 能量指标
-            "cr": parse_decimal(raw.get("cr_bfq")),
-            # MFI 资金流量指标
-            "mfi": parse_decimal(raw.get("mfi_bfq")),
-            # DPO 区间震荡线
-            "dpo": parse_decimal(raw.get("dpo_bfq")),
-            "madpo": parse_decimal(raw.get("madpo_bfq")),
-            # MASS 梅斯线
-            "mass": parse_decimal(raw.get("mass_bfq")),
-            "ma_mass": parse_decimal(raw.get("ma_mass_bfq")),
-            # ASI 振动升降指标
-            "asi": parse_decimal(raw.get("asi_bfq")),
-            "asit": parse_decimal(raw.get("asit_bfq")),
-            # DFMA 平行线差指标
-            "dfma_dif": parse_decimal(raw.get("dfma_dif_bfq")),
-            "dfma_difma": parse_decimal(raw.get("dfma_difma_bfq")),
-            # EMA 指数移动平均
-            "ema5": parse_decimal(raw.get("ema_bfq_5")),
-            "ema10": parse_decimal(raw.get("ema_bfq_10")),
-            "ema20": parse_decimal(raw.get("ema_bfq_20")),
-            "ema30": parse_decimal(raw.get("ema_bfq_30")),
-            "ema60": parse_decimal(raw.get("ema_bfq_60")),
-            "ema90": parse_decimal(raw.get("ema_bfq_90")),
-            "ema250": parse_decimal(raw.get("ema_bfq_250")),
-            # EXPMA 指数平滑移动平均
-            "expma_12": parse_decimal(raw.get("expma_12_bfq")),
-            "expma_50": parse_decimal(raw.get("expma_50_bfq")),
-            # KTN 肯特纳通道
-            "ktn_upper": parse_decimal(raw.get("ktn_upper_bfq")),
-            "ktn_mid": parse_decimal(raw.get("ktn_mid_bfq")),
-            "ktn_lower": parse_decimal(raw.get("ktn_down_bfq")),
-            # TAQ 唐奇安通道
-            "taq_up": parse_decimal(raw.get("taq_up_bfq")),
-            "taq_mid": parse_decimal(raw.get("taq_mid_bfq")),
-            "taq_down": parse_decimal(raw.get("taq_down_bfq")),
-            # XSII 薛斯通道
-            "xsii_td1": parse_decimal(raw.get("xsii_td1_bfq")),
-            "xsii_td2": parse_decimal(raw.get("xsii_td2_bfq")),
-            "xsii_td3": parse_decimal(raw.get("xsii_td3_bfq")),
-            "xsii_td4": parse_decimal(raw.get("xsii_td4_bfq")),
-            # Days 连涨连跌天数
-            "updays": parse_decimal(raw.get("updays")),
-            "downdays": parse_decimal(raw.get("downdays")),
-            "topdays": parse_decimal(raw.get("topdays")),
-            "lowdays": parse_decimal(raw.get("lowdays")),
-            # BBI 多空指标
-            "bbi": parse_decimal(raw.get("bbi_bfq")),
-        })
-    return cleaned
+    return transform_rows("index_technical", raw_rows)
 
 
 # =====================================================================
@@ -578,26 +455,7 @@ def transform_tushare_concept_daily(raw_rows: list[dict]) -> list[dict]:
     Returns:
         清洗后的数据行列表
     """
-    cleaned = []
-    for raw in raw_rows:
-        close = parse_decimal(raw.get("close"))
-        # 过滤掉 close 为 null 的脏数据（部分板块在某些日期无行情）
-        if close is None:
-            continue
-        cleaned.append({
-            "ts_code": raw["ts_code"],
-            "trade_date": parse_date(raw["trade_date"]),
-            "open": parse_decimal(raw.get("open")) or close,
-            "high": parse_decimal(raw.get("high")) or close,
-            "low": parse_decimal(raw.get("low")) or close,
-            "close": close,
-            "pre_close": parse_decimal(raw.get("pre_close")),
-            "change": parse_decimal(raw.get("change")),
-            "pct_chg": parse_decimal(raw.get("pct_chg")),
-            "vol": parse_decimal(raw.get("vol")) or Decimal("0"),
-            "amount": parse_decimal(raw.get("amount")) or Decimal("0"),
-        })
-    return cleaned
+    return transform_rows("concept_daily", raw_rows)
 
 
 def transform_tushare_concept_member(raw_rows: list[dict]) -> list[dict]:
@@ -630,42 +488,7 @@ def transform_tushare_moneyflow(raw_rows: list[dict]) -> list[dict]:
 
     字段一一对应，日期 VARCHAR(8) → DATE，数值 NUMERIC → Decimal，NaN/None → 0。
     """
-    if not raw_rows:
-        return []
-
-    _ZERO = Decimal("0")
-    cleaned: list[dict] = []
-    for raw in raw_rows:
-        ts_code = raw.get("ts_code", "")
-        if not ts_code:
-            continue
-        trade_date = parse_date(raw.get("trade_date"))
-        if trade_date is None:
-            continue
-
-        cleaned.append({
-            "ts_code": ts_code,
-            "trade_date": trade_date,
-            "buy_sm_vol": parse_decimal(raw.get("buy_sm_vol")) or _ZERO,
-            "buy_sm_amount": parse_decimal(raw.get("buy_sm_amount")) or _ZERO,
-            "sell_sm_vol": parse_decimal(raw.get("sell_sm_vol")) or _ZERO,
-            "sell_sm_amount": parse_decimal(raw.get("sell_sm_amount")) or _ZERO,
-            "buy_md_vol": parse_decimal(raw.get("buy_md_vol")) or _ZERO,
-            "buy_md_amount": parse_decimal(raw.get("buy_md_amount")) or _ZERO,
-            "sell_md_vol": parse_decimal(raw.get("sell_md_vol")) or _ZERO,
-            "sell_md_amount": parse_decimal(raw.get("sell_md_amount")) or _ZERO,
-            "buy_lg_vol": parse_decimal(raw.get("buy_lg_vol")) or _ZERO,
-            "buy_lg_amount": parse_decimal(raw.get("buy_lg_amount")) or _ZERO,
-            "sell_lg_vol": parse_decimal(raw.get("sell_lg_vol")) or _ZERO,
-            "sell_lg_amount": parse_decimal(raw.get("sell_lg_amount")) or _ZERO,
-            "buy_elg_vol": parse_decimal(raw.get("buy_elg_vol")) or _ZERO,
-            "buy_elg_amount": parse_decimal(raw.get("buy_elg_amount")) or _ZERO,
-            "sell_elg_vol": parse_decimal(raw.get("sell_elg_vol")) or _ZERO,
-            "sell_elg_amount": parse_decimal(raw.get("sell_elg_amount")) or _ZERO,
-            "net_mf_amount": parse_decimal(raw.get("net_mf_amount")) or _ZERO,
-            "data_source": "tushare",
-        })
-    return cleaned
+    return transform_rows("moneyflow", raw_rows)
 
 
 def transform_tushare_top_list(raw_rows: list[dict]) -> list[dict]:
@@ -673,29 +496,7 @@ def transform_tushare_top_list(raw_rows: list[dict]) -> list[dict]:
 
     字段映射：l_buy → buy_total, l_sell → sell_total, net_amount → net_buy。
     """
-    if not raw_rows:
-        return []
-
-    cleaned: list[dict] = []
-    for raw in raw_rows:
-        ts_code = raw.get("ts_code", "")
-        if not ts_code:
-            continue
-        trade_date = parse_date(raw.get("trade_date"))
-        if trade_date is None:
-            continue
-
-        cleaned.append({
-            "ts_code": ts_code,
-            "trade_date": trade_date,
-            "reason": _safe_str(raw.get("reason")) or None,
-            "buy_total": parse_decimal(raw.get("l_buy")),
-            "sell_total": parse_decimal(raw.get("l_sell")),
-            "net_buy": parse_decimal(raw.get("net_amount")),
-            "list_name": _safe_str(raw.get("name")) or None,
-            "data_source": "tushare",
-        })
-    return cleaned
+    return transform_rows("top_list", raw_rows)
 
 
 def transform_tushare_top_inst(raw_rows: list[dict]) -> list[dict]:
@@ -741,28 +542,7 @@ def transform_tushare_suspend_d(raw_rows: list[dict]) -> list[dict]:
     Returns:
         清洗后的数据行列表
     """
-    if not raw_rows:
-        return []
-
-    cleaned: list[dict] = []
-    for raw in raw_rows:
-        ts_code = raw.get("ts_code", "")
-        if not ts_code:
-            continue
-        trade_date = parse_date(raw.get("suspend_date"))
-        if trade_date is None:
-            continue
-
-        cleaned.append({
-            "ts_code": ts_code,
-            "trade_date": trade_date,
-            "suspend_timing": _safe_str(raw.get("suspend_timing")) or None,
-            "suspend_type": _safe_str(raw.get("reason_type")) or None,
-            "suspend_reason": _safe_str(raw.get("suspend_reason")) or None,
-            "resume_date": parse_date(raw.get("resume_date")),
-            "data_source": "tushare",
-        })
-    return cleaned
+    return transform_rows("suspend_d", raw_rows)
 
 
 def transform_tushare_limit_list_d(raw_rows: list[dict]) -> list[dict]:
@@ -774,36 +554,7 @@ def transform_tushare_limit_list_d(raw_rows: list[dict]) -> list[dict]:
     Returns:
         清洗后的数据行列表
     """
-    if not raw_rows:
-        return []
-
-    cleaned: list[dict] = []
-    for raw in raw_rows:
-        ts_code = raw.get("ts_code", "")
-        if not ts_code:
-            continue
-        trade_date = parse_date(raw.get("trade_date"))
-        if trade_date is None:
-            continue
-
-        cleaned.append({
-            "ts_code": ts_code,
-            "trade_date": trade_date,
-            "name": _safe_str(raw.get("name")) or None,
-            "close": parse_decimal(raw.get("close")),
-            "pct_chg": parse_decimal(raw.get("pct_chg")),
-            "amp": parse_decimal(raw.get("amp")),
-            "fc_ratio": parse_decimal(raw.get("fc_ratio")),
-            "fl_ratio": parse_decimal(raw.get("fl_ratio")),
-            "fd_amount": parse_decimal(raw.get("fd_amount")),
-            "first_time": _safe_str(raw.get("first_time")) or None,
-            "last_time": _safe_str(raw.get("last_time")) or None,
-            "open_times": int(raw["open_times"]) if raw.get("open_times") is not None else None,
-            "up_stat": _safe_str(raw.get("up_stat")) or None,
-            "limit_times": int(raw["limit_times"]) if raw.get("limit_times") is not None else None,
-            "data_source": "tushare",
-        })
-    return cleaned
+    return transform_rows("limit_list_d", raw_rows)
 
 
 # ---------------------------------------------------------------------------
@@ -816,49 +567,7 @@ def transform_tushare_income(raw_rows: list[dict]) -> list[dict]:
 
     只保留合并报表（report_type="1"），按 (ts_code, end_date, report_type) 去重。
     """
-    seen: dict[tuple, dict] = {}
-    for raw in raw_rows:
-        ts_code = raw.get("ts_code", "")
-        if not ts_code:
-            continue
-
-        report_type = _safe_str(raw.get("report_type", "")) or "1"
-        if report_type != "1":
-            continue
-
-        end_date = parse_date(raw.get("end_date"))
-        if end_date is None:
-            continue
-
-        key = (ts_code, end_date, report_type)
-        seen[key] = {
-            "ts_code": ts_code,
-            "end_date": end_date,
-            "report_type": report_type,
-            "ann_date": parse_date(raw.get("ann_date")),
-            "total_revenue": parse_decimal(raw.get("total_revenue")),
-            "revenue": parse_decimal(raw.get("revenue")),
-            "oper_cost": parse_decimal(raw.get("oper_cost")),
-            "total_cogs": parse_decimal(raw.get("total_cogs")),
-            "sell_exp": parse_decimal(raw.get("sell_exp")),
-            "admin_exp": parse_decimal(raw.get("admin_exp")),
-            "fin_exp": parse_decimal(raw.get("fin_exp")),
-            "rd_exp": parse_decimal(raw.get("rd_exp")),
-            "operate_profit": parse_decimal(raw.get("operate_profit")),
-            "total_profit": parse_decimal(raw.get("total_profit")),
-            "income_tax": parse_decimal(raw.get("income_tax")),
-            "n_income": parse_decimal(raw.get("n_income")),
-            "n_income_attr_p": parse_decimal(raw.get("n_income_attr_p")),
-            "basic_eps": parse_decimal(raw.get("basic_eps")),
-            "diluted_eps": parse_decimal(raw.get("diluted_eps")),
-            "ebit": parse_decimal(raw.get("ebit")),
-            "ebitda": parse_decimal(raw.get("ebitda")),
-            "invest_income": parse_decimal(raw.get("invest_income")),
-            "non_oper_income": parse_decimal(raw.get("non_oper_income")),
-            "non_oper_exp": parse_decimal(raw.get("non_oper_exp")),
-            "data_source": "tushare",
-        }
-    return list(seen.values())
+    return transform_rows("income", raw_rows)
 
 
 def transform_tushare_balancesheet(raw_rows: list[dict]) -> list[dict]:
@@ -866,58 +575,7 @@ def transform_tushare_balancesheet(raw_rows: list[dict]) -> list[dict]:
 
     只保留合并报表（report_type="1"），按 (ts_code, end_date, report_type) 去重。
     """
-    seen: dict[tuple, dict] = {}
-    for raw in raw_rows:
-        ts_code = raw.get("ts_code", "")
-        if not ts_code:
-            continue
-
-        report_type = _safe_str(raw.get("report_type", "")) or "1"
-        if report_type != "1":
-            continue
-
-        end_date = parse_date(raw.get("end_date"))
-        if end_date is None:
-            continue
-
-        key = (ts_code, end_date, report_type)
-        seen[key] = {
-            "ts_code": ts_code,
-            "end_date": end_date,
-            "report_type": report_type,
-            "ann_date": parse_date(raw.get("ann_date")),
-            "total_assets": parse_decimal(raw.get("total_assets")),
-            "total_cur_assets": parse_decimal(raw.get("total_cur_assets")),
-            "total_nca": parse_decimal(raw.get("total_nca")),
-            "money_cap": parse_decimal(raw.get("money_cap")),
-            "accounts_receiv": parse_decimal(raw.get("accounts_receiv")),
-            "notes_receiv": parse_decimal(raw.get("notes_receiv")),
-            "prepayment": parse_decimal(raw.get("prepayment")),
-            "contract_assets": parse_decimal(raw.get("contract_assets")),
-            "inventories": parse_decimal(raw.get("inventories")),
-            "fix_assets": parse_decimal(raw.get("fix_assets")),
-            "intan_assets": parse_decimal(raw.get("intan_assets")),
-            "goodwill": parse_decimal(raw.get("goodwill")),
-            "total_liab": parse_decimal(raw.get("total_liab")),
-            "total_cur_liab": parse_decimal(raw.get("total_cur_liab")),
-            "total_ncl": parse_decimal(raw.get("total_ncl")),
-            "st_borr": parse_decimal(raw.get("st_borr")),
-            "lt_borr": parse_decimal(raw.get("lt_borr")),
-            "bond_payable": parse_decimal(raw.get("bond_payable")),
-            "notes_payable": parse_decimal(raw.get("notes_payable")),
-            "adv_receipts": parse_decimal(raw.get("adv_receipts")),
-            "contract_liab": parse_decimal(raw.get("contract_liab")),
-            "total_hldr_eqy_exc_min_int": parse_decimal(raw.get("total_hldr_eqy_exc_min_int")),
-            "total_hldr_eqy_inc_min_int": parse_decimal(raw.get("total_hldr_eqy_inc_min_int")),
-            "total_share": parse_decimal(raw.get("total_share")),
-            "cap_rese": parse_decimal(raw.get("cap_rese")),
-            "surplus_rese": parse_decimal(raw.get("surplus_rese")),
-            "undistr_porfit": parse_decimal(raw.get("undistr_porfit")),
-            "minority_int": parse_decimal(raw.get("minority_int")),
-            "treasury_share": parse_decimal(raw.get("treasury_share")),
-            "data_source": "tushare",
-        }
-    return list(seen.values())
+    return transform_rows("balancesheet", raw_rows)
 
 
 def transform_tushare_cashflow(raw_rows: list[dict]) -> list[dict]:
@@ -925,44 +583,5 @@ def transform_tushare_cashflow(raw_rows: list[dict]) -> list[dict]:
 
     只保留合并报表（report_type="1"），按 (ts_code, end_date, report_type) 去重。
     """
-    seen: dict[tuple, dict] = {}
-    for raw in raw_rows:
-        ts_code = raw.get("ts_code", "")
-        if not ts_code:
-            continue
-
-        report_type = _safe_str(raw.get("report_type", "")) or "1"
-        if report_type != "1":
-            continue
-
-        end_date = parse_date(raw.get("end_date"))
-        if end_date is None:
-            continue
-
-        key = (ts_code, end_date, report_type)
-        seen[key] = {
-            "ts_code": ts_code,
-            "end_date": end_date,
-            "report_type": report_type,
-            "ann_date": parse_date(raw.get("ann_date")),
-            "n_cashflow_act": parse_decimal(raw.get("n_cashflow_act")),
-            "n_cashflow_inv_act": parse_decimal(raw.get("n_cashflow_inv_act")),
-            "n_cash_flows_fnc_act": parse_decimal(raw.get("n_cash_flows_fnc_act")),
-            "c_fr_sale_sg": parse_decimal(raw.get("c_fr_sale_sg")),
-            "c_paid_goods_s": parse_decimal(raw.get("c_paid_goods_s")),
-            "c_paid_to_for_empl": parse_decimal(raw.get("c_paid_to_for_empl")),
-            "c_paid_for_taxes": parse_decimal(raw.get("c_paid_for_taxes")),
-            "c_pay_acq_const_fiolta": parse_decimal(raw.get("c_pay_acq_const_fiolta")),
-            "c_recp_borrow": parse_decimal(raw.get("c_recp_borrow")),
-            "c_pay_dist_dpcp_int_exp": parse_decimal(raw.get("c_pay_dist_dpcp_int_exp")),
-            "c_cash_equ_end_period": parse_decimal(raw.get("c_cash_equ_end_period")),
-            "c_cash_equ_beg_period": parse_decimal(raw.get("c_cash_equ_beg_period")),
-            "n_incr_cash_cash_equ": parse_decimal(raw.get("n_incr_cash_cash_equ")),
-            "free_cashflow": parse_decimal(raw.get("free_cashflow")),
-            "net_profit": parse_decimal(raw.get("net_profit")),
-            "depr_fa_coga_dpba": parse_decimal(raw.get("depr_fa_coga_dpba")),
-            "invest_loss": parse_decimal(raw.get("invest_loss")),
-            "data_source": "tushare",
-        }
-    return list(seen.values())
+    return transform_rows("cashflow", raw_rows)
 
@@ -0,0 +1,564 @@
+"""Tushare 原始数据的列式（向量化）清洗。
+
+原 etl.py 中的 transform_tushare_* 逐行遍历 dict 并对每个值调用 parse_decimal，
+回填时 Python 循环的开销超过数据库写入。本模块为同一批转换提供列式实现，
+etl.py 的对应函数经 transform_rows 转发到这里（DataManager 各同步路径不变）：
+输入 DataFrame（或 pyarrow Table / dict 列表），输出按业务表列顺序排列、
+类型化的列数组，可直接交给 COPY 写入：
+
+- 数值列：float64（NaN 表示 NULL）
+- 整数列：Int64（可空 int64）
+- 日期列：datetime64（日精度，to_arrow 后为 date32）
+- 文本列：object（None 表示 NULL）
+
+清洗语义（过滤条件、缺省值、字段映射、去重）与原 dict 版本一致，
+数值以 float64 承载，写入 NUMERIC 列时由数据库按列精度舍入。
+float64 只保证约 15~17 位有效数字；transform_rows（dict 兼容包装）改走精确路径：
+数值列直接由原始字符串解析为 Decimal（object 列，与 parse_decimal 一致），不经 float。
+
+- columnar_tushare_*：各业务表的列式转换
+- to_records：列式结果转回 list[dict]（数值为 Decimal），兼容现有 dict API
+- transform_rows：按名称调用列式转换并返回 dict 列表的兼容包装（精确 Decimal）
+"""
+
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from decimal import Decimal, InvalidOperation
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------------------------------
+# 列解析
+# ---------------------------------------------------------------------------
+
+
+def as_frame(data) -> pd.DataFrame:
+    """将 DataFrame / pyarrow Table / dict 列表统一为 DataFrame。"""
+    if isinstance(data, pd.DataFrame):
+        return data
+    if hasattr(data, "to_pandas"):
+        return data.to_pandas()
+    return pd.DataFrame.from_records(list(data))
+
+
+# 精确模式：数值列解析为 Decimal（object 列），由 transform_rows 在转换期间开启
+_EXACT_NUMERIC: ContextVar[bool] = ContextVar("etl_columnar_exact_numeric", default=False)
+
+
+def _exact_decimal(value) -> Decimal | float:
+    """单值 → Decimal（与 parse_decimal 一致按字符串解析），空值/非法值/非有限值为 NaN。"""
+    if value is None or (isinstance(value, float) and value != value):
+        return np.nan
+    try:
+        parsed = Decimal(str(value).strip())
+    except (InvalidOperation, ValueError):
+        return np.nan
+    return parsed if parsed.is_finite() else np.nan
+
+
+def _float(df: pd.DataFrame, col: str) -> pd.Series:
+    """数值列 → float64，空值/非法值为 NaN。"""
+    if col not in df.columns:
+        return pd.Series(np.nan, index=df.index, dtype="float64")
+    return pd.to_numeric(df[col], errors="coerce").astype("float64")
+
+
+def _num(df: pd.DataFrame, col: str) -> pd.Series:
+    """数值列 → float64，空值/非法值为 NaN（对应 parse_decimal 返回 None）。
+
+    精确模式下返回 Decimal 的 object 列（空值仍为 NaN），不丢失 float64 之外的有效数字。
+    """
+    if col not in df.columns or not _EXACT_NUMERIC.get():
+        return _float(df, col)
+    return df[col].map(_exact_decimal).astype(object)
+
+
+def _int(df: pd.DataFrame, col: str) -> pd.Series:
+    """整数列 → 可空 Int64。"""
+    return _float(df, col).round().astype("Int64")
+
+
+def _date(df: pd.DataFrame, col: str) -> pd.Series:
+    """日期列（YYYYMMDD / YYYY-MM-DD / date）→ datetime64，无法解析为 NaT。"""
+    if col not in df.columns:
+        return pd.Series(pd.NaT, index=df.index, dtype="datetime64[s]")
+    s = df[col]
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s.dt.normalize().astype("datetime64[s]")
+    text = s.where(s.notna()).astype("string").str.strip()
+    out = pd.to_datetime(text, format="%Y%m%d", errors="coerce")
+    dashed = out.isna() & text.str.contains("-", regex=False).fillna(False)
+    if dashed.any():
+        out[dashed] = pd.to_datetime(text[dashed], format="%Y-%m-%d", errors="coerce")
+    return out.astype("datetime64[s]")
+
+
+def _text(df: pd.DataFrame, col: str, empty_none: bool = True, default: str | None = None) -> pd.Series:
+    """文本列 → object，NaN/None 为 default；empty_none 时空串也视为 None。"""
+    if col not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    s = df[col].astype(object)
+    missing = s.isna()
+    if empty_none:
+        missing |= s.eq("")
+    return s.where(~missing, default)
+
+
+def _fill_zero(s: pd.Series) -> pd.Series:
+    """NULL 记 0（对应 dict 版本的 `parse_decimal(...) or Decimal("0")`）。"""
+    return s.fillna(Decimal("0") if s.dtype == object else 0.0)
+
+
+def _key_mask(df: pd.DataFrame, code_col: str = "ts_code") -> pd.Series:
+    """代码非空的行。"""
+    if code_col not in df.columns:
+        return pd.Series(False, index=df.index)
+    codes = df[code_col]
+    return codes.notna() & codes.astype(object).ne("")
+
+
+def _frame(columns: dict[str, pd.Series | object], index: pd.Index) -> pd.DataFrame:
+    """按业务表列顺序组装结果，标量列广播为常量列。"""
+    out = pd.DataFrame(columns, index=index)
+    return out.reset_index(drop=True)
+
+
+# ---------------------------------------------------------------------------
+# P0 日线
+# ---------------------------------------------------------------------------
+
+
+def _lookup(source, value_col: str) -> pd.DataFrame:
+    """构建 (ts_code, trade_date) → value 查找表，重复键保留最后一条。"""
+    df = as_frame(source)
+    if df.empty or not {"ts_code", "trade_date"} <= set(df.columns):
+        return pd.DataFrame({"ts_code": [], "trade_date": [], value_col: []})
+    lookup = pd.DataFrame({
+        "ts_code": df["ts_code"],
+        "trade_date": df["trade_date"],
+        value_col: _num(df, value_col),
+    })
+    return lookup.drop_duplicates(["ts_code", "trade_date"], keep="last")
+
+
+_DAILY_OUT = {
+    "ts_code": object, "trade_date": "datetime64[s]", "open": "float64", "high": "float64",
+    "low": "float64", "close": "float64", "pre_close": "float64", "pct_chg": "float64",
+    "vol": "float64", "amount": "float64", "adj_factor": "float64", "turnover_rate": "float64",
+    "trade_status": object, "data_source": object,
+}
+
+
+def _empty(dtypes: dict[str, object]) -> pd.DataFrame:
+    """空结果（保留列名与类型）。"""
+    return pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in dtypes.items()})
+
+
+def columnar_tushare_daily(raw_daily, raw_adj_factor, raw_daily_basic) -> pd.DataFrame:
+    """daily + adj_factor + daily_basic → stock_daily（列式版 transform_tushare_daily）。
+
+    amount 千元 → 元；vol/amount 缺失记 0；vol = 0 且 amount = 0 时 trade_status = "0"。
+
+    Args:
+        raw_daily: raw_tushare_daily 数据
+        raw_adj_factor: raw_tushare_adj_factor 数据
+        raw_daily_basic: raw_tushare_daily_basic 数据
+
+    Returns:
+        stock_daily 列顺序的列式数据
+    """
+    df = as_frame(raw_daily)
+    trade_date = _date(df, "trade_date")
+    df = df[trade_date.notna()]
+    if df.empty:
+        return _empty(_DAILY_OUT)
+    trade_date = trade_date[df.index]
+
+    keys = pd.DataFrame({"ts_code": _text(df, "ts_code", default=""), "trade_date": df["trade_date"]})
+    merged = keys.merge(_lookup(raw_adj_factor, "adj_factor"), on=["ts_code", "trade_date"], how="left")
+    merged = merged.merge(_lookup(raw_daily_basic, "turnover_rate"), on=["ts_code", "trade_date"], how="left")
+
+    vol = _num(df, "vol")
+    amount = _fill_zero(_num(df, "amount") * 1000)
+    trade_status = np.where(vol.eq(0) & amount.eq(0), "0", "1")
+
+    return _frame({
+        "ts_code": keys["ts_code"],
+        "trade_date": trade_date,
+        "open": _num(df, "open"),
+        "high": _num(df, "high"),
+        "low": _num(df, "low"),
+        "close": _num(df, "close"),
+        "pre_close": _num(df, "pre_close"),
+        "pct_chg": _num(df, "pct_chg"),
+        "vol": _fill_zero(vol),
+        "amount": amount,
+        "adj_factor": merged["adj_factor"].to_numpy(),
+        "turnover_rate": merged["turnover_rate"].to_numpy(),
+        "trade_status": trade_status,
+        "data_source": "tushare",
+    }, df.index)
+
+
+# ---------------------------------------------------------------------------
+# P2 资金流向 / 龙虎榜
+# ---------------------------------------------------------------------------
+
+_MONEYFLOW_FIELDS = (
+    "buy_sm_vol", "buy_sm_amount", "sell_sm_vol", "sell_sm_amount",
+    "buy_md_vol", "buy_md_amount", "sell_md_vol", "sell_md_amount",
+    "buy_lg_vol", "buy_lg_amount", "sell_lg_vol", "sell_lg_amount",
+    "buy_elg_vol", "buy_elg_amount", "sell_elg_vol", "sell_elg_amount",
+    "net_mf_amount",
+)
+
+
+def _code_date_rows(df: pd.DataFrame, date_col: str = "trade_date") -> tuple[pd.DataFrame, pd.Series]:
+    """过滤代码为空或日期无法解析的行，返回 (过滤后数据, 解析后的日期)。"""
+    dates = _date(df, date_col)
+    keep = _key_mask(df) & dates.notna()
+    return df[keep], dates[keep]
+
+
+def columnar_tushare_moneyflow(raw_rows) -> pd.DataFrame:
+    """moneyflow → money_flow（列式版），数值缺失记 0。"""
+    df, trade_date = _code_date_rows(as_frame(raw_rows))
+    columns: dict = {"ts_code": df.get("ts_code"), "trade_date": trade_date}
+    for field in _MONEYFLOW_FIELDS:
+        columns[field] = _fill_zero(_num(df, field))
+    columns["data_source"] = "tushare"
+    return _frame(columns, df.index)
+
+
+def columnar_tushare_top_list(raw_rows) -> pd.DataFrame:
+    """top_list → dragon_tiger（列式版）。"""
+    df, trade_date = _code_date_rows(as_frame(raw_rows))
+    return _frame({
+        "ts_code": df.get("ts_code"),
+        "trade_date": trade_date,
+        "reason": _text(df, "reason"),
+        "buy_total": _num(df, "l_buy"),
+        "sell_total": _num(df, "l_sell"),
+        "net_buy": _num(df, "net_amount"),
+        "list_name": _text(df, "name"),
+        "data_source": "tushare",
+    }, df.index)
+
+
+# ---------------------------------------------------------------------------
+# P3 指数
+# ---------------------------------------------------------------------------
+
+_INDEX_BAR_FIELDS = ("open", "high", "low", "close", "pre_close", "change", "pct_chg")
+
+
+def columnar_tushare_index_daily(raw_rows) -> pd.DataFrame:
+    """index_daily → index_daily（列式版），过滤日期无效或 OHLC 不完整的行。"""
+    df = as_frame(raw_rows)
+    trade_date = _date(df, "trade_date")
+    keep = trade_date.notna()
+    for field in ("open", "high", "low"):
+        keep &= df[field].notna() if field in df.columns else False
+    df, trade_date = df[keep], trade_date[keep]
+
+    columns: dict = {"ts_code": df.get("ts_code"), "trade_date": trade_date}
+    for field in _INDEX_BAR_FIELDS:
+        columns[field] = _num(df, field)
+    columns["vol"] = _fill_zero(_num(df, "vol"))
+    columns["amount"] = _fill_zero(_num(df, "amount"))
+    return _frame(columns, df.index)
+
+
+def columnar_tushare_index_weight(raw_rows) -> pd.DataFrame:
+    """index_weight → index_weight（列式版）。"""
+    df = as_frame(raw_rows)
+    return _frame({
+        "index_code": df.get("index_code"),
+        "con_code": df.get("con_code"),
+        "trade_date": _date(df, "trade_date"),
+        "weight": _num(df, "weight"),
+    }, df.index)
+
+
+# 业务表字段 → raw_tushare_index_factor_pro 字段（None 表示 raw 表无对应字段）
+INDEX_TECHNICAL_FIELDS: dict[str, str | None] = {
+    "ma5": "ma_bfq_5", "ma10": "ma_bfq_10", "ma20": "ma_bfq_20", "ma60": "ma_bfq_60",
+    "ma120": "ma_bfq_90", "ma250": "ma_bfq_250",
+    "macd_dif": "macd_dif_bfq", "macd_dea": "macd_dea_bfq", "macd_hist": "macd_bfq",
+    "kdj_k": "kdj_k_bfq", "kdj_d": "kdj_d_bfq", "kdj_j": "kdj_bfq",
+    "rsi6": "rsi_bfq_6", "rsi12": "rsi_bfq_12", "rsi24": "rsi_bfq_24",
+    "boll_upper": "boll_upper_bfq", "boll_mid": "boll_mid_bfq", "boll_lower": "boll_lower_bfq",
+    "vol_ma5": None, "vol_ma10": None, "vol_ratio": None,
+    "atr14": "atr_bfq", "cci14": "cci_bfq", "willr14": "wr_bfq", "wr": "wr_bfq",
+    "cci": "cci_bfq", "bias": "bias1_bfq", "obv": "obv_bfq",
+    "dmi_pdi": "dmi_pdi_bfq", "dmi_mdi": "dmi_mdi_bfq", "dmi_adx": "dmi_adx_bfq", "dmi_adxr": "dmi_adxr_bfq",
+    "mtm": "mtm_bfq", "mtmma": "mtmma_bfq", "roc": "roc_bfq", "maroc": "maroc_bfq",
+    "psy": "psy_bfq", "psyma": "psyma_bfq", "trix": "trix_bfq", "trma": "trma_bfq",
+    "emv": "emv_bfq", "maemv": "maemv_bfq", "vr": "vr_bfq",
+    "brar_ar": "brar_ar_bfq", "brar_br": "brar_br_bfq", "cr": "cr_bfq", "mfi": "mfi_bfq",
+    "dpo": "dpo_bfq", "madpo": "madpo_bfq", "mass": "mass_bfq", "ma_mass": "ma_mass_bfq",
+    "asi": "asi_bfq", "asit": "asit_bfq", "dfma_dif": "dfma_dif_bfq", "dfma_difma": "dfma_difma_bfq",
+    "ema5": "ema_bfq_5", "ema10": "ema_bfq_10", "ema20": "ema_bfq_20", "ema30": "ema_bfq_30",
+    "ema60": "ema_bfq_60", "ema90": "ema_bfq_90", "ema250": "ema_bfq_250",
+    "expma_12": "expma_12_bfq", "expma_50": "expma_50_bfq",
+    "ktn_upper": "ktn_upper_bfq", "ktn_mid": "ktn_mid_bfq", "ktn_lower": "ktn_down_bfq",
+    "taq_up": "taq_up_bfq", "taq_mid": "taq_mid_bfq", "taq_down": "taq_down_bfq",
+    "xsii_td1": "xsii_td1_bfq", "xsii_td2": "xsii_td2_bfq", "xsii_td3": "xsii_td3_bfq", "xsii_td4": "xsii_td4_bfq",
+    "updays": "updays", "downdays": "downdays", "topdays": "topdays", "lowdays": "lowdays",
+    "bbi": "bbi_bfq",
+}
+
+
+def columnar_tushare_index_technical(raw_rows) -> pd.DataFrame:
+    """index_factor_pro → index_technical_daily（列式版），字段映射见 INDEX_TECHNICAL_FIELDS。"""
+    df = as_frame(raw_rows)
+    columns: dict = {"ts_code": df.get("ts_code"), "trade_date": _date(df, "trade_date")}
+    for field, src in INDEX_TECHNICAL_FIELDS.items():
+        columns[field] = _num(df, src) if src else np.nan
+    return _frame(columns, df.index)
+
+
+# ---------------------------------------------------------------------------
+# P4 板块
+# ---------------------------------------------------------------------------
+
+
+def columnar_tushare_concept_daily(raw_rows) -> pd.DataFrame:
+    """ths_daily → concept_daily（列式版），过滤 close 为空的行，open/high/low 缺失或为 0 时取 close。"""
+    df = as_frame(raw_rows)
+    close = _num(df, "close")
+    keep = close.notna()
+    df, close = df[keep], close[keep]
+
+    def _or_close(field: str) -> pd.Series:
+        value = _num(df, field)
+        return value.where(value.notna() & value.ne(0), close)
+
+    return _frame({
+        "ts_code": df.get("ts_code"),
+        "trade_date": _date(df, "trade_date"),
+        "open": _or_close("open"),
+        "high": _or_close("high"),
+        "low": _or_close("low"),
+        "close": close,
+        "pre_close": _num(df, "pre_close"),
+        "change": _num(df, "change"),
+        "pct_chg": _num(df, "pct_chg"),
+        "vol": _fill_zero(_num(df, "vol")),
+        "amount": _fill_zero(_num(df, "amount")),
+    }, df.index)
+
+
+# ---------------------------------------------------------------------------
+# 财务数据
+# ---------------------------------------------------------------------------
+
+# 业务表字段 → raw_tushare_fina_indicator 字段（None 表示暂无来源）
+FINA_INDICATOR_FIELDS: dict[str, str | None] = {
+    "eps": "eps", "ocf_per_share": "ocfps",
+    "roe": "roe", "roe_diluted": "roe_dt", "gross_margin": "grossprofit_margin", "net_margin": "netprofit_margin",
+    "revenue_yoy": "or_yoy", "profit_yoy": "netprofit_yoy",
+    "pe_ttm": None, "pb": None, "ps_ttm": None, "total_mv": None, "circ_mv": None,
+    "current_ratio": "current_ratio", "quick_ratio": "quick_ratio", "debt_ratio": "debt_to_assets",
+}
+
+
+def columnar_tushare_fina_indicator(raw_rows) -> pd.DataFrame:
+    """fina_indicator → finance_indicator（列式版），过滤 end_date/ann_date 无效的行。"""
+    df = as_frame(raw_rows)
+    end_date, ann_date = _date(df, "end_date"), _date(df, "ann_date")
+    keep = _key_mask(df) & end_date.notna() & ann_date.notna()
+    df = df[keep]
+
+    columns: dict = {
+        "ts_code": df.get("ts_code"),
+        "end_date": end_date[keep],
+        "ann_date": ann_date[keep],
+        "report_type": _text(df, "update_flag", empty_none=False, default=""),
+    }
+    for field, src in FINA_INDICATOR_FIELDS.items():
+        columns[field] = _num(df, src) if src else np.nan
+    columns["data_source"] = "tushare"
+    return _frame(columns, df.index)
+
+
+INCOME_FIELDS = (
+    "total_revenue", "revenue", "oper_cost", "total_cogs", "sell_exp", "admin_exp", "fin_exp",
+    "rd_exp", "operate_profit", "total_profit", "income_tax", "n_income", "n_income_attr_p",
+    "basic_eps", "diluted_eps", "ebit", "ebitda", "invest_income", "non_oper_income", "non_oper_exp",
+)
+
+BALANCESHEET_FIELDS = (
+    "total_assets", "total_cur_assets", "total_nca", "money_cap", "accounts_receiv", "notes_receiv",
+    "prepayment", "contract_assets", "inventories", "fix_assets", "intan_assets", "goodwill",
+    "total_liab", "total_cur_liab", "total_ncl", "st_borr", "lt_borr", "bond_payable",
+    "notes_payable", "adv_receipts", "contract_liab", "total_hldr_eqy_exc_min_int",
+    "total_hldr_eqy_inc_min_int", "total_share", "cap_rese", "surplus_rese", "undistr_porfit",
+    "minority_int", "treasury_share",
+)
+
+CASHFLOW_FIELDS = (
+    "n_cashflow_act", "n_cashflow_inv_act", "n_cash_flows_fnc_act", "c_fr_sale_sg", "c_paid_goods_s",
+    "c_paid_to_for_empl", "c_paid_for_taxes", "c_pay_acq_const_fiolta", "c_recp_borrow",
+    "c_pay_dist_dpcp_int_exp", "c_cash_equ_end_period", "c_cash_equ_beg_period",
+    "n_incr_cash_cash_equ", "free_cashflow", "net_profit", "depr_fa_coga_dpba", "invest_loss",
+)
+
+
+def _financial_statement(raw_rows, fields: tuple[str, ...]) -> pd.DataFrame:
+    """财务三表通用转换：只保留合并报表（report_type="1"），按 (ts_code, end_date, report_type) 去重保留最后一条。"""
+    df = as_frame(raw_rows)
+    report_type = _text(df, "report_type", default="1").astype(str)
+    end_date = _date(df, "end_date")
+    keep = _key_mask(df) & report_type.eq("1") & end_date.notna()
+    df = df[keep]
+
+    columns: dict = {
+        "ts_code": df.get("ts_code"),
+        "end_date": end_date[keep],
+        "report_type": report_type[keep],
+        "ann_date": _date(df, "ann_date"),
+    }
+    for field in fields:
+        columns[field] = _num(df, field)
+    columns["data_source"] = "tushare"
+    out = _frame(columns, df.index)
+    return out.drop_duplicates(["ts_code", "end_date", "report_type"], keep="last").reset_index(drop=True)
+
+
+def columnar_tushare_income(raw_rows) -> pd.DataFrame:
+    """income → income_statement（列式版）。"""
+    return _financial_statement(raw_rows, INCOME_FIELDS)
+
+
+def columnar_tushare_balancesheet(raw_rows) -> pd.DataFrame:
+    """balancesheet → balance_sheet（列式版）。"""
+    return _financial_statement(raw_rows, BALANCESHEET_FIELDS)
+
+
+def columnar_tushare_cashflow(raw_rows) -> pd.DataFrame:
+    """cashflow → cash_flow_statement（列式版）。"""
+    return _financial_statement(raw_rows, CASHFLOW_FIELDS)
+
+
+# ---------------------------------------------------------------------------
+# P5 扩展数据
+# ---------------------------------------------------------------------------
+
+
+def columnar_tushare_suspend_d(raw_rows) -> pd.DataFrame:
+    """suspend_d → suspend_info（列式版）。"""
+    df, trade_date = _code_date_rows(as_frame(raw_rows), "suspend_date")
+    return _frame({
+        "ts_code": df.get("ts_code"),
+        "trade_date": trade_date,
+        "suspend_timing": _text(df, "suspend_timing"),
+        "suspend_type": _text(df, "reason_type"),
+        "suspend_reason": _text(df, "suspend_reason"),
+        "resume_date": _date(df, "resume_date"),
+        "data_source": "tushare",
+    }, df.index)
+
+
+def columnar_tushare_limit_list_d(raw_rows) -> pd.DataFrame:
+    """limit_list_d → limit_list_daily（列式版）。"""
+    df, trade_date = _code_date_rows(as_frame(raw_rows))
+    return _frame({
+        "ts_code": df.get("ts_code"),
+        "trade_date": trade_date,
+        "name": _text(df, "name"),
+        "close": _num(df, "close"),
+        "pct_chg": _num(df, "pct_chg"),
+        "amp": _num(df, "amp"),
+        "fc_ratio": _num(df, "fc_ratio"),
+        "fl_ratio": _num(df, "fl_ratio"),
+        "fd_amount": _num(df, "fd_amount"),
+        "first_time": _text(df, "first_time"),
+        "last_time": _text(df, "last_time"),
+        "open_times": _int(df, "open_times"),
+        "up_stat": _text(df, "up_stat"),
+        "limit_times": _int(df, "limit_times"),
+        "data_source": "tushare",
+    }, df.index)
+
+
+# ---------------------------------------------------------------------------
+# 输出转换与兼容包装
+# ---------------------------------------------------------------------------
+
+COLUMNAR_TRANSFORMS: dict[str, Callable[..., pd.DataFrame]] = {
+    "daily": columnar_tushare_daily,
+    "moneyflow": columnar_tushare_moneyflow,
+    "top_list": columnar_tushare_top_list,
+    "index_daily": columnar_tushare_index_daily,
+    "index_weight": columnar_tushare_index_weight,
+    "index_technical": columnar_tushare_index_technical,
+    "concept_daily": columnar_tushare_concept_daily,
+    "fina_indicator": columnar_tushare_fina_indicator,
+    "income": columnar_tushare_income,
+    "balancesheet": columnar_tushare_balancesheet,
+    "cashflow": columnar_tushare_cashflow,
+    "suspend_d": columnar_tushare_suspend_d,
+    "limit_list_d": columnar_tushare_limit_list_d,
+}
+
+
+def _column_values(s: pd.Series) -> list:
+    """单列转 Python 值：float → Decimal，Int64 → int，日期 → date，空值 → None。
+
+    精确模式的 Decimal object 列原样保留（NaN → None）。
+    """
+    if pd.api.types.is_float_dtype(s):
+        return [None if v != v else Decimal(repr(v)) for v in s.tolist()]
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return [None if v is pd.NaT else v.date() for v in s.tolist()]
+    if isinstance(s.dtype, pd.Int64Dtype):
+        return [None if v is pd.NA else int(v) for v in s.astype(object).tolist()]
+    return [None if (isinstance(v, float) and v != v) else v for v in s.tolist()]
+
+
+def to_records(frame: pd.DataFrame) -> list[dict]:
+    """列式结果 → list[dict]，字段与 etl.py dict 版本一致（数值为 Decimal）。
+
+    float64 经最短十进制表示转为 Decimal，仅在 float64 精度（约 15 位有效数字）内无损；
+    需要原样保留输入精度时使用 transform_rows。
+    """
+    names = list(frame.columns)
+    columns = [_column_values(frame[name]) for name in names]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def to_arrow(frame: pd.DataFrame):
+    """列式结果 → pyarrow Table（日期列为 date32）。需要 pyarrow。"""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.date32()))
+    return table
+
+
+def transform_rows(name: str, *sources: Iterable[dict] | pd.DataFrame) -> list[dict]:
+    """兼容包装：以列式实现执行转换，返回与 transform_tushare_{name} 相同结构的 dict 列表。
+
+    转换期间开启精确模式，数值由原始值直接解析为 Decimal，与 parse_decimal 结果一致。
+
+    Args:
+        name: 转换名称（COLUMNAR_TRANSFORMS 的键，如 "daily"、"moneyflow"）
+        *sources: 原始数据（dict 列表或 DataFrame），个数与对应 dict 版本的参数一致
+
+    Returns:
+        清洗后的数据行列表
+    """
+    try:
+        fn = COLUMNAR_TRANSFORMS[name]
+    except KeyError:
+        raise ValueError(f"未知的列式转换: {name}") from None
+    token = _EXACT_NUMERIC.set(True)
+    try:
+        frame = fn(*sources)
+    finally:
+        _EXACT_NUMERIC.reset(token)
+    return to_records(frame)
@@ -0,0 +1,82 @@
+"""历史补数拉取规划：按日期切片 vs 按代码区间切片。
+
+Tushare 的日频接口有两种取数方式：
+- 按日期：trade_date=某日，一次返回全市场当日数据（全市场行数超过单次上限时需分页）
+- 按代码：ts_code + start_date/end_date，一次返回单只股票一段区间的数据
+  （区间交易日数不超过单次行数上限）
+
+补数时按缺口形状（缺失日期数 × 涉及代码数）与接口单次行数上限估算两种方式的
+调用次数，选择消耗限流配额更少的一种：缺口覆盖全市场时按日期更省，
+少量代码的深度缺口（新纳入的股票、个别代码的历史空洞）按代码区间更省。
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import date
+
+# 各接口单次调用最多返回的行数
+API_ROW_CAPS: dict[str, int] = {
+    "daily": 6000,
+    "adj_factor": 6000,
+    "daily_basic": 6000,
+    "stk_limit": 5800,
+    "moneyflow": 6000,
+    "ths_daily": 3000,
+    "index_daily": 8000,
+}
+
+
+@dataclass(frozen=True)
+class FetchPlan:
+    """单张表的拉取方案。
+
+    Attributes:
+        mode: "by_date"（逐日全市场）或 "by_code"（逐代码区间）
+        by_date_calls: 按日期方式的单接口调用次数
+        by_code_calls: 按代码方式的单接口调用次数
+        windows: 按代码方式下每只股票的区间切片 [(start, end), ...]
+    """
+
+    mode: str
+    by_date_calls: int
+    by_code_calls: int
+    windows: tuple[tuple[date, date], ...] = ()
+
+    @property
+    def calls(self) -> int:
+        """所选方式的单接口调用次数。"""
+        return self.by_code_calls if self.mode == "by_code" else self.by_date_calls
+
+
+def range_windows(span_dates: list[date], row_cap: int) -> list[tuple[date, date]]:
+    """将交易日序列切成每段不超过 row_cap 个交易日的区间（单代码单次调用不超过行数上限）。"""
+    span = sorted(span_dates)
+    return [(span[i], span[min(i + row_cap, len(span)) - 1]) for i in range(0, len(span), row_cap)]
+
+
+def plan_fetch(
+    dates: list[date],
+    span_dates: list[date],
+    n_codes: int,
+    market_codes: int,
+    apis: list[str],
+) -> FetchPlan:
+    """为一张表选择拉取方式。
+
+    Args:
+        dates: 缺失（待同步）的交易日
+        span_dates: dates 首尾之间的全部交易日（按代码区间拉取时覆盖的范围）
+        n_codes: 缺口涉及的代码数
+        market_codes: 全市场代码数（按日期拉取时每次返回的行数）
+        apis: 该表需要调用的接口（取其中最小的单次行数上限）
+
+    Returns:
+        FetchPlan；调用次数相同时保持按日期方式
+    """
+    row_cap = min(API_ROW_CAPS.get(api, API_ROW_CAPS["daily"]) for api in apis)
+    by_date_calls = len(dates) * max(1, math.ceil(market_codes / row_cap))
+    windows = range_windows(span_dates or dates, row_cap)
+    by_code_calls = n_codes * len(windows)
+    if dates and n_codes and by_code_calls < by_date_calls:
+        return FetchPlan("by_code", by_date_calls, by_code_calls, tuple(windows))
+    return FetchPlan("by_date", by_date_calls, by_code_calls)
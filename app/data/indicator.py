@@ -641,6 +641,82 @@ def _build_indicator_row(ts_code: str, trade_date: date, row: pd.Series) -> dict
     return record
 
 
+def build_indicator_frame(
+    ts_codes: str | np.ndarray | pd.Series,
+    trade_dates: np.ndarray | pd.Series,
+    indicators: pd.DataFrame | dict[str, np.ndarray],
+) -> pd.DataFrame:
+    """按列构建技术指标写入帧（_build_indicator_row 的列式版本）。
+
+    舍入到 4 位小数，超出 Numeric 范围的值置为 NaN（写入时为 NULL），
+    规则与 _build_indicator_row 一致，但不逐行构建字典。
+
+    Args:
+        ts_codes: 单个标的代码（广播到所有行）或与行数等长的代码数组
+        trade_dates: 交易日期数组
+        indicators: 包含指标列的 DataFrame 或 {列名: 数组}
+
+    Returns:
+        列为 ts_code, trade_date + INDICATOR_COLUMNS 的 DataFrame
+    """
+    _WIDE_COLUMNS = {"vol_ma5", "vol_ma10", "obv"}
+    _LIMIT_12_4 = 99999999.9999
+    _LIMIT_20_2 = 999999999999999999.99
+
+    trade_dates = np.asarray(trade_dates)
+    frame: dict[str, Any] = {
+        "ts_code": np.broadcast_to(np.asarray(ts_codes, dtype=object), trade_dates.shape),
+        "trade_date": trade_dates,
+    }
+    for col in INDICATOR_COLUMNS:
+        if col not in indicators:
+            frame[col] = np.full(trade_dates.shape, np.nan)
+            continue
+        vals = np.round(np.asarray(indicators[col], dtype=float), 4)
+        limit = _LIMIT_20_2 if col in _WIDE_COLUMNS else _LIMIT_12_4
+        with np.errstate(invalid="ignore"):
+            vals[np.abs(vals) > limit] = np.nan
+        frame[col] = vals
+    return pd.DataFrame(frame)
+
+
+async def write_technical_frame(
+    session_factory: async_sessionmaker[AsyncSession],
+    frame: pd.DataFrame,
+    target_table: Type[DeclarativeBase],
+) -> int:
+    """将列式指标帧写入技术指标表，优先使用 COPY 协议。
+
+    目标范围为空（新表、新标的）时直接 COPY，否则经临时表合并；
+    COPY 失败时降级到 INSERT ... ON CONFLICT。
+
+    Args:
+        session_factory: 异步数据库会话工厂
+        frame: build_indicator_frame 构建的 DataFrame
+        target_table: 目标技术指标表模型
+
+    Returns:
+        处理的行数
+    """
+    if frame.empty:
+        return 0
+
+    try:
+        from app.data.copy_writer import copy_upsert_frame
+        return await copy_upsert_frame(target_table.__table__, frame, conflict="update")
+    except Exception as e:
+        logger.warning(
+            "[技术指标] COPY 写入 %s 失败，降级到 INSERT: %s",
+            target_table.__tablename__, e,
+        )
+
+    rows = frame.astype(object).where(frame.notna(), None).to_dict("records")
+    async with session_factory() as session:
+        count = await _upsert_technical_rows_generic(session, rows, target_table)
+        await session.commit()
+    return count
+
+
 async def _upsert_technical_rows_generic(
     session: AsyncSession,
     rows: list[dict],
@@ -701,15 +777,17 @@ async def _upsert_technical_rows_generic(
 async def compute_all_stocks(
     session_factory: async_sessionmaker[AsyncSession],
     progress_callback: Callable[[int, int], None] | None = None,
+    workers: int = 1,
 ) -> dict:
     """全市场批量计算技术指标并写入 technical_daily 表。
 
     遍历所有上市股票，逐股加载历史日线数据，计算全部指标，
-    使用 UPSERT 写入数据库。每 BATCH_COMMIT_SIZE 只股票提交一次。
+    按列构建写入帧并通过 COPY 写入数据库。每 BATCH_COMMIT_SIZE 只股票提交一次。
 
     Args:
         session_factory: 异步数据库会话工厂
         progress_callback: 可选的进度回调函数，接收 (processed, total) 参数
+        workers: 工作进程数，大于 1 时使用进程池计算（见 app.data.indicator_pool）
 
     Returns:
         汇总字典：{"total": N, "success": M, "failed": F, "elapsed_seconds": T}
@@ -722,13 +800,21 @@ async def compute_all_stocks(
         result = await session.execute(stmt)
         all_codes = [row[0] for row in result.all()]
 
+    if workers > 1:
+        from app.data.indicator_pool import compute_all_parallel
+
+        return await compute_all_parallel(
+            session_factory, StockDaily, TechnicalDaily, all_codes,
+            workers=workers, progress_callback=progress_callback,
+        )
+
     total = len(all_codes)
     success = 0
     failed = 0
     logger.info("开始全量计算技术指标，共 %d 只股票", total)
 
     # 2. 逐股计算，分批提交
-    batch_rows: list[dict] = []
+    batch_frames: list[pd.DataFrame] = []
     batch_count = 0
 
     for i, ts_code in enumerate(all_codes):
@@ -762,11 +848,10 @@ async def compute_all_stocks(
             # 计算指标
             df_with_indicators = compute_single_stock_indicators(df)
 
-            # 构建写入行（所有交易日的指标）
-            for _, row in df_with_indicators.iterrows():
-                batch_rows.append(
-                    _build_indicator_row(ts_code, row["trade_date"], row)
-                )
+            # 构建列式写入帧（所有交易日的指标）
+            batch_frames.append(build_indicator_frame(
+                ts_code, df_with_indicators["trade_date"].to_numpy(), df_with_indicators,
+            ))
 
             success += 1
 
@@ -777,15 +862,15 @@ async def compute_all_stocks(
         batch_count += 1
 
         # 每 BATCH_COMMIT_SIZE 只股票提交一次
-        if batch_count >= BATCH_COMMIT_SIZE and batch_rows:
-            async with session_factory() as session:
-                await _upsert_technical_rows(session, batch_rows)
-                await session.commit()
+        if batch_count >= BATCH_COMMIT_SIZE and batch_frames:
+            written = await write_technical_frame(
+                session_factory, pd.concat(batch_frames, ignore_index=True), TechnicalDaily,
+            )
             logger.info(
                 "已提交 %d 只股票的指标数据（%d 行）",
-                batch_count, len(batch_rows),
+                batch_count, written,
             )
-            batch_rows = []
+            batch_frames = []
             batch_count = 0
 
         # 进度回调
@@ -793,10 +878,21 @@ async def compute_all_stocks(
             progress_callback(i + 1, total)
 
     # 提交剩余数据
-    if batch_rows:
-        async with session_factory() as session:
-            await _upsert_technical_rows(session, batch_rows)
-            await session.commit()
+    if batch_frames:
+        await write_technical_frame(
+            session_factory, pd.concat(batch_frames, ignore_index=True), TechnicalDaily,
+        )
+
+    # 全量重算后清除递推状态，下次增量更新基于最新历史重建；本地列式镜像与面板缓存整体待重写
+    from app.config import settings
+    from app.data.columnar_store import invalidate_columnar_range
+    from app.data.indicator_state import invalidate_indicator_state
+    from app.data.panel_cache import invalidate_panel_cache
+
+    await invalidate_indicator_state(session_factory, TechnicalDaily)
+    data_start = date.fromisoformat(settings.data_start_date)
+    invalidate_columnar_range(data_start, date.today(), datasets=["technical_daily"])
+    invalidate_panel_cache(data_start)
 
     elapsed = round(time.time() - start_time, 2)
     summary = {
@@ -829,146 +925,29 @@ async def compute_incremental(
     session_factory: async_sessionmaker[AsyncSession],
     target_date: date | None = None,
     progress_callback: Callable[[int, int], None] | None = None,
+    use_state: bool = True,
 ) -> dict:
     """增量计算技术指标：仅计算指定交易日（默认最新）的指标。
 
-    对每只股票加载 LOOKBACK_DAYS 天历史数据，计算指标后仅
-    UPSERT 目标日期那一行到 technical_daily。
+    默认从 indicator_state 保存的递推状态推进一根 K 线（见 app.data.indicator_state），
+    无状态、存在缺口或复权因子变化的股票退回全历史重算。
+    use_state=False 时加载最近 LOOKBACK_DAYS 根 K 线构建面板计算。
 
     Args:
         session_factory: 异步数据库会话工厂
         target_date: 目标交易日，None 表示自动检测最新交易日
         progress_callback: 可选的进度回调函数
+        use_state: 是否使用递推状态续算
 
     Returns:
         汇总字典：{"trade_date": "YYYY-MM-DD", "total": N, "success": M, "failed": F}
     """
-    start_time = time.time()
-
-    # 1. 确定目标交易日
-    if target_date is None:
-        async with session_factory() as session:
-            result = await session.execute(
-                select(StockDaily.trade_date)
-                .order_by(StockDaily.trade_date.desc())
-                .limit(1)
-            )
-            row = result.scalar_one_or_none()
-            if row is None:
-                logger.warning("stock_daily 表无数据，无法确定最新交易日")
-                return {"trade_date": None, "total": 0, "success": 0, "failed": 0}
-            target_date = row
-
-    logger.info("增量计算目标日期: %s", target_date)
-
-    # 2. 查询在目标日期有日线数据的所有股票
-    async with session_factory() as session:
-        stmt = (
-            select(StockDaily.ts_code)
-            .where(StockDaily.trade_date == target_date)
-            .distinct()
-        )
-        result = await session.execute(stmt)
-        target_codes = [row[0] for row in result.all()]
-
-    total = len(target_codes)
-    success = 0
-    failed = 0
-    batch_rows: list[dict] = []
-    batch_count = 0
-
-    logger.info("目标日期 %s 共 %d 只股票需要计算", target_date, total)
-
-    for i, ts_code in enumerate(target_codes):
-        try:
-            # 加载历史数据（截止到目标日期）
-            async with session_factory() as session:
-                stmt = (
-                    select(StockDaily)
-                    .where(
-                        StockDaily.ts_code == ts_code,
-                        StockDaily.trade_date <= target_date,
-                    )
-                    .order_by(StockDaily.trade_date.desc())
-                    .limit(LOOKBACK_DAYS)
-                )
-                result = await session.execute(stmt)
-                rows = result.scalars().all()
-
-            if not rows:
-                continue
-
-            # 转换为 DataFrame（注意：查询是 DESC 排序，需要反转）
-            records = [{
-                "trade_date": r.trade_date,
-                "open": float(r.open) if r.open else 0.0,
-                "high": float(r.high) if r.high else 0.0,
-                "low": float(r.low) if r.low else 0.0,
-                "close": float(r.close) if r.close else 0.0,
-                "vol": float(r.vol) if r.vol else 0.0,
-            } for r in reversed(rows)]
-            df = pd.DataFrame(records)
-
-            # 计算指标
-            df_with_indicators = compute_single_stock_indicators(df)
-
-            # 仅取目标日期那一行
-            target_row = df_with_indicators[
-                df_with_indicators["trade_date"] == target_date
-            ]
-            if not target_row.empty:
-                batch_rows.append(
-                    _build_indicator_row(ts_code, target_date, target_row.iloc[0])
-                )
-
-            success += 1
-
-        except Exception as e:
-            logger.error("增量计算股票 %s 指标失败: %s", ts_code, e)
-            failed += 1
-
-        batch_count += 1
-
-        # 每 BATCH_COMMIT_SIZE 只股票提交一次
-        if batch_count >= BATCH_COMMIT_SIZE and batch_rows:
-            async with session_factory() as session:
-                await _upsert_technical_rows(session, batch_rows)
-                await session.commit()
-            batch_rows = []
-            batch_count = 0
-
-        # 进度回调
-        if progress_callback and (i + 1) % 500 == 0:
-            progress_callback(i + 1, total)
-
-    # 提交剩余数据
-    if batch_rows:
-        async with session_factory() as session:
-            await _upsert_technical_rows(session, batch_rows)
-            await session.commit()
-
-    elapsed = round(time.time() - start_time, 2)
-    summary = {
-        "trade_date": str(target_date),
-        "total": total,
-        "success": success,
-        "failed": failed,
-        "elapsed_seconds": elapsed,
-    }
-
-    # 记录总体汇总日志
-    avg_time = elapsed / total if total > 0 else 0
-    logger.info(
-        "[技术指标] 增量计算完成：日期 %s，成功 %d 只，失败 %d 只，总耗时 %.1fs，平均 %.3fs/只",
-        target_date, success, failed, elapsed, avg_time,
+    return await compute_incremental_generic(
+        session_factory, StockDaily, TechnicalDaily,
+        target_date=target_date, progress_callback=progress_callback,
+        use_state=use_state,
     )
 
-    # 检测慢速计算（总耗时 >10 分钟）
-    if elapsed > 600:
-        logger.warning("[技术指标] 慢速计算：增量计算耗时 %.1fs (%.1f分钟)", elapsed, elapsed / 60)
-
-    return summary
-
 
 # ============================================================
 # 泛化批量计算和增量计算（支持多种市场数据表）
@@ -982,11 +961,12 @@ async def compute_all_generic(
     code_filter_column: str = "list_status",
     code_filter_value: str = "L",
     progress_callback: Callable[[int, int], None] | None = None,
+    workers: int = 1,
 ) -> dict:
     """泛化全市场批量计算技术指标并写入指定技术指标表。
 
     遍历所有标的，逐个加载历史日线数据，计算全部指标，
-    使用 UPSERT 写入数据库。每 BATCH_COMMIT_SIZE 个标的提交一次。
+    按列构建写入帧并通过 COPY 写入数据库。每 BATCH_COMMIT_SIZE 个标的提交一次。
 
     Args:
         session_factory: 异步数据库会话工厂
@@ -995,6 +975,7 @@ async def compute_all_generic(
         code_filter_column: 用于过滤标的的列名（如 "list_status"）
         code_filter_value: 过滤值（如 "L" 表示上市）
         progress_callback: 可选的进度回调函数，接收 (processed, total) 参数
+        workers: 工作进程数，大于 1 时使用进程池计算（见 app.data.indicator_pool）
 
     Returns:
         汇总字典：{"total": N, "success": M, "failed": F, "elapsed_seconds": T}
@@ -1016,6 +997,14 @@ async def compute_all_generic(
         result = await session.execute(stmt)
         all_codes = [row[0] for row in result.all()]
 
+    if workers > 1:
+        from app.data.indicator_pool import compute_all_parallel
+
+        return await compute_all_parallel(
+            session_factory, source_table, target_table, all_codes,
+            workers=workers, progress_callback=progress_callback,
+        )
+
     total = len(all_codes)
     success = 0
     failed = 0
@@ -1023,7 +1012,7 @@ async def compute_all_generic(
                 source_table.__tablename__, target_table.__tablename__, total)
 
     # 2. 逐个计算，分批提交
-    batch_rows: list[dict] = []
+    batch_frames: list[pd.DataFrame] = []
     batch_count = 0
 
     for i, ts_code in enumerate(all_codes):
@@ -1057,11 +1046,10 @@ async def compute_all_generic(
             # 计算指标
             df_with_indicators = compute_indicators_generic(df)
 
-            # 构建写入行（所有交易日的指标）
-            for _, row in df_with_indicators.iterrows():
-                batch_rows.append(
-                    _build_indicator_row(ts_code, row["trade_date"], row)
-                )
+            # 构建列式写入帧（所有交易日的指标）
+            batch_frames.append(build_indicator_frame(
+                ts_code, df_with_indicators["trade_date"].to_numpy(), df_with_indicators,
+            ))
 
             success += 1
 
@@ -1072,15 +1060,15 @@ async def compute_all_generic(
         batch_count += 1
 
         # 每 BATCH_COMMIT_SIZE 个标的提交一次
-        if batch_count >= BATCH_COMMIT_SIZE and batch_rows:
-            async with session_factory() as session:
-                await _upsert_technical_rows_generic(session, batch_rows, target_table)
-                await session.commit()
+        if batch_count >= BATCH_COMMIT_SIZE and batch_frames:
+            written = await write_technical_frame(
+                session_factory, pd.concat(batch_frames, ignore_index=True), target_table,
+            )
             logger.info(
                 "已提交 %d 个标的的指标数据（%d 行）",
-                batch_count, len(batch_rows),
+                batch_count, written,
             )
-            batch_rows = []
+            batch_frames = []
             batch_count = 0
 
         # 进度回调
@@ -1088,10 +1076,15 @@ async def compute_all_generic(
             progress_callback(i + 1, total)
 
     # 提交剩余数据
-    if batch_rows:
-        async with session_factory() as session:
-            await _upsert_technical_rows_generic(session, batch_rows, target_table)
-            await session.commit()
+    if batch_frames:
+        await write_technical_frame(
+            session_factory, pd.concat(batch_frames, ignore_index=True), target_table,
+        )
+
+    # 全量重算后清除递推状态，下次增量更新基于最新历史重建
+    from app.data.indicator_state import invalidate_indicator_state
+
+    await invalidate_indicator_state(session_factory, target_table)
 
     elapsed = round(time.time() - start_time, 2)
     summary = {
@@ -1121,11 +1114,14 @@ async def compute_incremental_generic(
     target_table: Type[DeclarativeBase],
     target_date: date | None = None,
     progress_callback: Callable[[int, int], None] | None = None,
+    use_state: bool = True,
 ) -> dict:
     """泛化增量计算技术指标：仅计算指定交易日（默认最新）的指标。
 
-    对每个标的加载 LOOKBACK_DAYS 天历史数据，计算指标后仅
-    UPSERT 目标日期那一行到指定技术指标表。
+    默认使用递推状态续算（app.data.indicator_state）：每个标的只读取当日行情和
+    已保存状态即可推进一根 K 线；无状态、存在缺口或复权因子变化时退回全历史重算。
+    use_state=False 时使用面板引擎（app.data.indicator_panel）加载
+    LOOKBACK_DAYS 根 K 线计算。两种方式都只 UPSERT 目标日期那一行。
 
     Args:
         session_factory: 异步数据库会话工厂
@@ -1133,133 +1129,22 @@ async def compute_incremental_generic(
         target_table: 目标技术指标表模型（TechnicalDaily/IndexTechnicalDaily/ConceptTechnicalDaily）
         target_date: 目标交易日，None 表示自动检测最新交易日
         progress_callback: 可选的进度回调函数
+        use_state: 是否使用递推状态续算
 
     Returns:
         汇总字典：{"trade_date": "YYYY-MM-DD", "total": N, "success": M, "failed": F}
     """
-    start_time = time.time()
-
-    # 1. 确定目标交易日
-    if target_date is None:
-        async with session_factory() as session:
-            result = await session.execute(
-                select(source_table.trade_date)
-                .order_by(source_table.trade_date.desc())
-                .limit(1)
-            )
-            row = result.scalar_one_or_none()
-            if row is None:
-                logger.warning("%s 表无数据，无法确定最新交易日", source_table.__tablename__)
-                return {"trade_date": None, "total": 0, "success": 0, "failed": 0}
-            target_date = row
+    if use_state:
+        from app.data.indicator_state import compute_incremental_stateful
 
-    logger.info("增量计算目标日期: %s（%s → %s）", target_date,
-                source_table.__tablename__, target_table.__tablename__)
-
-    # 2. 查询在目标日期有日线数据的所有标的
-    async with session_factory() as session:
-        stmt = (
-            select(source_table.ts_code)
-            .where(source_table.trade_date == target_date)
-            .distinct()
+        return await compute_incremental_stateful(
+            session_factory, source_table, target_table,
+            target_date=target_date, progress_callback=progress_callback,
         )
-        result = await session.execute(stmt)
-        target_codes = [row[0] for row in result.all()]
-
-    total = len(target_codes)
-    success = 0
-    failed = 0
-    batch_rows: list[dict] = []
-    batch_count = 0
-
-    logger.info("目标日期 %s 共 %d 个标的需要计算", target_date, total)
-
-    for i, ts_code in enumerate(target_codes):
-        try:
-            # 加载历史数据（截止到目标日期）
-            async with session_factory() as session:
-                stmt = (
-                    select(source_table)
-                    .where(
-                        source_table.ts_code == ts_code,
-                        source_table.trade_date <= target_date,
-                    )
-                    .order_by(source_table.trade_date.desc())
-                    .limit(LOOKBACK_DAYS)
-                )
-                result = await session.execute(stmt)
-                rows = result.scalars().all()
-
-            if not rows:
-                continue
-
-            # 转换为 DataFrame（注意：查询是 DESC 排序，需要反转）
-            records = [{
-                "trade_date": r.trade_date,
-                "open": float(r.open) if r.open else 0.0,
-                "high": float(r.high) if r.high else 0.0,
-                "low": float(r.low) if r.low else 0.0,
-                "close": float(r.close) if r.close else 0.0,
-                "vol": float(r.vol) if r.vol else 0.0,
-            } for r in reversed(rows)]
-            df = pd.DataFrame(records)
-
-            # 计算指标
-            df_with_indicators = compute_indicators_generic(df)
-
-            # 仅取目标日期那一行
-            target_row = df_with_indicators[
-                df_with_indicators["trade_date"] == target_date
-            ]
-            if not target_row.empty:
-                batch_rows.append(
-                    _build_indicator_row(ts_code, target_date, target_row.iloc[0])
-                )
-
-            success += 1
-
-        except Exception as e:
-            logger.error("增量计算标的 %s 指标失败: %s", ts_code, e)
-            failed += 1
-
-        batch_count += 1
 
-        # 每 BATCH_COMMIT_SIZE 个标的提交一次
-        if batch_count >= BATCH_COMMIT_SIZE and batch_rows:
-            async with session_factory() as session:
-                await _upsert_technical_rows_generic(session, batch_rows, target_table)
-                await session.commit()
-            batch_rows = []
-            batch_count = 0
-
-        # 进度回调
-        if progress_callback and (i + 1) % 500 == 0:
-            progress_callback(i + 1, total)
-
-    # 提交剩余数据
-    if batch_rows:
-        async with session_factory() as session:
-            await _upsert_technical_rows_generic(session, batch_rows, target_table)
-            await session.commit()
+    from app.data.indicator_panel import compute_incremental_panel
 
-    elapsed = round(time.time() - start_time, 2)
-    summary = {
-        "trade_date": str(target_date),
-        "total": total,
-        "success": success,
-        "failed": failed,
-        "elapsed_seconds": elapsed,
-    }
-
-    # 记录总体汇总日志
-    avg_time = elapsed / total if total > 0 else 0
-    logger.info(
-        "[技术指标] 增量计算完成（%s → %s）：日期 %s，成功 %d 个，失败 %d 个，总耗时 %.1fs，平均 %.3fs/个",
-        source_table.__tablename__, target_table.__tablename__, target_date, success, failed, elapsed, avg_time,
+    return await compute_incremental_panel(
+        session_factory, source_table, target_table,
+        target_date=target_date, progress_callback=progress_callback,
     )
-
-    # 检测慢速计算（总耗时 >10 分钟）
-    if elapsed > 600:
-        logger.warning("[技术指标] 慢速计算：增量计算耗时 %.1fs (%.1f分钟)", elapsed, elapsed / 60)
-
-    return summary
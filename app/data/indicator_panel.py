@@ -0,0 +1,660 @@
+"""截面向量化技术指标引擎（date × stock 面板）。
+
+与 indicator.py 中逐标的计算不同，本模块一次性加载全市场回看窗口，
+按字段构建 (bar, 标的) 二维矩阵，在 numpy 中按列同时计算所有标的的指标。
+
+面板按「标的自身的 K 线序号」对齐而非日历对齐：每一列是该标的截至目标日的
+最近 N 根 K 线，右对齐到矩阵底部，历史不足的标的在顶部以 NaN 填充。
+因此每列的计算序列与逐标的调用 compute_indicators_generic() 完全一致，
+停牌缺口不会引入额外的 NaN。
+
+用于盘后增量更新：一次 SQL 读取 + 一次矩阵计算 替代约 5000 次逐股往返。
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date
+from typing import Type
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase
+
+from app.data.indicator import (
+    INDICATOR_COLUMNS,
+    LOOKBACK_DAYS,
+    _build_indicator_row,
+    _upsert_technical_rows_generic,
+)
+
+logger = logging.getLogger(__name__)
+
+# 面板字段（与 compute_indicators_generic 的输入列一致）
+PANEL_FIELDS = ("open", "high", "low", "close", "vol")
+
+
+@dataclass
+class PricePanel:
+    """全市场行情面板。
+
+    所有矩阵形状均为 (depth, n_codes)，第 j 列对应 codes[j]，
+    最后一行为各标的最新一根 K 线，顶部不足部分为 NaN / NaT。
+    """
+
+    codes: list[str]
+    trade_dates: np.ndarray  # datetime64[D]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    vol: np.ndarray
+
+    @property
+    def depth(self) -> int:
+        return self.close.shape[0]
+
+    @property
+    def valid(self) -> np.ndarray:
+        """有真实 K 线的位置掩码。"""
+        return ~np.isnat(self.trade_dates)
+
+
+def build_price_panel(df: pd.DataFrame) -> PricePanel:
+    """将长表行情数据转换为右对齐的 date × stock 面板。
+
+    Args:
+        df: 包含 ts_code, trade_date, open, high, low, close, vol 列的长表，
+            顺序不限
+
+    Returns:
+        PricePanel，列按 ts_code 字典序排列
+    """
+    if df.empty:
+        empty = np.empty((0, 0))
+        return PricePanel(
+            codes=[], trade_dates=np.empty((0, 0), dtype="datetime64[D]"),
+            open=empty, high=empty, low=empty, close=empty, vol=empty,
+        )
+
+    codes, code_idx = np.unique(df["ts_code"].to_numpy(dtype=object), return_inverse=True)
+    dates = pd.to_datetime(df["trade_date"]).to_numpy(dtype="datetime64[D]")
+
+    # 按 (标的, 日期) 排序，计算每行在所属标的内的序号
+    order = np.lexsort((dates, code_idx))
+    code_idx = code_idx[order]
+    dates = dates[order]
+    counts = np.bincount(code_idx, minlength=len(codes))
+    depth = int(counts.max())
+    group_start = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    pos_in_group = np.arange(len(order)) - group_start[code_idx]
+    # 右对齐：每个标的的最后一根 K 线落在 depth - 1 行
+    row_idx = depth - counts[code_idx] + pos_in_group
+
+    trade_dates = np.full((depth, len(codes)), np.datetime64("NaT", "D"))
+    trade_dates[row_idx, code_idx] = dates
+
+    matrices: dict[str, np.ndarray] = {}
+    for field in PANEL_FIELDS:
+        # 与逐股路径一致：NULL / 0 均视为 0.0
+        values = pd.to_numeric(df[field], errors="coerce").astype(float).fillna(0.0).to_numpy()
+        mat = np.full((depth, len(codes)), np.nan)
+        mat[row_idx, code_idx] = values[order]
+        matrices[field] = mat
+
+    return PricePanel(codes=codes.tolist(), trade_dates=trade_dates, **matrices)
+
+
+# ============================================================
+# 列向量化指标原语（axis=0 为时间轴）
+# ============================================================
+
+
+def _rolling(x: np.ndarray, window: int, reducer: Callable, tail: int) -> np.ndarray:
+    """对最后 tail 行计算定长滚动窗口统计量，窗口含 NaN 时结果为 NaN。"""
+    out = np.full((tail, x.shape[1]), np.nan)
+    src = x[max(x.shape[0] - tail - window + 1, 0):]
+    if src.shape[0] >= window:
+        res = reducer(sliding_window_view(src, window, axis=0), axis=-1)
+        out[tail - res.shape[0]:] = res
+    return out
+
+
+def _ewm(
+    x: np.ndarray,
+    com: float,
+    min_periods: int = 0,
+    init: tuple[np.ndarray, np.ndarray] | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """按列计算 adjust=False 的指数加权均值。
+
+    逐行递推与 pandas ewm(adjust=False) 的实现保持同样的运算顺序，
+    从每列第一个有效值开始，观测数不足 min_periods 的位置为 NaN。
+
+    Args:
+        x: 输入矩阵
+        com: 质心参数，alpha = 1 / (1 + com)
+        min_periods: 最少观测数
+        init: 可选的初始状态 (weighted, nobs)，用于从已保存状态续算
+
+    Returns:
+        (输出矩阵, 最终 weighted, 最终 nobs)
+    """
+    alpha = 1.0 / (1.0 + com)
+    old_wt = 1.0 - alpha
+    denom = old_wt + alpha
+    out = np.empty_like(x)
+    if init is None:
+        weighted = np.full(x.shape[1], np.nan)
+        nobs = np.zeros(x.shape[1], dtype=np.int64)
+    else:
+        weighted, nobs = init[0].copy(), init[1].copy()
+    for t in range(x.shape[0]):
+        cur = x[t]
+        observed = ~np.isnan(cur)
+        nobs += observed
+        started = ~np.isnan(weighted)
+        weighted = np.where(
+            started & observed & (weighted != cur),
+            (old_wt * weighted + alpha * cur) / denom,
+            np.where(started, weighted, cur),
+        )
+        out[t] = np.where(nobs >= max(min_periods, 1), weighted, np.nan)
+    return out, weighted, nobs
+
+
+def _kdj_recursive(
+    rsv: np.ndarray,
+    init: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """按列递推 KDJ 的 K、D 值（初始值 50）。
+
+    Returns:
+        (k 矩阵, d 矩阵, 最终 k 状态, 最终 d 状态, 是否已起算)
+    """
+    k_out = np.full_like(rsv, np.nan)
+    d_out = np.full_like(rsv, np.nan)
+    if init is None:
+        k_state = np.full(rsv.shape[1], 50.0)
+        d_state = np.full(rsv.shape[1], 50.0)
+        started = np.zeros(rsv.shape[1], dtype=bool)
+    else:
+        k_state, d_state, started = (a.copy() for a in init)
+    for t in range(rsv.shape[0]):
+        cur = rsv[t]
+        observed = ~np.isnan(cur)
+        k = k_state * 2 / 3 + cur / 3
+        d = d_state * 2 / 3 + k / 3
+        k_out[t] = np.where(observed, k, np.nan)
+        d_out[t] = np.where(observed, d, np.nan)
+        # 起算后出现缺失值，逐标的路径的后续递推将全部为 NaN
+        k_state = np.where(observed, k, np.where(started, np.nan, k_state))
+        d_state = np.where(observed, d, np.where(started, np.nan, d_state))
+        started |= observed
+    return k_out, d_out, k_state, d_state, started
+
+
+def _shift(x: np.ndarray) -> np.ndarray:
+    """沿时间轴下移一行，首行填充 NaN。"""
+    out = np.full_like(x, np.nan)
+    out[1:] = x[:-1]
+    return out
+
+
+def _mad(windows: np.ndarray, axis: int = -1) -> np.ndarray:
+    """滚动窗口平均绝对偏差。"""
+    mean = windows.mean(axis=axis, keepdims=True)
+    return np.abs(windows - mean).mean(axis=axis)
+
+
+# ============================================================
+# 递推状态（支持逐日 O(1) 续算）
+# ============================================================
+
+# 递推类指标的内部状态字段（与 indicator_state 表列对应）
+STATE_COLUMNS = (
+    "ema12", "ema26", "macd_dea",
+    "kdj_k", "kdj_d",
+    "rsi6_gain", "rsi6_loss", "rsi12_gain", "rsi12_loss", "rsi24_gain", "rsi24_loss",
+    "atr14", "obv",
+)
+
+# 窗口类指标续算所需保留的尾部 K 线数（含最新一根）：
+# close 供 MA250/BOLL/CCI，high 供 HIGH_60/唐奇安/KDJ/WR，low 供唐奇安/KDJ/WR，vol 供 VOL_MA10
+STATE_WINDOWS = {"close": 250, "high": 60, "low": 20, "vol": 10}
+
+# KDJ 的 RSV 从第 9 根 K 线起有效
+_KDJ_PERIOD = 9
+
+
+@dataclass
+class PanelState:
+    """一组标的截至某根 K 线的指标递推状态。
+
+    values 中各数组形状为 (n_codes,)；windows 中各矩阵形状为
+    (STATE_WINDOWS[field], n_codes)，右对齐，历史不足部分为 NaN。
+    """
+
+    codes: list[str]
+    trade_dates: np.ndarray  # datetime64[D]
+    bar_count: np.ndarray  # int64，已处理的 K 线数
+    values: dict[str, np.ndarray]
+    windows: dict[str, np.ndarray]
+    adj_factor: np.ndarray  # float64，无复权因子的表为 NaN
+
+
+def compute_indicators_panel(
+    panel: PricePanel,
+    tail: int | None = None,
+) -> dict[str, np.ndarray]:
+    """对面板中所有标的按列计算全部技术指标。
+
+    计算口径与 compute_indicators_generic() 逐项一致。
+    递推类指标（EMA/MACD/KDJ/RSI/ATR/OBV）需遍历完整面板，
+    滚动窗口类指标仅对输出的最后 tail 行计算。
+
+    Args:
+        panel: 行情面板
+        tail: 仅返回最后 tail 行（增量更新传 1），None 表示全部行
+
+    Returns:
+        {指标列名: 形状为 (tail, n_codes) 的 float64 矩阵}
+    """
+    out, _ = _compute_panel(panel, tail)
+    return out
+
+
+def seed_indicator_state(
+    panel: PricePanel,
+    adj_factor: np.ndarray | None = None,
+) -> tuple[dict[str, np.ndarray], PanelState]:
+    """从完整历史面板计算最后一行指标，并导出递推状态。
+
+    Args:
+        panel: 各标的自上市以来的完整行情面板
+        adj_factor: 各标的最后一根 K 线的复权因子，形状 (n_codes,)
+
+    Returns:
+        (最后一行指标 {列名: (1, n_codes)}, PanelState)
+    """
+    out, final = _compute_panel(panel, 1)
+    bar_count = panel.valid.sum(axis=0).astype(np.int64)
+    return out, _build_state(panel, final, bar_count, adj_factor)
+
+
+def advance_indicator_state(
+    state: PanelState,
+    bars: PricePanel,
+    adj_factor: np.ndarray | None = None,
+) -> tuple[dict[str, np.ndarray], PanelState]:
+    """从已保存状态向前推进一根 K 线，无需读取历史行情。
+
+    Args:
+        state: 上一根 K 线的递推状态
+        bars: 新 K 线面板（depth=1），列顺序与 state.codes 一致
+        adj_factor: 新 K 线的复权因子，形状 (n_codes,)
+
+    Returns:
+        (新 K 线的指标 {列名: (1, n_codes)}, 推进后的 PanelState)
+    """
+    history = max(STATE_WINDOWS.values())
+    n = len(state.codes)
+
+    def _stack(field: str) -> np.ndarray:
+        mat = np.full((history + 1, n), np.nan)
+        window = state.windows.get(field)
+        if window is not None:
+            mat[history - window.shape[0]:history] = window
+        mat[history] = getattr(bars, field)[-1]
+        return mat
+
+    trade_dates = np.full((history + 1, n), np.datetime64("NaT", "D"))
+    trade_dates[history] = bars.trade_dates[-1]
+    panel = PricePanel(
+        codes=state.codes,
+        trade_dates=trade_dates,
+        open=np.full((history + 1, n), np.nan),
+        high=_stack("high"),
+        low=_stack("low"),
+        close=_stack("close"),
+        vol=_stack("vol"),
+    )
+    out, final = _compute_panel(panel, 1, state=state, start=history)
+    bar_count = state.bar_count + panel.valid[history:].sum(axis=0)
+    return out, _build_state(panel, final, bar_count, adj_factor)
+
+
+def _build_state(
+    panel: PricePanel,
+    final: dict[str, np.ndarray],
+    bar_count: np.ndarray,
+    adj_factor: np.ndarray | None,
+) -> PanelState:
+    """由计算结束时的递推值和面板尾部窗口构建 PanelState。"""
+    n = len(panel.codes)
+    windows: dict[str, np.ndarray] = {}
+    for field, size in STATE_WINDOWS.items():
+        mat = np.full((size, n), np.nan)
+        src = getattr(panel, field)[-size:]
+        mat[size - src.shape[0]:] = src
+        windows[field] = mat
+    return PanelState(
+        codes=list(panel.codes),
+        trade_dates=panel.trade_dates[-1].copy() if panel.depth else np.empty(0, "datetime64[D]"),
+        bar_count=np.asarray(bar_count, dtype=np.int64),
+        values={col: final[col] for col in STATE_COLUMNS},
+        windows=windows,
+        adj_factor=(
+            np.full(n, np.nan) if adj_factor is None
+            else np.asarray(adj_factor, dtype=float)
+        ),
+    )
+
+
+def _compute_panel(
+    panel: PricePanel,
+    tail: int | None,
+    state: PanelState | None = None,
+    start: int = 0,
+) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray]]:
+    """面板指标计算核心。
+
+    state 为空时递推从面板首行开始；否则面板前 start 行为已处理的历史窗口，
+    递推从 start 行起、以 state 中保存的值为初始状态继续。
+
+    Returns:
+        (指标输出 {列名: (tail, n_codes)}, 递推结束时的状态值 {STATE_COLUMNS: (n_codes,)})
+    """
+    depth = panel.depth
+    rec_rows = depth - start
+    tail = rec_rows if tail is None else min(tail, rec_rows)
+    close, high, low, vol = panel.close, panel.high, panel.low, panel.vol
+    out: dict[str, np.ndarray] = {}
+    final: dict[str, np.ndarray] = {}
+
+    def _tail(x: np.ndarray) -> np.ndarray:
+        return x[x.shape[0] - tail:]
+
+    def _init(col: str, nobs: np.ndarray) -> tuple[np.ndarray, np.ndarray] | None:
+        if state is None:
+            return None
+        return state.values[col].astype(float), nobs
+
+    bar_count = None if state is None else state.bar_count.astype(np.int64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # --- 均线 ---
+        for period in (5, 10, 20, 60, 120, 250):
+            out[f"ma{period}"] = _rolling(close, period, np.mean, tail)
+
+        # --- MACD ---
+        rec_close = close[start:]
+        ema12, final["ema12"], _ = _ewm(rec_close, com=(12 - 1) / 2.0, init=_init("ema12", bar_count))
+        ema26, final["ema26"], _ = _ewm(rec_close, com=(26 - 1) / 2.0, init=_init("ema26", bar_count))
+        dif = ema12 - ema26
+        dea, final["macd_dea"], _ = _ewm(dif, com=(9 - 1) / 2.0, init=_init("macd_dea", bar_count))
+        out["macd_dif"] = _tail(dif)
+        out["macd_dea"] = _tail(dea)
+        out["macd_hist"] = _tail(2.0 * (dif - dea))
+
+        # --- KDJ（递推需要从 start 行起的全部 RSV） ---
+        lowest_low = _rolling(low, _KDJ_PERIOD, np.min, rec_rows)
+        highest_high = _rolling(high, _KDJ_PERIOD, np.max, rec_rows)
+        price_range = highest_high - lowest_low
+        rsv = np.where(price_range == 0, 50.0, (rec_close - lowest_low) / price_range * 100.0)
+        kdj_init = None
+        if state is not None:
+            kdj_init = (
+                state.values["kdj_k"].astype(float),
+                state.values["kdj_d"].astype(float),
+                bar_count >= _KDJ_PERIOD,
+            )
+            # 尚未起算的标的保持初始值 50
+            kdj_init = (
+                np.where(kdj_init[2], kdj_init[0], 50.0),
+                np.where(kdj_init[2], kdj_init[1], 50.0),
+                kdj_init[2],
+            )
+        kdj_k, kdj_d, final["kdj_k"], final["kdj_d"], _ = _kdj_recursive(rsv, kdj_init)
+        out["kdj_k"] = _tail(kdj_k)
+        out["kdj_d"] = _tail(kdj_d)
+        out["kdj_j"] = _tail(3.0 * kdj_k - 2.0 * kdj_d)
+
+        # --- RSI（Wilder 平滑，首根 K 线无涨跌幅） ---
+        delta = (close - _shift(close))[start:]
+        gain = np.maximum(delta, 0.0)
+        loss = np.maximum(-delta, 0.0)
+        diff_count = None if bar_count is None else np.maximum(bar_count - 1, 0)
+        for period in (6, 12, 24):
+            avg_gain, final[f"rsi{period}_gain"], _ = _ewm(
+                gain, com=period - 1, min_periods=period,
+                init=_init(f"rsi{period}_gain", diff_count),
+            )
+            avg_loss, final[f"rsi{period}_loss"], _ = _ewm(
+                loss, com=period - 1, min_periods=period,
+                init=_init(f"rsi{period}_loss", diff_count),
+            )
+            avg_gain, avg_loss = _tail(avg_gain), _tail(avg_loss)
+            rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+            rsi = np.where(avg_loss != 0, rsi, 100.0)
+            rsi = np.where((avg_gain == 0) & (avg_loss == 0), 0.0, rsi)
+            out[f"rsi{period}"] = rsi
+
+        # --- 布林带 ---
+        mid = out["ma20"]
+        std = _rolling(close, 20, np.std, tail)
+        out["boll_upper"] = mid + 2.0 * std
+        out["boll_mid"] = mid
+        out["boll_lower"] = mid - 2.0 * std
+
+        # --- 成交量指标 ---
+        vol_ma5 = _rolling(vol, 5, np.mean, tail)
+        out["vol_ma5"] = vol_ma5
+        out["vol_ma10"] = _rolling(vol, 10, np.mean, tail)
+        out["vol_ratio"] = _tail(vol) / np.where(vol_ma5 == 0, np.nan, vol_ma5)
+
+        # --- ATR ---
+        prev_close = _shift(close)
+        true_range = np.fmax(
+            high - low,
+            np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)),
+        )[start:]
+        atr, final["atr14"], _ = _ewm(
+            true_range, com=(14 - 1) / 2.0, min_periods=14, init=_init("atr14", bar_count),
+        )
+        out["atr14"] = _tail(atr)
+
+        # --- Williams %R ---
+        hh14 = _rolling(high, 14, np.max, tail)
+        ll14 = _rolling(low, 14, np.min, tail)
+        range14 = hh14 - ll14
+        wr = np.where(range14 == 0, -50.0, (hh14 - _tail(close)) / range14 * -100.0)
+        out["wr"] = np.where(np.isnan(hh14), np.nan, wr)
+
+        # --- CCI ---
+        tp = (high + low + close) / 3.0
+        tp_sma = _rolling(tp, 14, np.mean, tail)
+        mad = _rolling(tp, 14, _mad, tail)
+        cci = (_tail(tp) - tp_sma) / (0.015 * mad)
+        out["cci"] = np.where(mad != 0, cci, 0.0)
+
+        # --- BIAS ---
+        ma20_safe = np.where(out["ma20"] == 0, np.nan, out["ma20"])
+        out["bias"] = (_tail(close) - ma20_safe) / ma20_safe * 100.0
+
+        # --- OBV（与逐股路径相同的顺序累加） ---
+        contrib = np.sign(delta) * vol[start:]
+        obv0 = np.zeros(panel.close.shape[1]) if state is None else state.values["obv"].astype(float)
+        obv = np.nancumsum(np.vstack([obv0, contrib]), axis=0)[1:]
+        final["obv"] = obv[-1] if rec_rows else obv0
+        out["obv"] = np.where(_tail(panel.valid), _tail(obv), np.nan)
+
+        # --- 唐奇安通道（不含当日） ---
+        out["donchian_upper"] = _rolling(_shift(high), 20, np.max, tail)
+        out["donchian_lower"] = _rolling(_shift(low), 20, np.min, tail)
+
+        # --- 滚动最高价 ---
+        out["high_20"] = _rolling(high, 20, np.max, tail)
+        out["high_60"] = _rolling(high, 60, np.max, tail)
+
+    return {col: out[col] for col in INDICATOR_COLUMNS}, final
+
+
+# ============================================================
+# 数据加载与增量更新入口
+# ============================================================
+
+
+async def load_price_panel(
+    session_factory: async_sessionmaker[AsyncSession],
+    source_table: Type[DeclarativeBase],
+    target_date: date,
+    lookback: int | None = LOOKBACK_DAYS,
+    codes: list[str] | None = None,
+) -> PricePanel:
+    """一次查询加载一组标的截至目标日的最近 lookback 根 K 线。
+
+    使用 LATERAL 子查询按 (ts_code, trade_date DESC) 索引逐标的取尾部，
+    语义与逐股 ORDER BY trade_date DESC LIMIT lookback 完全一致。
+
+    Args:
+        session_factory: 异步数据库会话工厂
+        source_table: 源数据表模型（StockDaily/IndexDaily/ConceptDaily）
+        target_date: 目标交易日
+        lookback: 每个标的回看 K 线数，None 表示加载全部历史
+        codes: 指定标的列表，None 表示目标日有行情的全部标的
+
+    Returns:
+        PricePanel
+    """
+    table_name = source_table.__tablename__
+    if codes is None:
+        code_source = f"SELECT DISTINCT ts_code FROM {table_name} WHERE trade_date = :target_date"
+    else:
+        code_source = "SELECT unnest(CAST(:codes AS text[])) AS ts_code"
+    limit_clause = "" if lookback is None else "LIMIT :lookback"
+    sql = text(f"""
+        SELECT c.ts_code, s.trade_date, s.open, s.high, s.low, s.close, s.vol
+        FROM ({code_source}) c
+        CROSS JOIN LATERAL (
+            SELECT trade_date, open, high, low, close, vol
+            FROM {table_name} t
+            WHERE t.ts_code = c.ts_code AND t.trade_date <= :target_date
+            ORDER BY t.trade_date DESC
+            {limit_clause}
+        ) s
+    """)
+    params: dict = {"target_date": target_date}
+    if lookback is not None:
+        params["lookback"] = lookback
+    if codes is not None:
+        params["codes"] = list(codes)
+    async with session_factory() as session:
+        result = await session.execute(sql, params)
+        rows = result.all()
+
+    df = pd.DataFrame(rows, columns=["ts_code", "trade_date", *PANEL_FIELDS])
+    return build_price_panel(df)
+
+
+def indicator_rows(
+    codes: list[str],
+    indicators: dict[str, np.ndarray],
+    trade_date: date,
+) -> list[dict]:
+    """将指标矩阵的最后一行转换为 technical 表写入行（NaN → None，越界 → None）。"""
+    return [
+        _build_indicator_row(
+            ts_code, trade_date, {col: indicators[col][-1, j] for col in INDICATOR_COLUMNS}
+        )
+        for j, ts_code in enumerate(codes)
+    ]
+
+
+def panel_rows_for_date(
+    panel: PricePanel,
+    indicators: dict[str, np.ndarray],
+    target_date: date,
+) -> list[dict]:
+    """提取面板最后一行中交易日为 target_date 的标的，构建写入行。"""
+    hit = np.flatnonzero(panel.trade_dates[-1] == np.datetime64(target_date, "D"))
+    return indicator_rows(
+        [panel.codes[j] for j in hit],
+        {col: indicators[col][:, hit] for col in INDICATOR_COLUMNS},
+        target_date,
+    )
+
+
+async def compute_incremental_panel(
+    session_factory: async_sessionmaker[AsyncSession],
+    source_table: Type[DeclarativeBase],
+    target_table: Type[DeclarativeBase],
+    target_date: date | None = None,
+    progress_callback: Callable[[int, int], None] | None = None,
+) -> dict:
+    """面板模式增量计算：一次加载、一次矩阵计算、一次写入。
+
+    Args:
+        session_factory: 异步数据库会话工厂
+        source_table: 源数据表模型（StockDaily/IndexDaily/ConceptDaily）
+        target_table: 目标技术指标表模型
+        target_date: 目标交易日，None 表示自动检测最新交易日
+        progress_callback: 可选的进度回调函数，接收 (processed, total) 参数
+
+    Returns:
+        汇总字典：{"trade_date": "YYYY-MM-DD", "total": N, "success": M, "failed": F,
+        "elapsed_seconds": T}
+    """
+    start_time = time.time()
+
+    if target_date is None:
+        async with session_factory() as session:
+            result = await session.execute(
+                select(source_table.trade_date)
+                .order_by(source_table.trade_date.desc())
+                .limit(1)
+            )
+            target_date = result.scalar_one_or_none()
+            if target_date is None:
+                logger.warning("%s 表无数据，无法确定最新交易日", source_table.__tablename__)
+                return {"trade_date": None, "total": 0, "success": 0, "failed": 0}
+
+    load_start = time.time()
+    panel = await load_price_panel(session_factory, source_table, target_date)
+    load_elapsed = time.time() - load_start
+
+    compute_start = time.time()
+    indicators = compute_indicators_panel(panel, tail=1)
+    rows = panel_rows_for_date(panel, indicators, target_date)
+    compute_elapsed = time.time() - compute_start
+
+    write_start = time.time()
+    if rows:
+        async with session_factory() as session:
+            await _upsert_technical_rows_generic(session, rows, target_table)
+            await session.commit()
+    write_elapsed = time.time() - write_start
+
+    total = len(panel.codes)
+    if progress_callback:
+        progress_callback(total, total)
+
+    elapsed = round(time.time() - start_time, 2)
+    logger.info(
+        "[技术指标] 面板增量计算完成（%s → %s）：日期 %s，%d 个标的，面板 %d×%d，"
+        "加载=%.2fs，计算=%.2fs，写入=%.2fs，总耗时 %.1fs",
+        source_table.__tablename__, target_table.__tablename__, target_date,
+        len(rows), panel.depth, total, load_elapsed, compute_elapsed, write_elapsed, elapsed,
+    )
+
+    return {
+        "trade_date": str(target_date),
+        "total": total,
+        "success": len(rows),
+        "failed": total - len(rows),
+        "elapsed_seconds": elapsed,
+    }
@@ -0,0 +1,226 @@
+"""多进程技术指标全量计算。
+
+asyncio + to_thread 的并发方式下 pandas 计算仍受 GIL 限制，基本只能用满一个核。
+本模块使用进程池执行全量重算：
+1. 主进程按分片（每片 SHARD_SIZE 个标的）读取历史行情
+2. 行情切片交给工作进程计算指标（纯 CPU，不持有数据库连接）
+3. 计算结果以列式 DataFrame 返回主进程，由单一 COPY 写入器写入目标表
+
+读取与写入在主进程串行进行，工作进程同时计算后续分片；
+在途分片数限制为工作进程数的 2 倍以控制内存。
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Type
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase
+
+from app.data.indicator import build_indicator_frame, compute_indicators_generic
+
+logger = logging.getLogger(__name__)
+
+# 每个分片包含的标的数
+SHARD_SIZE = 50
+
+_PRICE_COLUMNS = ["open", "high", "low", "close", "vol"]
+
+
+def _compute_shard(df: pd.DataFrame) -> dict:
+    """工作进程入口：计算一个分片内所有标的的全部历史指标。
+
+    Args:
+        df: 分片行情长表（ts_code, trade_date, open, high, low, close, vol），
+            已按 ts_code, trade_date 排序
+
+    Returns:
+        {"frame": 列式写入帧, "codes": 成功标的数, "failed": [失败标的],
+         "rows": 行数, "seconds": 计算耗时, "pid": 工作进程 PID}
+    """
+    start = time.perf_counter()
+    frames: list[pd.DataFrame] = []
+    failed: list[str] = []
+    for ts_code, g in df.groupby("ts_code", sort=False):
+        try:
+            single = g[["trade_date", *_PRICE_COLUMNS]].reset_index(drop=True)
+            result = compute_indicators_generic(single)
+            frames.append(build_indicator_frame(
+                ts_code, result["trade_date"].to_numpy(), result,
+            ))
+        except Exception:
+            failed.append(ts_code)
+
+    frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return {
+        "frame": frame,
+        "codes": len(frames),
+        "failed": failed,
+        "rows": len(frame),
+        "seconds": time.perf_counter() - start,
+        "pid": os.getpid(),
+    }
+
+
+async def _load_shard(
+    session_factory: async_sessionmaker[AsyncSession],
+    source_table: Type[DeclarativeBase],
+    codes: list[str],
+) -> pd.DataFrame:
+    """加载一个分片的完整历史行情（NULL 价格按 0.0 处理，与逐股路径一致）。"""
+    sql = text(
+        f"SELECT ts_code, trade_date, {', '.join(_PRICE_COLUMNS)} "
+        f"FROM {source_table.__tablename__} "
+        f"WHERE ts_code = ANY(CAST(:codes AS text[])) "
+        f"ORDER BY ts_code, trade_date"
+    )
+    async with session_factory() as session:
+        result = await session.execute(sql, {"codes": codes})
+        rows = result.all()
+    df = pd.DataFrame(rows, columns=["ts_code", "trade_date", *_PRICE_COLUMNS])
+    for col in _PRICE_COLUMNS:
+        df[col] = pd.to_numeric(df[col]).astype(float).fillna(0.0)
+    return df
+
+
+def summarize_workers(results: list[dict]) -> dict[int, dict]:
+    """按工作进程汇总吞吐量。
+
+    Returns:
+        {pid: {"shards", "codes", "rows", "seconds", "codes_per_second", "rows_per_second"}}
+    """
+    stats: dict[int, dict] = {}
+    for r in results:
+        s = stats.setdefault(r["pid"], {"shards": 0, "codes": 0, "rows": 0, "seconds": 0.0})
+        s["shards"] += 1
+        s["codes"] += r["codes"]
+        s["rows"] += r["rows"]
+        s["seconds"] += r["seconds"]
+    for s in stats.values():
+        s["seconds"] = round(s["seconds"], 2)
+        s["codes_per_second"] = round(s["codes"] / s["seconds"], 1) if s["seconds"] > 0 else 0.0
+        s["rows_per_second"] = round(s["rows"] / s["seconds"], 0) if s["seconds"] > 0 else 0.0
+    return stats
+
+
+async def compute_all_parallel(
+    session_factory: async_sessionmaker[AsyncSession],
+    source_table: Type[DeclarativeBase],
+    target_table: Type[DeclarativeBase],
+    codes: list[str],
+    workers: int | None = None,
+    shard_size: int = SHARD_SIZE,
+    progress_callback: Callable[[int, int], None] | None = None,
+) -> dict:
+    """使用进程池全量计算技术指标并通过 COPY 写入目标表。
+
+    Args:
+        session_factory: 异步数据库会话工厂
+        source_table: 源数据表模型（StockDaily/IndexDaily/ConceptDaily）
+        target_table: 目标技术指标表模型
+        codes: 待计算的标的列表
+        workers: 工作进程数，None 表示 CPU 核数
+        shard_size: 每个分片的标的数
+        progress_callback: 可选的进度回调函数，接收 (processed, total) 参数
+
+    Returns:
+        汇总字典：{"total": N, "success": M, "failed": F, "elapsed_seconds": T,
+        "workers": {pid: 吞吐统计}}
+    """
+    from app.config import settings
+    from app.data.columnar_store import DATASETS, invalidate_columnar_range
+    from app.data.indicator import write_technical_frame
+    from app.data.indicator_state import invalidate_indicator_state
+    from app.data.panel_cache import invalidate_panel_cache
+
+    start_time = time.time()
+    workers = workers or os.cpu_count() or 1
+    total = len(codes)
+    shards = [codes[i : i + shard_size] for i in range(0, total, shard_size)]
+    logger.info(
+        "开始多进程全量计算技术指标（%s → %s），共 %d 个标的，%d 个分片，%d 个进程",
+        source_table.__tablename__, target_table.__tablename__, total, len(shards), workers,
+    )
+
+    results: list[dict] = []
+    shard_of: dict[asyncio.Future, list[str]] = {}
+    success = 0
+    failed = 0
+    written = 0
+    write_seconds = 0.0
+
+    async def _drain(futures: set[asyncio.Future]) -> set[asyncio.Future]:
+        """等待至少一个分片完成并写入其结果，返回仍在计算的分片。"""
+        nonlocal success, failed, written, write_seconds
+        done, pending = await asyncio.wait(futures, return_when=asyncio.FIRST_COMPLETED)
+        for fut in done:
+            shard_codes = shard_of.pop(fut)
+            try:
+                r = fut.result()
+            except Exception as e:
+                logger.error("分片计算失败（%d 个标的）: %s", len(shard_codes), e)
+                failed += len(shard_codes)
+                continue
+            for ts_code in r["failed"]:
+                logger.error("计算标的 %s 指标失败", ts_code)
+            write_start = time.perf_counter()
+            written += await write_technical_frame(session_factory, r.pop("frame"), target_table)
+            write_seconds += time.perf_counter() - write_start
+            results.append(r)
+            success += r["codes"]
+            failed += len(r["failed"])
+            if progress_callback:
+                progress_callback(success + failed, total)
+        return pending
+
+    loop = asyncio.get_running_loop()
+    # spawn：工作进程不继承主进程的事件循环和数据库连接池
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        in_flight: set[asyncio.Future] = set()
+        for shard_codes in shards:
+            df = await _load_shard(session_factory, source_table, shard_codes)
+            fut = loop.run_in_executor(pool, _compute_shard, df)
+            shard_of[fut] = shard_codes
+            in_flight.add(fut)
+            if len(in_flight) >= workers * 2:
+                in_flight = await _drain(in_flight)
+        while in_flight:
+            in_flight = await _drain(in_flight)
+
+    await invalidate_indicator_state(session_factory, target_table)
+    if target_table.__tablename__ in DATASETS:
+        data_start = date.fromisoformat(settings.data_start_date)
+        invalidate_columnar_range(data_start, date.today(), datasets=[target_table.__tablename__])
+        invalidate_panel_cache(data_start)
+
+    elapsed = round(time.time() - start_time, 2)
+    worker_stats = summarize_workers(results)
+    for pid, s in sorted(worker_stats.items()):
+        logger.info(
+            "[技术指标] 进程 %d：%d 个分片，%d 个标的，%d 行，计算 %.1fs，%.1f 个/秒，%.0f 行/秒",
+            pid, s["shards"], s["codes"], s["rows"], s["seconds"],
+            s["codes_per_second"], s["rows_per_second"],
+        )
+    logger.info(
+        "[技术指标] 多进程全量计算完成（%s → %s）：成功 %d 个，失败 %d 个，写入 %d 行"
+        "（COPY 耗时 %.1fs），总耗时 %.1fs",
+        source_table.__tablename__, target_table.__tablename__,
+        success, failed, written, write_seconds, elapsed,
+    )
+
+    return {
+        "total": total,
+        "success": success,
+        "failed": failed,
+        "elapsed_seconds": elapsed,
+        "workers": worker_stats,
+    }
@@ -0,0 +1,461 @@
+"""技术指标递推状态存储与逐日续算。
+
+EMA、MACD 信号线、KDJ 的 K/D、RSI 的 Wilder 平滑和 OBV 都是递推指标，
+结果依赖于完整历史。本模块将每个标的的递推内部状态和窗口类指标所需的
+尾部 K 线保存在 indicator_state 表中，盘后增量更新只需读取：
+- 当日行情（每个标的 1 行）
+- 上一交易日保存的状态（每个标的 1 行）
+即可推进一根 K 线，结果与全历史计算一致，且不再依赖回看窗口长度。
+
+每次推进同时保存推进前的状态（prev_state），同一日期重跑（链路失败重试、
+失败标的重试、手工重新同步）时从上一根 K 线的状态重新推进，而不是全历史重算。
+
+以下情况退回全历史重算并重新生成状态：
+- 标的无状态（新股、首次运行、状态被失效）
+- 状态日期与目标日之间存在未处理的 K 线（缺口）
+- 复权因子发生变化（除权除息）
+- 目标日等于状态日期但没有上一根 K 线的状态（该状态由全历史重算生成）
+- 目标日早于状态日期（补算历史日期，此时不覆盖更新的状态）
+"""
+
+import logging
+import time
+from collections.abc import Callable, Mapping
+from datetime import date
+from typing import Type
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase
+
+from app.data.indicator import _upsert_technical_rows_generic
+from app.data.indicator_panel import (
+    PANEL_FIELDS,
+    STATE_COLUMNS,
+    STATE_WINDOWS,
+    PanelState,
+    advance_indicator_state,
+    build_price_panel,
+    indicator_rows,
+    load_price_panel,
+    seed_indicator_state,
+)
+from app.data.query_params import any_of
+from app.models.technical import IndicatorState
+
+logger = logging.getLogger(__name__)
+
+# 全历史重算时每批加载的标的数（控制内存）
+REBUILD_CHUNK_SIZE = 200
+
+
+# ============================================================
+# 状态序列化
+# ============================================================
+
+
+# prev_state 中保存的状态列（不含主键与 prev_state 自身）
+_SNAPSHOT_KEYS = (
+    "trade_date", "adj_factor", "bar_count", *STATE_COLUMNS,
+    *(f"window_{field}" for field in STATE_WINDOWS),
+)
+
+
+def _snapshot(row: Mapping) -> dict:
+    """状态行 → prev_state JSON（日期转 ISO 字符串，复权因子转 float）。"""
+    snap = {k: row[k] for k in _SNAPSHOT_KEYS}
+    snap["trade_date"] = row["trade_date"].isoformat()
+    if snap["adj_factor"] is not None:
+        snap["adj_factor"] = float(snap["adj_factor"])
+    for field in STATE_WINDOWS:
+        snap[f"window_{field}"] = [float(v) for v in snap[f"window_{field}"] or []]
+    return snap
+
+
+def base_state(st: Mapping | None, target_date: date) -> Mapping | None:
+    """推进到 target_date 所依据的状态行。
+
+    状态日期早于目标日时即为该状态；等于目标日（重跑）时为保存的上一根 K 线状态；
+    否则（无状态、补算历史日期、重跑但无上一根状态）返回 None。
+    """
+    if st is None:
+        return None
+    if st["trade_date"] < target_date:
+        return st
+    prev = st.get("prev_state") if st["trade_date"] == target_date else None
+    if not prev:
+        return None
+    prev_date = date.fromisoformat(prev["trade_date"])
+    if prev_date >= target_date:
+        return None
+    return {**prev, "ts_code": st["ts_code"], "trade_date": prev_date}
+
+
+def state_to_rows(
+    state: PanelState,
+    target_table_name: str,
+    prev_rows: Mapping[str, Mapping] | None = None,
+) -> list[dict]:
+    """将 PanelState 转换为 indicator_state 表写入行。
+
+    Args:
+        state: 递推状态
+        target_table_name: 技术指标表名
+        prev_rows: {ts_code: 推进前的状态行}，写入 prev_state；None 表示无上一根状态
+    """
+    trade_dates = state.trade_dates.astype("datetime64[D]").astype(object)
+    rows: list[dict] = []
+    for j, ts_code in enumerate(state.codes):
+        row: dict = {
+            "target_table": target_table_name,
+            "ts_code": ts_code,
+            "trade_date": trade_dates[j],
+            "adj_factor": None if np.isnan(state.adj_factor[j]) else float(state.adj_factor[j]),
+            "bar_count": int(state.bar_count[j]),
+        }
+        for col in STATE_COLUMNS:
+            val = state.values[col][j]
+            row[col] = None if np.isnan(val) else float(val)
+        for field in STATE_WINDOWS:
+            window = state.windows[field][:, j]
+            row[f"window_{field}"] = window[~np.isnan(window)].tolist()
+        prev = prev_rows.get(ts_code) if prev_rows is not None else None
+        row["prev_state"] = _snapshot(prev) if prev is not None else None
+        rows.append(row)
+    return rows
+
+
+def state_from_rows(rows: list[Mapping], codes: list[str]) -> PanelState:
+    """将 indicator_state 表行按 codes 顺序还原为 PanelState。"""
+    by_code = {r["ts_code"]: r for r in rows}
+    n = len(codes)
+    values = {col: np.full(n, np.nan) for col in STATE_COLUMNS}
+    windows = {field: np.full((size, n), np.nan) for field, size in STATE_WINDOWS.items()}
+    trade_dates = np.full(n, np.datetime64("NaT", "D"))
+    bar_count = np.zeros(n, dtype=np.int64)
+    adj_factor = np.full(n, np.nan)
+
+    for j, ts_code in enumerate(codes):
+        r = by_code[ts_code]
+        trade_dates[j] = np.datetime64(r["trade_date"], "D")
+        bar_count[j] = r["bar_count"]
+        if r["adj_factor"] is not None:
+            adj_factor[j] = float(r["adj_factor"])
+        for col in STATE_COLUMNS:
+            if r[col] is not None:
+                values[col][j] = float(r[col])
+        for field, size in STATE_WINDOWS.items():
+            stored = np.asarray(r[f"window_{field}"] or [], dtype=float)[-size:]
+            windows[field][size - stored.shape[0]:, j] = stored
+
+    return PanelState(
+        codes=list(codes),
+        trade_dates=trade_dates,
+        bar_count=bar_count,
+        values=values,
+        windows=windows,
+        adj_factor=adj_factor,
+    )
+
+
+def _adj_changed(old: object, new: object) -> bool:
+    """复权因子是否变化（保留 6 位小数比较，任一侧缺失而另一侧存在视为变化）。"""
+    old_missing = old is None or pd.isna(old)
+    new_missing = new is None or pd.isna(new)
+    if old_missing and new_missing:
+        return False
+    if old_missing or new_missing:
+        return True
+    return round(float(old), 6) != round(float(new), 6)
+
+
+def plan_state_update(
+    codes: list[str],
+    states: Mapping[str, Mapping],
+    bar_adj: Mapping[str, object],
+    gap_codes: set[str],
+    target_date: date,
+) -> tuple[list[str], list[str]]:
+    """划分可逐日推进的标的与需要全历史重算的标的。
+
+    可推进的标的以 base_state 为起点：状态日期早于目标日时为当前状态，
+    同一日期重跑时为保存的上一根 K 线状态。
+
+    Args:
+        codes: 目标日有行情的标的
+        states: {ts_code: 状态行}
+        bar_adj: {ts_code: 目标日复权因子}
+        gap_codes: 起点状态日期与目标日之间存在未处理 K 线的标的
+        target_date: 目标交易日
+
+    Returns:
+        (advance_codes, rebuild_codes)
+    """
+    advance: list[str] = []
+    rebuild: list[str] = []
+    for ts_code in codes:
+        base = base_state(states.get(ts_code), target_date)
+        if (
+            base is None
+            or ts_code in gap_codes
+            or _adj_changed(base["adj_factor"], bar_adj.get(ts_code))
+        ):
+            rebuild.append(ts_code)
+        else:
+            advance.append(ts_code)
+    return advance, rebuild
+
+
+# ============================================================
+# 数据库读写
+# ============================================================
+
+
+async def save_indicator_state(session: AsyncSession, rows: list[dict]) -> int:
+    """UPSERT 状态行到 indicator_state 表，自动分片适配 asyncpg 参数上限。"""
+    if not rows:
+        return 0
+    table = IndicatorState.__table__
+    pk_cols = {"target_table", "ts_code"}
+    update_cols = [c.key for c in table.columns if c.key not in pk_cols | {"updated_at"}]
+    chunk_size = 32767 // len(rows[0])
+    for i in range(0, len(rows), chunk_size):
+        stmt = pg_insert(table).values(rows[i : i + chunk_size])
+        set_ = {col: stmt.excluded[col] for col in update_cols}
+        set_["updated_at"] = text("NOW()")
+        stmt = stmt.on_conflict_do_update(index_elements=list(pk_cols), set_=set_)
+        await session.execute(stmt)
+    return len(rows)
+
+
+async def invalidate_indicator_state(
+    session_factory: async_sessionmaker[AsyncSession],
+    target_table: Type[DeclarativeBase],
+    codes: list[str] | None = None,
+) -> int:
+    """删除指定标的（默认全部）的递推状态，下次增量更新将全历史重算。
+
+    Args:
+        session_factory: 异步数据库会话工厂
+        target_table: 技术指标表模型
+        codes: 标的列表，None 表示该表的全部状态
+
+    Returns:
+        删除的行数
+    """
+    stmt = delete(IndicatorState).where(
+        IndicatorState.target_table == target_table.__tablename__
+    )
+    if codes is not None:
+        if not codes:
+            return 0
+        stmt = stmt.where(any_of(IndicatorState.ts_code, codes))
+    async with session_factory() as session:
+        result = await session.execute(stmt)
+        await session.commit()
+    count = result.rowcount or 0
+    logger.info(
+        "[indicator_state] 已失效 %s 的 %d 条递推状态",
+        target_table.__tablename__, count,
+    )
+    return count
+
+
+async def _load_bars(
+    session_factory: async_sessionmaker[AsyncSession],
+    source_table: Type[DeclarativeBase],
+    target_date: date,
+) -> pd.DataFrame:
+    """加载目标日全部标的的当日行情（含复权因子，若源表有该列）。"""
+    table_name = source_table.__tablename__
+    has_adj = "adj_factor" in source_table.__table__.columns
+    adj_col = ", adj_factor" if has_adj else ", NULL AS adj_factor"
+    sql = text(
+        f"SELECT ts_code, trade_date, {', '.join(PANEL_FIELDS)}{adj_col} "
+        f"FROM {table_name} WHERE trade_date = :target_date"
+    )
+    async with session_factory() as session:
+        result = await session.execute(sql, {"target_date": target_date})
+        rows = result.all()
+    return pd.DataFrame(rows, columns=["ts_code", "trade_date", *PANEL_FIELDS, "adj_factor"])
+
+
+async def _load_states(
+    session_factory: async_sessionmaker[AsyncSession],
+    source_table: Type[DeclarativeBase],
+    target_table: Type[DeclarativeBase],
+    target_date: date,
+) -> tuple[dict[str, dict], set[str]]:
+    """加载目标表的全部状态行，并检测起点状态日期与目标日之间的 K 线缺口。
+
+    起点与 base_state 一致：状态日期等于目标日（重跑）时取 prev_state 的日期。
+    """
+    target_name = target_table.__tablename__
+    async with session_factory() as session:
+        result = await session.execute(
+            select(IndicatorState.__table__).where(
+                IndicatorState.target_table == target_name
+            )
+        )
+        states = {r["ts_code"]: dict(r) for r in result.mappings().all()}
+
+        gap_result = await session.execute(
+            text(f"""
+                WITH s AS (
+                    SELECT ts_code,
+                           CASE WHEN trade_date = :target_date
+                                THEN CAST(prev_state->>'trade_date' AS date)
+                                ELSE trade_date END AS base_date
+                    FROM indicator_state
+                    WHERE target_table = :target_table
+                )
+                SELECT s.ts_code FROM s
+                WHERE s.base_date < :target_date
+                  AND EXISTS (
+                      SELECT 1 FROM {source_table.__tablename__} d
+                      WHERE d.ts_code = s.ts_code
+                        AND d.trade_date > s.base_date
+                        AND d.trade_date < :target_date
+                  )
+            """),
+            {"target_table": target_name, "target_date": target_date},
+        )
+        gap_codes = {r[0] for r in gap_result.all()}
+    return states, gap_codes
+
+
+# ============================================================
+# 增量更新入口
+# ============================================================
+
+
+async def compute_incremental_stateful(
+    session_factory: async_sessionmaker[AsyncSession],
+    source_table: Type[DeclarativeBase],
+    target_table: Type[DeclarativeBase],
+    target_date: date | None = None,
+    progress_callback: Callable[[int, int], None] | None = None,
+) -> dict:
+    """基于递推状态的增量计算：多数标的只读当日行情 + 状态即可推进一根 K 线。
+
+    Args:
+        session_factory: 异步数据库会话工厂
+        source_table: 源数据表模型（StockDaily/IndexDaily/ConceptDaily）
+        target_table: 目标技术指标表模型
+        target_date: 目标交易日，None 表示自动检测最新交易日
+        progress_callback: 可选的进度回调函数，接收 (processed, total) 参数
+
+    Returns:
+        汇总字典：{"trade_date": "YYYY-MM-DD", "total": N, "success": M, "failed": F,
+        "advanced": A, "rebuilt": R, "elapsed_seconds": T}
+    """
+    start_time = time.time()
+    target_name = target_table.__tablename__
+
+    if target_date is None:
+        async with session_factory() as session:
+            result = await session.execute(
+                select(source_table.trade_date)
+                .order_by(source_table.trade_date.desc())
+                .limit(1)
+            )
+            target_date = result.scalar_one_or_none()
+            if target_date is None:
+                logger.warning("%s 表无数据，无法确定最新交易日", source_table.__tablename__)
+                return {"trade_date": None, "total": 0, "success": 0, "failed": 0}
+
+    bars_df = await _load_bars(session_factory, source_table, target_date)
+    states, gap_codes = await _load_states(session_factory, source_table, target_table, target_date)
+
+    codes = sorted(bars_df["ts_code"].unique().tolist())
+    bar_adj = dict(zip(bars_df["ts_code"], bars_df["adj_factor"]))
+    advance_codes, rebuild_codes = plan_state_update(
+        codes, states, bar_adj, gap_codes, target_date,
+    )
+    total = len(codes)
+    success = 0
+    failed = 0
+
+    logger.info(
+        "[indicator_state] %s → %s：日期 %s，共 %d 个标的，逐日推进 %d 个，全历史重算 %d 个（缺口 %d）",
+        source_table.__tablename__, target_name, target_date,
+        total, len(advance_codes), len(rebuild_codes), len(gap_codes),
+    )
+
+    # 1. 逐日推进：仅使用当日行情 + 已保存状态
+    if advance_codes:
+        try:
+            bars = build_price_panel(bars_df[bars_df["ts_code"].isin(advance_codes)])
+            base = {c: base_state(states[c], target_date) for c in bars.codes}
+            state = state_from_rows(list(base.values()), bars.codes)
+            adj = np.array([_to_float(bar_adj[c]) for c in bars.codes])
+            indicators, new_state = advance_indicator_state(state, bars, adj)
+            async with session_factory() as session:
+                await _upsert_technical_rows_generic(
+                    session, indicator_rows(bars.codes, indicators, target_date), target_table,
+                )
+                await save_indicator_state(session, state_to_rows(new_state, target_name, base))
+                await session.commit()
+            success += len(advance_codes)
+        except Exception as e:
+            logger.error("[indicator_state] 逐日推进失败，改为全历史重算: %s", e)
+            rebuild_codes = advance_codes + rebuild_codes
+
+    if progress_callback:
+        progress_callback(success, total)
+
+    # 2. 全历史重算：分批加载完整历史，重新生成状态
+    for i in range(0, len(rebuild_codes), REBUILD_CHUNK_SIZE):
+        chunk = rebuild_codes[i : i + REBUILD_CHUNK_SIZE]
+        try:
+            panel = await load_price_panel(
+                session_factory, source_table, target_date, lookback=None, codes=chunk,
+            )
+            adj = np.array([_to_float(bar_adj.get(c)) for c in panel.codes])
+            indicators, new_state = seed_indicator_state(panel, adj)
+            # 目标日早于已有状态（补算历史日期）时，保留更新的状态
+            state_rows = [
+                r for r in state_to_rows(new_state, target_name)
+                if r["ts_code"] not in states
+                or states[r["ts_code"]]["trade_date"] <= target_date
+            ]
+            async with session_factory() as session:
+                await _upsert_technical_rows_generic(
+                    session, indicator_rows(panel.codes, indicators, target_date), target_table,
+                )
+                await save_indicator_state(session, state_rows)
+                await session.commit()
+            success += len(panel.codes)
+            failed += len(chunk) - len(panel.codes)
+        except Exception as e:
+            logger.error("[indicator_state] 全历史重算失败（%d 个标的）: %s", len(chunk), e)
+            failed += len(chunk)
+
+        if progress_callback:
+            progress_callback(success + failed, total)
+
+    elapsed = round(time.time() - start_time, 2)
+    logger.info(
+        "[技术指标] 状态续算完成（%s → %s）：日期 %s，成功 %d 个，失败 %d 个，"
+        "推进 %d 个，重算 %d 个，总耗时 %.1fs",
+        source_table.__tablename__, target_name, target_date,
+        success, failed, len(advance_codes), len(rebuild_codes), elapsed,
+    )
+
+    return {
+        "trade_date": str(target_date),
+        "total": total,
+        "success": success,
+        "failed": failed,
+        "advanced": len(advance_codes),
+        "rebuilt": len(rebuild_codes),
+        "elapsed_seconds": elapsed,
+    }
+
+
+def _to_float(val: object) -> float:
+    """复权因子转 float，缺失为 NaN。"""
+    return np.nan if val is None or pd.isna(val) else float(val)
@@ -3,13 +3,16 @@ import traceback
 from datetime import date, timedelta
 
 import pandas as pd
-from sqlalchemy import func, select, text, update
+from sqlalchemy import Table, func, select, text, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.data.client_base import DataSourceClient
 from app.data.etl import (
+    DAILY_SELECT_SQL,
     batch_insert,
+    compare_daily_rows,
+    etl_daily_sql,
     transform_tushare_balancesheet,
     transform_tushare_cashflow,
     transform_tushare_daily,
@@ -28,6 +31,8 @@ from app.data.etl import (
     transform_tushare_top_list,
     transform_tushare_trade_cal,
 )
+from app.data.fetch_planner import plan_fetch
+from app.data.query_params import any_array, any_of
 from app.exceptions import DataSyncError
 from app.models.finance import BalanceSheet, CashFlowStatement, FinanceIndicator, IncomeStatement
 from app.models.flow import DragonTiger, MoneyFlow
@@ -330,39 +335,41 @@ class DataManager:
         Returns:
             {"daily": int, "adj_factor": int, "daily_basic": int, "stk_limit": int}
         """
+        frames = await self.fetch_raw_daily(trade_date)
+        return await self.write_raw_daily(trade_date, frames)
+
+    async def fetch_raw_daily(self, trade_date: date) -> dict[str, pd.DataFrame]:
+        """拉取阶段：并发获取某日 daily / adj_factor / daily_basic / stk_limit（保留 DataFrame）。
+
+        与 write_raw_daily 拆开，供多日期补数流水线分别调度网络与数据库。
+        """
+        import asyncio
+
         from app.data.tushare import TushareClient
 
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
+        apis = ("daily", "adj_factor", "daily_basic", "stk_limit")
+        frames = await asyncio.gather(*(client.fetch_raw_frame(api, trade_date=td_str) for api in apis))
+        return dict(zip(apis, frames))
 
-        # 并发获取四个接口的数据
-        import asyncio
-        raw_daily, raw_adj, raw_basic, raw_stk_limit = await asyncio.gather(
-            client.fetch_raw_daily(td_str),
-            client.fetch_raw_adj_factor(td_str),
-            client.fetch_raw_daily_basic(td_str),
-            client.fetch_raw_stk_limit(td_str),
-        )
-
-        counts = {"daily": 0, "adj_factor": 0, "daily_basic": 0, "stk_limit": 0}
+    async def write_raw_daily(self, trade_date: date, frames: dict[str, pd.DataFrame]) -> dict:
+        """写入阶段：将 fetch_raw_daily 的结果列式写入 raw 表。
 
+        Returns:
+            {"daily": int, "adj_factor": int, "daily_basic": int, "stk_limit": int}
+        """
+        tables = {
+            "daily": RawTushareDaily.__table__,
+            "adj_factor": RawTushareAdjFactor.__table__,
+            "daily_basic": RawTushareDailyBasic.__table__,
+            "stk_limit": RawTushareStkLimit.__table__,
+        }
         async with self._session_factory() as session:
-            if raw_daily:
-                counts["daily"] = await self._upsert_raw(
-                    session, RawTushareDaily.__table__, raw_daily
-                )
-            if raw_adj:
-                counts["adj_factor"] = await self._upsert_raw(
-                    session, RawTushareAdjFactor.__table__, raw_adj
-                )
-            if raw_basic:
-                counts["daily_basic"] = await self._upsert_raw(
-                    session, RawTushareDailyBasic.__table__, raw_basic
-                )
-            if raw_stk_limit:
-                counts["stk_limit"] = await self._upsert_raw(
-                    session, RawTushareStkLimit.__table__, raw_stk_limit
-                )
+            counts = {
+                name: await self._upsert_raw_frame(session, table, frames[name])
+                for name, table in tables.items()
+            }
             await session.commit()
 
         logger.info(
@@ -371,21 +378,77 @@ class DataManager:
         )
         return counts
 
-    async def etl_daily(self, trade_date: date) -> dict:
+    async def etl_daily(
+        self,
+        trade_date: date,
+        *,
+        end_date: date | None = None,
+        mode: str | None = None,
+    ) -> dict:
         """从 raw 表 JOIN 清洗写入 stock_daily 业务表。
 
+        支持两种 ETL 方式：
+        - sql：数据库内 INSERT ... SELECT ... ON CONFLICT，一条语句完成 JOIN、
+          单位换算和类型转换，区间按 _ETL_RANGE_DAYS 分段执行（默认）
+        - python：读回 raw 行，经 transform_tushare_daily 清洗后 batch_insert
+
+        SQL 方式失败时自动降级为 Python 方式。
+
         Args:
-            trade_date: 交易日期
+            trade_date: 交易日期（区间模式时为起始日期）
+            end_date: 结束日期（区间模式），None 表示单日模式
+            mode: "sql" / "python"，默认 settings.etl_daily_mode
 
         Returns:
             {"inserted": int}
         """
+        from app.config import settings
+
+        end_date = end_date or trade_date
+        mode = mode or settings.etl_daily_mode
+        if mode == "sql":
+            try:
+                count = 0
+                span_start = trade_date
+                while span_start <= end_date:
+                    span_end = min(end_date, span_start + timedelta(days=self._ETL_RANGE_DAYS - 1))
+                    async with self._session_factory() as session:
+                        count += await etl_daily_sql(
+                            session, span_start.strftime("%Y%m%d"), span_end.strftime("%Y%m%d"),
+                        )
+                    span_start = span_end + timedelta(days=1)
+                logger.debug("[etl_daily] %s~%s: SQL 写入 %d 条", trade_date, end_date, count)
+                return {"inserted": count}
+            except Exception as e:
+                logger.warning("[etl_daily] SQL ETL 失败，降级为 Python ETL: %s", e)
+
+        raw_daily, raw_adj, raw_basic = await self._load_raw_daily(trade_date, end_date)
+
+        # ETL 清洗
+        cleaned = transform_tushare_daily(raw_daily, raw_adj, raw_basic)
+
+        if not cleaned:
+            logger.debug("[etl_daily] %s: 无数据", trade_date)
+            return {"inserted": 0}
+
+        # 写入 stock_daily
+        async with self._session_factory() as session:
+            count = await batch_insert(session, StockDaily.__table__, cleaned)
+
+        logger.debug("[etl_daily] %s: 写入 %d 条", trade_date, count)
+        return {"inserted": count}
+
+    async def _load_raw_daily(
+        self, trade_date: date, end_date: date
+    ) -> tuple[list[dict], list[dict], list[dict]]:
+        """读取区间内 raw daily / adj_factor / daily_basic 原始行。"""
         td_str = trade_date.strftime("%Y%m%d")
+        end_str = end_date.strftime("%Y%m%d")
 
         async with self._session_factory() as session:
             # 从 raw 表读取数据
             daily_result = await session.execute(
-                select(RawTushareDaily).where(RawTushareDaily.trade_date == td_str)
+                select(RawTushareDaily).where(RawTushareDaily.trade_date.between(td_str, end_str))
             )
             raw_daily = [
                 {c.key: getattr(r, c.key) for c in RawTushareDaily.__table__.columns if c.key != "fetched_at"}
@@ -393,7 +456,7 @@ class DataManager:
             ]
 
             adj_result = await session.execute(
-                select(RawTushareAdjFactor).where(RawTushareAdjFactor.trade_date == td_str)
+                select(RawTushareAdjFactor).where(RawTushareAdjFactor.trade_date.between(td_str, end_str))
             )
             raw_adj = [
                 {c.key: getattr(r, c.key) for c in RawTushareAdjFactor.__table__.columns if c.key != "fetched_at"}
@@ -401,31 +464,53 @@ class DataManager:
             ]
 
             basic_result = await session.execute(
-                select(RawTushareDailyBasic).where(RawTushareDailyBasic.trade_date == td_str)
+                select(RawTushareDailyBasic).where(RawTushareDailyBasic.trade_date.between(td_str, end_str))
             )
             raw_basic = [
                 {c.key: getattr(r, c.key) for c in RawTushareDailyBasic.__table__.columns if c.key != "fetched_at"}
                 for r in basic_result.scalars().all()
             ]
+        return raw_daily, raw_adj, raw_basic
 
-        # ETL 清洗
-        cleaned = transform_tushare_daily(raw_daily, raw_adj, raw_basic)
+    async def verify_etl_daily(self, trade_date: date, end_date: date | None = None) -> dict:
+        """逐行比对 SQL ETL 与 Python transform 的结果（只读，不写入）。
 
-        if not cleaned:
-            logger.debug("[etl_daily] %s: 无数据", trade_date)
-            return {"inserted": 0}
+        Args:
+            trade_date: 交易日期（区间模式时为起始日期）
+            end_date: 结束日期，None 表示单日
+
+        Returns:
+            {"sql_rows": int, "python_rows": int, "mismatches": int, "samples": list[dict]}
+        """
+        end_date = end_date or trade_date
+        raw_daily, raw_adj, raw_basic = await self._load_raw_daily(trade_date, end_date)
+        py_rows = transform_tushare_daily(raw_daily, raw_adj, raw_basic)
 
-        # 写入 stock_daily
         async with self._session_factory() as session:
-            count = await batch_insert(session, StockDaily.__table__, cleaned)
+            result = await session.execute(
+                text(DAILY_SELECT_SQL),
+                {"start": trade_date.strftime("%Y%m%d"), "end": end_date.strftime("%Y%m%d")},
+            )
+            sql_rows = [dict(r) for r in result.mappings().all()]
 
-        logger.debug("[etl_daily] %s: 写入 %d 条", trade_date, count)
-        return {"inserted": count}
+        diffs = compare_daily_rows(sql_rows, py_rows, StockDaily.__table__)
+        if diffs:
+            logger.warning(
+                "[verify_etl_daily] %s~%s: %d 处差异，示例 %s",
+                trade_date, end_date, len(diffs), diffs[:3],
+            )
+        return {
+            "sql_rows": len(sql_rows),
+            "python_rows": len(py_rows),
+            "mismatches": len(diffs),
+            "samples": diffs[:20],
+        }
 
     async def sync_daily_by_date(self, dates: list[date]) -> dict:
         """按日期批量同步日线数据：sync_raw_daily → etl_daily → compute_incremental。
 
         支持单日和日期范围，一次 API 调用拉全市场数据，比逐只拉快 100 倍。
+        多日期时拉取与写入经 run_date_pipeline 重叠执行。
 
         Args:
             dates: 交易日期列表
@@ -437,7 +522,8 @@ class DataManager:
                 "raw_daily": int,
                 "etl_daily": int,
                 "indicators": int,
-                "elapsed_seconds": float
+                "elapsed_seconds": float,
+                "stages": dict  # 拉取/写入阶段吞吐与瓶颈
             }
         """
         import time
@@ -450,27 +536,28 @@ class DataManager:
 
         logger.info("[sync_daily_by_date] 开始按日期批量同步，共 %d 个交易日", len(dates))
 
-        # 步骤 1：逐日同步 raw 数据 + ETL
-        for td in dates:
-            try:
-                # 1.1 同步 raw 表
-                raw_result = await self.sync_raw_daily(td)
-                raw_count = raw_result.get("daily", 0)
-                raw_daily_count += raw_count
+        # 步骤 1：raw 数据 + ETL（拉取与写入流水线重叠，任一日期失败即停止拉取并抛出）
+        from app.data.date_pipeline import run_date_pipeline
 
-                # 1.2 ETL 到 stock_daily
-                etl_result = await self.etl_daily(td)
-                etl_count = etl_result.get("inserted", 0)
-                etl_daily_count += etl_count
-                total_rows += etl_count
+        async def _write(td: date, frames: dict) -> tuple[int, int]:
+            raw_result = await self.write_raw_daily(td, frames)
+            etl_result = await self.etl_daily(td)
+            raw_count = raw_result.get("daily", 0)
+            etl_count = etl_result.get("inserted", 0)
+            logger.info("[sync_daily_by_date] %s: raw=%d, etl=%d", td, raw_count, etl_count)
+            return raw_count, etl_count
 
-                logger.info(
-                    "[sync_daily_by_date] %s: raw=%d, etl=%d",
-                    td, raw_count, etl_count,
-                )
-            except Exception as e:
-                logger.warning("[sync_daily_by_date] %s 失败: %s", td, e)
-                raise
+        pipeline = await run_date_pipeline(
+            dates, self.fetch_raw_daily, _write, stop_on_error=True, label="sync_daily_by_date",
+        )
+        for raw_count, etl_count in pipeline["results"].values():
+            raw_daily_count += raw_count
+            etl_daily_count += etl_count
+            total_rows += etl_count
+        if pipeline["errors"]:
+            failed = min(pipeline["errors"])
+            logger.warning("[sync_daily_by_date] %s 失败: %s", failed, pipeline["errors"][failed])
+            raise pipeline["errors"][failed]
 
         # 步骤 2：计算最后一个日期的技术指标
         indicator_count = 0
@@ -540,6 +627,7 @@ class DataManager:
             "etl_daily": etl_daily_count,
             "indicators": indicator_count,
             "elapsed_seconds": elapsed,
+            "stages": pipeline["stages"],
         }
 
     # --- P2 资金流向同步 ---
@@ -613,22 +701,28 @@ class DataManager:
         )
         return counts
 
-    async def etl_moneyflow(self, trade_date: date) -> dict:
+    async def etl_moneyflow(self, trade_date: date, *, end_date: date | None = None) -> dict:
         """从 raw 表读取资金流向和龙虎榜数据，清洗后写入业务表。
 
+        支持两种模式：
+        - 单日模式：只传 trade_date（盘后增量用）
+        - 区间模式：传 trade_date + end_date（补缺/全量同步后按区间一次性清洗）
+
         Args:
-            trade_date: 交易日期
+            trade_date: 交易日期（区间模式时为起始日期）
+            end_date: 结束日期（区间模式），None 表示单日模式
 
         Returns:
             {"money_flow": int, "dragon_tiger": int}
         """
         td_str = trade_date.strftime("%Y%m%d")
+        end_str = (end_date or trade_date).strftime("%Y%m%d")
 
         async with self._session_factory() as session:
             # 读取 raw_tushare_moneyflow
             mf_result = await session.execute(
                 select(RawTushareMoneyflow).where(
-                    RawTushareMoneyflow.trade_date == td_str
+                    RawTushareMoneyflow.trade_date.between(td_str, end_str)
                 )
             )
             raw_mf = [
@@ -639,7 +733,7 @@ class DataManager:
             # 读取 raw_tushare_top_list
             tl_result = await session.execute(
                 select(RawTushareTopList).where(
-                    RawTushareTopList.trade_date == td_str
+                    RawTushareTopList.trade_date.between(td_str, end_str)
                 )
             )
             raw_tl = [
@@ -886,21 +980,27 @@ class DataManager:
 
     # --- P3 指数数据 ETL ---
 
-    async def etl_index(self, trade_date: date) -> dict:
+    async def etl_index(self, trade_date: date, *, end_date: date | None = None) -> dict:
         """从 raw 表清洗指数日线、成分股权重和技术因子写入业务表。
 
+        支持两种模式：
+        - 单日模式：只传 trade_date（盘后增量用）
+        - 区间模式：传 trade_date + end_date（补缺/全量同步后按区间一次性清洗）
+
         Args:
-            trade_date: 交易日期
+            trade_date: 交易日期（区间模式时为起始日期）
+            end_date: 结束日期（区间模式），None 表示单日模式
 
         Returns:
             {"index_daily": int, "index_weight": int, "index_technical_daily": int}
         """
         td_str = trade_date.strftime("%Y%m%d")
+        end_str = (end_date or trade_date).strftime("%Y%m%d")
 
         async with self._session_factory() as session:
             # 读取 raw_tushare_index_daily
             id_result = await session.execute(
-                select(RawTushareIndexDaily).where(RawTushareIndexDaily.trade_date == td_str)
+                select(RawTushareIndexDaily).where(RawTushareIndexDaily.trade_date.between(td_str, end_str))
             )
             raw_id = [
                 {c.key: getattr(r, c.key) for c in RawTushareIndexDaily.__table__.columns if c.key != "fetched_at"}
@@ -909,7 +1009,7 @@ class DataManager:
 
             # 读取 raw_tushare_index_weight
             iw_result = await session.execute(
-                select(RawTushareIndexWeight).where(RawTushareIndexWeight.trade_date == td_str)
+                select(RawTushareIndexWeight).where(RawTushareIndexWeight.trade_date.between(td_str, end_str))
             )
             raw_iw = [
                 {c.key: getattr(r, c.key) for c in RawTushareIndexWeight.__table__.columns if c.key != "fetched_at"}
@@ -918,7 +1018,7 @@ class DataManager:
 
             # 读取 raw_tushare_index_factor_pro
             it_result = await session.execute(
-                select(RawTushareIndexFactorPro).where(RawTushareIndexFactorPro.trade_date == td_str)
+                select(RawTushareIndexFactorPro).where(RawTushareIndexFactorPro.trade_date.between(td_str, end_str))
             )
             raw_it = [
                 {c.key: getattr(r, c.key) for c in RawTushareIndexFactorPro.__table__.columns if c.key != "fetched_at"}
@@ -1045,8 +1145,19 @@ class DataManager:
                 "[_upsert_raw] COPY 协议写入 %s 失败，降级到 INSERT: %s",
                 table.name, e,
             )
+        return await DataManager._insert_raw(session, table, rows, batch_size)
+
+    @staticmethod
+    async def _insert_raw(
+        session: AsyncSession, table, rows: list[dict], batch_size: int = 5000
+    ) -> int:
+        """INSERT ... ON CONFLICT DO UPDATE 写入 raw 表（COPY 失败后的降级路径）。
+
+        rows 须已完成 NaN 清洗、主键去重与列过滤。
+        """
+        if not rows:
+            return 0
 
-        # Fallback: 原有 INSERT ... ON CONFLICT DO UPDATE
         pk_cols = [c.name for c in table.primary_key.columns]
         update_cols = [c.name for c in table.columns if c.name not in pk_cols and c.name != "fetched_at"]
 
@@ -1059,101 +1170,139 @@ class DataManager:
             batch = rows[i : i + batch_size]
             stmt = pg_insert(table).values(batch)
             if update_cols:
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=pk_cols,
-                    set_={col: getattr(stmt.excluded, col) for col in update_cols},
-                )
+                set_ = {col: getattr(stmt.excluded, col) for col in update_cols}
+                if "fetched_at" in table.columns:
+                    # 重新拉取覆盖时刷新 fetched_at（下游据此判断 raw 行是否变更）
+                    set_["fetched_at"] = func.now()
+                stmt = stmt.on_conflict_do_update(index_elements=pk_cols, set_=set_)
             else:
                 stmt = stmt.on_conflict_do_nothing()
             await session.execute(stmt)
             total += len(batch)
         return total
 
+    async def _upsert_raw_frame(
+        self, session: AsyncSession, table, frame: pd.DataFrame
+    ) -> int:
+        """列式 UPSERT 原始数据到 raw 表（DataFrame 直通 COPY，不构建逐行 dict）。
+
+        列投影、主键空值过滤与去重均向量化执行，COPY 记录按列构建，NaN 写为 NULL。
+        COPY 失败时直接降级到 _insert_raw 的 INSERT 路径（不再重试 COPY）。
+        """
+        if frame is None or frame.empty:
+            return 0
+
+        from app.data.copy_writer import copy_insert, project_frame
+
+        frame = project_frame(table, frame)
+        if frame.empty:
+            return 0
+        try:
+            return await copy_insert(table, frame, conflict="update")
+        except Exception as e:
+            logger.warning(
+                "[_upsert_raw_frame] 列式 COPY 写入 %s 失败，降级到 INSERT: %s",
+                table.name, e,
+            )
+        rows = frame.astype(object).where(frame.notna(), None).to_dict("records")
+        return await self._insert_raw(session, table, rows)
+
     # --- Query operations ---
 
-    async def get_daily_bars(
+    async def get_daily_bars_columnar(
         self,
         codes: list[str],
         start_date: date,
         end_date: date,
         adj: str = "qfq",
         fields: list[str] | None = None,
-    ) -> pd.DataFrame:
-        """Query daily bars with optional forward/backward adjustment."""
+        output: str = "numpy",
+    ):
+        """Query daily bars as column arrays, adjusting all codes at once.
+
+        Only the requested columns (plus ts_code/adj_factor when adjusting) are
+        selected; rows are transposed straight into arrays without ORM objects.
+
+        Args:
+            codes: stock codes
+            start_date: first trade date (inclusive)
+            end_date: last trade date (inclusive)
+            adj: "qfq" / "hfq" / anything else for unadjusted (keeps adj_factor)
+            fields: output columns, default BAR_COLUMNS; unknown names are ignored
+            output: "numpy" for {column: np.ndarray}, "arrow" for a pyarrow Table
+
+        Returns:
+            Columns in ``fields`` order, rows sorted by (ts_code, trade_date).
+        """
+        from app.data.daily_bars import (
+            BAR_COLUMNS,
+            apply_adjustment,
+            columns_to_arrow,
+            rows_to_columns,
+        )
+
+        adjusting = adj in ("qfq", "hfq")
+        known = (*BAR_COLUMNS, "adj_factor")
+        if fields:
+            out_cols = [f for f in fields if f in known]
+        else:
+            out_cols = list(BAR_COLUMNS) if adjusting else list(known)
+        query_cols = list(dict.fromkeys(
+            [*out_cols, *(["ts_code", "adj_factor"] if adjusting else [])]
+        ))
+
         async with self._session_factory() as session:
             stmt = (
-                select(StockDaily)
+                select(*(getattr(StockDaily, c) for c in query_cols))
                 .where(
-                    StockDaily.ts_code.in_(codes),
+                    any_of(StockDaily.ts_code, codes),
                     StockDaily.trade_date >= start_date,
                     StockDaily.trade_date <= end_date,
                 )
                 .order_by(StockDaily.ts_code, StockDaily.trade_date)
             )
             result = await session.execute(stmt)
-            rows = result.scalars().all()
+            rows = result.all()
 
-        if not rows:
-            columns = fields or [
-                "ts_code", "trade_date", "open", "high", "low",
-                "close", "vol", "amount", "pct_chg", "turnover_rate",
-            ]
-            return pd.DataFrame(columns=columns)
+        columns = rows_to_columns(rows, query_cols)
+        if adjusting:
+            apply_adjustment(columns, adj)
+        columns = {c: columns[c] for c in out_cols}
+        return columns_to_arrow(columns) if output == "arrow" else columns
 
-        records = []
-        for r in rows:
-            records.append({
-                "ts_code": r.ts_code,
-                "trade_date": r.trade_date,
-                "open": float(r.open) if r.open else None,
-                "high": float(r.high) if r.high else None,
-                "low": float(r.low) if r.low else None,
-                "close": float(r.close) if r.close else None,
-                "vol": float(r.vol) if r.vol else 0,
-                "amount": float(r.amount) if r.amount else 0,
-                "pct_chg": float(r.pct_chg) if r.pct_chg else None,
-                "turnover_rate": float(r.turnover_rate) if r.turnover_rate else None,
-                "adj_factor": float(r.adj_factor) if r.adj_factor else None,
-            })
-
-        df = pd.DataFrame(records)
-
-        # Apply adjustment
-        if adj in ("qfq", "hfq") and "adj_factor" in df.columns:
-            df = self._apply_adjustment(df, adj)
+    async def get_daily_bars(
+        self,
+        codes: list[str],
+        start_date: date,
+        end_date: date,
+        adj: str = "qfq",
+        fields: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """Query daily bars with optional forward/backward adjustment.
 
-        if fields:
-            available = [f for f in fields if f in df.columns]
-            df = df[available]
+        Thin DataFrame wrapper over get_daily_bars_columnar.
+        """
+        columns = await self.get_daily_bars_columnar(codes, start_date, end_date, adj, fields)
+        if not columns or not len(next(iter(columns.values()))):
+            from app.data.daily_bars import BAR_COLUMNS
 
-        return df
+            return pd.DataFrame(columns=fields or list(BAR_COLUMNS))
+        return pd.DataFrame(columns)
 
     @staticmethod
     def _apply_adjustment(df: pd.DataFrame, adj: str) -> pd.DataFrame:
-        """Apply forward or backward price adjustment."""
+        """Apply forward or backward price adjustment (vectorized across codes)."""
         if df.empty or "adj_factor" not in df.columns:
             return df
 
-        price_cols = ["open", "high", "low", "close"]
-
-        for code in df["ts_code"].unique():
-            mask = df["ts_code"] == code
-            code_df = df.loc[mask]
-            factors = code_df["adj_factor"]
-
-            if factors.isna().all():
-                continue
+        from app.data.daily_bars import PRICE_COLUMNS, adjustment_ratio
 
-            if adj == "qfq":
-                latest_factor = factors.iloc[-1]
-                if latest_factor and latest_factor != 0:
-                    for col in price_cols:
-                        df.loc[mask, col] = (
-                            code_df[col] * factors / latest_factor
-                        )
-            elif adj == "hfq":
-                for col in price_cols:
-                    df.loc[mask, col] = code_df[col] * factors
+        factors = pd.to_numeric(df["adj_factor"], errors="coerce").to_numpy(dtype=float)
+        ratio = adjustment_ratio(df["ts_code"].to_numpy(), factors, adj)
+        if ratio is not None:
+            for col in PRICE_COLUMNS:
+                if col in df.columns:
+                    df[col] = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float) * ratio
 
         df = df.drop(columns=["adj_factor"], errors="ignore")
         return df
@@ -1253,7 +1402,7 @@ class DataManager:
                 stmt = (
                     select(*select_cols)
                     .where(
-                        TechnicalDaily.ts_code.in_(codes),
+                        any_of(TechnicalDaily.ts_code, codes),
                         TechnicalDaily.trade_date == trade_date,
                     )
                 )
@@ -1264,7 +1413,7 @@ class DataManager:
                         TechnicalDaily.ts_code,
                         func.max(TechnicalDaily.trade_date).label("max_date"),
                     )
-                    .where(TechnicalDaily.ts_code.in_(codes))
+                    .where(any_of(TechnicalDaily.ts_code, codes))
                     .group_by(TechnicalDaily.ts_code)
                     .subquery()
                 )
@@ -2751,11 +2900,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_suspend_d(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("suspend_d", trade_date=td_str)
         counts = {"suspend_d": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["suspend_d"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["suspend_d"] = await self._upsert_raw_frame(
                     session, RawTushareSuspendD.__table__, raw_data
                 )
                 await session.commit()
@@ -2767,11 +2916,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_limit_list_d(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("limit_list_d", trade_date=td_str)
         counts = {"limit_list_d": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["limit_list_d"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["limit_list_d"] = await self._upsert_raw_frame(
                     session, RawTushareLimitListD.__table__, raw_data
                 )
             await session.commit()
@@ -2783,11 +2932,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_margin(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("margin", trade_date=td_str)
         counts = {"margin": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["margin"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["margin"] = await self._upsert_raw_frame(
                     session, RawTushareMargin.__table__, raw_data
                 )
             await session.commit()
@@ -2799,11 +2948,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_margin_detail(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("margin_detail", trade_date=td_str)
         counts = {"margin_detail": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["margin_detail"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["margin_detail"] = await self._upsert_raw_frame(
                     session, RawTushareMarginDetail.__table__, raw_data
                 )
             await session.commit()
@@ -2815,11 +2964,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_block_trade(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("block_trade", trade_date=td_str)
         counts = {"block_trade": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["block_trade"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["block_trade"] = await self._upsert_raw_frame(
                     session, RawTushareBlockTrade.__table__, raw_data
                 )
             await session.commit()
@@ -2831,11 +2980,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_daily_share(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("daily_share", trade_date=td_str)
         counts = {"daily_share": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["daily_share"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["daily_share"] = await self._upsert_raw_frame(
                     session, RawTushareDailyShare.__table__, raw_data
                 )
             await session.commit()
@@ -2847,11 +2996,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_stk_factor(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("stk_factor", trade_date=td_str)
         counts = {"stk_factor": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["stk_factor"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["stk_factor"] = await self._upsert_raw_frame(
                     session, RawTushareStkFactor.__table__, raw_data
                 )
             await session.commit()
@@ -2863,11 +3012,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_stk_factor_pro(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("stk_factor_pro", trade_date=td_str)
         counts = {"stk_factor_pro": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["stk_factor_pro"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["stk_factor_pro"] = await self._upsert_raw_frame(
                     session, RawTushareStkFactorPro.__table__, raw_data
                 )
             await session.commit()
@@ -2879,11 +3028,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_hm_board(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("hm_board", trade_date=td_str)
         counts = {"hm_board": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["hm_board"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["hm_board"] = await self._upsert_raw_frame(
                     session, RawTushareHmBoard.__table__, raw_data
                 )
             await session.commit()
@@ -2895,11 +3044,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_hm_list(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("hm_list", trade_date=td_str)
         counts = {"hm_list": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["hm_list"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["hm_list"] = await self._upsert_raw_frame(
                     session, RawTushareHmList.__table__, raw_data
                 )
             await session.commit()
@@ -2911,11 +3060,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_ths_hot(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("ths_hot", trade_date=td_str)
         counts = {"ths_hot": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["ths_hot"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["ths_hot"] = await self._upsert_raw_frame(
                     session, RawTushareThsHot.__table__, raw_data
                 )
             await session.commit()
@@ -2927,11 +3076,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_dc_hot(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("dc_hot", trade_date=td_str)
         counts = {"dc_hot": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["dc_hot"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["dc_hot"] = await self._upsert_raw_frame(
                     session, RawTushareDcHot.__table__, raw_data
                 )
             await session.commit()
@@ -2943,11 +3092,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_ths_limit(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("ths_limit", trade_date=td_str)
         counts = {"ths_limit": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["ths_limit"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["ths_limit"] = await self._upsert_raw_frame(
                     session, RawTushareThsLimit.__table__, raw_data
                 )
             await session.commit()
@@ -2961,11 +3110,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_weekly(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("weekly", trade_date=td_str)
         counts = {"weekly": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["weekly"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["weekly"] = await self._upsert_raw_frame(
                     session, RawTushareWeekly.__table__, raw_data
                 )
             await session.commit()
@@ -2977,11 +3126,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_monthly(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("monthly", trade_date=td_str)
         counts = {"monthly": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["monthly"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["monthly"] = await self._upsert_raw_frame(
                     session, RawTushareMonthly.__table__, raw_data
                 )
             await session.commit()
@@ -2998,9 +3147,9 @@ class DataManager:
         counts = {"stock_company": 0}
         async with self._session_factory() as session:
             for exchange in ("SSE", "SZSE"):
-                raw_data = await client.fetch_raw_stock_company(exchange=exchange)
-                if raw_data:
-                    counts["stock_company"] += await self._upsert_raw(
+                raw_data = await client.fetch_raw_frame("stock_company", exchange=exchange)
+                if not raw_data.empty:
+                    counts["stock_company"] += await self._upsert_raw_frame(
                         session, RawTushareStockCompany.__table__, raw_data
                     )
             await session.commit()
@@ -3011,11 +3160,11 @@ class DataManager:
         """获取融资融券标的（全量）写入 raw 表。"""
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
-        raw_data = await client.fetch_raw_margin_target()
+        raw_data = await client.fetch_raw_frame("margin_target")
         counts = {"margin_target": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["margin_target"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["margin_target"] = await self._upsert_raw_frame(
                     session, RawTushareMarginTarget.__table__, raw_data
                 )
             await session.commit()
@@ -3029,11 +3178,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_top10_holders(ann_date=td_str)
+        raw_data = await client.fetch_raw_frame("top10_holders", ann_date=td_str)
         counts = {"top10_holders": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["top10_holders"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["top10_holders"] = await self._upsert_raw_frame(
                     session, RawTushareTop10Holders.__table__, raw_data
                 )
             await session.commit()
@@ -3045,11 +3194,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_top10_floatholders(ann_date=td_str)
+        raw_data = await client.fetch_raw_frame("top10_floatholders", ann_date=td_str)
         counts = {"top10_floatholders": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["top10_floatholders"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["top10_floatholders"] = await self._upsert_raw_frame(
                     session, RawTushareTop10Floatholders.__table__, raw_data
                 )
             await session.commit()
@@ -3061,11 +3210,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_stk_holdernumber(enddate=td_str)
+        raw_data = await client.fetch_raw_frame("stk_holdernumber", enddate=td_str)
         counts = {"stk_holdernumber": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["stk_holdernumber"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["stk_holdernumber"] = await self._upsert_raw_frame(
                     session, RawTushareStkHoldernumber.__table__, raw_data
                 )
             await session.commit()
@@ -3077,11 +3226,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_stk_holdertrade(ann_date=td_str)
+        raw_data = await client.fetch_raw_frame("stk_holdertrade", ann_date=td_str)
         counts = {"stk_holdertrade": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["stk_holdertrade"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["stk_holdertrade"] = await self._upsert_raw_frame(
                     session, RawTushareStkHoldertrade.__table__, raw_data
                 )
             await session.commit()
@@ -3096,11 +3245,11 @@ class DataManager:
         """获取股票曾用名（全量）写入 raw 表。"""
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
-        raw_data = await client.fetch_raw_namechange()
+        raw_data = await client.fetch_raw_frame("namechange")
         counts = {"namechange": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["namechange"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["namechange"] = await self._upsert_raw_frame(
                     session, RawTushareNamechange.__table__, raw_data
                 )
             await session.commit()
@@ -3111,11 +3260,11 @@ class DataManager:
         """获取上市公司管理层（全量）写入 raw 表。"""
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
-        raw_data = await client.fetch_raw_stk_managers()
+        raw_data = await client.fetch_raw_frame("stk_managers")
         counts = {"stk_managers": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["stk_managers"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["stk_managers"] = await self._upsert_raw_frame(
                     session, RawTushareStkManagers.__table__, raw_data
                 )
             await session.commit()
@@ -3126,11 +3275,11 @@ class DataManager:
         """获取管理层薪酬和持股（全量）写入 raw 表。"""
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
-        raw_data = await client.fetch_raw_stk_rewards()
+        raw_data = await client.fetch_raw_frame("stk_rewards")
         counts = {"stk_rewards": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["stk_rewards"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["stk_rewards"] = await self._upsert_raw_frame(
                     session, RawTushareStkRewards.__table__, raw_data
                 )
             await session.commit()
@@ -3141,11 +3290,11 @@ class DataManager:
         """获取 IPO 新股列表（全量）写入 raw 表。"""
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
-        raw_data = await client.fetch_raw_new_share()
+        raw_data = await client.fetch_raw_frame("new_share")
         counts = {"new_share": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["new_share"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["new_share"] = await self._upsert_raw_frame(
                     session, RawTushareNewShare.__table__, raw_data
                 )
             await session.commit()
@@ -3156,11 +3305,11 @@ class DataManager:
         """获取股票上市历史（全量）写入 raw 表。"""
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
-        raw_data = await client.fetch_raw_stk_list_his()
+        raw_data = await client.fetch_raw_frame("stk_list_his")
         counts = {"stk_list_his": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["stk_list_his"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["stk_list_his"] = await self._upsert_raw_frame(
                     session, RawTushareStkListHis.__table__, raw_data
                 )
             await session.commit()
@@ -3174,11 +3323,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_hsgt_top10(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("hsgt_top10", trade_date=td_str)
         counts = {"hsgt_top10": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["hsgt_top10"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["hsgt_top10"] = await self._upsert_raw_frame(
                     session, RawTushareHsgtTop10.__table__, raw_data
                 )
             await session.commit()
@@ -3190,11 +3339,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_ggt_daily(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("ggt_daily", trade_date=td_str)
         counts = {"ggt_daily": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["ggt_daily"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["ggt_daily"] = await self._upsert_raw_frame(
                     session, RawTushareGgtDaily.__table__, raw_data
                 )
             await session.commit()
@@ -3207,11 +3356,11 @@ class DataManager:
         """获取股权质押统计（全量）写入 raw 表。"""
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
-        raw_data = await client.fetch_raw_pledge_stat()
+        raw_data = await client.fetch_raw_frame("pledge_stat")
         counts = {"pledge_stat": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["pledge_stat"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["pledge_stat"] = await self._upsert_raw_frame(
                     session, RawTusharePledgeStat.__table__, raw_data
                 )
             await session.commit()
@@ -3222,11 +3371,11 @@ class DataManager:
         """获取股权质押明细（全量）写入 raw 表。"""
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
-        raw_data = await client.fetch_raw_pledge_detail()
+        raw_data = await client.fetch_raw_frame("pledge_detail")
         counts = {"pledge_detail": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["pledge_detail"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["pledge_detail"] = await self._upsert_raw_frame(
                     session, RawTusharePledgeDetail.__table__, raw_data
                 )
             await session.commit()
@@ -3237,11 +3386,11 @@ class DataManager:
         """获取股票回购（全量）写入 raw 表。"""
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
-        raw_data = await client.fetch_raw_repurchase()
+        raw_data = await client.fetch_raw_frame("repurchase")
         counts = {"repurchase": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["repurchase"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["repurchase"] = await self._upsert_raw_frame(
                     session, RawTushareRepurchase.__table__, raw_data
                 )
             await session.commit()
@@ -3253,11 +3402,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_share_float(ann_date=td_str)
+        raw_data = await client.fetch_raw_frame("share_float", ann_date=td_str)
         counts = {"share_float": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["share_float"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["share_float"] = await self._upsert_raw_frame(
                     session, RawTushareShareFloat.__table__, raw_data
                 )
             await session.commit()
@@ -3271,11 +3420,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_report_rc(date=td_str)
+        raw_data = await client.fetch_raw_frame("report_rc", date=td_str)
         counts = {"report_rc": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["report_rc"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["report_rc"] = await self._upsert_raw_frame(
                     session, RawTushareReportRc.__table__, raw_data
                 )
             await session.commit()
@@ -3287,11 +3436,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_cyq_perf(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("cyq_perf", trade_date=td_str)
         counts = {"cyq_perf": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["cyq_perf"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["cyq_perf"] = await self._upsert_raw_frame(
                     session, RawTushareCyqPerf.__table__, raw_data
                 )
             await session.commit()
@@ -3303,11 +3452,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_cyq_chips(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("cyq_chips", trade_date=td_str)
         counts = {"cyq_chips": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["cyq_chips"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["cyq_chips"] = await self._upsert_raw_frame(
                     session, RawTushareCyqChips.__table__, raw_data
                 )
             await session.commit()
@@ -3319,11 +3468,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_ccass_hold(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("ccass_hold", trade_date=td_str)
         counts = {"ccass_hold": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["ccass_hold"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["ccass_hold"] = await self._upsert_raw_frame(
                     session, RawTushareCcassHold.__table__, raw_data
                 )
             await session.commit()
@@ -3335,11 +3484,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_ccass_hold_detail(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("ccass_hold_detail", trade_date=td_str)
         counts = {"ccass_hold_detail": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["ccass_hold_detail"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["ccass_hold_detail"] = await self._upsert_raw_frame(
                     session, RawTushareCcassHoldDetail.__table__, raw_data
                 )
             await session.commit()
@@ -3351,11 +3500,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_hk_hold(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("hk_hold", trade_date=td_str)
         counts = {"hk_hold": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["hk_hold"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["hk_hold"] = await self._upsert_raw_frame(
                     session, RawTushareHkHold.__table__, raw_data
                 )
             await session.commit()
@@ -3366,11 +3515,11 @@ class DataManager:
         """获取机构调研（全量）写入 raw 表。"""
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
-        raw_data = await client.fetch_raw_stk_surv()
+        raw_data = await client.fetch_raw_frame("stk_surv")
         counts = {"stk_surv": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["stk_surv"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["stk_surv"] = await self._upsert_raw_frame(
                     session, RawTushareStkSurv.__table__, raw_data
                 )
             await session.commit()
@@ -3384,11 +3533,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_slb_len(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("slb_len", trade_date=td_str)
         counts = {"slb_len": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["slb_len"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["slb_len"] = await self._upsert_raw_frame(
                     session, RawTushareSlbLen.__table__, raw_data
                 )
             await session.commit()
@@ -3402,11 +3551,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_limit_step(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("limit_step", trade_date=td_str)
         counts = {"limit_step": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["limit_step"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["limit_step"] = await self._upsert_raw_frame(
                     session, RawTushareLimitStep.__table__, raw_data
                 )
             await session.commit()
@@ -3418,11 +3567,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_hm_detail(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("hm_detail", trade_date=td_str)
         counts = {"hm_detail": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["hm_detail"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["hm_detail"] = await self._upsert_raw_frame(
                     session, RawTushareHmDetail.__table__, raw_data
                 )
             await session.commit()
@@ -3434,11 +3583,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_stk_auction(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("stk_auction", trade_date=td_str)
         counts = {"stk_auction": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["stk_auction"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["stk_auction"] = await self._upsert_raw_frame(
                     session, RawTushareStkAuction.__table__, raw_data
                 )
             await session.commit()
@@ -3450,11 +3599,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_stk_auction_o(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("stk_auction_o", trade_date=td_str)
         counts = {"stk_auction_o": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["stk_auction_o"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["stk_auction_o"] = await self._upsert_raw_frame(
                     session, RawTushareStkAuctionO.__table__, raw_data
                 )
             await session.commit()
@@ -3466,11 +3615,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_kpl_list(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("kpl_list", trade_date=td_str)
         counts = {"kpl_list": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["kpl_list"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["kpl_list"] = await self._upsert_raw_frame(
                     session, RawTushareKplList.__table__, raw_data
                 )
             await session.commit()
@@ -3482,11 +3631,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         td_str = trade_date.strftime("%Y%m%d")
-        raw_data = await client.fetch_raw_kpl_concept(trade_date=td_str)
+        raw_data = await client.fetch_raw_frame("kpl_concept", trade_date=td_str)
         counts = {"kpl_concept": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["kpl_concept"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["kpl_concept"] = await self._upsert_raw_frame(
                     session, RawTushareKplConcept.__table__, raw_data
                 )
             await session.commit()
@@ -3498,11 +3647,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         month_str = trade_date.strftime("%Y%m")
-        raw_data = await client.fetch_raw_broker_recommend(month=month_str)
+        raw_data = await client.fetch_raw_frame("broker_recommend", month=month_str)
         counts = {"broker_recommend": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["broker_recommend"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["broker_recommend"] = await self._upsert_raw_frame(
                     session, RawTushareBrokerRecommend.__table__, raw_data
                 )
             await session.commit()
@@ -3514,11 +3663,11 @@ class DataManager:
         from app.data.tushare import TushareClient
         client: TushareClient = self._primary_client  # type: ignore[assignment]
         month_str = trade_date.strftime("%Y%m")
-        raw_data = await client.fetch_raw_ggt_monthly(month=month_str)
+        raw_data = await client.fetch_raw_frame("ggt_monthly", month=month_str)
         counts = {"ggt_monthly": 0}
         async with self._session_factory() as session:
-            if raw_data:
-                counts["ggt_monthly"] = await self._upsert_raw(
+            if not raw_data.empty:
+                counts["ggt_monthly"] = await self._upsert_raw_frame(
                     session, RawTushareGgtMonthly.__table__, raw_data
                 )
             await session.commit()
@@ -3527,21 +3676,27 @@ class DataManager:
 
     # --- P5 ETL 方法 ---
 
-    async def etl_suspend(self, trade_date: date) -> dict:
+    async def etl_suspend(self, trade_date: date, *, end_date: date | None = None) -> dict:
         """从 raw 表读取停复牌数据，清洗后写入 suspend_info 业务表。
 
+        支持两种模式：
+        - 单日模式：只传 trade_date（盘后增量用）
+        - 区间模式：传 trade_date + end_date（补缺/全量同步后按区间一次性清洗）
+
         Args:
-            trade_date: 交易日期
+            trade_date: 交易日期（区间模式时为起始日期）
+            end_date: 结束日期（区间模式），None 表示单日模式
 
         Returns:
             {"suspend_info": int}
         """
         td_str = trade_date.strftime("%Y%m%d")
+        end_str = (end_date or trade_date).strftime("%Y%m%d")
 
         async with self._session_factory() as session:
             result = await session.execute(
                 select(RawTushareSuspendD).where(
-                    RawTushareSuspendD.suspend_date == td_str
+                    RawTushareSuspendD.suspend_date.between(td_str, end_str)
                 )
             )
             raw_rows = [
@@ -3561,21 +3716,27 @@ class DataManager:
         logger.debug("[etl_suspend] %s: %d", trade_date, counts["suspend_info"])
         return counts
 
-    async def etl_limit_list(self, trade_date: date) -> dict:
+    async def etl_limit_list(self, trade_date: date, *, end_date: date | None = None) -> dict:
         """从 raw 表读取涨跌停统计数据，清洗后写入 limit_list_daily 业务表。
 
+        支持两种模式：
+        - 单日模式：只传 trade_date（盘后增量用）
+        - 区间模式：传 trade_date + end_date（补缺/全量同步后按区间一次性清洗）
+
         Args:
-            trade_date: 交易日期
+            trade_date: 交易日期（区间模式时为起始日期）
+            end_date: 结束日期（区间模式），None 表示单日模式
 
         Returns:
             {"limit_list_daily": int}
         """
         td_str = trade_date.strftime("%Y%m%d")
+        end_str = (end_date or trade_date).strftime("%Y%m%d")
 
         async with self._session_factory() as session:
             result = await session.execute(
                 select(RawTushareLimitListD).where(
-                    RawTushareLimitListD.trade_date == td_str
+                    RawTushareLimitListD.trade_date.between(td_str, end_str)
                 )
             )
             raw_rows = [
@@ -3927,26 +4088,57 @@ class DataManager:
             result.extend(entries)
         return result
 
+    # 区间 ETL 每次调用覆盖的最大自然日跨度（控制单次读取的 raw 行数）
+    _ETL_RANGE_DAYS = 31
+
+    # 支持 ts_code + start_date/end_date 区间拉取的日频 raw 表：raw_table → [(接口, 目标表)]
+    _RANGE_FETCH_TABLES: dict[str, list[tuple[str, Table]]] = {
+        "raw_tushare_daily": [
+            ("daily", RawTushareDaily.__table__),
+            ("adj_factor", RawTushareAdjFactor.__table__),
+            ("daily_basic", RawTushareDailyBasic.__table__),
+            ("stk_limit", RawTushareStkLimit.__table__),
+        ],
+        "raw_tushare_moneyflow": [("moneyflow", RawTushareMoneyflow.__table__)],
+    }
+    # 按代码区间拉取时每个工作单元包含的代码数（单元内合并为一次 COPY）
+    _RANGE_CODES_PER_UNIT = 50
+
     async def sync_raw_tables(
         self,
         table_group: str | list[str],
         start_date: date,
         end_date: date,
         mode: str = "incremental",
+        concurrency: int | None = None,
+        codes: list[str] | None = None,
     ) -> dict:
         """统一同步入口：按表组和模式同步 raw 表并执行 ETL。
 
+        各表相互独立，(表, 日期) 工作单元按表轮转排队，由有界并发执行；
+        每个 Tushare 接口的配额由 TushareClient 的自适应限流器控制。
+        表内全部日期同步完成后，ETL 按区间批量执行一次（不再逐日执行），
+        依赖前序 raw 表的 ETL（如 etl_moneyflow 读取 moneyflow + top_list）
+        会等待这些表同步完成后再执行。
+
+        full/gap_fill 模式下，支持区间拉取的日频表（_RANGE_FETCH_TABLES）由
+        fetch_planner 按缺口形状选择逐日全市场拉取或逐代码区间拉取。
+
         Args:
             table_group: "p0"/"p1"/"p2"/"p3"/"p4"/"p5"/"all" 或列表
             start_date: 起始日期（full 模式使用）
             end_date: 结束日期（通常为目标交易日）
             mode: "full"=全量, "incremental"=仅 end_date, "gap_fill"=基于进度补缺口
+            concurrency: 同时执行的工作单元数，默认 settings.raw_sync_concurrency
+            codes: 缺口涉及的代码（仅补这些代码的历史时传入），None 表示全市场
 
         Returns:
             {table_name: {rows: int, error: str|None}, ...}
         """
+        import asyncio
         import time
-        import traceback
+
+        from app.config import settings
 
         chain_start = time.monotonic()
         entries = self._resolve_table_groups(table_group)
@@ -3968,9 +4160,10 @@ class DataManager:
                 for row in result.scalars().all():
                     progress_map[row.table_name] = row.last_sync_date
 
-        results: dict = {}
         total_entries = len(entries)
-
+        listed_codes: list[str] | None = None  # 区间拉取规划时按需加载
+        plans: list[dict] = []
+        feeders: list[dict] = []  # 上一个带 ETL 的条目之后、尚无 ETL 的条目
         for entry_idx, (raw_table, sync_method_name, freq, etl_method_name) in enumerate(entries, 1):
             sync_method = getattr(self, sync_method_name, None)
             if sync_method is None:
@@ -3983,7 +4176,7 @@ class DataManager:
             elif freq == "period":
                 dates_to_sync = [None]
             elif freq == "bulk_daily":
-                dates_to_sync = [end_date]  # 占位，实际在下面特殊处理
+                dates_to_sync = [end_date]  # 占位，实际在 _sync_raw_unit 中特殊处理
             elif mode == "incremental":
                 dates_to_sync = [end_date]
             elif mode == "full":
@@ -3998,151 +4191,96 @@ class DataManager:
             else:
                 dates_to_sync = [end_date]
 
-            table_start = time.monotonic()
-            total_rows = 0
-            error_msg = None
-            total_dates = len(dates_to_sync)
-
-            for date_idx, td in enumerate(dates_to_sync, 1):
-                try:
-                    if freq == "static":
-                        r = await sync_method()
-                    elif freq == "period":
-                        if td is not None:
-                            period_str = td.strftime("%Y%m%d")
-                            r = await sync_method(period_str)
-                        else:
-                            r = {}
-                    elif freq == "bulk_daily":
-                        if mode in ("full", "gap_fill") and start_date and end_date:
-                            r = await sync_method(start_date, end_date=end_date)
-                        else:
-                            r = await sync_method(td)
-                    else:
-                        r = await sync_method(td)
-                    # 累加行数
-                    rows = 0
-                    if isinstance(r, dict):
-                        rows = sum(v for v in r.values() if isinstance(v, int))
-                        total_rows += rows
-                    # 日频表且多日：每个日期 1 条日志
-                    if freq == "daily" and total_dates > 1:
-                        logger.info(
-                            "[sync] %s [表%d/%d] [%d/%d] %s ✓ %d行",
-                            raw_table, entry_idx, total_entries,
-                            date_idx, total_dates, td, rows,
-                        )
-                except Exception:
-                    error_msg = traceback.format_exc()[-200:]
-                    if freq == "daily" and total_dates > 1:
-                        logger.warning(
-                            "[sync] %s [表%d/%d] [%d/%d] %s ✗ %s",
-                            raw_table, entry_idx, total_entries,
-                            date_idx, total_dates, td, error_msg[:80],
-                        )
-                    else:
-                        logger.warning(
-                            "[sync_raw_tables] %s 在 %s 失败: %s",
-                            raw_table, td, error_msg,
-                        )
-
-            # 执行对应的 ETL
-            if etl_method_name and error_msg is None:
-                etl_method = getattr(self, etl_method_name, None)
-                if etl_method:
-                    # 静态表 ETL：无参数直接调用
-                    if freq == "static":
-                        try:
-                            await etl_method()
-                            logger.info(
-                                "[sync] ETL %s [表%d/%d] 静态 ✓",
-                                etl_method_name, entry_idx, total_entries,
-                            )
-                        except Exception:
-                            logger.warning(
-                                "[sync] ETL %s [表%d/%d] 静态 ✗ %s",
-                                etl_method_name, entry_idx, total_entries,
-                                traceback.format_exc()[-200:],
-                            )
-                    else:
-                        if mode == "incremental":
-                            # 增量模式：仅对最新日期执行 ETL
-                            etl_dates = [end_date]
-                        elif mode in ("full", "gap_fill") and freq in ("daily", "bulk_daily"):
-                            # 全量/补缺模式：逐日执行 ETL
-                            etl_dates = trading_dates if trading_dates else [end_date]
-                        elif freq == "period":
-                            etl_dates = [end_date]
-                        else:
-                            etl_dates = [end_date]
-
-                        etl_ok = 0
-                        etl_fail = 0
-                        for etl_idx, etl_td in enumerate(etl_dates, 1):
-                            try:
-                                if freq == "period":
-                                    await etl_method(etl_td.strftime("%Y%m%d"))
-                                else:
-                                    await etl_method(etl_td)
-                                etl_ok += 1
-                                if len(etl_dates) > 1 and etl_idx % 100 == 0:
-                                    logger.info(
-                                        "[sync] ETL %s [%d/%d] %s ✓",
-                                        etl_method_name, etl_idx, len(etl_dates), etl_td,
-                                    )
-                            except Exception:
-                                etl_fail += 1
-                                logger.warning(
-                                    "[sync] ETL %s [表%d/%d] %s ✗ %s",
-                                    etl_method_name, entry_idx, total_entries,
-                                    etl_td, traceback.format_exc()[-200:],
-                                )
-                        if len(etl_dates) == 1:
-                            if etl_ok:
-                                logger.info(
-                                    "[sync] ETL %s [表%d/%d] %s ✓",
-                                    etl_method_name, entry_idx, total_entries, end_date,
-                                )
-                        else:
-                            logger.info(
-                                "[sync] ETL %s [表%d/%d] 完成：%d 成功，%d 失败",
-                                etl_method_name, entry_idx, total_entries, etl_ok, etl_fail,
-                            )
-
-            results[raw_table] = {"rows": total_rows, "error": error_msg}
-
-            # 表完成汇总
-            table_elapsed = time.monotonic() - table_start
-            if freq == "static":
-                logger.info(
-                    "[sync] %s [表%d/%d] 静态 ✓ %d行，耗时%.1fs",
-                    raw_table, entry_idx, total_entries, total_rows, table_elapsed,
-                )
-            elif freq == "bulk_daily" and mode in ("full", "gap_fill"):
-                logger.info(
-                    "[sync] %s [表%d/%d] 批量 %s~%s ✓ %d行，耗时%.1fs",
-                    raw_table, entry_idx, total_entries,
-                    start_date, end_date, total_rows, table_elapsed,
-                )
-            elif total_dates > 1:
+            units: list = dates_to_sync
+            range_windows: tuple = ()
+            if (
+                freq == "daily" and mode in ("full", "gap_fill")
+                and raw_table in self._RANGE_FETCH_TABLES and len(dates_to_sync) > 1
+            ):
+                if listed_codes is None:
+                    listed_codes = [s["ts_code"] for s in await self.get_stock_list()]
+                gap_codes = codes or listed_codes
+                apis = [api for api, _ in self._RANGE_FETCH_TABLES[raw_table]]
+                span = [d for d in trading_dates if dates_to_sync[0] <= d <= dates_to_sync[-1]]
+                fetch_plan = plan_fetch(dates_to_sync, span, len(gap_codes), len(listed_codes), apis)
                 logger.info(
-                    "[sync] %s [表%d/%d] 完成：%d日，共%d行，耗时%.1fs",
-                    raw_table, entry_idx, total_entries,
-                    total_dates, total_rows, table_elapsed,
+                    "[sync_raw_tables] %s: %d 个日期 × %d 只代码，按日期 %d 次 / 按代码 %d 次调用 → %s",
+                    raw_table, len(dates_to_sync), len(gap_codes),
+                    fetch_plan.by_date_calls, fetch_plan.by_code_calls, fetch_plan.mode,
                 )
+                if fetch_plan.mode == "by_code":
+                    step = self._RANGE_CODES_PER_UNIT
+                    units = [gap_codes[i : i + step] for i in range(0, len(gap_codes), step)]
+                    range_windows = fetch_plan.windows
+
+            plan = {
+                "raw_table": raw_table,
+                "sync_method": sync_method,
+                "freq": freq,
+                "etl_method_name": etl_method_name,
+                "entry_idx": entry_idx,
+                "dates": dates_to_sync,
+                "units": units,
+                "range_windows": range_windows,
+                "pending": len(units),
+                "rows": 0,
+                "error": None,
+                "start": None,
+                "done": asyncio.Event(),
+                "feeders": [],
+            }
+            if etl_method_name:
+                plan["feeders"] = feeders
+                feeders = []
             else:
-                logger.info(
-                    "[sync] %s [表%d/%d] %s ✓ %d行，耗时%.1fs",
-                    raw_table, entry_idx, total_entries,
-                    end_date, total_rows, table_elapsed,
+                feeders.append(plan)
+            plans.append(plan)
+
+        results: dict = {}
+        sem = asyncio.Semaphore(max(1, concurrency or settings.raw_sync_concurrency))
+
+        async def _finish(plan: dict) -> None:
+            plan["done"].set()
+            await asyncio.gather(*(f["done"].wait() for f in plan["feeders"]))
+            if plan["etl_method_name"] and plan["error"] is None:
+                await self._run_raw_table_etl(
+                    plan, mode, start_date, end_date, trading_dates, total_entries,
                 )
+            self._log_raw_table_done(plan, mode, start_date, end_date, total_entries)
+            results[plan["raw_table"]] = {"rows": plan["rows"], "error": plan["error"]}
 
             # 更新 raw_sync_progress（Task 3.4）
-            if error_msg is None and freq != "static":
+            if plan["error"] is None and plan["freq"] != "static":
                 await self._update_raw_sync_progress(
-                    raw_table, end_date, total_rows
+                    plan["raw_table"], end_date, plan["rows"]
                 )
 
+        async def _unit(plan: dict, date_idx: int, td: date | None) -> None:
+            async with sem:
+                if plan["start"] is None:
+                    plan["start"] = time.monotonic()
+                await self._sync_raw_unit(plan, date_idx, td, mode, start_date, end_date, total_entries)
+            plan["pending"] -= 1
+            if plan["pending"] == 0:
+                await _finish(plan)
+
+        # 按表轮转排队：信号量按等待顺序放行，各表交替推进，分散到不同接口配额
+        queues = [[(p, i, unit) for i, unit in enumerate(p["units"], 1)] for p in plans]
+        units = [
+            queue[k] for k in range(max((len(q) for q in queues), default=0))
+            for queue in queues if k < len(queue)
+        ]
+        empty = [p for p in plans if p["pending"] == 0]
+        outcomes = await asyncio.gather(
+            *(_unit(p, i, td) for p, i, td in units),
+            *(_finish(p) for p in empty),
+            return_exceptions=True,
+        )
+        # 与逐表执行时一致：进度写入等非同步错误在所有单元结束后抛出
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+
         elapsed = time.monotonic() - chain_start
         ok_count = sum(1 for v in results.values() if v.get("error") is None)
         fail_count = len(results) - ok_count
@@ -4152,6 +4290,247 @@ class DataManager:
         )
         return results
 
+    async def _sync_raw_unit(
+        self,
+        plan: dict,
+        date_idx: int,
+        td: date | None,
+        mode: str,
+        start_date: date,
+        end_date: date,
+        total_entries: int,
+    ) -> None:
+        """执行单个 (表, 日期) 同步单元，行数和错误累加到 plan。
+
+        按代码区间拉取的表（plan["range_windows"] 非空）中，td 为一组代码。
+        """
+        raw_table = plan["raw_table"]
+        freq = plan["freq"]
+        sync_method = plan["sync_method"]
+        total_dates = len(plan["units"])
+        unit_codes: list[str] = []
+        if plan["range_windows"]:
+            unit_codes = td
+            td = f"{unit_codes[0]} 等 {len(unit_codes)} 只代码"
+        try:
+            if unit_codes:
+                r = await self._sync_raw_range(raw_table, unit_codes, plan["range_windows"])
+            elif freq == "static":
+                r = await sync_method()
+            elif freq == "period":
+                if td is not None:
+                    period_str = td.strftime("%Y%m%d")
+                    r = await sync_method(period_str)
+                else:
+                    r = {}
+            elif freq == "bulk_daily":
+                if mode in ("full", "gap_fill") and start_date and end_date:
+                    r = await sync_method(start_date, end_date=end_date)
+                else:
+                    r = await sync_method(td)
+            else:
+                r = await sync_method(td)
+            # 累加行数
+            rows = 0
+            if isinstance(r, dict):
+                rows = sum(v for v in r.values() if isinstance(v, int))
+                plan["rows"] += rows
+            # 日频表且多日：每个日期 1 条日志
+            if freq == "daily" and total_dates > 1:
+                logger.info(
+                    "[sync] %s [表%d/%d] [%d/%d] %s ✓ %d行",
+                    raw_table, plan["entry_idx"], total_entries,
+                    date_idx, total_dates, td, rows,
+                )
+        except Exception:
+            error_msg = traceback.format_exc()[-200:]
+            plan["error"] = error_msg
+            if freq == "daily" and total_dates > 1:
+                logger.warning(
+                    "[sync] %s [表%d/%d] [%d/%d] %s ✗ %s",
+                    raw_table, plan["entry_idx"], total_entries,
+                    date_idx, total_dates, td, error_msg[:80],
+                )
+            else:
+                logger.warning(
+                    "[sync_raw_tables] %s 在 %s 失败: %s",
+                    raw_table, td, error_msg,
+                )
+
+    async def _sync_raw_range(
+        self,
+        raw_table: str,
+        codes: list[str],
+        windows: tuple[tuple[date, date], ...],
+    ) -> dict:
+        """按代码区间拉取一组代码的历史数据，合并后每个接口一次写入 raw 表。
+
+        Args:
+            raw_table: _RANGE_FETCH_TABLES 中的 raw 表名
+            codes: 股票代码
+            windows: 每只代码的区间切片（由 fetch_planner 按单次行数上限生成）
+
+        Returns:
+            {接口名: 写入行数}
+        """
+        import asyncio
+
+        from app.data.tushare import TushareClient
+
+        client: TushareClient = self._primary_client  # type: ignore[assignment]
+        specs = self._RANGE_FETCH_TABLES[raw_table]
+        collected: dict[str, list[pd.DataFrame]] = {api: [] for api, _ in specs}
+        for code in codes:
+            for start, end in windows:
+                frames = await asyncio.gather(*(
+                    client.fetch_raw_frame(
+                        api, ts_code=code, start_date=start.strftime("%Y%m%d"), end_date=end.strftime("%Y%m%d"),
+                    )
+                    for api, _ in specs
+                ))
+                for (api, _), frame in zip(specs, frames):
+                    if not frame.empty:
+                        collected[api].append(frame)
+
+        counts = {}
+        async with self._session_factory() as session:
+            for api, table in specs:
+                frame = pd.concat(collected[api], ignore_index=True) if collected[api] else pd.DataFrame()
+                counts[api] = await self._upsert_raw_frame(session, table, frame)
+            await session.commit()
+        logger.debug("[_sync_raw_range] %s: %d 只代码 × %d 段区间 → %s", raw_table, len(codes), len(windows), counts)
+        return counts
+
+    async def _run_raw_table_etl(
+        self,
+        plan: dict,
+        mode: str,
+        start_date: date,
+        end_date: date,
+        trading_dates: list[date],
+        total_entries: int,
+    ) -> None:
+        """表同步完成后执行对应 ETL。
+
+        支持区间模式（end_date 关键字参数）的 ETL 按不超过 _ETL_RANGE_DAYS
+        的区间分段调用；其他 ETL 保持逐日调用。
+        """
+        import inspect
+
+        etl_method_name = plan["etl_method_name"]
+        etl_method = getattr(self, etl_method_name, None)
+        if not etl_method:
+            return
+        freq = plan["freq"]
+        entry_idx = plan["entry_idx"]
+
+        # 静态表 ETL：无参数直接调用
+        if freq == "static":
+            try:
+                await etl_method()
+                logger.info(
+                    "[sync] ETL %s [表%d/%d] 静态 ✓",
+                    etl_method_name, entry_idx, total_entries,
+                )
+            except Exception:
+                logger.warning(
+                    "[sync] ETL %s [表%d/%d] 静态 ✗ %s",
+                    etl_method_name, entry_idx, total_entries,
+                    traceback.format_exc()[-200:],
+                )
+            return
+
+        if mode == "incremental":
+            # 增量模式：仅对最新日期执行 ETL
+            etl_dates = [end_date]
+        elif mode in ("full", "gap_fill") and freq == "daily":
+            # 全量/补缺模式：本表实际同步的日期
+            etl_dates = sorted(plan["dates"])
+        elif mode in ("full", "gap_fill") and freq == "bulk_daily":
+            etl_dates = trading_dates if trading_dates else [end_date]
+        else:
+            etl_dates = [end_date]
+        if not etl_dates:
+            return
+
+        # 区间分段：(起始日, 结束日)；不支持区间的 ETL 退化为逐日
+        if freq != "period" and "end_date" in inspect.signature(etl_method).parameters:
+            spans: list[tuple[date, date]] = []
+            for d in etl_dates:
+                if spans and (d - spans[-1][0]).days < self._ETL_RANGE_DAYS:
+                    spans[-1] = (spans[-1][0], d)
+                else:
+                    spans.append((d, d))
+        else:
+            spans = [(d, d) for d in etl_dates]
+
+        etl_ok = 0
+        etl_fail = 0
+        for span_start, span_end in spans:
+            try:
+                if freq == "period":
+                    await etl_method(span_start.strftime("%Y%m%d"))
+                elif span_end != span_start:
+                    await etl_method(span_start, end_date=span_end)
+                else:
+                    await etl_method(span_start)
+                etl_ok += 1
+            except Exception:
+                etl_fail += 1
+                logger.warning(
+                    "[sync] ETL %s [表%d/%d] %s~%s ✗ %s",
+                    etl_method_name, entry_idx, total_entries,
+                    span_start, span_end, traceback.format_exc()[-200:],
+                )
+        if len(etl_dates) == 1:
+            if etl_ok:
+                logger.info(
+                    "[sync] ETL %s [表%d/%d] %s ✓",
+                    etl_method_name, entry_idx, total_entries, end_date,
+                )
+        else:
+            logger.info(
+                "[sync] ETL %s [表%d/%d] %s~%s 完成：%d 段成功，%d 段失败",
+                etl_method_name, entry_idx, total_entries,
+                etl_dates[0], etl_dates[-1], etl_ok, etl_fail,
+            )
+
+    @staticmethod
+    def _log_raw_table_done(
+        plan: dict, mode: str, start_date: date, end_date: date, total_entries: int,
+    ) -> None:
+        """输出单表同步完成汇总日志。"""
+        import time
+
+        raw_table = plan["raw_table"]
+        entry_idx = plan["entry_idx"]
+        total_rows = plan["rows"]
+        total_dates = len(plan["dates"])
+        table_elapsed = time.monotonic() - plan["start"] if plan["start"] else 0.0
+        if plan["freq"] == "static":
+            logger.info(
+                "[sync] %s [表%d/%d] 静态 ✓ %d行，耗时%.1fs",
+                raw_table, entry_idx, total_entries, total_rows, table_elapsed,
+            )
+        elif plan["freq"] == "bulk_daily" and mode in ("full", "gap_fill"):
+            logger.info(
+                "[sync] %s [表%d/%d] 批量 %s~%s ✓ %d行，耗时%.1fs",
+                raw_table, entry_idx, total_entries,
+                start_date, end_date, total_rows, table_elapsed,
+            )
+        elif total_dates > 1:
+            logger.info(
+                "[sync] %s [表%d/%d] 完成：%d日，共%d行，耗时%.1fs",
+                raw_table, entry_idx, total_entries,
+                total_dates, total_rows, table_elapsed,
+            )
+        else:
+            logger.info(
+                "[sync] %s [表%d/%d] %s ✓ %d行，耗时%.1fs",
+                raw_table, entry_idx, total_entries,
+                end_date, total_rows, table_elapsed,
+            )
+
     async def _update_raw_sync_progress(
         self, table_name: str, sync_date: date, rows: int
     ) -> None:
@@ -4281,18 +4660,14 @@ class DataManager:
             ]
 
             deleted = {}
-            # 分批处理代码列表（避免 SQL 参数过多）
-            batch_size = 100
+            # 代码集合作为一个数组参数绑定，每张表一条语句
             for tbl in tables_to_clean:
-                total_deleted = 0
                 try:
-                    for i in range(0, len(delisted_codes), batch_size):
-                        batch = delisted_codes[i:i + batch_size]
-                        result = await session.execute(
-                            text(f'DELETE FROM "{tbl}" WHERE ts_code = ANY(:codes)'),
-                            {"codes": batch},
-                        )
-                        total_deleted += result.rowcount
+                    result = await session.execute(
+                        text(f'DELETE FROM "{tbl}" WHERE {any_array("ts_code")}'),
+                        {"codes": delisted_codes},
+                    )
+                    total_deleted = result.rowcount
                     if total_deleted > 0:
                         deleted[tbl] = total_deleted
                         logger.info("  - %s: 删除 %d 行", tbl, total_deleted)
@@ -4304,7 +4679,7 @@ class DataManager:
                 await session.execute(
                     text(
                         "UPDATE stock_sync_progress SET status = 'delisted' "
-                        "WHERE ts_code = ANY(:codes) AND status != 'delisted'"
+                        f"WHERE {any_array('ts_code')} AND status != 'delisted'"
                     ),
                     {"codes": delisted_codes},
                 )
@@ -4326,12 +4701,63 @@ class DataManager:
 
     # --- 策略命中率追踪 ---
 
+    # update_pick_returns 每条语句处理的选股记录数
+    _PICK_RETURNS_BATCH = 5000
+
+    # 集合式回填：LATERAL 取每条记录 pick_date 之后的前 20 个有效交易日收盘价，
+    # 聚合出 1/3/5/10/20 日收益与 20 日内最大收益/回撤，同一语句 UPDATE ... FROM 写回；
+    # COALESCE 只填充仍为 NULL 的字段，部分已回填的记录可重复执行
+    _PICK_RETURNS_SQL = """
+        WITH fwd AS (
+            SELECT p.id, p.pick_close, f.close, f.n
+            FROM strategy_picks p
+            CROSS JOIN LATERAL (
+                SELECT sd.close, row_number() OVER (ORDER BY sd.trade_date) AS n
+                FROM stock_daily sd
+                JOIN trade_calendar tc ON sd.trade_date = tc.cal_date
+                WHERE sd.ts_code = p.ts_code
+                  AND sd.trade_date > p.pick_date
+                  AND sd.trade_date <= :today
+                  AND tc.is_open = true
+                  AND sd.close IS NOT NULL
+                  AND sd.vol > 0
+                ORDER BY sd.trade_date
+                LIMIT 20
+            ) f
+            WHERE p.id = ANY(:ids)
+        ),
+        calc AS (
+            SELECT id,
+                   ROUND((MAX(close) FILTER (WHERE n = 1) - pick_close) / pick_close * 100, 4) AS r1,
+                   ROUND((MAX(close) FILTER (WHERE n = 3) - pick_close) / pick_close * 100, 4) AS r3,
+                   ROUND((MAX(close) FILTER (WHERE n = 5) - pick_close) / pick_close * 100, 4) AS r5,
+                   ROUND((MAX(close) FILTER (WHERE n = 10) - pick_close) / pick_close * 100, 4) AS r10,
+                   ROUND((MAX(close) FILTER (WHERE n = 20) - pick_close) / pick_close * 100, 4) AS r20,
+                   ROUND((MAX(close) - pick_close) / pick_close * 100, 4) AS max_ret,
+                   ROUND((MIN(close) - pick_close) / pick_close * 100, 4) AS max_dd
+            FROM fwd
+            GROUP BY id, pick_close
+        )
+        UPDATE strategy_picks sp SET
+            return_1d  = COALESCE(sp.return_1d,  c.r1),
+            return_3d  = COALESCE(sp.return_3d,  c.r3),
+            return_5d  = COALESCE(sp.return_5d,  c.r5),
+            return_10d = COALESCE(sp.return_10d, c.r10),
+            return_20d = COALESCE(sp.return_20d, c.r20),
+            max_return   = COALESCE(sp.max_return,   c.max_ret),
+            max_drawdown = COALESCE(sp.max_drawdown, c.max_dd),
+            updated_at = NOW()
+        FROM calc c
+        WHERE sp.id = c.id
+        RETURNING sp.id
+    """
+
     async def update_pick_returns(self, target_date: date | None = None) -> dict:
         """回填策略选股记录的 N 日收益率。
 
-        查找 return_1d/3d/5d/10d/20d 为 NULL 的记录，
-        根据 pick_date 和 ts_code 从 stock_daily 获取后续收盘价，
-        计算收益率并更新。停牌（无数据）的日期自动跳过。
+        查找 return_1d/3d/5d/10d/20d 为 NULL 的记录，按批（_PICK_RETURNS_BATCH 条）
+        以一条集合式 SQL 从 stock_daily 取后续收盘价、计算收益率并写回
+        （见 _PICK_RETURNS_SQL）。停牌（无数据）的日期自动跳过，已有值的字段不覆盖。
 
         Args:
             target_date: 基准日期，默认今天
@@ -4341,23 +4767,19 @@ class DataManager:
         """
         today = target_date or date.today()
         updated = 0
-        skipped = 0
 
-        # 查询需要回填的记录：任意 return_Nd 为 NULL 且 pick_date 足够早
-        # 用最宽松条件（return_1d IS NULL）先拉出候选，逐条判断
+        # 需要回填的记录：任意 return_Nd 为 NULL；pick_close 为空或 0 无法计算收益
         async with self._session_factory() as session:
             result = await session.execute(
                 text("""
-                    SELECT id, strategy_name, pick_date, ts_code, pick_close,
-                           return_1d, return_3d, return_5d, return_10d, return_20d,
-                           max_return, max_drawdown
+                    SELECT id, pick_close
                     FROM strategy_picks
                     WHERE pick_close IS NOT NULL
                       AND (
                           return_1d IS NULL OR return_3d IS NULL OR return_5d IS NULL
                           OR return_10d IS NULL OR return_20d IS NULL
                       )
-                    ORDER BY pick_date
+                    ORDER BY pick_date, id
                 """)
             )
             records = result.fetchall()
@@ -4366,106 +4788,112 @@ class DataManager:
             logger.info("[update_pick_returns] 无需回填的记录")
             return {"updated": 0, "skipped": 0}
 
+        ids = [r.id for r in records if float(r.pick_close) != 0]
         logger.info("[update_pick_returns] 待回填记录 %d 条", len(records))
 
-        # 按 (pick_date, ts_code) 分组，批量查询后续收盘价
-        # 先收集所有需要查询的 (ts_code, pick_date) 对
-        from collections import defaultdict
-        code_dates: dict[str, set[date]] = defaultdict(set)
-        for row in records:
-            code_dates[row.ts_code].add(row.pick_date)
-
-        # 对每只股票，查询 pick_date 后 30 个交易日的收盘价
-        # 用 trade_calendar 确定交易日偏移
-        close_cache: dict[tuple[str, date], list[tuple[date, float]]] = {}
-
-        async with self._session_factory() as session:
-            for ts_code, pick_dates in code_dates.items():
-                for pick_date in pick_dates:
-                    result = await session.execute(
-                        text("""
-                            SELECT sd.trade_date, sd.close
-                            FROM stock_daily sd
-                            JOIN trade_calendar tc ON sd.trade_date = tc.cal_date
-                            WHERE sd.ts_code = :ts_code
-                              AND sd.trade_date > :pick_date
-                              AND sd.trade_date <= :today
-                              AND tc.is_open = true
-                              AND sd.close IS NOT NULL
-                              AND sd.vol > 0
-                            ORDER BY sd.trade_date
-                            LIMIT 25
-                        """),
-                        {"ts_code": ts_code, "pick_date": pick_date, "today": today},
-                    )
-                    rows = result.fetchall()
-                    close_cache[(ts_code, pick_date)] = [(r.trade_date, float(r.close)) for r in rows]
-
-        # 逐条计算并批量更新
+        batch_size = self._PICK_RETURNS_BATCH
         async with self._session_factory() as session:
-            for row in records:
-                closes = close_cache.get((row.ts_code, row.pick_date), [])
-                if not closes:
-                    skipped += 1
-                    continue
-
-                pick_close = float(row.pick_close)
-                if pick_close == 0:
-                    skipped += 1
-                    continue
-
-                # 按交易日序号取对应收盘价（1/3/5/10/20 日）
-                def get_return(n: int) -> float | None:
-                    if len(closes) >= n:
-                        c = closes[n - 1][1]
-                        return round((c - pick_close) / pick_close * 100, 4)
-                    return None
-
-                # 计算各期收益率（仅回填 NULL 字段）
-                r1 = row.return_1d if row.return_1d is not None else get_return(1)
-                r3 = row.return_3d if row.return_3d is not None else get_return(3)
-                r5 = row.return_5d if row.return_5d is not None else get_return(5)
-                r10 = row.return_10d if row.return_10d is not None else get_return(10)
-                r20 = row.return_20d if row.return_20d is not None else get_return(20)
-
-                # 计算 20 日内最大收益和最大回撤
-                max_ret = row.max_return
-                max_dd = row.max_drawdown
-                if max_ret is None or max_dd is None:
-                    returns_20 = [
-                        (c - pick_close) / pick_close * 100
-                        for _, c in closes[:20]
-                    ]
-                    if returns_20:
-                        max_ret = round(max(returns_20), 4)
-                        max_dd = round(min(returns_20), 4)
-
-                await session.execute(
-                    text("""
-                        UPDATE strategy_picks SET
-                            return_1d  = COALESCE(return_1d,  :r1),
-                            return_3d  = COALESCE(return_3d,  :r3),
-                            return_5d  = COALESCE(return_5d,  :r5),
-                            return_10d = COALESCE(return_10d, :r10),
-                            return_20d = COALESCE(return_20d, :r20),
-                            max_return   = COALESCE(max_return,   :max_ret),
-                            max_drawdown = COALESCE(max_drawdown, :max_dd),
-                            updated_at = NOW()
-                        WHERE id = :id
-                    """),
-                    {
-                        "id": row.id,
-                        "r1": r1, "r3": r3, "r5": r5, "r10": r10, "r20": r20,
-                        "max_ret": max_ret, "max_dd": max_dd,
-                    },
+            for offset in range(0, len(ids), batch_size):
+                result = await session.execute(
+                    text(self._PICK_RETURNS_SQL),
+                    {"ids": ids[offset : offset + batch_size], "today": today},
                 )
-                updated += 1
-
+                updated += len(result.fetchall())
             await session.commit()
 
+        # 无后续行情（停牌/未到期）或 pick_close 为 0 的记录
+        skipped = len(records) - updated
         logger.info("[update_pick_returns] 完成：更新 %d 条，跳过 %d 条", updated, skipped)
         return {"updated": updated, "skipped": skipped}
 
+    # 选股收益的 (周期, 列) 展开，供命中率统计 SQL 复用
+    _HIT_PERIODS_SQL = """
+        (VALUES ('1d', p.return_1d), ('3d', p.return_3d), ('5d', p.return_5d),
+                ('10d', p.return_10d), ('20d', p.return_20d)) AS v(period, ret)
+    """
+
+    # 增量刷新日汇总：只重算水位之后有选股记录变化（新增/收益回填）的 (策略, 选股日)。
+    # 水位回退 1 小时，覆盖水位前开始、之后才提交的写入；重算是幂等的
+    _HIT_DAILY_REFRESH_SQL = f"""
+        WITH mark AS (
+            SELECT COALESCE(MAX(refreshed_at) - INTERVAL '1 hour', '-infinity'::timestamp) AS since
+            FROM strategy_hit_daily
+        ),
+        changed AS (
+            SELECT DISTINCT strategy_name, pick_date
+            FROM strategy_picks, mark
+            WHERE updated_at >= mark.since OR created_at >= mark.since
+        )
+        INSERT INTO strategy_hit_daily
+            (strategy_name, pick_date, period, pick_count, win_count,
+             return_sum, best_return, worst_return, refreshed_at)
+        SELECT p.strategy_name, p.pick_date, v.period,
+               COUNT(*), COUNT(*) FILTER (WHERE v.ret > 0),
+               SUM(v.ret), MAX(v.ret), MIN(v.ret), NOW()
+        FROM strategy_picks p
+        JOIN changed c ON c.strategy_name = p.strategy_name AND c.pick_date = p.pick_date
+        CROSS JOIN LATERAL {_HIT_PERIODS_SQL}
+        WHERE p.pick_close IS NOT NULL AND v.ret IS NOT NULL
+        GROUP BY p.strategy_name, p.pick_date, v.period
+        ON CONFLICT (strategy_name, pick_date, period) DO UPDATE SET
+            pick_count   = EXCLUDED.pick_count,
+            win_count    = EXCLUDED.win_count,
+            return_sum   = EXCLUDED.return_sum,
+            best_return  = EXCLUDED.best_return,
+            worst_return = EXCLUDED.worst_return,
+            refreshed_at = EXCLUDED.refreshed_at
+    """
+
+    # 滚动窗口（最近 30 个交易日）统计：计数、命中与收益和由日汇总求和，
+    # 中位数在窗口内选股上用 percentile_cont 计算；一条 INSERT ... ON CONFLICT 写入全部策略/周期
+    _HIT_STATS_SQL = f"""
+        WITH win AS (
+            SELECT cal_date AS start_date FROM trade_calendar
+            WHERE is_open = true AND cal_date <= :stat_date
+            ORDER BY cal_date DESC
+            OFFSET 29 LIMIT 1
+        ),
+        sums AS (
+            SELECT d.strategy_name, d.period,
+                   SUM(d.pick_count) AS total, SUM(d.win_count) AS wins, SUM(d.return_sum) AS ret_sum,
+                   MAX(d.best_return) AS best, MIN(d.worst_return) AS worst
+            FROM strategy_hit_daily d, win
+            WHERE d.pick_date >= win.start_date AND d.pick_date <= :stat_date
+            GROUP BY d.strategy_name, d.period
+        ),
+        med AS (
+            SELECT p.strategy_name, v.period,
+                   percentile_cont(0.5) WITHIN GROUP (ORDER BY v.ret) AS median
+            FROM strategy_picks p
+            CROSS JOIN win
+            CROSS JOIN LATERAL {_HIT_PERIODS_SQL}
+            WHERE p.pick_date >= win.start_date AND p.pick_date <= :stat_date
+              AND p.pick_close IS NOT NULL AND v.ret IS NOT NULL
+            GROUP BY p.strategy_name, v.period
+        )
+        INSERT INTO strategy_hit_stats
+            (strategy_name, stat_date, period, total_picks, win_count,
+             hit_rate, avg_return, median_return, best_return, worst_return)
+        SELECT s.strategy_name, CAST(:stat_date AS date), s.period, s.total, s.wins,
+               ROUND(s.wins * 100.0 / s.total, 4),
+               ROUND(s.ret_sum / s.total, 4),
+               ROUND(m.median::numeric, 4),
+               s.best, s.worst
+        FROM sums s
+        JOIN med m ON m.strategy_name = s.strategy_name AND m.period = s.period
+        WHERE s.total > 0
+        ON CONFLICT ON CONSTRAINT uq_hit_stats_strategy_date_period
+        DO UPDATE SET
+            total_picks   = EXCLUDED.total_picks,
+            win_count     = EXCLUDED.win_count,
+            hit_rate      = EXCLUDED.hit_rate,
+            avg_return    = EXCLUDED.avg_return,
+            median_return = EXCLUDED.median_return,
+            best_return   = EXCLUDED.best_return,
+            worst_return  = EXCLUDED.worst_return
+        RETURNING strategy_name
+    """
+
     async def compute_hit_stats(self, target_date: date | None = None) -> dict:
         """计算策略命中率统计并写入 strategy_hit_stats。
 
@@ -4473,111 +4901,30 @@ class DataManager:
         按 period (1d/3d/5d/10d/20d) 分别计算命中率和收益分布，
         UPSERT 到 strategy_hit_stats 表。
 
+        先增量刷新 strategy_hit_daily（只重算有新到期选股的选股日），
+        再以一条 SQL 聚合窗口内的日汇总并批量 UPSERT，不在 Python 中逐条计算。
+
         Args:
             target_date: 统计基准日期，默认今天
 
         Returns:
             {"upserted": int, "strategies": int}
         """
-        import statistics
-
         stat_date = target_date or date.today()
-        upserted = 0
 
-        # 查询最近 30 个交易日内有收益数据的选股记录
         async with self._session_factory() as session:
-            result = await session.execute(
-                text("""
-                    SELECT strategy_name, ts_code,
-                           return_1d, return_3d, return_5d, return_10d, return_20d
-                    FROM strategy_picks
-                    WHERE pick_date >= (
-                        SELECT cal_date FROM trade_calendar
-                        WHERE is_open = true AND cal_date <= :stat_date
-                        ORDER BY cal_date DESC
-                        OFFSET 29 LIMIT 1
-                    )
-                    AND pick_date <= :stat_date
-                    AND pick_close IS NOT NULL
-                """),
-                {"stat_date": stat_date},
-            )
-            rows = result.fetchall()
+            refreshed = await session.execute(text(self._HIT_DAILY_REFRESH_SQL))
+            result = await session.execute(text(self._HIT_STATS_SQL), {"stat_date": stat_date})
+            written = [r.strategy_name for r in result.fetchall()]
+            await session.commit()
 
-        if not rows:
+        if not written:
             logger.info("[compute_hit_stats] 无选股记录，跳过统计")
             return {"upserted": 0, "strategies": 0}
 
-        # 按策略分组
-        from collections import defaultdict
-        strategy_data: dict[str, dict[str, list[float]]] = defaultdict(lambda: {
-            "1d": [], "3d": [], "5d": [], "10d": [], "20d": []
-        })
-
-        period_col = {
-            "1d": "return_1d", "3d": "return_3d", "5d": "return_5d",
-            "10d": "return_10d", "20d": "return_20d",
-        }
-
-        for row in rows:
-            sname = row.strategy_name
-            for period, col in period_col.items():
-                val = getattr(row, col)
-                if val is not None:
-                    strategy_data[sname][period].append(float(val))
-
-        # 计算统计并 UPSERT
-        async with self._session_factory() as session:
-            for strategy_name, periods in strategy_data.items():
-                for period, returns in periods.items():
-                    if not returns:
-                        continue
-                    total = len(returns)
-                    wins = sum(1 for r in returns if r > 0)
-                    hit_rate = round(wins / total * 100, 4)
-                    avg_ret = round(sum(returns) / total, 4)
-                    med_ret = round(statistics.median(returns), 4)
-                    best = round(max(returns), 4)
-                    worst = round(min(returns), 4)
-
-                    await session.execute(
-                        text("""
-                            INSERT INTO strategy_hit_stats
-                                (strategy_name, stat_date, period, total_picks, win_count,
-                                 hit_rate, avg_return, median_return, best_return, worst_return)
-                            VALUES
-                                (:strategy_name, :stat_date, :period, :total_picks, :win_count,
-                                 :hit_rate, :avg_return, :median_return, :best_return, :worst_return)
-                            ON CONFLICT ON CONSTRAINT uq_hit_stats_strategy_date_period
-                            DO UPDATE SET
-                                total_picks   = EXCLUDED.total_picks,
-                                win_count     = EXCLUDED.win_count,
-                                hit_rate      = EXCLUDED.hit_rate,
-                                avg_return    = EXCLUDED.avg_return,
-                                median_return = EXCLUDED.median_return,
-                                best_return   = EXCLUDED.best_return,
-                                worst_return  = EXCLUDED.worst_return
-                        """),
-                        {
-                            "strategy_name": strategy_name,
-                            "stat_date": stat_date,
-                            "period": period,
-                            "total_picks": total,
-                            "win_count": wins,
-                            "hit_rate": hit_rate,
-                            "avg_return": avg_ret,
-                            "median_return": med_ret,
-                            "best_return": best,
-                            "worst_return": worst,
-                        },
-                    )
-                    upserted += 1
-
-            await session.commit()
-
-        strategies_count = len(strategy_data)
+        strategies_count = len(set(written))
         logger.info(
-            "[compute_hit_stats] 完成：%d 个策略，写入 %d 条统计记录（日期：%s）",
-            strategies_count, upserted, stat_date,
+            "[compute_hit_stats] 完成：%d 个策略，写入 %d 条统计记录（日期：%s，刷新日汇总 %d 条）",
+            strategies_count, len(written), stat_date, refreshed.rowcount,
         )
-        return {"upserted": upserted, "strategies": strategies_count}
+        return {"upserted": len(written), "strategies": strategies_count}
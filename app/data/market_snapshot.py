@@ -0,0 +1,236 @@
+"""每日市场快照（market_snapshot_daily）构建。
+
+V2 Pipeline Layer 0、V4 日常执行器以及依赖它们的参数优化器、选股 API，
+原先每次运行都要重新 JOIN stocks / stock_daily / technical_daily /
+raw_tushare_daily_basic，再查前一交易日指标、DISTINCT ON 扫描 finance_indicator。
+本模块在盘后 ETL（含技术指标）完成后，以一条 INSERT ... SELECT 把这些特征
+物化为每只股票每日一行，消费方只需按 trade_date 做一次索引扫描。
+
+快照未构建的日期（历史日期、构建失败）由消费方回退到原有多表查询。
+快照构建后来源数据又被改写（失败重试补同步、历史回补、复权因子重算、
+财报/每日指标重新拉取、股票基础信息变更）时，fresh_snapshot_dates 将该日视为过期，
+消费方同样回退到多表查询，直至重新构建。
+
+使用示例：
+    await build_market_snapshot(async_session_factory, date(2026, 3, 9))
+    await build_market_snapshot_range(async_session_factory, dates)
+"""
+
+import logging
+import time
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# 快照列（与 MarketSnapshotDaily 一致，不含 built_at），按来源分组
+_STOCK_COLUMNS = ("name", "industry", "market", "list_status", "list_date")
+_BAR_COLUMNS = ("open", "high", "low", "close", "vol", "amount", "pct_chg")
+_TECH_COLUMNS = (
+    "ma5", "ma10", "ma20", "ma60",
+    "macd_dif", "macd_dea", "macd_hist",
+    "rsi6", "rsi12",
+    "boll_upper", "boll_mid", "boll_lower",
+    "vol_ma5", "vol_ma10", "vol_ratio",
+    "atr14", "high_20", "high_60",
+)
+_PREV_TECH_COLUMNS = ("ma5", "ma20", "ma60", "macd_dif", "atr14", "rsi6", "rsi12")
+_PREV_BAR_COLUMNS = ("close", "open", "pct_chg")
+_FINANCE_COLUMNS = (
+    "roe", "eps", "revenue_yoy", "profit_yoy",
+    "current_ratio", "quick_ratio", "debt_ratio",
+    "gross_margin", "net_margin", "ocf_per_share",
+)
+
+SNAPSHOT_COLUMNS: tuple[str, ...] = (
+    "ts_code", "trade_date",
+    *_STOCK_COLUMNS,
+    *_BAR_COLUMNS,
+    *_TECH_COLUMNS,
+    *(f"{c}_prev" for c in (*_PREV_TECH_COLUMNS, *_PREV_BAR_COLUMNS)),
+    "turnover_rate", "pe_ttm", "pb", "dividend_yield",
+    *_FINANCE_COLUMNS,
+)
+
+_SELECT_EXPRS = (
+    "sd.ts_code", "sd.trade_date",
+    *(f"s.{c}" for c in _STOCK_COLUMNS),
+    *(f"sd.{c}" for c in _BAR_COLUMNS),
+    *(f"td.{c}" for c in _TECH_COLUMNS),
+    *(f"tp.{c}" for c in _PREV_TECH_COLUMNS),
+    *(f"sp.{c}" for c in _PREV_BAR_COLUMNS),
+    "db.turnover_rate",
+    # daily_basic 的估值每日更新，优先使用；缺失时回退到最新一期财报
+    "COALESCE(db.pe_ttm, fin.pe_ttm)",
+    "COALESCE(db.pb, fin.pb)",
+    "db.dv_ttm",
+    *(f"fin.{c}" for c in _FINANCE_COLUMNS),
+)
+
+# 前一交易日取全市场口径（最近一个有成交的交易日），与 Layer 0 原实现一致
+_BUILD_SQL = f"""
+    WITH prev AS (
+        SELECT MAX(trade_date) AS d
+        FROM stock_daily
+        WHERE trade_date < :trade_date AND vol > 0
+    ),
+    fin AS (
+        SELECT DISTINCT ON (fi.ts_code)
+            fi.ts_code, fi.pe_ttm, fi.pb, {", ".join(f"fi.{c}" for c in _FINANCE_COLUMNS)}
+        FROM finance_indicator fi
+        WHERE fi.ann_date <= :trade_date
+          AND fi.ts_code IN (SELECT ts_code FROM stock_daily WHERE trade_date = :trade_date)
+        ORDER BY fi.ts_code, fi.end_date DESC
+    )
+    INSERT INTO market_snapshot_daily ({", ".join(SNAPSHOT_COLUMNS)})
+    SELECT {", ".join(_SELECT_EXPRS)}
+    FROM stock_daily sd
+    JOIN stocks s ON s.ts_code = sd.ts_code
+    CROSS JOIN prev
+    LEFT JOIN technical_daily td ON td.ts_code = sd.ts_code AND td.trade_date = sd.trade_date
+    LEFT JOIN technical_daily tp ON tp.ts_code = sd.ts_code AND tp.trade_date = prev.d
+    LEFT JOIN stock_daily sp ON sp.ts_code = sd.ts_code AND sp.trade_date = prev.d
+    LEFT JOIN raw_tushare_daily_basic db
+        ON db.ts_code = sd.ts_code AND db.trade_date = :trade_date_str
+    LEFT JOIN fin ON fin.ts_code = sd.ts_code
+    WHERE sd.trade_date = :trade_date
+"""
+
+
+# 已构建且来源行未在构建后被改写的日期。来源水位：
+#   stock_daily / technical_daily.updated_at（当日及前一交易日，后者提供 *_prev 列）
+#   raw_tushare_daily_basic.fetched_at（当日，trade_date 为 YYYYMMDD 文本）
+#   finance_indicator.updated_at（ann_date <= 当日的财报）
+# stocks.updated_at 每次股票列表同步都会刷新，改为直接比对快照中的基础信息列
+_FRESH_DATES_SQL = f"""
+    WITH m AS (
+        SELECT trade_date, MIN(built_at) AS built_at,
+               (SELECT MAX(p.trade_date) FROM stock_daily p
+                WHERE p.trade_date < ms.trade_date AND p.vol > 0) AS prev_date
+        FROM market_snapshot_daily ms
+        WHERE trade_date = ANY(CAST(:dates AS date[]))
+        GROUP BY trade_date
+    ),
+    fin_changed AS (
+        SELECT ann_date, updated_at FROM finance_indicator
+        WHERE updated_at > (SELECT MIN(built_at) FROM m)
+    )
+    SELECT m.trade_date
+    FROM m
+    WHERE NOT EXISTS (
+        SELECT 1 FROM stock_daily sd
+        WHERE sd.trade_date IN (m.trade_date, m.prev_date) AND sd.updated_at > m.built_at
+    )
+      AND NOT EXISTS (
+        SELECT 1 FROM technical_daily td
+        WHERE td.trade_date IN (m.trade_date, m.prev_date) AND td.updated_at > m.built_at
+    )
+      AND NOT EXISTS (
+        SELECT 1 FROM raw_tushare_daily_basic db
+        WHERE db.trade_date = TO_CHAR(m.trade_date, 'YYYYMMDD') AND db.fetched_at > m.built_at
+    )
+      AND NOT EXISTS (
+        SELECT 1 FROM fin_changed f
+        WHERE f.ann_date <= m.trade_date AND f.updated_at > m.built_at
+    )
+      AND NOT EXISTS (
+        SELECT 1 FROM market_snapshot_daily ms
+        JOIN stocks s ON s.ts_code = ms.ts_code
+        WHERE ms.trade_date = m.trade_date
+          AND ({", ".join(f"ms.{c}" for c in _STOCK_COLUMNS)})
+              IS DISTINCT FROM ({", ".join(f"s.{c}" for c in _STOCK_COLUMNS)})
+    )
+"""
+
+
+async def snapshot_exists(session: AsyncSession, trade_date: date) -> bool:
+    """指定交易日的快照是否已构建。"""
+    result = await session.execute(
+        text("SELECT 1 FROM market_snapshot_daily WHERE trade_date = :trade_date LIMIT 1"),
+        {"trade_date": trade_date},
+    )
+    return result.scalar() is not None
+
+
+async def fresh_snapshot_dates(session: AsyncSession, trade_dates: list[date]) -> set[date]:
+    """返回快照可用的交易日：已构建，且构建后各来源表（见 _FRESH_DATES_SQL）未被改写。
+
+    Args:
+        session: 数据库会话
+        trade_dates: 待检查的交易日
+
+    Returns:
+        快照可直接读取的交易日集合；未构建或已过期的日期不在其中
+    """
+    if not trade_dates:
+        return set()
+    result = await session.execute(text(_FRESH_DATES_SQL), {"dates": list(trade_dates)})
+    fresh = {r[0] for r in result.fetchall()}
+    stale = len(trade_dates) - len(fresh)
+    if stale:
+        logger.debug("[市场快照] %d 个交易日未构建或已过期", stale)
+    return fresh
+
+
+async def snapshot_fresh(session: AsyncSession, trade_date: date) -> bool:
+    """指定交易日的快照是否可用（已构建且未过期），见 fresh_snapshot_dates。"""
+    return trade_date in await fresh_snapshot_dates(session, [trade_date])
+
+
+async def build_market_snapshot(
+    session_factory: async_sessionmaker[AsyncSession],
+    trade_date: date,
+) -> dict:
+    """重建指定交易日的市场快照（先删后插，同一事务内完成）。
+
+    Args:
+        session_factory: 异步数据库会话工厂
+        trade_date: 交易日
+
+    Returns:
+        {"trade_date": date, "rows": int, "elapsed_seconds": float}
+    """
+    start = time.monotonic()
+    async with session_factory() as session:
+        await session.execute(
+            text("DELETE FROM market_snapshot_daily WHERE trade_date = :trade_date"),
+            {"trade_date": trade_date},
+        )
+        result = await session.execute(text(_BUILD_SQL), {
+            "trade_date": trade_date,
+            "trade_date_str": trade_date.strftime("%Y%m%d"),
+        })
+        await session.commit()
+
+    rows = result.rowcount or 0
+    elapsed = round(time.monotonic() - start, 2)
+    logger.info("[市场快照] %s 构建完成：%d 行，耗时 %.2fs", trade_date, rows, elapsed)
+    return {"trade_date": trade_date, "rows": rows, "elapsed_seconds": elapsed}
+
+
+async def build_market_snapshot_range(
+    session_factory: async_sessionmaker[AsyncSession],
+    trade_dates: list[date],
+) -> dict:
+    """逐日构建多个交易日的快照（历史回补，供参数优化等按历史日期运行的场景使用）。
+
+    Args:
+        session_factory: 异步数据库会话工厂
+        trade_dates: 交易日列表
+
+    Returns:
+        {"success": int, "failed": int, "failed_dates": [date], "rows": int}
+    """
+    success, rows, failed_dates = 0, 0, []
+    for td in trade_dates:
+        try:
+            result = await build_market_snapshot(session_factory, td)
+        except Exception as e:
+            logger.warning("[市场快照] %s 构建失败: %s", td, e)
+            failed_dates.append(td)
+            continue
+        success += 1
+        rows += result["rows"]
+    return {"success": success, "failed": len(failed_dates), "failed_dates": failed_dates, "rows": rows}
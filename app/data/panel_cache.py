@@ -0,0 +1,418 @@
+"""内存映射的 date × stock 行情面板缓存。
+
+将优化器/回测所需的全市场日线字段保存为固定形状的数组：
+    {panel_cache_dir}/index.json                 # 索引：当前版本、交易日、股票代码、字段 dtype
+    {panel_cache_dir}/{version}/{field}.npy      # (交易日数, 股票数) 数组
+    {panel_cache_dir}/{version}/valid.npy        # 当日是否有行情（vol > 0）
+
+股票代码按首次出现顺序分配固定的整数 ID（只追加，不重排），价格类字段为
+float64（与 _preload_market_data 的 float(Decimal) 逐位一致，阈值比较不因精度翻转）、
+成交量为 int64。读取使用 np.load(mmap_mode="r")，多个优化进程通过
+操作系统页缓存只读共享同一份数据，加载耗时与数据量无关。
+
+增量更新只从数据库拉取缓存最后一个交易日（含，覆盖可能不完整的当日数据）
+之后的行情，写入新版本目录后原子切换 index.json；已映射旧版本的进程不受影响。
+历史行情被改写（复权因子重算、补数、全量重算指标）时由写入路径调用
+invalidate_panel_cache 标记起始日，下次更新从该日起重新拉取；每次更新还会比对
+stocks 的上市状态，已退市/暂停的股票整列置为无行情，重新上市的股票触发全量重建。
+
+PanelMarketData 将面板包装为 {date: {ts_code: {...}}} 只读映射，
+与 _preload_market_data 返回的嵌套字典接口兼容。
+"""
+
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 字段 → dtype（与 _preload_market_data 的字段一致）
+PANEL_FIELDS: dict[str, str] = {
+    "close": "float64", "open": "float64", "high": "float64", "low": "float64",
+    "vol": "int64", "pct_chg": "float64", "turnover_rate": "float64",
+    "vol_ratio": "float64", "ma10": "float64", "ma20": "float64",
+}
+
+_INDEX = "index.json"
+
+_FETCH_SQL = """
+    SELECT sd.trade_date, sd.ts_code, sd.close, sd.open,
+           sd.high, sd.low, sd.vol, sd.pct_chg, sd.turnover_rate,
+           td.vol_ratio, td.ma10, td.ma20
+    FROM stock_daily sd
+    JOIN stocks s ON sd.ts_code = s.ts_code AND s.list_status='L'
+    LEFT JOIN technical_daily td
+        ON sd.ts_code=td.ts_code AND sd.trade_date=td.trade_date
+    WHERE sd.trade_date BETWEEN :start AND :end AND sd.vol > 0
+"""
+
+_LISTED_SQL = "SELECT ts_code FROM stocks WHERE list_status = 'L'"
+
+# 新进入上市列表的股票在缓存区间内是否已有行情（走 (ts_code, trade_date) 索引）
+_HAS_HISTORY_SQL = """
+    SELECT DISTINCT ts_code FROM stock_daily
+    WHERE ts_code = ANY(CAST(:codes AS text[]))
+      AND trade_date BETWEEN :start AND :end AND vol > 0
+"""
+
+
+@dataclass
+class MarketPanel:
+    """date × stock 行情面板。
+
+    Attributes:
+        dates: 交易日数组，datetime64[D]，升序
+        codes: 股票代码列表，下标即股票 ID
+        fields: 字段名 → (len(dates), len(codes)) 数组
+        valid: (len(dates), len(codes)) 布尔数组，当日是否有行情
+    """
+
+    dates: np.ndarray
+    codes: list[str]
+    fields: dict[str, np.ndarray]
+    valid: np.ndarray
+
+    def __post_init__(self) -> None:
+        self.code_index = {c: i for i, c in enumerate(self.codes)}
+        self._date_index = {d: i for i, d in enumerate(self.dates.astype(object))}
+
+    def row(self, d: date) -> int | None:
+        """交易日对应的行号，不存在时返回 None。"""
+        return self._date_index.get(d)
+
+    def slice_dates(self, start: date, end: date) -> "MarketPanel":
+        """截取 [start, end] 区间（返回视图，不复制数据）。"""
+        lo = int(np.searchsorted(self.dates, np.datetime64(start, "D"), side="left"))
+        hi = int(np.searchsorted(self.dates, np.datetime64(end, "D"), side="right"))
+        return MarketPanel(
+            dates=self.dates[lo:hi],
+            codes=self.codes,
+            fields={k: v[lo:hi] for k, v in self.fields.items()},
+            valid=self.valid[lo:hi],
+        )
+
+
+# ============================================================
+# 构建与合并
+# ============================================================
+
+
+def merge_panel(
+    old: MarketPanel | None, df: pd.DataFrame, drop_codes: set[str] | None = None,
+) -> MarketPanel:
+    """将新拉取的长表行情合并进面板。
+
+    df 中出现的交易日及之后的旧行会被替换；新股票追加到代码表末尾，
+    已有股票 ID 保持不变。
+
+    Args:
+        old: 已有面板，None 表示全新构建
+        df: 长表行情（trade_date, ts_code 及 PANEL_FIELDS 各列）
+        drop_codes: 不再上市的股票，所有交易日置为无行情（ID 保留）
+
+    Returns:
+        合并后的新面板（内存数组）
+    """
+    new_dates = np.unique(np.asarray(pd.to_datetime(df["trade_date"]).to_numpy(), dtype="datetime64[D]"))
+    if old is not None and len(new_dates):
+        keep = int(np.searchsorted(old.dates, new_dates[0], side="left"))
+    else:
+        keep = 0 if old is None else len(old.dates)
+
+    codes = list(old.codes) if old is not None else []
+    code_index = {c: i for i, c in enumerate(codes)}
+    for c in sorted(set(df["ts_code"]) - set(code_index)):
+        code_index[c] = len(codes)
+        codes.append(c)
+
+    dates = np.concatenate([old.dates[:keep], new_dates]) if old is not None else new_dates
+    n_dates, n_codes = len(dates), len(codes)
+    n_old_codes = len(old.codes) if old is not None else 0
+
+    fields: dict[str, np.ndarray] = {}
+    valid = np.zeros((n_dates, n_codes), dtype=bool)
+    if old is not None:
+        valid[:keep, :n_old_codes] = old.valid[:keep]
+
+    rows = np.searchsorted(dates, np.asarray(pd.to_datetime(df["trade_date"]).to_numpy(), dtype="datetime64[D]"))
+    cols = df["ts_code"].map(code_index).to_numpy()
+    valid[rows, cols] = True
+    if drop_codes:
+        valid[:, [code_index[c] for c in drop_codes if c in code_index]] = False
+
+    for name, dtype in PANEL_FIELDS.items():
+        arr = np.zeros((n_dates, n_codes), dtype=dtype)
+        if old is not None:
+            arr[:keep, :n_old_codes] = old.fields[name][:keep]
+        values = pd.to_numeric(df[name]).astype(float).fillna(0.0).to_numpy()
+        arr[rows, cols] = values.astype(dtype) if dtype != "int64" else values.astype(np.int64)
+        fields[name] = arr
+
+    return MarketPanel(dates=dates, codes=codes, fields=fields, valid=valid)
+
+
+# ============================================================
+# 持久化
+# ============================================================
+
+
+def _cache_dir(cache_dir: str | Path | None) -> Path:
+    return Path(cache_dir or settings.panel_cache_dir)
+
+
+def _read_index(root: Path) -> dict:
+    path = root / _INDEX
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def write_panel_cache(
+    panel: MarketPanel,
+    cache_dir: str | Path | None = None,
+    listed: list[str] | None = None,
+    invalidated_from: date | None = None,
+) -> Path:
+    """将面板写入新版本目录并原子切换索引，清理旧版本。
+
+    Args:
+        panel: 面板
+        cache_dir: 缓存目录
+        listed: 构建时的上市股票列表（供下次更新比对上市状态）
+        invalidated_from: 尚未处理的失效起始日（写入期间新产生的标记）
+    """
+    root = _cache_dir(cache_dir)
+    version = datetime.now().strftime("%Y%m%d%H%M%S") + "-" + uuid.uuid4().hex[:6]
+    vdir = root / version
+    vdir.mkdir(parents=True, exist_ok=True)
+
+    for name, arr in panel.fields.items():
+        np.save(vdir / f"{name}.npy", np.ascontiguousarray(arr))
+    np.save(vdir / "valid.npy", np.ascontiguousarray(panel.valid))
+
+    index = {
+        "version": version,
+        "dates": [str(d) for d in panel.dates],
+        "codes": panel.codes,
+        "fields": PANEL_FIELDS,
+        "listed": sorted(listed) if listed is not None else None,
+        "invalidated_from": invalidated_from.isoformat() if invalidated_from else None,
+        "updated_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    tmp = root / f"{_INDEX}.tmp"
+    tmp.write_text(json.dumps(index), encoding="utf-8")
+    os.replace(tmp, root / _INDEX)
+
+    # 已映射旧版本的进程仍持有文件句柄，删除目录不影响其读取
+    for child in root.iterdir():
+        if child.is_dir() and child.name != version:
+            shutil.rmtree(child, ignore_errors=True)
+    return vdir
+
+
+def load_panel_cache(cache_dir: str | Path | None = None) -> MarketPanel | None:
+    """以内存映射方式只读加载面板缓存，缓存不存在或不完整时返回 None。"""
+    index = _read_index(_cache_dir(cache_dir))
+    if index.get("fields") != PANEL_FIELDS:
+        return None
+    root = _cache_dir(cache_dir)
+
+    vdir = root / index["version"]
+    shape = (len(index["dates"]), len(index["codes"]))
+    try:
+        fields = {name: np.load(vdir / f"{name}.npy", mmap_mode="r") for name in PANEL_FIELDS}
+        valid = np.load(vdir / "valid.npy", mmap_mode="r")
+    except FileNotFoundError:
+        return None
+    if valid.shape != shape or any(a.shape != shape for a in fields.values()):
+        logger.warning("[面板缓存] 数组形状与索引不一致，忽略缓存：%s", vdir)
+        return None
+
+    return MarketPanel(
+        dates=np.array(index["dates"], dtype="datetime64[D]"),
+        codes=index["codes"],
+        fields=fields,
+        valid=valid,
+    )
+
+
+def invalidate_panel_cache(start: date, cache_dir: str | Path | None = None) -> bool:
+    """标记 start 及之后的缓存行情已被改写，下次 update_panel_cache 从该日起重新拉取。
+
+    只修改索引，不访问数据库；缓存不存在时不做任何事。索引写入失败只记录告警。
+
+    Returns:
+        是否写入了新的标记
+    """
+    root = _cache_dir(cache_dir)
+    try:
+        index = _read_index(root)
+        if not index:
+            return False
+        current = index.get("invalidated_from")
+        if current and date.fromisoformat(current) <= start:
+            return False
+        index["invalidated_from"] = start.isoformat()
+        tmp = root / f"{_INDEX}.tmp"
+        tmp.write_text(json.dumps(index), encoding="utf-8")
+        os.replace(tmp, root / _INDEX)
+    except (OSError, ValueError) as e:
+        logger.warning("[面板缓存] 标记失效失败：%s", e)
+        return False
+    logger.info("[面板缓存] 标记 %s 之后的行情待重新拉取", start)
+    return True
+
+
+async def update_panel_cache(
+    session: AsyncSession,
+    start_date: date,
+    end_date: date,
+    cache_dir: str | Path | None = None,
+    full_rebuild: bool = False,
+) -> MarketPanel:
+    """确保缓存覆盖 [start_date, end_date]，按日期增量更新后返回该区间的面板。
+
+    缓存起始日晚于 start_date、重新上市的股票在缓存区间内已有行情或 full_rebuild=True
+    时全量重建；否则拉取缓存最后一个交易日（含）与失效标记日两者中较早者到 end_date
+    的行情，并将已不在上市列表中的股票整列置为无行情。
+
+    Args:
+        session: 数据库会话
+        start_date: 需要覆盖的起始日期
+        end_date: 需要覆盖的结束日期
+        cache_dir: 缓存目录，默认 settings.panel_cache_dir
+        full_rebuild: 是否强制全量重建
+
+    Returns:
+        [start_date, end_date] 区间的面板（内存映射视图）
+    """
+    t0 = time.monotonic()
+    root = _cache_dir(cache_dir)
+    index = _read_index(root)
+    cached = None if full_rebuild else load_panel_cache(cache_dir)
+    if cached is not None and len(cached.dates) and cached.dates[0] > np.datetime64(start_date, "D"):
+        cached = None
+    if cached is not None and index.get("listed") is None:
+        cached = None
+
+    listed = [r[0] for r in (await session.execute(text(_LISTED_SQL))).all()]
+    invalidated = index.get("invalidated_from")
+    drop_codes: set[str] = set()
+    fetch_end = end_date
+    if cached is not None and len(cached.dates):
+        cache_start = cached.dates[0].astype(object)
+        fetch_start = cached.dates[-1].astype(object)
+        # 从失效日重新拉取时覆盖到缓存末尾，避免截断 end_date 之后已缓存的行情
+        fetch_end = max(end_date, fetch_start)
+        if invalidated:
+            fetch_start = max(min(fetch_start, date.fromisoformat(invalidated)), cache_start)
+        cached_listed = set(index["listed"])
+        drop_codes = cached_listed - set(listed)
+        relisted = sorted(set(listed) - cached_listed)
+        if relisted and fetch_start > cache_start:
+            r = await session.execute(text(_HAS_HISTORY_SQL), {
+                "codes": relisted, "start": cache_start, "end": fetch_start - timedelta(days=1),
+            })
+            if r.all():
+                cached = None
+    else:
+        cached = None
+    if cached is None:
+        fetch_start, fetch_end = start_date, end_date
+        drop_codes = set()
+    mode = "全量" if cached is None else "增量"
+
+    if cached is None or fetch_start <= end_date or invalidated or drop_codes:
+        r = await session.execute(text(_FETCH_SQL), {"start": fetch_start, "end": fetch_end})
+        df = pd.DataFrame(
+            r.all(),
+            columns=["trade_date", "ts_code", *PANEL_FIELDS],
+        )
+        if cached is None or not df.empty or drop_codes or invalidated:
+            # 拉取期间新产生的失效标记保留到下次更新
+            pending = _read_index(root).get("invalidated_from")
+            write_panel_cache(
+                merge_panel(cached, df, drop_codes), cache_dir, listed=listed,
+                invalidated_from=date.fromisoformat(pending) if pending and pending != invalidated else None,
+            )
+            cached = load_panel_cache(cache_dir)
+        logger.info(
+            "[面板缓存] %s更新：%s ~ %s，%d 行，下架 %d 只，耗时 %.1fs",
+            mode, fetch_start, fetch_end, len(df), len(drop_codes), time.monotonic() - t0,
+        )
+
+    return cached.slice_dates(start_date, end_date)
+
+
+# ============================================================
+# 嵌套字典兼容视图
+# ============================================================
+
+
+class _DayView(Mapping):
+    """单个交易日的 {ts_code: {字段: 值}} 只读视图（按需构造字典）。"""
+
+    def __init__(self, panel: MarketPanel, row: int, order: np.ndarray) -> None:
+        self._panel = panel
+        self._row = row
+        self._order = order
+
+    def __getitem__(self, code: str) -> dict:
+        j = self._panel.code_index.get(code)
+        if j is None or not self._panel.valid[self._row, j]:
+            raise KeyError(code)
+        out = {
+            name: float(arr[self._row, j]) for name, arr in self._panel.fields.items()
+        }
+        out["vol"] = int(self._panel.fields["vol"][self._row, j])
+        return out
+
+    def __iter__(self) -> Iterator[str]:
+        valid = self._panel.valid[self._row]
+        codes = self._panel.codes
+        return (codes[j] for j in self._order if valid[j])
+
+    def __len__(self) -> int:
+        return int(self._panel.valid[self._row].sum())
+
+
+class PanelMarketData(Mapping):
+    """{date: {ts_code: {...}}} 只读视图，与 _preload_market_data 的结果接口兼容。
+
+    股票按代码排序迭代，与按 ts_code 排序的 SQL 结果一致。
+    """
+
+    def __init__(self, panel: MarketPanel) -> None:
+        self.panel = panel
+        self._order = np.argsort(np.asarray(panel.codes, dtype=object)) if panel.codes else np.array([], dtype=int)
+
+    def __getitem__(self, d: date) -> _DayView:
+        row = self.panel.row(d)
+        if row is None:
+            raise KeyError(d)
+        return _DayView(self.panel, row, self._order)
+
+    def __iter__(self) -> Iterator[date]:
+        return iter(self.panel.dates.astype(object))
+
+    def __len__(self) -> int:
+        return len(self.panel.dates)
+
+    def codes_where(self, mask: np.ndarray) -> list[str]:
+        """返回单行布尔掩码中为 True 的股票代码（按代码排序）。"""
+        codes = self.panel.codes
+        return [codes[j] for j in self._order if mask[j]]
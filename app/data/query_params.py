@@ -0,0 +1,35 @@
+"""集合参数的查询辅助。
+
+按代码集合过滤时，不再为每个 ts_code 生成一个占位符（IN (:c0, :c1, ..., :cN)）：
+5,000 只股票意味着 5,000 个绑定参数、每次 SQL 文本都不同，asyncpg 的预编译语句
+缓存无法命中，服务端每次都要重新解析和规划。整个集合改为作为一个数组参数绑定，
+`col = ANY(CAST(:codes AS text[]))`，SQL 文本固定，可复用预编译语句。
+
+使用示例：
+    sql = f"SELECT ... FROM stock_daily WHERE {any_array('ts_code')}"
+    await session.execute(text(sql), {"codes": codes})
+
+    select(StockDaily).where(any_of(StockDaily.ts_code, codes))
+"""
+
+from collections.abc import Iterable
+
+from sqlalchemy import any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def any_array(column: str, param: str = "codes", sql_type: str = "text") -> str:
+    """生成 `column = ANY(CAST(:param AS sql_type[]))` 条件片段。
+
+    Args:
+        column: 列表达式（可带表别名，如 "td.ts_code"）
+        param: 绑定参数名，执行时传入 list
+        sql_type: 数组元素的 SQL 类型（text / int / date ...）
+    """
+    return f"{column} = ANY(CAST(:{param} AS {sql_type}[]))"
+
+
+def any_of(column: ColumnElement, values: Iterable) -> ColumnElement:
+    """ORM 版本：`column = ANY(:param)`，整个集合作为一个数组参数（替代 column.in_(values)）。"""
+    return column == any_(bindparam(None, list(values), type_=ARRAY(column.type)))
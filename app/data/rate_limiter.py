@@ -0,0 +1,369 @@
+"""Tushare 自适应限流器（AIMD + 每接口并发 + 跨进程共享）。
+
+每个接口维护一个 60 秒滑动窗口和当前速率上限（次/分钟）：
+- 加性增：每放行一次调用，速率增加 AI_STEP / rate（满负荷时约每分钟 +AI_STEP），
+  不超过配置的上限（_API_RATE_LIMITS 或 tushare_qps_limit）
+- 乘性减：遇到 "每分钟最多访问" 限流错误时速率乘以 MD_FACTOR，
+  COOLDOWN 秒内的重复限流只计数不再下调（避免多个进程同时触发时叠加下调）
+- 并发：每个接口独立的 asyncio.Semaphore 控制在途请求数，
+  不再用一把锁串行所有调用方
+
+窗口与速率状态存放在后端中，多个进程（调度器、CLI 回填、API 触发的同步）
+共享同一份配额：
+- local：进程内存（仅单进程）
+- file：本机 JSON 状态文件 + fcntl 文件锁（默认）
+- redis：Redis 有序集合 + Lua 脚本原子放行（多机部署）
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import time
+import uuid
+from pathlib import Path
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 60.0
+AI_STEP = 10.0          # 满负荷时每分钟加性增量（次/分钟）
+MD_FACTOR = 0.5         # 限流时乘性减系数
+MIN_RATE = 1.0          # 速率下限（次/分钟）
+COOLDOWN = 5.0          # 乘性减冷却时间（秒）
+
+
+# ============================================================
+# 窗口状态（local / file 后端共用）
+# ============================================================
+
+
+def _new_state(ceiling: float) -> dict:
+    return {"rate": ceiling, "calls": [], "throttled": 0, "cut_at": 0.0, "learned": None}
+
+
+def _admit(state: dict, now: float, ceiling: float) -> float:
+    """尝试在窗口内放行一次调用。
+
+    Returns:
+        0 表示已放行；否则为需要等待的秒数
+    """
+    state["rate"] = min(state["rate"], ceiling)
+    calls = [t for t in state["calls"] if t > now - WINDOW_SECONDS]
+    state["calls"] = calls
+    if len(calls) < max(1, math.floor(state["rate"])):
+        calls.append(now)
+        state["rate"] = min(ceiling, state["rate"] + AI_STEP / max(state["rate"], 1.0))
+        return 0.0
+    # 等到窗口内最早的一次调用滑出；速率下调后可能需要滑出多次
+    excess = len(calls) - max(1, math.floor(state["rate"]))
+    return max(calls[excess] + WINDOW_SECONDS - now, 0.01)
+
+
+def _cut(state: dict, now: float) -> None:
+    """乘性减（冷却期内只计数）。"""
+    state["throttled"] += 1
+    if now - state["cut_at"] >= COOLDOWN:
+        state["learned"] = state["rate"]
+        state["rate"] = max(MIN_RATE, state["rate"] * MD_FACTOR)
+        state["cut_at"] = now
+
+
+def _usage(state: dict, now: float) -> int:
+    return sum(1 for t in state["calls"] if t > now - WINDOW_SECONDS)
+
+
+# ============================================================
+# 后端
+# ============================================================
+
+
+class _LocalBackend:
+    """进程内状态。"""
+
+    def __init__(self) -> None:
+        self._states: dict[str, dict] = {}
+
+    def _state(self, api: str, ceiling: float) -> dict:
+        if api not in self._states:
+            self._states[api] = _new_state(ceiling)
+        return self._states[api]
+
+    async def admit(self, api: str, ceiling: float) -> float:
+        return _admit(self._state(api, ceiling), time.time(), ceiling)
+
+    async def throttle(self, api: str, ceiling: float) -> float:
+        state = self._state(api, ceiling)
+        _cut(state, time.time())
+        return state["rate"]
+
+    async def states(self) -> dict[str, dict]:
+        return {api: dict(s) for api, s in self._states.items()}
+
+
+class _FileBackend:
+    """本机跨进程共享：单个 JSON 状态文件，读改写在 fcntl 排他锁内完成。"""
+
+    def __init__(self, directory: str | Path) -> None:
+        self._dir = Path(directory)
+        self._path = self._dir / "tushare_rate_limit.json"
+        self._lock_path = self._dir / "tushare_rate_limit.lock"
+
+    def _transact(self, fn):
+        import fcntl
+
+        self._dir.mkdir(parents=True, exist_ok=True)
+        with open(self._lock_path, "a+") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                try:
+                    data = json.loads(self._path.read_text(encoding="utf-8"))
+                except (FileNotFoundError, json.JSONDecodeError):
+                    data = {}
+                result = fn(data)
+                self._path.write_text(json.dumps(data), encoding="utf-8")
+                return result
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    async def admit(self, api: str, ceiling: float) -> float:
+        def _fn(data: dict) -> float:
+            state = data.setdefault(api, _new_state(ceiling))
+            return _admit(state, time.time(), ceiling)
+
+        return await asyncio.to_thread(self._transact, _fn)
+
+    async def throttle(self, api: str, ceiling: float) -> float:
+        def _fn(data: dict) -> float:
+            state = data.setdefault(api, _new_state(ceiling))
+            _cut(state, time.time())
+            return state["rate"]
+
+        return await asyncio.to_thread(self._transact, _fn)
+
+    async def states(self) -> dict[str, dict]:
+        return await asyncio.to_thread(self._transact, lambda data: json.loads(json.dumps(data)))
+
+
+# KEYS[1]=调用窗口 zset, KEYS[2]=状态 hash；ARGV: now, window, ceiling, ai_step, member
+_REDIS_ADMIT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local ceiling = tonumber(ARGV[3])
+local rate = tonumber(redis.call('HGET', KEYS[2], 'rate') or ceiling)
+if rate > ceiling then rate = ceiling end
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local n = redis.call('ZCARD', KEYS[1])
+local limit = math.max(1, math.floor(rate))
+if n < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[5])
+    redis.call('EXPIRE', KEYS[1], math.ceil(window * 2))
+    rate = math.min(ceiling, rate + tonumber(ARGV[4]) / math.max(rate, 1))
+    redis.call('HSET', KEYS[2], 'rate', tostring(rate))
+    return '0'
+end
+local oldest = redis.call('ZRANGE', KEYS[1], n - limit, n - limit, 'WITHSCORES')
+return tostring(math.max(tonumber(oldest[2]) + window - now, 0.01))
+"""
+
+# KEYS[1]=状态 hash；ARGV: now, ceiling, factor, min_rate, cooldown
+_REDIS_THROTTLE = """
+local now = tonumber(ARGV[1])
+local rate = tonumber(redis.call('HGET', KEYS[1], 'rate') or ARGV[2])
+local cut_at = tonumber(redis.call('HGET', KEYS[1], 'cut_at') or 0)
+redis.call('HINCRBY', KEYS[1], 'throttled', 1)
+if now - cut_at >= tonumber(ARGV[5]) then
+    redis.call('HSET', KEYS[1], 'learned', tostring(rate))
+    rate = math.max(tonumber(ARGV[4]), rate * tonumber(ARGV[3]))
+    redis.call('HSET', KEYS[1], 'rate', tostring(rate), 'cut_at', tostring(now))
+end
+return tostring(rate)
+"""
+
+
+class _RedisBackend:
+    """多机共享：Redis 有序集合记录窗口内调用，Lua 脚本保证放行原子性。"""
+
+    _PREFIX = "tushare:rl"
+
+    def __init__(self, client=None) -> None:
+        self._client = client
+        self._apis: set[str] = set()
+
+    def _redis(self):
+        if self._client is None:
+            import redis.asyncio as aioredis
+
+            from app.cache.redis_client import redis_url
+
+            self._client = aioredis.from_url(redis_url(), socket_timeout=5.0)
+        return self._client
+
+    def _keys(self, api: str) -> tuple[str, str]:
+        return f"{self._PREFIX}:{api}:calls", f"{self._PREFIX}:{api}:state"
+
+    async def admit(self, api: str, ceiling: float) -> float:
+        self._apis.add(api)
+        calls_key, state_key = self._keys(api)
+        wait = await self._redis().eval(
+            _REDIS_ADMIT, 2, calls_key, state_key,
+            time.time(), WINDOW_SECONDS, ceiling, AI_STEP, uuid.uuid4().hex,
+        )
+        return float(wait)
+
+    async def throttle(self, api: str, ceiling: float) -> float:
+        _, state_key = self._keys(api)
+        rate = await self._redis().eval(
+            _REDIS_THROTTLE, 1, state_key,
+            time.time(), ceiling, MD_FACTOR, MIN_RATE, COOLDOWN,
+        )
+        return float(rate)
+
+    async def states(self) -> dict[str, dict]:
+        client = self._redis()
+        now = time.time()
+        out: dict[str, dict] = {}
+        for api in sorted(self._apis):
+            calls_key, state_key = self._keys(api)
+            raw = await client.hgetall(state_key)
+            state = {
+                (k.decode() if isinstance(k, bytes) else k): float(v) for k, v in raw.items()
+            }
+            used = await client.zcount(calls_key, now - WINDOW_SECONDS, "+inf")
+            out[api] = {
+                "rate": state.get("rate"),
+                "calls": [now] * int(used),
+                "throttled": int(state.get("throttled", 0)),
+                "learned": state.get("learned"),
+            }
+        return out
+
+
+def _make_backend(name: str):
+    if name == "local":
+        return _LocalBackend()
+    if name == "redis":
+        return _RedisBackend()
+    if name == "file":
+        return _FileBackend(settings.tushare_rate_limit_dir)
+    raise ValueError(f"未知的限流后端: {name}（可选 local/file/redis）")
+
+
+# ============================================================
+# 限流器
+# ============================================================
+
+
+class AdaptiveRateLimiter:
+    """按接口自适应限流 + 并发控制。
+
+    Args:
+        default_rate: 未单独配置接口的速率上限（次/分钟）
+        api_rates: 接口 → 速率上限（次/分钟）
+        max_concurrency: 每个接口的默认最大在途请求数
+        api_concurrency: 接口 → 最大在途请求数
+        backend: "local" / "file" / "redis"
+    """
+
+    def __init__(
+        self,
+        default_rate: float,
+        api_rates: dict[str, float] | None = None,
+        max_concurrency: int = 8,
+        api_concurrency: dict[str, int] | None = None,
+        backend: str = "file",
+    ) -> None:
+        self._default_rate = float(default_rate)
+        self._api_rates = dict(api_rates or {})
+        self._max_concurrency = max_concurrency
+        self._api_concurrency = dict(api_concurrency or {})
+        self._backend = _make_backend(backend)
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._in_flight: dict[str, int] = {}
+
+    def ceiling(self, api: str) -> float:
+        """接口的速率上限（次/分钟）。"""
+        return float(self._api_rates.get(api, self._default_rate))
+
+    def concurrency(self, api: str) -> int:
+        """接口的最大在途请求数。"""
+        return self._api_concurrency.get(api, self._max_concurrency)
+
+    def _semaphore(self, api: str) -> asyncio.Semaphore:
+        if api not in self._semaphores:
+            self._semaphores[api] = asyncio.Semaphore(self.concurrency(api))
+        return self._semaphores[api]
+
+    def slot(self, api: str) -> _Slot:
+        """获取一个调用名额：占用并发槽位，并等待窗口放行。
+
+        用法::
+
+            async with limiter.slot("daily"):
+                df = await asyncio.to_thread(pro.query, "daily", ...)
+        """
+        return _Slot(self, api)
+
+    async def _acquire(self, api: str) -> None:
+        ceiling = self.ceiling(api)
+        while (wait := await self._backend.admit(api, ceiling)) > 0:
+            await asyncio.sleep(wait)
+
+    async def on_throttle(self, api: str) -> float:
+        """记录一次限流错误并乘性下调速率。
+
+        Returns:
+            下调后的速率（次/分钟）
+        """
+        rate = await self._backend.throttle(api, self.ceiling(api))
+        logger.warning("[限流] %s 触发 Tushare 限流，速率下调为 %.0f 次/分钟", api, rate)
+        return rate
+
+    async def snapshot(self) -> dict[str, dict]:
+        """导出各接口的限流状态与配额利用率。
+
+        Returns:
+            {api: {rate, ceiling, used_last_minute, utilization, in_flight,
+                   concurrency, throttled, learned_ceiling}}
+        """
+        now = time.time()
+        out: dict[str, dict] = {}
+        for api, state in (await self._backend.states()).items():
+            used = _usage(state, now)
+            rate = state.get("rate") or self.ceiling(api)
+            out[api] = {
+                "rate": round(rate, 1),
+                "ceiling": self.ceiling(api),
+                "used_last_minute": used,
+                "utilization": round(used / self.ceiling(api), 3),
+                "in_flight": self._in_flight.get(api, 0),
+                "concurrency": self.concurrency(api),
+                "throttled": int(state.get("throttled", 0)),
+                "learned_ceiling": state.get("learned"),
+            }
+        return out
+
+
+class _Slot:
+    """AdaptiveRateLimiter.slot() 返回的异步上下文管理器。"""
+
+    def __init__(self, limiter: AdaptiveRateLimiter, api: str) -> None:
+        self._limiter = limiter
+        self._api = api
+        self._sem = limiter._semaphore(api)
+
+    async def __aenter__(self) -> None:
+        await self._sem.acquire()
+        try:
+            await self._limiter._acquire(self._api)
+        except BaseException:
+            self._sem.release()
+            raise
+        self._limiter._in_flight[self._api] = self._limiter._in_flight.get(self._api, 0) + 1
+
+    async def __aexit__(self, *exc) -> None:
+        self._limiter._in_flight[self._api] -= 1
+        self._sem.release()
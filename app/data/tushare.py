@@ -1,7 +1,8 @@
 """Tushare Pro API 客户端。
 
-令牌桶限流 + asyncio.to_thread 异步包装 + 自动重试。
+自适应限流（app.data.rate_limiter）+ asyncio.to_thread 异步包装 + 自动重试。
 实现 DataSourceClient Protocol，同时提供 fetch_raw_* 系列方法获取原始数据。
+可选的本地响应缓存（录制 / 回放）见 app.data.tushare_cache。
 """
 
 from __future__ import annotations
@@ -9,7 +10,6 @@ from __future__ import annotations
 import asyncio
 import logging
 import math
-import time
 from datetime import date
 from decimal import Decimal, InvalidOperation
 from typing import TYPE_CHECKING
@@ -22,53 +22,26 @@ from app.exceptions import DataSourceError
 if TYPE_CHECKING:
     import pandas as pd
 
-logger = logging.getLogger(__name__)
-
+    from app.data.rate_limiter import AdaptiveRateLimiter
+    from app.data.tushare_cache import TushareResponseCache
 
-class _TokenBucket:
-    """令牌桶限流器。
-
-    以固定速率补充令牌，每次 API 调用消耗一个令牌。
-    当令牌不足时异步等待，确保不超过 Tushare 频率限制。
-    """
-
-    def __init__(self, rate_per_minute: int) -> None:
-        self._rate = rate_per_minute / 60.0  # 每秒补充令牌数
-        self._max_tokens = float(rate_per_minute)
-        self._tokens = float(rate_per_minute)  # 初始满桶
-        self._last_refill = time.monotonic()
-        self._lock = asyncio.Lock()
-
-    async def acquire(self) -> None:
-        """获取一个令牌，令牌不足时等待。"""
-        async with self._lock:
-            self._refill()
-            if self._tokens < 1.0:
-                wait_time = (1.0 - self._tokens) / self._rate
-                await asyncio.sleep(wait_time)
-                self._refill()
-            self._tokens -= 1.0
-
-    def _refill(self) -> None:
-        """根据经过的时间补充令牌。"""
-        now = time.monotonic()
-        elapsed = now - self._last_refill
-        self._tokens = min(self._max_tokens, self._tokens + elapsed * self._rate)
-        self._last_refill = now
+logger = logging.getLogger(__name__)
 
 
 class TushareClient:
     """Tushare Pro API 客户端。
 
-    - 令牌桶限流（默认 400 次/分钟，官方限制 500）
-    - 特殊接口独立限流桶（如 limit_list_d 200 次/分钟）
+    - 按接口自适应限流（默认上限 400 次/分钟，官方限制 500），
+      遇到限流错误乘性下调、正常调用加性恢复，配额状态跨进程共享
+    - 特殊接口独立上限（如 limit_list_d 200 次/分钟）和每接口并发数
     - asyncio.to_thread 异步包装（Tushare SDK 是同步的）
     - 指数退避重试，限流错误加长退避
     - 实现 DataSourceClient Protocol 的 4 个方法
     - 提供 fetch_raw_* 系列方法获取原始数据
+    - 可选响应缓存：命中时不消耗限流令牌，回放模式完全离线
     """
 
-    # 特殊限流接口（接口名 → 每分钟次数），未列出的接口使用全局桶
+    # 特殊限流接口（接口名 → 每分钟次数），未列出的接口使用 qps_limit
     _API_RATE_LIMITS: dict[str, int] = {
         "limit_list_d": 180,   # 官方 200 次/分钟，留余量
         "stk_auction": 8,      # 官方 10 次/分钟，留余量
@@ -76,21 +49,40 @@ class TushareClient:
         "ccass_hold": 250,     # 官方 300 次/分钟，留余量
     }
 
+    # 特殊并发接口（接口名 → 最大在途请求数），未列出的接口使用 tushare_max_concurrency
+    _API_CONCURRENCY: dict[str, int] = {
+        "stk_auction": 1,      # 每分钟仅 10 次，串行即可
+    }
+
+    # fetch_raw_frame 的字段映射（接口名 → {API 字段: raw 表字段}），与对应 fetch_raw_* 一致
+    _RAW_FRAME_RENAMES: dict[str, dict[str, str]] = {
+        "suspend_d": {"trade_date": "suspend_date"},
+    }
+
     def __init__(
         self,
         token: str = settings.tushare_token,
         retry_count: int = settings.tushare_retry_count,
         retry_interval: float = settings.tushare_retry_interval,
         qps_limit: int = settings.tushare_qps_limit,
+        cache: TushareResponseCache | None = None,
+        limiter: AdaptiveRateLimiter | None = None,
     ) -> None:
+        from app.data.rate_limiter import AdaptiveRateLimiter
+        from app.data.tushare_cache import TushareResponseCache
+
         self._token = token
         self._retry_count = retry_count
         self._retry_interval = retry_interval
-        self._bucket = _TokenBucket(qps_limit)
-        # 为特殊限流接口创建独立令牌桶
-        self._api_buckets: dict[str, _TokenBucket] = {
-            api: _TokenBucket(rate) for api, rate in self._API_RATE_LIMITS.items()
-        }
+        self._limiter = limiter or AdaptiveRateLimiter(
+            default_rate=qps_limit,
+            api_rates=self._API_RATE_LIMITS,
+            max_concurrency=settings.tushare_max_concurrency,
+            api_concurrency=self._API_CONCURRENCY,
+            backend=settings.tushare_rate_limit_backend,
+        )
+        # 响应缓存（未显式传入时按 settings.tushare_cache_mode 创建，off 时为 None）
+        self._cache = cache if cache is not None else TushareResponseCache.from_settings()
         # 初始化 Tushare Pro API（同步）
         self._pro = ts.pro_api(token)
 
@@ -198,6 +190,25 @@ class TushareClient:
     # fetch_raw_* 系列方法 — 按日期获取全市场原始数据
     # ------------------------------------------------------------------
 
+    async def fetch_raw_frame(self, api_name: str, **kwargs) -> pd.DataFrame:
+        """获取原始数据 DataFrame（不转为 dict 列表），供列式写入 raw 表。
+
+        与同名 fetch_raw_* 方法返回相同的数据与字段名，只是保留 DataFrame 形式，
+        避免 to_dict("records") 及后续逐行清洗的开销。
+
+        Args:
+            api_name: Tushare 接口名称（如 "daily", "limit_list_d"）
+            **kwargs: 接口参数
+
+        Returns:
+            pandas DataFrame（无数据时为空 DataFrame）
+        """
+        df = await self._call(api_name, **kwargs)
+        renames = self._RAW_FRAME_RENAMES.get(api_name)
+        if renames:
+            df = df.rename(columns=renames)
+        return df
+
     async def fetch_raw_stock_basic(self, list_status: str = "L") -> list[dict]:
         """获取股票基础信息原始数据。"""
         df = await self._call(
@@ -526,7 +537,7 @@ class TushareClient:
     # ------------------------------------------------------------------
 
     async def _call(self, api_name: str, **kwargs) -> pd.DataFrame:
-        """调用 Tushare API，带令牌桶限流和重试。
+        """调用 Tushare API，带响应缓存、令牌桶限流和重试。
 
         Args:
             api_name: Tushare 接口名称（如 "daily", "stock_basic"）
@@ -536,27 +547,42 @@ class TushareClient:
             pandas DataFrame
 
         Raises:
-            DataSourceError: 重试耗尽后仍然失败
+            DataSourceError: 重试耗尽后仍然失败，或回放模式下缓存未命中
         """
         import pandas as _pd
 
+        if self._cache is not None:
+            cached = await asyncio.to_thread(self._cache.get, api_name, kwargs)
+            if cached is not None:
+                return cached
+            if self._cache.replay:
+                raise DataSourceError(
+                    f"Tushare {api_name} 回放模式缓存未命中: {kwargs}"
+                )
+
         last_error: Exception | None = None
-        # 优先使用接口专属限流桶，未配置则使用全局桶
-        bucket = self._api_buckets.get(api_name, self._bucket)
         for attempt in range(self._retry_count + 1):
             try:
-                await bucket.acquire()
-                df = await asyncio.to_thread(
-                    self._pro.query, api_name, **kwargs
-                )
+                async with self._limiter.slot(api_name):
+                    df = await asyncio.to_thread(
+                        self._pro.query, api_name, **kwargs
+                    )
                 if df is None:
-                    return _pd.DataFrame()
+                    df = _pd.DataFrame()
+                if self._cache is not None:
+                    try:
+                        await asyncio.to_thread(self._cache.put, api_name, kwargs, df)
+                    except Exception as e:
+                        logger.warning("[Tushare缓存] %s 写入失败: %s", api_name, e)
                 return df
             except Exception as e:
                 last_error = e
+                throttled = "每分钟最多访问" in str(e)
+                if throttled:
+                    await self._limiter.on_throttle(api_name)
                 if attempt < self._retry_count:
                     # 限流错误使用更长退避（15s/30s/45s），确保限流窗口过去
-                    if "每分钟最多访问" in str(e):
+                    if throttled:
                         wait = 15.0 * (attempt + 1)
                     else:
                         wait = self._retry_interval * (2 ** attempt)
@@ -569,6 +595,10 @@ class TushareClient:
             f"Tushare {api_name} 调用失败（重试 {self._retry_count} 次后）: {last_error}"
         ) from last_error
 
+    async def rate_limit_stats(self) -> dict[str, dict]:
+        """各接口限流状态与配额利用率（见 AdaptiveRateLimiter.snapshot）。"""
+        return await self._limiter.snapshot()
+
     @staticmethod
     def _to_decimal(val) -> Decimal | None:
         """将值转换为 Decimal，无效值返回 None。"""
@@ -0,0 +1,204 @@
+"""Tushare 接口响应的本地磁盘缓存（录制 / 回放）。
+
+按 (接口名, 归一化参数) 计算内容地址，将响应 DataFrame 保存为 zstd 压缩的
+Parquet 文件：
+    {tushare_cache_dir}/{api_name}/{key[:2]}/{key}.parquet
+
+文件的 schema metadata 中记录接口名、参数和抓取时间，用于判断新鲜度：
+- 抓取时参数中的日期均已过去（早于抓取日期）：视为不可变，永不过期
+- 抓取时含当天或未来日期：数据可能不完整，SAME_DAY_TTL 秒后过期，
+  直到在数据日期之后重新抓取为止（按抓取日期判断，而不是按读取日期）
+- 当天或未来日期的空响应不写入缓存
+- 按报告期（period）查询的财务数据：可能被修订，PERIOD_TTL 秒后过期
+- 无日期参数的基础信息类接口：REFERENCE_TTL 秒后过期
+
+缓存模式（settings.tushare_cache_mode）：
+- off：不使用缓存（默认）
+- on：命中且新鲜时直接返回，否则请求远端并写入缓存
+- record：总是请求远端并覆盖写入缓存（重新录制）
+- replay：只从缓存读取，不访问网络，未命中时报错（可重复的全流程性能测试）
+
+依赖 pyarrow（uv sync --extra columnar），未安装时缓存自动关闭。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+
+import pandas as pd
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ("off", "on", "record", "replay")
+
+SAME_DAY_TTL = 3600          # 当日数据 1 小时
+PERIOD_TTL = 86400           # 财务报告期数据 1 天
+REFERENCE_TTL = 86400        # 基础信息类数据 1 天
+
+# 视为日期的参数名（YYYYMMDD）
+_DATE_PARAMS = ("trade_date", "start_date", "end_date", "ann_date", "cal_date", "list_date", "delist_date")
+
+_META_KEY = b"tushare_cache"
+
+
+def normalize_params(kwargs: dict) -> dict[str, str]:
+    """归一化接口参数：去掉 None 和空字符串，值转为字符串，按键排序。
+
+    Tushare 对空参数与未传参数的处理相同，归一化后两者命中同一缓存。
+    """
+    return {
+        k: str(v) for k, v in sorted(kwargs.items())
+        if v is not None and v != ""
+    }
+
+
+def cache_key(api_name: str, kwargs: dict) -> str:
+    """(接口名, 归一化参数) 的内容地址（sha256）。"""
+    payload = json.dumps(
+        {"api": api_name, "params": normalize_params(kwargs)},
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _param_dates(params: dict[str, str]) -> list[str]:
+    """参数中的日期值（YYYYMMDD）。"""
+    return [
+        params[k] for k in _DATE_PARAMS
+        if k in params and len(params[k]) == 8 and params[k].isdigit()
+    ]
+
+
+def _not_yet_past(params: dict[str, str], on: date) -> bool:
+    """参数中是否有日期不早于 on（即在 on 当天数据可能尚不完整）。"""
+    dates = _param_dates(params)
+    return bool(dates) and max(dates) >= on.strftime("%Y%m%d")
+
+
+def freshness_ttl(api_name: str, params: dict[str, str], fetched_on: date | None = None) -> float | None:
+    """按接口、参数和抓取日期判断缓存有效期。
+
+    Args:
+        api_name: 接口名
+        params: 归一化后的参数
+        fetched_on: 响应的抓取日期，默认 date.today()
+
+    Returns:
+        有效期秒数，None 表示永不过期
+    """
+    if _param_dates(params):
+        return SAME_DAY_TTL if _not_yet_past(params, fetched_on or date.today()) else None
+    if "period" in params:
+        return PERIOD_TTL
+    return REFERENCE_TTL
+
+
+class TushareResponseCache:
+    """Tushare 响应磁盘缓存。
+
+    Args:
+        root: 缓存根目录
+        mode: 缓存模式，见 CACHE_MODES
+    """
+
+    def __init__(self, root: str | Path, mode: str = "on") -> None:
+        if mode not in CACHE_MODES:
+            raise ValueError(f"未知的 Tushare 缓存模式: {mode}（可选 {', '.join(CACHE_MODES)}）")
+        self.root = Path(root)
+        self.mode = mode
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "writes": 0}
+
+    @classmethod
+    def from_settings(cls) -> TushareResponseCache | None:
+        """按配置创建缓存；未启用或缺少 pyarrow 时返回 None。"""
+        mode = settings.tushare_cache_mode
+        if mode == "off":
+            return None
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            if mode == "replay":
+                raise RuntimeError("Tushare 回放模式需要 pyarrow，请执行 uv sync --extra columnar")
+            logger.warning("[Tushare缓存] 未安装 pyarrow，缓存已关闭")
+            return None
+        return cls(settings.tushare_cache_dir, mode)
+
+    @property
+    def replay(self) -> bool:
+        """是否为回放模式（禁止访问网络）。"""
+        return self.mode == "replay"
+
+    def _path(self, api_name: str, key: str) -> Path:
+        return self.root / api_name / key[:2] / f"{key}.parquet"
+
+    def get(self, api_name: str, kwargs: dict) -> pd.DataFrame | None:
+        """读取缓存响应。
+
+        record 模式总是返回 None；replay 模式忽略新鲜度；
+        on 模式下过期条目视为未命中。
+
+        Returns:
+            缓存的 DataFrame，未命中时返回 None
+        """
+        if self.mode == "record":
+            return None
+        import pyarrow.parquet as pq
+
+        path = self._path(api_name, cache_key(api_name, kwargs))
+        if not path.exists():
+            self.stats["misses"] += 1
+            return None
+
+        table = pq.read_table(path)
+        if self.mode == "on":
+            meta = json.loads((table.schema.metadata or {}).get(_META_KEY, b"{}"))
+            fetched_at = meta.get("fetched_at", 0)
+            ttl = freshness_ttl(api_name, normalize_params(kwargs), date.fromtimestamp(fetched_at))
+            if ttl is not None and time.time() - fetched_at > ttl:
+                self.stats["stale"] += 1
+                return None
+
+        self.stats["hits"] += 1
+        return table.to_pandas()
+
+    def put(self, api_name: str, kwargs: dict, df: pd.DataFrame) -> Path | None:
+        """写入响应（临时文件 + 原子替换）。
+
+        当天或未来日期的空响应（数据可能尚未发布）不写入，返回 None。
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if df.empty and _not_yet_past(normalize_params(kwargs), date.today()):
+            return None
+
+        key = cache_key(api_name, kwargs)
+        path = self._path(api_name, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        meta = {
+            "api": api_name,
+            "params": normalize_params(kwargs),
+            "fetched_at": time.time(),
+            "fetched_at_iso": datetime.now().isoformat(timespec="seconds"),
+        }
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            _META_KEY: json.dumps(meta, ensure_ascii=False).encode("utf-8"),
+        })
+
+        tmp = path.with_name(f".{key}.{uuid.uuid4().hex[:8]}.tmp")
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, path)
+        self.stats["writes"] += 1
+        return path
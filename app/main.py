@@ -152,6 +152,12 @@ async def _cleanup_obsolete_strategy_data(
             .bindparams(bindparam("obsolete_names", expanding=True)),
             {"obsolete_names": obsolete_names},
         ),
+        (
+            "strategy_hit_daily",
+            text("DELETE FROM strategy_hit_daily WHERE strategy_name IN :obsolete_names")
+            .bindparams(bindparam("obsolete_names", expanding=True)),
+            {"obsolete_names": obsolete_names},
+        ),
         (
             "trade_plan_daily_ext",
             text("DELETE FROM trade_plan_daily_ext WHERE source_strategy IN :obsolete_names")
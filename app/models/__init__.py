@@ -13,9 +13,10 @@ from app.models.raw import (
     RawTushareStkLimit,
     RawTushareTradeCal,
 )
+from app.models.snapshot import MarketSnapshotDaily
 from app.models.strategy import DataSourceConfig, MarketRegimeDaily, Strategy
 from app.models.starmap import MacroSignalDaily, SectorResonanceDaily, TradePlanDailyExt
-from app.models.technical import TechnicalDaily
+from app.models.technical import IndicatorState, TechnicalDaily
 
 __all__ = [
     "AIAnalysisResult",
@@ -27,7 +28,9 @@ __all__ = [
     "DataSourceConfig",
     "DragonTiger",
     "FinanceIndicator",
+    "IndicatorState",
     "MarketRegimeDaily",
+    "MarketSnapshotDaily",
     "MoneyFlow",
     "RawTushareAdjFactor",
     "RawTushareDaily",
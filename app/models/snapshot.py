@@ -0,0 +1,92 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Float, Index, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class MarketSnapshotDaily(Base):
+    """每日市场快照：每只股票每个交易日一行的选股特征宽表。
+
+    盘后 ETL 完成后由 app.data.market_snapshot 一次性构建，汇集行情、技术指标、
+    前一交易日滞后值、每日估值与最新一期已公告财务指标。V2 Pipeline Layer 0、
+    V4 日常执行器等直接按 trade_date 读取，无需重复多表 JOIN。
+    数值列统一为双精度，读取后无需 Decimal 转换。
+    """
+
+    __tablename__ = "market_snapshot_daily"
+    __table_args__ = (
+        Index("idx_market_snapshot_trade_date", "trade_date"),
+    )
+
+    ts_code: Mapped[str] = mapped_column(String(16), primary_key=True)
+    trade_date: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    # 股票基础信息（构建当日）
+    name: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    industry: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    market: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    list_status: Mapped[str | None] = mapped_column(String(4), nullable=True)
+    list_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+
+    # 当日行情
+    open: Mapped[float | None] = mapped_column(Float, nullable=True)
+    high: Mapped[float | None] = mapped_column(Float, nullable=True)
+    low: Mapped[float | None] = mapped_column(Float, nullable=True)
+    close: Mapped[float | None] = mapped_column(Float, nullable=True)
+    vol: Mapped[float | None] = mapped_column(Float, nullable=True)
+    amount: Mapped[float | None] = mapped_column(Float, nullable=True)
+    pct_chg: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    # 当日技术指标
+    ma5: Mapped[float | None] = mapped_column(Float, nullable=True)
+    ma10: Mapped[float | None] = mapped_column(Float, nullable=True)
+    ma20: Mapped[float | None] = mapped_column(Float, nullable=True)
+    ma60: Mapped[float | None] = mapped_column(Float, nullable=True)
+    macd_dif: Mapped[float | None] = mapped_column(Float, nullable=True)
+    macd_dea: Mapped[float | None] = mapped_column(Float, nullable=True)
+    macd_hist: Mapped[float | None] = mapped_column(Float, nullable=True)
+    rsi6: Mapped[float | None] = mapped_column(Float, nullable=True)
+    rsi12: Mapped[float | None] = mapped_column(Float, nullable=True)
+    boll_upper: Mapped[float | None] = mapped_column(Float, nullable=True)
+    boll_mid: Mapped[float | None] = mapped_column(Float, nullable=True)
+    boll_lower: Mapped[float | None] = mapped_column(Float, nullable=True)
+    vol_ma5: Mapped[float | None] = mapped_column(Float, nullable=True)
+    vol_ma10: Mapped[float | None] = mapped_column(Float, nullable=True)
+    vol_ratio: Mapped[float | None] = mapped_column(Float, nullable=True)
+    atr14: Mapped[float | None] = mapped_column(Float, nullable=True)
+    high_20: Mapped[float | None] = mapped_column(Float, nullable=True)
+    high_60: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    # 前一交易日滞后值（_prev 后缀）
+    ma5_prev: Mapped[float | None] = mapped_column(Float, nullable=True)
+    ma20_prev: Mapped[float | None] = mapped_column(Float, nullable=True)
+    ma60_prev: Mapped[float | None] = mapped_column(Float, nullable=True)
+    macd_dif_prev: Mapped[float | None] = mapped_column(Float, nullable=True)
+    atr14_prev: Mapped[float | None] = mapped_column(Float, nullable=True)
+    rsi6_prev: Mapped[float | None] = mapped_column(Float, nullable=True)
+    rsi12_prev: Mapped[float | None] = mapped_column(Float, nullable=True)
+    close_prev: Mapped[float | None] = mapped_column(Float, nullable=True)
+    open_prev: Mapped[float | None] = mapped_column(Float, nullable=True)
+    pct_chg_prev: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    # 每日估值（pe_ttm/pb 优先取 daily_basic，缺失时回退到最新财报）
+    turnover_rate: Mapped[float | None] = mapped_column(Float, nullable=True)
+    pe_ttm: Mapped[float | None] = mapped_column(Float, nullable=True)
+    pb: Mapped[float | None] = mapped_column(Float, nullable=True)
+    dividend_yield: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    # 最新一期已公告财务指标（ann_date <= trade_date）
+    roe: Mapped[float | None] = mapped_column(Float, nullable=True)
+    eps: Mapped[float | None] = mapped_column(Float, nullable=True)
+    revenue_yoy: Mapped[float | None] = mapped_column(Float, nullable=True)
+    profit_yoy: Mapped[float | None] = mapped_column(Float, nullable=True)
+    current_ratio: Mapped[float | None] = mapped_column(Float, nullable=True)
+    quick_ratio: Mapped[float | None] = mapped_column(Float, nullable=True)
+    debt_ratio: Mapped[float | None] = mapped_column(Float, nullable=True)
+    gross_margin: Mapped[float | None] = mapped_column(Float, nullable=True)
+    net_margin: Mapped[float | None] = mapped_column(Float, nullable=True)
+    ocf_per_share: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    built_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
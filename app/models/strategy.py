@@ -72,6 +72,7 @@ class StrategyPick(Base):
         Index("idx_picks_strategy_date", "strategy_name", "pick_date"),
         Index("idx_picks_date", "pick_date"),
         Index("idx_picks_code", "ts_code"),
+        Index("idx_picks_updated_at", "updated_at"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -115,3 +116,23 @@ class StrategyHitStat(Base):
     worst_return: Mapped[float | None] = mapped_column(Numeric(10, 4), nullable=True)   # 最差收益率%
 
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+
+class StrategyHitDaily(Base):
+    """策略命中率日汇总：按策略、选股日、周期累计已到期选股的收益。
+
+    compute_hit_stats 只重算有选股记录变化的选股日，滚动窗口内的命中数、
+    收益和直接由本表求和得到。
+    """
+
+    __tablename__ = "strategy_hit_daily"
+
+    strategy_name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    pick_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    period: Mapped[str] = mapped_column(String(8), primary_key=True)       # 1d/3d/5d/10d/20d
+    pick_count: Mapped[int] = mapped_column(Integer, nullable=False)       # 已到期选股数
+    win_count: Mapped[int] = mapped_column(Integer, nullable=False)        # 盈利数（收益>0）
+    return_sum: Mapped[float] = mapped_column(Numeric(20, 4), nullable=False)   # 收益率之和%
+    best_return: Mapped[float | None] = mapped_column(Numeric(10, 4), nullable=True)
+    worst_return: Mapped[float | None] = mapped_column(Numeric(10, 4), nullable=True)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())  # 增量刷新水位
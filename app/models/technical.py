@@ -1,6 +1,7 @@
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Index, Numeric, String, func
+from sqlalchemy import Date, DateTime, Float, Index, Integer, Numeric, String, func
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -66,3 +67,49 @@ class TechnicalDaily(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), onupdate=func.now()
     )
+
+
+class IndicatorState(Base):
+    """技术指标递推状态表。
+
+    每个标的在每张技术指标表上保存一行，记录截至 trade_date 的递推类指标内部状态
+    （EMA/MACD/KDJ/RSI/ATR/OBV）以及窗口类指标续算所需的尾部 K 线，
+    盘后增量更新据此逐日推进一根 K 线，无需回读历史行情。
+    """
+
+    __tablename__ = "indicator_state"
+
+    target_table: Mapped[str] = mapped_column(String(32), primary_key=True)
+    ts_code: Mapped[str] = mapped_column(String(16), primary_key=True)
+    trade_date: Mapped[date] = mapped_column(Date, nullable=False)
+    adj_factor: Mapped[float | None] = mapped_column(Numeric(16, 6), nullable=True)
+    bar_count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # 递推类指标内部状态（双精度，保证续算与全量计算一致）
+    ema12: Mapped[float | None] = mapped_column(Float, nullable=True)
+    ema26: Mapped[float | None] = mapped_column(Float, nullable=True)
+    macd_dea: Mapped[float | None] = mapped_column(Float, nullable=True)
+    kdj_k: Mapped[float | None] = mapped_column(Float, nullable=True)
+    kdj_d: Mapped[float | None] = mapped_column(Float, nullable=True)
+    rsi6_gain: Mapped[float | None] = mapped_column(Float, nullable=True)
+    rsi6_loss: Mapped[float | None] = mapped_column(Float, nullable=True)
+    rsi12_gain: Mapped[float | None] = mapped_column(Float, nullable=True)
+    rsi12_loss: Mapped[float | None] = mapped_column(Float, nullable=True)
+    rsi24_gain: Mapped[float | None] = mapped_column(Float, nullable=True)
+    rsi24_loss: Mapped[float | None] = mapped_column(Float, nullable=True)
+    atr14: Mapped[float | None] = mapped_column(Float, nullable=True)
+    obv: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    # 窗口类指标所需的尾部 K 线（按日期升序，最后一个元素为 trade_date 当日）
+    window_close: Mapped[list[float]] = mapped_column(ARRAY(Float), nullable=False)
+    window_high: Mapped[list[float]] = mapped_column(ARRAY(Float), nullable=False)
+    window_low: Mapped[list[float]] = mapped_column(ARRAY(Float), nullable=False)
+    window_vol: Mapped[list[float]] = mapped_column(ARRAY(Float), nullable=False)
+
+    # 推进到 trade_date 之前的上一根 K 线状态（同上各列，不含本列）；
+    # 同一日期重跑时从该状态重新推进一根 K 线，无需全历史重算
+    prev_state: Mapped[dict | None] = mapped_column(JSONB(none_as_null=True), nullable=True)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now()
+    )
@@ -12,8 +12,9 @@ from datetime import date
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
+from app.data.query_params import any_array
 from app.optimization.param_space import generate_combinations
-from app.strategy.pipeline_v2 import execute_pipeline_v2
+from app.strategy.pipeline_v2 import execute_pipeline_v2, execute_pipeline_v2_batch
 
 logger = logging.getLogger(__name__)
 
@@ -138,20 +139,34 @@ class MarketOptimizer:
         all_returns: list[float] = []
         total_picks = 0
 
-        for target_date in sample_dates:
-            try:
-                pipeline_result = await execute_pipeline_v2(
-                    session_factory=self._session_factory,
-                    target_date=target_date,
-                    trigger_names=[strategy_name],
-                    strategy_params={strategy_name: params} if params else None,
-                    top_n=50,
-                )
-            except Exception as exc:
-                logger.debug("评估失败 date=%s params=%s: %s", target_date, params, exc)
-                continue
+        strategy_params = {strategy_name: params} if params else None
+        try:
+            # 一次加载全部采样日期的 Layer 0 面板，各层策略只执行一次
+            pipeline_results = await execute_pipeline_v2_batch(
+                target_dates=sample_dates,
+                session_factory=self._session_factory,
+                trigger_names=[strategy_name],
+                strategy_params=strategy_params,
+                top_n=50,
+            )
+        except Exception as exc:
+            logger.warning("批量评估失败，回退逐日执行 params=%s: %s", params, exc)
+            pipeline_results = {}
+            for target_date in sample_dates:
+                try:
+                    pipeline_results[target_date] = await execute_pipeline_v2(
+                        session_factory=self._session_factory,
+                        target_date=target_date,
+                        trigger_names=[strategy_name],
+                        strategy_params=strategy_params,
+                        top_n=50,
+                    )
+                except Exception as exc:
+                    logger.debug("评估失败 date=%s params=%s: %s", target_date, params, exc)
 
-            if not pipeline_result.picks:
+        for target_date in sample_dates:
+            pipeline_result = pipeline_results.get(target_date)
+            if pipeline_result is None or not pipeline_result.picks:
                 continue
 
             ts_codes = [pick.ts_code for pick in pipeline_result.picks]
@@ -223,7 +238,7 @@ class MarketOptimizer:
 
             sell_date = future_dates[-1]
             result = await session.execute(
-                text("""
+                text(f"""
                     SELECT
                         b.ts_code,
                         b.close AS buy_close,
@@ -231,7 +246,7 @@ class MarketOptimizer:
                     FROM stock_daily b
                     JOIN stock_daily s ON b.ts_code = s.ts_code AND s.trade_date = :sell_date
                     WHERE b.trade_date = :buy_date
-                      AND b.ts_code = ANY(:codes)
+                      AND {any_array("b.ts_code")}
                       AND b.close > 0
                       AND s.close > 0
                 """),
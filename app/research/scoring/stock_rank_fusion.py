@@ -15,6 +15,7 @@ from datetime import date
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.data.query_params import any_array
 from app.research.scoring.normalize import percentile_rank
 
 logger = logging.getLogger(__name__)
@@ -102,15 +103,13 @@ async def calc_stock_rank_fusion(
 
         # 2. 获取资金流和换手率
         try:
-            placeholders = ",".join([f":c{i}" for i in range(len(codes))])
-            params = {"td": trade_date}
-            params.update({f"c{i}": c for i, c in enumerate(codes)})
+            params = {"td": trade_date, "codes": codes}
 
             rows = await session.execute(
                 text(
                     f"SELECT ts_code, turnover_rate, amount "
                     f"FROM stock_daily "
-                    f"WHERE trade_date = :td AND ts_code IN ({placeholders})"
+                    f"WHERE trade_date = :td AND {any_array('ts_code')}"
                 ),
                 params,
             )
@@ -128,7 +127,7 @@ async def calc_stock_rank_fusion(
                     f"SELECT cm.ts_code, ci.ts_code AS sector_code, ci.name AS sector_name "
                     f"FROM concept_member cm "
                     f"JOIN concept_index ci ON cm.concept_code = ci.ts_code "
-                    f"WHERE cm.ts_code IN ({placeholders})"
+                    f"WHERE {any_array('cm.ts_code')}"
                 ),
                 params,
             )
@@ -272,6 +272,27 @@ async def run_post_market_chain(target_date: date | None = None) -> None:
         # 步骤 4：缓存刷新（非关键，失败不阻断）
         await cache_refresh_step(target)
 
+        # 步骤 4.1：本地列式镜像增量同步（可选，非关键，失败不阻断）
+        if settings.columnar_store_enabled:
+            columnar_start = time.monotonic()
+            try:
+                from app.data.columnar_store import sync_columnar_store
+
+                columnar_result = await sync_columnar_store(async_session_factory)
+                logger.info(
+                    "[列式镜像] 完成：%s，耗时 %.1fs",
+                    {k: v["rows"] for k, v in columnar_result.items()},
+                    time.monotonic() - columnar_start,
+                )
+            except Exception:
+                logger.warning(
+                    "[列式镜像] 失败（继续执行），耗时 %.1fs\n%s",
+                    time.monotonic() - columnar_start, traceback.format_exc(),
+                )
+
+        # 步骤 4.2：每日市场快照（供 V2 Layer 0 / V4 执行器读取；失败时二者回退到多表查询）
+        await snapshot_step(target)
+
         # 步骤 4.5：市场状态预计算（非关键，失败不阻断）
         regime_start = time.monotonic()
         try:
@@ -545,6 +566,31 @@ async def cache_refresh_step(target_date: date) -> None:
         logger.warning("[缓存刷新] 失败（耗时 %.1fs），策略管道将回源数据库：%s", elapsed, e)
 
 
+async def snapshot_step(target_date: date) -> None:
+    """（重新）构建目标日市场快照（非关键步骤，失败不阻断链路）。
+
+    盘后链路与失败重试补同步后均需调用：快照是来源表的物化副本，
+    来源数据改写后不重建，消费方会因水位过期回退到多表查询。
+
+    Args:
+        target_date: 目标日期
+    """
+    step_start = time.monotonic()
+    try:
+        from app.data.market_snapshot import build_market_snapshot
+
+        result = await build_market_snapshot(async_session_factory, target_date)
+        logger.info(
+            "[市场快照] 完成：%d 行，耗时 %.1fs",
+            result["rows"], time.monotonic() - step_start,
+        )
+    except Exception:
+        logger.warning(
+            "[市场快照] 失败（继续执行），耗时 %.1fs\n%s",
+            time.monotonic() - step_start, traceback.format_exc(),
+        )
+
+
 async def pipeline_step(target_date: date) -> list:
     """执行统一选股管道（V2 主链 + V4 独立链）。
 
@@ -797,6 +843,10 @@ async def retry_failed_stocks_job() -> None:
             success_count, fail_count, elapsed,
         )
 
+        # 补同步改写了目标日行情与指标，先重建快照再补跑策略
+        if success_count:
+            await snapshot_step(target)
+
         # 重试后检查完整性，达到阈值则补跑策略
         summary = await manager.get_sync_summary(target)
         completion_rate = summary["completion_rate"]
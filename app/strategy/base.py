@@ -147,6 +147,24 @@ class BaseStrategyV2(ABC):
         """
         ...
 
+    def execute_sync(
+        self,
+        df: pd.DataFrame,
+        target_date: date,
+    ) -> list[StrategySignal] | pd.Series | dict[str, float]:
+        """同步执行 execute，不创建事件循环（供线程池调用）。
+
+        策略的 execute 只做 DataFrame 列运算、不 await I/O，协程一次驱动即可完成；
+        若 execute 确实挂起等待 I/O 则抛出 RuntimeError。
+        """
+        coro = self.execute(df, target_date)
+        try:
+            coro.send(None)
+        except StopIteration as stop:
+            return stop.value
+        coro.close()
+        raise RuntimeError(f"策略 {self.name} 的 execute 需要事件循环，不能同步执行")
+
     @property
     def static_weight(self) -> float:
         """基于三模型均分的静态权重（归一化到 0-1）。"""
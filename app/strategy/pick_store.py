@@ -10,6 +10,25 @@ from sqlalchemy.ext.asyncio import async_sessionmaker
 logger = logging.getLogger(__name__)
 
 
+# 一条多行 UPSERT 写入当日全部选股（按列传数组，unnest 展开为行）
+_UPSERT_PICKS_SQL = text("""
+    INSERT INTO strategy_picks
+        (strategy_name, pick_date, ts_code, pick_score, pick_close)
+    SELECT u.strategy_name, :pick_date, u.ts_code, u.pick_score, u.pick_close
+    FROM unnest(
+        CAST(:strategy_names AS text[]),
+        CAST(:ts_codes AS text[]),
+        CAST(:pick_scores AS float8[]),
+        CAST(:pick_closes AS float8[])
+    ) AS u(strategy_name, ts_code, pick_score, pick_close)
+    ON CONFLICT ON CONSTRAINT uq_picks_strategy_date_code
+    DO UPDATE SET
+        pick_score = EXCLUDED.pick_score,
+        pick_close = EXCLUDED.pick_close,
+        updated_at = NOW()
+""")
+
+
 class _PickLike(Protocol):
     ts_code: str
     close: float
@@ -30,7 +49,10 @@ async def save_strategy_picks(
     target_date: date,
     picks: list[_PickLike],
 ) -> int:
-    """将选股结果批量写入 `strategy_picks` 表。"""
+    """将选股结果批量写入 `strategy_picks` 表。
+
+    同一 (策略, 股票) 只保留最后一条，整批以一条多行 UPSERT 写入并提交。
+    """
     if not picks or not strategy_names:
         return 0
 
@@ -58,22 +80,18 @@ async def save_strategy_picks(
     for row in rows:
         deduped[(row["strategy_name"], row["ts_code"])] = row
 
+    values = list(deduped.values())
     async with session_factory() as session:
-        for row in deduped.values():
-            await session.execute(
-                text("""
-                    INSERT INTO strategy_picks
-                        (strategy_name, pick_date, ts_code, pick_score, pick_close)
-                    VALUES
-                        (:strategy_name, :pick_date, :ts_code, :pick_score, :pick_close)
-                    ON CONFLICT ON CONSTRAINT uq_picks_strategy_date_code
-                    DO UPDATE SET
-                        pick_score = EXCLUDED.pick_score,
-                        pick_close = EXCLUDED.pick_close,
-                        updated_at = NOW()
-                """),
-                row,
-            )
+        await session.execute(
+            _UPSERT_PICKS_SQL,
+            {
+                "pick_date": target_date,
+                "strategy_names": [r["strategy_name"] for r in values],
+                "ts_codes": [r["ts_code"] for r in values],
+                "pick_scores": [r["pick_score"] for r in values],
+                "pick_closes": [r["pick_close"] for r in values],
+            },
+        )
         await session.commit()
 
     logger.info("[strategy_picks] 写入 %d 条选股记录（日期：%s）", len(deduped), target_date)
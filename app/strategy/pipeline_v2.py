@@ -6,15 +6,21 @@ Layer 2: 信号触发（Trigger）
 Layer 3: 多因子融合排序（Confirmer + 市场状态感知）
 """
 
+import asyncio
 import logging
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date
 
+import numpy as np
 import pandas as pd
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.data.market_snapshot import SNAPSHOT_COLUMNS, fresh_snapshot_dates, snapshot_fresh
+from app.data.query_params import any_array
 from app.database import async_session_factory
 from app.strategy.base import SignalGroup, StrategyRole, StrategySignal
 from app.strategy.factory import StrategyFactoryV2
@@ -23,7 +29,7 @@ from app.strategy.pick_store import save_strategy_picks
 from app.strategy.weight_engine import (
     compute_rolling_performance,
     get_signal_group_coefficient,
-    get_style_bonus,
+    get_style_bonus_vector,
 )
 
 logger = logging.getLogger(__name__)
@@ -190,13 +196,21 @@ async def _execute_pipeline_v2_on_session(
     """在既有会话上执行 V2 Pipeline。"""
     market_regime = await get_market_regime(session_factory, target_date)
 
-    # Layer 0: SQL 硬性排除
-    df = await _layer0_sql_filter(
+    # Layer 0: SQL 硬性排除（优先读取当日市场快照，已含财务字段）
+    df = await _layer0_from_snapshot(
         session,
         target_date,
         industries=industries,
         markets=markets,
     )
+    from_snapshot = df is not None
+    if not from_snapshot:
+        df = await _layer0_sql_filter(
+            session,
+            target_date,
+            industries=industries,
+            markets=markets,
+        )
     layer_stats["layer0"] = len(df)
     if df.empty:
         logger.warning("[Pipeline V2] Layer 0 无股票通过")
@@ -210,14 +224,16 @@ async def _execute_pipeline_v2_on_session(
 
     logger.info(f"[Pipeline V2] Layer 0 通过: {len(df)} 只")
 
-    # 补充财务数据（Layer 1 的 Guard/Scorer/Tagger 需要）
-    df = await _enrich_finance_data_v2(session, df, target_date)
+    # 补充财务数据（Layer 1 的 Guard/Scorer/Tagger 需要；快照中已包含）
+    if not from_snapshot:
+        df = await _enrich_finance_data_v2(session, df, target_date)
 
-    # Layer 1: 质量底池
-    layer1_results = await _layer1_quality_pool(df, target_date)
-    passed_stocks = [r for r in layer1_results if r.passed_guard]
-    layer_stats["layer1"] = len(passed_stocks)
-    if not passed_stocks:
+    # Layer 1: 质量底池（Guard 掩码、质量分、风格标签按列计算）
+    passed_guard, quality_scores, all_tags = await _layer1_outputs(df, target_date)
+    layer1 = _layer1_frame(df, passed_guard, quality_scores, all_tags)
+    passed_mask = layer1["passed_guard"].to_numpy(dtype=bool)
+    layer_stats["layer1"] = int(passed_mask.sum())
+    if not layer_stats["layer1"]:
         logger.warning("[Pipeline V2] Layer 1 无股票通过 Guard")
         return PipelineV2Result(
             target_date=target_date,
@@ -227,11 +243,10 @@ async def _execute_pipeline_v2_on_session(
             market_regime=market_regime.value,
         )
 
-    logger.info(f"[Pipeline V2] Layer 1 通过: {len(passed_stocks)} 只")
+    logger.info(f"[Pipeline V2] Layer 1 通过: {layer_stats['layer1']} 只")
 
     # 构建 Layer 1 通过的股票 DataFrame
-    passed_codes = [r.ts_code for r in passed_stocks]
-    df_passed = df[df["ts_code"].isin(passed_codes)].copy()
+    df_passed = df[passed_mask].copy()
 
     # Layer 2: 信号触发
     layer2_signals = await _layer2_trigger_signals(
@@ -239,6 +254,7 @@ async def _execute_pipeline_v2_on_session(
         target_date,
         trigger_names=trigger_names,
         strategy_params=strategy_params,
+        trigger_stats=layer_stats,
     )
     layer_stats["layer2_signals"] = len(layer2_signals)
     if not layer2_signals:
@@ -260,20 +276,17 @@ async def _execute_pipeline_v2_on_session(
         target_date,
     )
 
-    # Layer 3: 多因子融合排序
-    picks = await _layer3_fusion_ranking(
+    # Layer 3: 多因子融合排序（已按 final_score 降序截取 top_n）
+    result_picks = await _layer3_fusion_ranking(
         session=session,
         df=df_passed,
-        layer1_results=layer1_results,
+        layer1_results=layer1,
         layer2_signals=layer2_signals,
         target_date=target_date,
         market_regime=market_regime,
         rolling_performance=rolling_performance,
+        top_n=top_n,
     )
-
-    # 排序并返回 top_n
-    picks.sort(key=lambda x: x.final_score, reverse=True)
-    result_picks = picks[:top_n]
     layer_stats["layer3"] = len(result_picks)
 
     return PipelineV2Result(
@@ -285,6 +298,319 @@ async def _execute_pipeline_v2_on_session(
     )
 
 
+# ============================================================
+# 多日期批量执行
+# ============================================================
+
+# 批量执行时组合键 "ts_code|YYYYMMDD" 的分隔符
+_BATCH_KEY_SEP = "|"
+
+
+async def execute_pipeline_v2_batch(
+    target_dates: list[date],
+    session_factory: async_sessionmaker = async_session_factory,
+    trigger_names: list[str] | None = None,
+    strategy_params: dict[str, dict] | None = None,
+    top_n: int = 50,
+    industries: list[str] | None = None,
+    markets: list[str] | None = None,
+    save_picks: bool = False,
+) -> dict[date, PipelineV2Result]:
+    """对多个交易日批量执行 V2 Pipeline，结果与逐日调用 execute_pipeline_v2 一致。
+
+    一次加载覆盖全部日期的 Layer 0 面板（快照按日期一次查询），把各日期的行拼接后
+    以 "ts_code|YYYYMMDD" 组合键作为 ts_code，Guard/Scorer/Tagger/Trigger/Confirmer
+    各执行一次；再按日期拆分，逐日完成依赖市场状态与滚动表现的融合打分。
+    V2 策略均为逐行计算（不做跨股票截面统计），因此拼接执行与逐日执行结果相同。
+
+    Args:
+        target_dates: 目标日期列表（去重后按日期升序执行）
+        session_factory: 异步数据库会话工厂
+        trigger_names: 运行的 V2 trigger 名称列表，None 表示全部 trigger
+        strategy_params: trigger 名称 -> 运行时参数
+        top_n: 每个日期返回前 N 只股票
+        industries: 行业过滤
+        markets: 市场过滤
+        save_picks: 是否逐日写入 strategy_picks
+
+    Returns:
+        {date: PipelineV2Result}；elapsed_ms 为整批耗时
+    """
+    start_time = time.monotonic()
+    dates = sorted(set(target_dates))
+    if not dates:
+        return {}
+    logger.info(
+        "[Pipeline V2 批量] 开始执行：%d 个日期（%s ~ %s），triggers=%s",
+        len(dates), dates[0], dates[-1], trigger_names or "ALL",
+    )
+
+    results: dict[date, PipelineV2Result] = {}
+    async with session_factory() as session:
+        panel = await _layer0_panel(session, dates, industries=industries, markets=markets)
+        regimes = {d: await get_market_regime(session_factory, d) for d in dates}
+        stats = {d: {"layer0": 0} for d in dates}
+        if not panel.empty:
+            layer0_counts = panel["trade_date"].value_counts()
+            for d in dates:
+                stats[d]["layer0"] = int(layer0_counts.get(d, 0))
+
+            picks_by_date = await _batch_layers(
+                session, panel, dates, regimes, stats,
+                trigger_names=trigger_names, strategy_params=strategy_params, top_n=top_n,
+            )
+        else:
+            picks_by_date = {}
+
+    elapsed_ms = int((time.monotonic() - start_time) * 1000)
+    for d in dates:
+        results[d] = PipelineV2Result(
+            target_date=d,
+            picks=picks_by_date.get(d, []),
+            layer_stats=stats[d],
+            elapsed_ms=elapsed_ms,
+            market_regime=regimes[d].value,
+        )
+
+    if save_picks:
+        active_triggers = trigger_names or [
+            meta.name for meta in StrategyFactoryV2.get_by_role(StrategyRole.TRIGGER)
+        ]
+        for d, result in results.items():
+            if not result.picks:
+                continue
+            try:
+                await save_strategy_picks(
+                    session_factory=session_factory,
+                    strategy_names=active_triggers,
+                    target_date=d,
+                    picks=result.picks,
+                )
+            except Exception:
+                logger.exception("[Pipeline V2 批量] %s 保存 strategy_picks 失败，不影响其他日期", d)
+
+    logger.info(
+        "[Pipeline V2 批量] 完成：%d 个日期，共 %d 只，耗时 %dms",
+        len(dates), sum(len(r.picks) for r in results.values()), elapsed_ms,
+    )
+    return results
+
+
+async def _batch_layers(
+    session: AsyncSession,
+    panel: pd.DataFrame,
+    dates: list[date],
+    regimes: dict[date, MarketRegime],
+    stats: dict[date, dict[str, int]],
+    trigger_names: list[str] | None,
+    strategy_params: dict[str, dict] | None,
+    top_n: int,
+) -> dict[date, list[StockPickV2]]:
+    """在多日期面板上执行 Layer 1-3，返回各日期的 top_n 选股（并填充 stats）。"""
+    panel = panel.reset_index(drop=True)
+    day_keys = panel["trade_date"].map(lambda d: d.strftime("%Y%m%d"))
+    keys = panel["ts_code"] + _BATCH_KEY_SEP + day_keys
+    key_map = dict(zip(keys, zip(panel["ts_code"], panel["trade_date"])))
+    work = panel.copy()
+    work["ts_code"] = keys
+    # V2 策略不依赖 target_date，传入批次最后一个日期
+    ref_date = dates[-1]
+
+    # Layer 1：一次执行
+    passed_guard, quality_scores, all_tags = await _layer1_outputs(work, ref_date)
+    layer1 = _layer1_frame(panel, passed_guard, quality_scores, all_tags)
+    passed_guard = layer1["passed_guard"]
+
+    # Layer 2：只对通过 Guard 的行执行一次
+    work_passed = work[passed_guard]
+    batch_trigger_stats: dict[str, int] = {}
+    signals = await _layer2_trigger_signals(
+        work_passed, ref_date, trigger_names=trigger_names, strategy_params=strategy_params,
+        trigger_stats=batch_trigger_stats,
+    )
+    signals_by_date: dict[date, list[Layer2Signal]] = {}
+    for sig in signals:
+        code, d = key_map[sig.ts_code]
+        sig.ts_code = code
+        signals_by_date.setdefault(d, []).append(sig)
+
+    # Confirmer：一次执行（只在有信号的日期使用）
+    confirmer_all = await _confirmer_bonuses(work_passed, ref_date) if signals else {}
+
+    # 按整数日期编号切分，避免逐日比较 date 对象
+    day_ids, day_values = pd.factorize(panel["trade_date"])
+    day_id_of = {d: i for i, d in enumerate(day_values)}
+    # Confirmer 加分按组合键拆回 (日期编号, 代码)
+    key_index = pd.Index(keys)
+    codes_arr = panel["ts_code"].to_numpy()
+    confirmer_split = {}
+    for name, data in confirmer_all.items():
+        series = data["bonus_series"]
+        pos = key_index.get_indexer(series.index)
+        known = pos >= 0
+        confirmer_split[name] = (
+            day_ids[pos[known]], codes_arr[pos[known]], series.to_numpy()[known], data,
+        )
+
+    picks_by_date: dict[date, list[StockPickV2]] = {}
+    for d in dates:
+        if stats[d]["layer0"] == 0:
+            continue
+        day_mask = day_ids == day_id_of[d]
+        day_df = panel[day_mask]
+        stats[d]["layer1"] = int(passed_guard[day_mask].sum())
+        if stats[d]["layer1"] == 0:
+            continue
+
+        day_signals = signals_by_date.get(d, [])
+        # trigger 耗时为整批耗时；候选数与信号数按日期拆分
+        day_signal_counts = Counter(sig.strategy_name for sig in day_signals)
+        for key, value in batch_trigger_stats.items():
+            name, field = key.removeprefix("layer2:").rsplit(":", 1)
+            if field == "candidates":
+                value = stats[d]["layer1"]
+            elif field == "signals":
+                value = day_signal_counts.get(name, 0)
+            stats[d][key] = value
+        stats[d]["layer2_signals"] = len(day_signals)
+        if not day_signals:
+            continue
+
+        day_passed = day_df[passed_guard[day_mask]]
+        confirmer_data = {}
+        for name, (bonus_days, bonus_codes, bonus_values, data) in confirmer_split.items():
+            in_day = bonus_days == day_id_of[d]
+            confirmer_data[name] = {
+                **data,
+                "bonus_series": pd.Series(bonus_values[in_day], index=bonus_codes[in_day]),
+            }
+
+        active_signal_names = sorted({sig.strategy_name for sig in day_signals})
+        rolling_performance = await compute_rolling_performance(session, active_signal_names, d)
+        picks_by_date[d] = await _layer3_fusion_ranking(
+            session=session,
+            df=day_passed,
+            layer1_results=layer1[day_mask],
+            layer2_signals=day_signals,
+            target_date=d,
+            market_regime=regimes[d],
+            rolling_performance=rolling_performance,
+            confirmer_data=confirmer_data,
+            top_n=top_n,
+        )
+        stats[d]["layer3"] = len(picks_by_date[d])
+
+    return picks_by_date
+
+
+async def _layer0_panel(
+    session: AsyncSession,
+    dates: list[date],
+    industries: list[str] | None = None,
+    markets: list[str] | None = None,
+) -> pd.DataFrame:
+    """多日期 Layer 0 面板：快照可用的日期一次查询，其余日期（未构建或已过期）逐日回退到多表查询 + 财务补充。"""
+    snapshot_dates = sorted(await fresh_snapshot_dates(session, dates))
+
+    frames = []
+    if snapshot_dates:
+        # 上市满 1 年的门槛按各日期分别计算（与单日口径一致）
+        result = await session.execute(
+            text(f"""
+                SELECT {", ".join(f"m.{c}" for c in _LAYER0_SNAPSHOT_COLUMNS)}
+                FROM market_snapshot_daily m
+                JOIN unnest(CAST(:dates AS date[]), CAST(:min_list_dates AS date[]))
+                    AS d(trade_date, min_list_date) ON m.trade_date = d.trade_date
+                WHERE m.list_status = 'L'
+                  AND m.name NOT LIKE '%ST%'
+                  AND m.name NOT LIKE '%退%'
+                  AND m.amount >= 5000000
+                  AND m.pct_chg > -9.9
+                  AND m.pct_chg < 9.9
+                  AND m.list_date <= d.min_list_date
+                  AND m.vol > 0
+                ORDER BY m.trade_date, m.ts_code
+            """),
+            {
+                "dates": snapshot_dates,
+                "min_list_dates": [d.replace(year=d.year - 1) for d in snapshot_dates],
+            },
+        )
+        rows = result.fetchall()
+        if rows:
+            snap = pd.DataFrame(rows, columns=list(_LAYER0_SNAPSHOT_COLUMNS))
+            if industries:
+                snap = snap[snap["industry"].isin(industries)]
+            if markets:
+                snap = snap[snap["market"].isin(markets)]
+            frames.append(snap)
+
+    for d in dates:
+        if d in snapshot_dates:
+            continue
+        df = await _layer0_sql_filter(session, d, industries=industries, markets=markets)
+        if not df.empty:
+            frames.append(await _enrich_finance_data_v2(session, df, d))
+
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+# Layer 0 从快照读取的列：与 _layer0_sql_filter + _enrich_finance_data_v2 的输出一致
+_LAYER0_SNAPSHOT_COLUMNS = tuple(
+    c for c in SNAPSHOT_COLUMNS if c not in ("list_status", "list_date")
+)
+
+
+async def _layer0_from_snapshot(
+    session: AsyncSession,
+    target_date: date,
+    industries: list[str] | None = None,
+    markets: list[str] | None = None,
+) -> pd.DataFrame | None:
+    """Layer 0: 从 market_snapshot_daily 读取当日候选（一次按日期的索引扫描）。
+
+    排除条件与 _layer0_sql_filter 相同；快照已包含前日滞后值与财务字段。
+
+    Returns:
+        通过 Layer 0 的 DataFrame；当日快照尚未构建或已过期时返回 None（由调用方回退到多表查询）
+    """
+    if not await snapshot_fresh(session, target_date):
+        logger.info("[Pipeline V2] %s 市场快照未构建或已过期，Layer 0 回退到多表查询", target_date)
+        return None
+
+    min_list_date = target_date.replace(year=target_date.year - 1)  # 上市满1年简化
+    result = await session.execute(
+        text(f"""
+            SELECT {", ".join(_LAYER0_SNAPSHOT_COLUMNS)}
+            FROM market_snapshot_daily
+            WHERE trade_date = :target_date
+              AND list_status = 'L'
+              AND name NOT LIKE '%ST%'
+              AND name NOT LIKE '%退%'
+              AND amount >= 5000000
+              AND pct_chg > -9.9
+              AND pct_chg < 9.9
+              AND list_date <= :min_list_date
+              AND vol > 0
+            ORDER BY ts_code
+        """),
+        {"target_date": target_date, "min_list_date": min_list_date},
+    )
+    rows = result.fetchall()
+    if not rows:
+        return pd.DataFrame()
+
+    df = pd.DataFrame(rows, columns=list(_LAYER0_SNAPSHOT_COLUMNS))
+    if industries:
+        df = df[df["industry"].isin(industries)].copy()
+    if markets:
+        df = df[df["market"].isin(markets)].copy()
+    return df
+
+
 async def _layer0_sql_filter(
     session: AsyncSession,
     target_date: date,
@@ -379,10 +705,6 @@ async def _layer0_sql_filter(
 
     # 前日技术指标（_prev 后缀）
     if prev_date is not None and not df.empty:
-        ts_codes = df["ts_code"].tolist()
-        codes_placeholder = ", ".join(f":c{i}" for i in range(len(ts_codes)))
-        code_params = {f"c{i}": code for i, code in enumerate(ts_codes)}
-
         prev_sql = text(f"""
             SELECT
                 td.ts_code,
@@ -400,10 +722,10 @@ async def _layer0_sql_filter(
             JOIN stock_daily sd
                 ON td.ts_code = sd.ts_code AND td.trade_date = sd.trade_date
             WHERE td.trade_date = :prev_date
-              AND td.ts_code IN ({codes_placeholder})
+              AND {any_array("td.ts_code")}
         """)
         prev_result = await session.execute(
-            prev_sql, {"prev_date": prev_date, **code_params}
+            prev_sql, {"prev_date": prev_date, "codes": df["ts_code"].tolist()}
         )
         prev_rows = prev_result.fetchall()
 
@@ -437,9 +759,7 @@ async def _enrich_finance_data_v2(
     if df.empty:
         return df
 
-    ts_codes = df["ts_code"].tolist()
-    codes_placeholder = ", ".join(f":c{i}" for i in range(len(ts_codes)))
-    code_params = {f"c{i}": code for i, code in enumerate(ts_codes)}
+    codes = df["ts_code"].tolist()
 
     # 使用 DISTINCT ON 获取每只股票最新一期财务数据
     finance_sql = text(f"""
@@ -451,13 +771,13 @@ async def _enrich_finance_data_v2(
             gross_margin, net_margin,
             ocf_per_share
         FROM finance_indicator
-        WHERE ts_code IN ({codes_placeholder})
+        WHERE {any_array("ts_code")}
           AND ann_date <= :target_date
         ORDER BY ts_code, end_date DESC
     """)
 
     result = await session.execute(
-        finance_sql, {"target_date": target_date, **code_params}
+        finance_sql, {"target_date": target_date, "codes": codes}
     )
     rows = result.fetchall()
 
@@ -486,13 +806,13 @@ async def _enrich_finance_data_v2(
             dv_ttm AS dividend_yield
         FROM raw_tushare_daily_basic
         WHERE trade_date = :trade_date_str
-          AND ts_code IN ({codes_placeholder})
+          AND {any_array("ts_code")}
     """)
 
     # raw_tushare_daily_basic 的 trade_date 是 String(8) 格式
     trade_date_str = target_date.strftime("%Y%m%d")
     db_result = await session.execute(
-        daily_basic_sql, {"trade_date_str": trade_date_str, **code_params}
+        daily_basic_sql, {"trade_date_str": trade_date_str, "codes": codes}
     )
     db_rows = db_result.fetchall()
 
@@ -519,13 +839,11 @@ async def _enrich_finance_data_v2(
     return df
 
 
-async def _layer1_quality_pool(
+async def _layer1_outputs(
     df: pd.DataFrame,
     target_date: date,
-) -> list[Layer1Result]:
-    """Layer 1: 质量底池（Guard + Scorer + Tagger）。"""
-    results = []
-
+) -> tuple[pd.Series, pd.Series, dict[str, pd.Series]]:
+    """Layer 1 向量化部分：Guard 通过掩码、质量分、风格标签强度（均与 df 同索引）。"""
     # 获取所有 Guard 策略
     guards = StrategyFactoryV2.get_by_role(StrategyRole.GUARD)
     guard_masks = []
@@ -566,21 +884,124 @@ async def _layer1_quality_pool(
                     [all_tags[style_key], strength_series], axis=1
                 ).max(axis=1)
 
-    # 构建结果
-    for idx, row in df.iterrows():
-        ts_code = row["ts_code"]
-        tags = {k: float(v.loc[idx]) for k, v in all_tags.items() if v.loc[idx] > 0}
+    return passed_guard, quality_scores, all_tags
 
-        results.append(
-            Layer1Result(
-                ts_code=ts_code,
-                passed_guard=bool(passed_guard.loc[idx]),
-                quality_score=float(quality_scores.loc[idx]),
-                tags=tags,
-            )
+
+# Layer 1 表的固定列，其余列为风格标签强度
+_LAYER1_BASE_COLUMNS = ("ts_code", "passed_guard", "quality_score")
+
+
+def _layer1_frame(
+    df: pd.DataFrame,
+    passed_guard: pd.Series,
+    quality_scores: pd.Series,
+    all_tags: dict[str, pd.Series],
+) -> pd.DataFrame:
+    """把 Layer 1 向量化输出按 df 的行（及其索引）整理为一张表。
+
+    列为 ts_code / passed_guard / quality_score 与各风格标签强度（未打标或非正为 0）。
+    """
+    frame = pd.DataFrame(
+        {
+            "ts_code": df["ts_code"].to_numpy(),
+            "passed_guard": passed_guard.reindex(df.index).astype(bool).to_numpy(),
+            "quality_score": quality_scores.reindex(df.index).astype(float).to_numpy(),
+        },
+        index=df.index,
+    )
+    for style_key, strength in all_tags.items():
+        values = strength.reindex(df.index).astype(float)
+        frame[style_key] = values.where(values > 0, 0.0).to_numpy()
+    return frame
+
+
+def _layer1_results(layer1: pd.DataFrame) -> list[Layer1Result]:
+    """Layer 1 表 → Layer1Result 列表（tags 只含强度为正的风格）。"""
+    tag_cols = [c for c in layer1.columns if c not in _LAYER1_BASE_COLUMNS]
+    tag_values = layer1[tag_cols].to_numpy(dtype=float)
+    return [
+        Layer1Result(
+            ts_code=ts_code,
+            passed_guard=bool(passed),
+            quality_score=float(score),
+            tags={k: float(v) for k, v in zip(tag_cols, tags) if v > 0},
+        )
+        for ts_code, passed, score, tags in zip(
+            layer1["ts_code"], layer1["passed_guard"], layer1["quality_score"], tag_values,
         )
+    ]
 
-    return results
+
+def _layer1_frame_from_results(layer1_results: list[Layer1Result]) -> pd.DataFrame:
+    """Layer1Result 列表 → Layer 1 表（_layer1_results 的逆变换）。"""
+    frame = pd.DataFrame(
+        {
+            "ts_code": [r.ts_code for r in layer1_results],
+            "passed_guard": [r.passed_guard for r in layer1_results],
+            "quality_score": [float(r.quality_score) for r in layer1_results],
+        }
+    )
+    tags = pd.DataFrame.from_records([r.tags for r in layer1_results], index=frame.index)
+    return pd.concat([frame, tags.fillna(0.0)], axis=1)
+
+
+async def _layer1_quality_pool(
+    df: pd.DataFrame,
+    target_date: date,
+) -> list[Layer1Result]:
+    """Layer 1: 质量底池（Guard + Scorer + Tagger）。"""
+    passed_guard, quality_scores, all_tags = await _layer1_outputs(df, target_date)
+    return _layer1_results(_layer1_frame(df, passed_guard, quality_scores, all_tags))
+
+
+# Layer 2 trigger 线程池：进程内复用，首次并发执行时创建，workers 变化时重建
+_TRIGGER_POOL: tuple[int, ThreadPoolExecutor] | None = None
+
+
+def _trigger_pool(workers: int) -> ThreadPoolExecutor:
+    """返回 max_workers=workers 的共享线程池。"""
+    global _TRIGGER_POOL
+    if _TRIGGER_POOL is None or _TRIGGER_POOL[0] != workers:
+        if _TRIGGER_POOL is not None:
+            _TRIGGER_POOL[1].shutdown(wait=False)
+        _TRIGGER_POOL = (workers, ThreadPoolExecutor(max_workers=workers, thread_name_prefix="layer2-trigger"))
+    return _TRIGGER_POOL[1]
+
+
+def _run_trigger_in_thread(trigger, df: pd.DataFrame, target_date: date) -> tuple[list, float]:
+    """线程池入口：同步执行一个 trigger（不创建事件循环），返回 (信号, 耗时秒)。"""
+    start = time.perf_counter()
+    signals = trigger.execute_sync(df, target_date)
+    return signals, time.perf_counter() - start
+
+
+async def _run_triggers(
+    triggers: list,
+    df: pd.DataFrame,
+    target_date: date,
+    workers: int,
+) -> list[tuple[list, float]]:
+    """执行全部 trigger，结果顺序与 triggers 一致。
+
+    默认（workers=1）在事件循环内串行执行：trigger 多为毫秒级列运算，线程调度开销
+    大于收益。trigger 只读同一个候选 DataFrame、互不依赖，workers > 1 时提交到共享
+    线程池并通过 execute_sync 同步执行，仅适用于基准显示收益的场景（存在长时间
+    释放 GIL 的慢 trigger）。
+    """
+    if workers <= 1 or len(triggers) <= 1:
+        outputs = []
+        for trigger in triggers:
+            start = time.perf_counter()
+            signals = await trigger.execute(df, target_date)
+            outputs.append((signals, time.perf_counter() - start))
+        return outputs
+
+    loop = asyncio.get_running_loop()
+    pool = _trigger_pool(workers)
+    return await asyncio.gather(*[
+        loop.run_in_executor(pool, _run_trigger_in_thread, trigger, df, target_date)
+        for trigger in triggers
+    ])
 
 
 async def _layer2_trigger_signals(
@@ -588,20 +1009,33 @@ async def _layer2_trigger_signals(
     target_date: date,
     trigger_names: list[str] | None = None,
     strategy_params: dict[str, dict] | None = None,
+    trigger_stats: dict[str, int] | None = None,
 ) -> list[Layer2Signal]:
-    """Layer 2: 信号触发（Trigger）。"""
-    signals = []
+    """Layer 2: 信号触发（Trigger）。
+
+    Args:
+        trigger_stats: 提供时写入每个 trigger 的
+            layer2:<name>:elapsed_ms / layer2:<name>:candidates / layer2:<name>:signals
+    """
+    from app.config import settings
 
     triggers = StrategyFactoryV2.get_by_role(StrategyRole.TRIGGER)
     if trigger_names:
         trigger_name_set = set(trigger_names)
         triggers = [meta for meta in triggers if meta.name in trigger_name_set]
 
-    for meta in triggers:
-        params = (strategy_params or {}).get(meta.name)
-        trigger = StrategyFactoryV2.get_strategy(meta.name, params=params)
-        strategy_signals = await trigger.execute(df, target_date)
+    instances = [
+        StrategyFactoryV2.get_strategy(meta.name, params=(strategy_params or {}).get(meta.name))
+        for meta in triggers
+    ]
+    outputs = await _run_triggers(instances, df, target_date, settings.pipeline_trigger_workers)
 
+    signals = []
+    for meta, (strategy_signals, seconds) in zip(triggers, outputs):
+        if trigger_stats is not None:
+            trigger_stats[f"layer2:{meta.name}:elapsed_ms"] = int(seconds * 1000)
+            trigger_stats[f"layer2:{meta.name}:candidates"] = len(df)
+            trigger_stats[f"layer2:{meta.name}:signals"] = len(strategy_signals)
         for sig in strategy_signals:
             signals.append(
                 Layer2Signal(
@@ -613,33 +1047,18 @@ async def _layer2_trigger_signals(
                 )
             )
 
-    return signals
-
-
-async def _layer3_fusion_ranking(
-    session: AsyncSession,
-    df: pd.DataFrame,
-    layer1_results: list[Layer1Result],
-    layer2_signals: list[Layer2Signal],
-    target_date: date,
-    market_regime: MarketRegime,
-    rolling_performance: dict[str, float],
-) -> list[StockPickV2]:
-    """Layer 3: 多因子融合排序。"""
-    # 构建 Layer 1 结果字典
-    layer1_dict = {r.ts_code: r for r in layer1_results}
+    if outputs:
+        slowest_meta, (_, slowest) = max(zip(triggers, outputs), key=lambda item: item[1][1])
+        logger.info(
+            "[Pipeline V2] Layer 2 执行 %d 个 trigger，最慢 %s 耗时 %dms",
+            len(triggers), slowest_meta.name, int(slowest * 1000),
+        )
 
-    # 按股票分组信号
-    signals_by_stock = {}
-    for sig in layer2_signals:
-        if sig.ts_code not in signals_by_stock:
-            signals_by_stock[sig.ts_code] = []
-        signals_by_stock[sig.ts_code].append(sig)
+    return signals
 
-    # 将 DataFrame 索引设置为 ts_code，方便后续查找
-    df_indexed = df.set_index("ts_code")
 
-    # 获取所有 Confirmer 策略
+async def _confirmer_bonuses(df: pd.DataFrame, target_date: date) -> dict[str, dict]:
+    """执行全部 Confirmer，返回 {名称: {"bonus_series", "applicable_groups"}}。"""
     confirmers = StrategyFactoryV2.get_by_role(StrategyRole.CONFIRMER)
     confirmer_data = {}
     for meta in confirmers:
@@ -652,92 +1071,145 @@ async def _layer3_fusion_ranking(
             "bonus_series": bonus_series,
             "applicable_groups": applicable_groups,
         }
+    return confirmer_data
 
-    # 计算每只股票的最终得分
-    picks = []
-    for ts_code, signals in signals_by_stock.items():
-        layer1_result = layer1_dict.get(ts_code)
-        if not layer1_result or not layer1_result.passed_guard:
-            continue
-
-        # 获取股票基本信息
-        if ts_code not in df_indexed.index:
-            continue
-        stock_row = df_indexed.loc[ts_code]
-
-        # 信号强度分：
-        # Σ(静态权重 × 市场状态系数 × rolling_performance × 信号置信度)
-        signal_strength = sum(
-            sig.static_weight
-            * get_signal_group_coefficient(market_regime, sig.signal_group)
-            * rolling_performance.get(sig.strategy_name, 1.0)
-            * sig.confidence
-            for sig in signals
-        )
-
-        # Confirmer 加分：按信号组过滤，叠加所有匹配的 confirmer，封顶 0.6
-        # 获取该股票的所有信号组
-        stock_signal_groups = {sig.signal_group for sig in signals}
-
-        total_bonus = 0.0
-        for confirmer_name, data in confirmer_data.items():
-            bonus_series = data["bonus_series"]
-            applicable_groups = data["applicable_groups"]
-
-            # 如果 confirmer 没有限制信号组，或者股票信号组与 confirmer 适用组有交集
-            if not applicable_groups or any(
-                sg in applicable_groups for sg in stock_signal_groups
-            ):
-                if ts_code in bonus_series.index:
-                    total_bonus += float(bonus_series.loc[ts_code])
-
-        confirmed_bonus = min(total_bonus, 0.6)
-
-        signal_strength += confirmed_bonus
-
-        # 质量底分
-        quality_score_normalized = layer1_result.quality_score / 100.0
 
-        # 动态加权展示值：该股票触发信号的 rolling_performance 均值
-        dynamic_weight = (
-            sum(rolling_performance.get(sig.strategy_name, 1.0) for sig in signals) / len(signals)
-            if signals else 1.0
-        )
+async def _layer3_fusion_ranking(
+    session: AsyncSession,
+    df: pd.DataFrame,
+    layer1_results: list[Layer1Result] | pd.DataFrame,
+    layer2_signals: list[Layer2Signal],
+    target_date: date,
+    market_regime: MarketRegime,
+    rolling_performance: dict[str, float],
+    confirmer_data: dict[str, dict] | None = None,
+    top_n: int | None = None,
+) -> list[StockPickV2]:
+    """Layer 3: 多因子融合排序。
 
-        # 风格增益：style_strength × regime_style_bonus（转换为相对 1.0 的增减项）
-        style_bonus = get_style_bonus(layer1_result.tags, market_regime)
+    所有触发信号的股票按列一次计算得分，按 final_score 降序（同分保持信号出现顺序）
+    返回，只为前 top_n 只构造 StockPickV2。
 
-        final_score = (
-            signal_strength * 0.5
-            + quality_score_normalized * 0.4
-            + style_bonus * 0.1
-        )
+    Args:
+        layer1_results: Layer 1 结果（Layer1Result 列表或 _layer1_frame 的表）
+        confirmer_data: _confirmer_bonuses 的结果，未提供时按 df 现算
+        top_n: 只返回前 N 只，None 表示全部
+    """
+    if not layer2_signals:
+        return []
+    layer1 = (
+        layer1_results if isinstance(layer1_results, pd.DataFrame)
+        else _layer1_frame_from_results(layer1_results)
+    )
+    # 同一代码出现多次时以最后一条为准
+    layer1 = layer1.drop_duplicates("ts_code", keep="last").set_index("ts_code")
+    stocks = df.drop_duplicates("ts_code", keep="last").set_index("ts_code")
+
+    # 信号表：每个信号一行
+    sig = pd.DataFrame(
+        {
+            "ts_code": [s.ts_code for s in layer2_signals],
+            "strategy_name": [s.strategy_name for s in layer2_signals],
+            "signal_group": [s.signal_group for s in layer2_signals],
+            "confidence": [s.confidence for s in layer2_signals],
+            "static_weight": [s.static_weight for s in layer2_signals],
+        }
+    )
+    # 只保留通过 Guard 且在 df 中的股票（按索引定位，避免字符串列 isin）
+    passed_codes = layer1.index[layer1["passed_guard"].to_numpy(dtype=bool)]
+    keep = (passed_codes.get_indexer(sig["ts_code"]) >= 0) & (stocks.index.get_indexer(sig["ts_code"]) >= 0)
+    sig = sig[keep]
+    if sig.empty:
+        return []
+
+    group_coeff = {
+        g: get_signal_group_coefficient(market_regime, g) for g in sig["signal_group"].unique()
+    }
+    perf = sig["strategy_name"].map(lambda name: rolling_performance.get(name, 1.0)).astype(float)
+
+    # 信号强度分：Σ(静态权重 × 市场状态系数 × rolling_performance × 信号置信度)
+    contribution = (
+        sig["static_weight"].astype(float)
+        * sig["signal_group"].map(group_coeff).astype(float)
+        * perf
+        * sig["confidence"].astype(float)
+    )
+    by_stock = sig["ts_code"].to_numpy(dtype=object)
+    signal_strength = contribution.groupby(by_stock, sort=False).sum()
+    codes = signal_strength.index
+
+    if confirmer_data is None:
+        confirmer_data = await _confirmer_bonuses(df, target_date)
+
+    # Confirmer 加分：按信号组过滤，叠加所有匹配的 confirmer，封顶 0.6
+    total_bonus = np.zeros(len(codes))
+    for data in confirmer_data.values():
+        bonus_series = data["bonus_series"]
+        bonus_series = bonus_series[~bonus_series.index.duplicated(keep="first")]
+        applicable_groups = data["applicable_groups"]
+        # confirmer 没有限制信号组，或者股票信号组与 confirmer 适用组有交集
+        if applicable_groups:
+            in_group = sig["signal_group"].map(lambda g: g in applicable_groups).astype(bool)
+            applies = in_group.groupby(by_stock, sort=False).any().to_numpy(dtype=bool)
+        else:
+            applies = np.ones(len(codes), dtype=bool)
+        pos = bonus_series.index.get_indexer(codes)
+        values = bonus_series.to_numpy(dtype=float)[np.maximum(pos, 0)] if len(bonus_series) else 0.0
+        total_bonus += np.where(applies & (pos >= 0), values, 0.0)
+    confirmed_bonus = np.minimum(total_bonus, 0.6)
+
+    layer1 = layer1.reindex(codes)
+    quality = layer1["quality_score"].to_numpy(dtype=float)
+    tag_cols = [c for c in layer1.columns if c not in _LAYER1_BASE_COLUMNS]
+    tag_values = layer1[tag_cols]
+    # 风格增益：style_strength × regime_style_bonus（转换为相对 1.0 的增减项）
+    style_bonus = get_style_bonus_vector(tag_values, market_regime)
+    # 动态加权展示值：该股票触发信号的 rolling_performance 均值
+    dynamic_weight = perf.groupby(by_stock, sort=False).mean().to_numpy()
+
+    final_score = (
+        (signal_strength.to_numpy() + confirmed_bonus) * 0.5
+        + quality / 100.0 * 0.4
+        + style_bonus * 0.1
+    )
 
-        # 构建触发信号列表
-        triggered_signals = [
-            {
-                "strategy": sig.strategy_name,
-                "group": sig.signal_group,
-                "confidence": sig.confidence,
-                "weight": sig.static_weight,
-            }
-            for sig in signals
-        ]
+    order = np.argsort(-final_score, kind="stable")
+    if top_n is not None:
+        order = order[:top_n]
+
+    selected = codes[order]
+    signals_by_stock: dict[str, list[dict]] = {code: [] for code in selected}
+    for s in layer2_signals:
+        if s.ts_code in signals_by_stock:
+            signals_by_stock[s.ts_code].append(
+                {
+                    "strategy": s.strategy_name,
+                    "group": s.signal_group,
+                    "confidence": s.confidence,
+                    "weight": s.static_weight,
+                }
+            )
 
+    rows = stocks.loc[selected, ["name", "close", "pct_chg"]]
+    tag_matrix = tag_values.to_numpy(dtype=float)
+    picks = []
+    for pos, ts_code, name, close, pct_chg in zip(
+        order, selected, rows["name"], rows["close"], rows["pct_chg"],
+    ):
         picks.append(
             StockPickV2(
                 ts_code=ts_code,
-                name=stock_row["name"],
-                close=float(stock_row["close"]),
-                pct_chg=float(stock_row["pct_chg"]),
-                quality_score=layer1_result.quality_score,
-                tags=layer1_result.tags,
-                triggered_signals=triggered_signals,
-                confirmed_bonus=confirmed_bonus,
-                dynamic_weight=dynamic_weight,
-                style_bonus=style_bonus,
+                name=name,
+                close=float(close),
+                pct_chg=float(pct_chg),
+                quality_score=float(quality[pos]),
+                tags={k: float(v) for k, v in zip(tag_cols, tag_matrix[pos]) if v > 0},
+                triggered_signals=signals_by_stock[ts_code],
+                confirmed_bonus=float(confirmed_bonus[pos]),
+                dynamic_weight=float(dynamic_weight[pos]),
+                style_bonus=float(style_bonus[pos]),
                 market_regime=market_regime.value,
-                final_score=final_score,
+                final_score=float(final_score[pos]),
             )
         )
 
@@ -106,13 +106,12 @@ class VolumePricePatternStrategy(BaseStrategy):
                     self.params.get("sector_momentum_days", 5),
                 )
                 if strong:
-                    # 更新板块得分
-                    for code in triggered_codes:
-                        score = 1.0 if code in strong else 0.0
-                        await session.execute(text(
-                            "UPDATE strategy_watchpool SET sector_score=:s "
-                            "WHERE ts_code=:c AND status='triggered' AND triggered_date=:d"
-                        ), {"s": score, "c": code, "d": target_date})
+                    # 更新板块得分（一条语句覆盖全部触发股票）
+                    await session.execute(text(
+                        "UPDATE strategy_watchpool "
+                        "SET sector_score = CASE WHEN ts_code = ANY(:strong) THEN 1.0 ELSE 0.0 END "
+                        "WHERE ts_code = ANY(:codes) AND status='triggered' AND triggered_date=:d"
+                    ), {"strong": list(strong), "codes": list(triggered_codes), "d": target_date})
 
             await session.commit()
 
@@ -17,6 +17,7 @@ import pandas as pd
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.data.market_snapshot import snapshot_fresh
 from app.database import async_session_factory
 from app.strategy.pick_store import save_strategy_picks
 from app.strategy.pick_types import StockPick
@@ -26,6 +27,9 @@ logger = logging.getLogger(__name__)
 
 V4_STRATEGY_NAME = "volume-price-pattern"
 
+# V4 日常执行读取的快照列
+_SNAPSHOT_COLUMNS = ("ts_code", "name", "open", "high", "low", "close", "vol", "pct_chg", "vol_ratio")
+
 
 async def _load_strategy_config(session: AsyncSession) -> tuple[bool, dict]:
     """读取 V4 策略的启用状态与参数。"""
@@ -53,7 +57,29 @@ async def _fetch_daily_snapshot(
     session: AsyncSession,
     target_date: date,
 ) -> pd.DataFrame:
-    """获取 V4 日常执行所需的快照数据。"""
+    """获取 V4 日常执行所需的快照数据。
+
+    优先读取 market_snapshot_daily；当日快照未构建或已过期时回退到 stock_daily 多表查询。
+    """
+    if await snapshot_fresh(session, target_date):
+        result = await session.execute(
+            text(
+                f"""
+                SELECT {", ".join(_SNAPSHOT_COLUMNS[:-1])}, COALESCE(vol_ratio, 0) AS vol_ratio
+                FROM market_snapshot_daily
+                WHERE trade_date = :trade_date
+                  AND vol > 0
+                  AND list_status = 'L'
+                ORDER BY ts_code
+                """
+            ),
+            {"trade_date": target_date},
+        )
+        rows = result.fetchall()
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame(rows, columns=list(_SNAPSHOT_COLUMNS))
+
     result = await session.execute(
         text(
             """
@@ -85,20 +111,7 @@ async def _fetch_daily_snapshot(
     if not rows:
         return pd.DataFrame()
 
-    return pd.DataFrame(
-        rows,
-        columns=[
-            "ts_code",
-            "name",
-            "open",
-            "high",
-            "low",
-            "close",
-            "vol",
-            "pct_chg",
-            "vol_ratio",
-        ],
-    )
+    return pd.DataFrame(rows, columns=list(_SNAPSHOT_COLUMNS))
 
 
 async def _load_triggered_meta(
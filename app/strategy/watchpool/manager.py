@@ -8,15 +8,36 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = logging.getLogger(__name__)
 
+# T0 事件按列传数组，一条 INSERT ... SELECT unnest 写入整批
 INSERT_T0_SQL = text("""
     INSERT INTO strategy_watchpool
         (ts_code, strategy_name, t0_date, t0_close, t0_open, t0_low, t0_volume, t0_pct_chg,
          sector_score, market_score)
-    VALUES (:ts_code, :strategy_name, :t0_date, :t0_close, :t0_open, :t0_low, :t0_volume,
-            :t0_pct_chg, :sector_score, :market_score)
+    SELECT * FROM unnest(
+        CAST(:ts_code AS text[]), CAST(:strategy_name AS text[]), CAST(:t0_date AS date[]),
+        CAST(:t0_close AS float8[]), CAST(:t0_open AS float8[]), CAST(:t0_low AS float8[]),
+        CAST(:t0_volume AS bigint[]), CAST(:t0_pct_chg AS float8[]),
+        CAST(:sector_score AS float8[]), CAST(:market_score AS float8[])
+    )
     ON CONFLICT ON CONSTRAINT uq_watchpool_code_date_strategy DO NOTHING
 """)
 
+T0_COLUMNS = (
+    "ts_code", "strategy_name", "t0_date", "t0_close", "t0_open", "t0_low",
+    "t0_volume", "t0_pct_chg", "sector_score", "market_score",
+)
+
+# 洗盘进度按 id 批量回写：一条 UPDATE ... FROM unnest 覆盖当日全部观察中记录
+UPDATE_WASHOUT_SQL = text("""
+    UPDATE strategy_watchpool w
+    SET washout_days = u.days, min_washout_vol = u.vol, min_washout_low = u.low,
+        updated_at = NOW()
+    FROM unnest(
+        CAST(:ids AS int[]), CAST(:days AS int[]), CAST(:vols AS bigint[]), CAST(:lows AS float8[])
+    ) AS u(id, days, vol, low)
+    WHERE w.id = u.id
+""")
+
 WATCHING_WITH_TODAY_SQL = text("""
     SELECT w.id, w.ts_code, w.t0_open, w.t0_low, w.t0_volume,
            w.washout_days, w.min_washout_vol, w.min_washout_low,
@@ -94,12 +115,11 @@ async def verify_accumulation(
 async def insert_t0_batch(
     session: AsyncSession, entries: list[dict]
 ) -> int:
-    """批量写入新 T0 事件到观察池。"""
-    count = 0
-    for e in entries:
-        await session.execute(INSERT_T0_SQL, e)
-        count += 1
-    return count
+    """批量写入新 T0 事件到观察池（一条语句，已存在的事件跳过）。"""
+    if not entries:
+        return 0
+    await session.execute(INSERT_T0_SQL, {col: [e.get(col) for e in entries] for col in T0_COLUMNS})
+    return len(entries)
 
 
 async def update_watchpool(
@@ -138,11 +158,9 @@ async def update_watchpool(
         ), {"ids": expired_ids})
         stats["expired"] = len(expired_ids)
 
-    for wid, days, mvol, mlow in update_batch:
-        await session.execute(text(
-            "UPDATE strategy_watchpool SET washout_days=:d, min_washout_vol=:v, "
-            "min_washout_low=:l, updated_at=NOW() WHERE id=:id"
-        ), {"id": wid, "d": days, "v": mvol, "l": mlow})
+    if update_batch:
+        ids, days, vols, lows = (list(col) for col in zip(*update_batch))
+        await session.execute(UPDATE_WASHOUT_SQL, {"ids": ids, "days": days, "vols": vols, "lows": lows})
     stats["updated"] = len(update_batch)
 
     return stats
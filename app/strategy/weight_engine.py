@@ -5,9 +5,12 @@ from __future__ import annotations
 import logging
 from datetime import date, timedelta
 
+import numpy as np
+import pandas as pd
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.data.query_params import any_array
 from app.strategy.base import SignalGroup
 from app.strategy.market_regime import MarketRegime
 
@@ -83,6 +86,27 @@ def get_style_bonus(
     return _clamp(total_bonus, -0.3, 0.3)
 
 
+def get_style_bonus_vector(
+    tags: pd.DataFrame,
+    regime: MarketRegime,
+) -> np.ndarray:
+    """按列批量计算风格增益（与 get_style_bonus 逐行结果一致）。
+
+    Args:
+        tags: 每行一只股票、每列一个风格的强度矩阵（未打标为 0）
+        regime: 市场状态
+
+    Returns:
+        与 tags 行数相同的风格增益数组
+    """
+    coeffs = REGIME_STYLE_COEFFICIENTS.get(regime, {})
+    styles = [c for c in tags.columns if c in coeffs]
+    if not styles:
+        return np.zeros(len(tags))
+    deltas = np.array([coeffs[c] - 1.0 for c in styles])
+    return np.clip(tags[styles].to_numpy(dtype=float) @ deltas, -0.3, 0.3)
+
+
 async def compute_rolling_performance(
     session: AsyncSession,
     strategy_names: list[str],
@@ -105,7 +129,7 @@ async def compute_rolling_performance(
     try:
         result = await session.execute(
             text(
-                """
+                f"""
                 SELECT
                     strategy_name,
                     COALESCE(SUM(total_picks), 0) AS total_picks,
@@ -117,7 +141,7 @@ async def compute_rolling_performance(
                     ) AS weighted_avg_return,
                     COALESCE(STDDEV_POP(avg_return), 0) AS return_std
                 FROM strategy_hit_stats
-                WHERE strategy_name = ANY(:strategy_names)
+                WHERE {any_array("strategy_name", "strategy_names")}
                   AND period = :period
                   AND stat_date > :start_date
                   AND stat_date <= :target_date
@@ -1,12 +1,16 @@
 """V4 回测引擎 — 逐日模拟量价配合策略。"""
 
 import logging
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import date
 
+import numpy as np
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.data.panel_cache import PanelMarketData
+from app.data.query_params import any_array
 from app.strategy.filters.market_filter import MarketState, evaluate_market
 from app.v4backtest.models import BacktestSignal
 
@@ -91,10 +95,10 @@ async def _verify_accumulation_batch(
     if not prev:
         return set()
 
-    r3 = await session.execute(text("""
+    r3 = await session.execute(text(f"""
         SELECT ts_code FROM (
             SELECT ts_code, (MAX(high)-MIN(low))/NULLIF(MIN(low),0) AS amp
-            FROM stock_daily WHERE ts_code=ANY(:codes)
+            FROM stock_daily WHERE {any_array("ts_code")}
               AND trade_date BETWEEN :s AND :p GROUP BY ts_code
         ) t WHERE amp <= :max_range
     """), {"codes": codes, "s": start_date, "p": prev[0],
@@ -102,8 +106,34 @@ async def _verify_accumulation_batch(
     return {row[0] for row in r3}
 
 
+def _verify_accumulation_from_panel(
+    market_data: PanelMarketData,
+    lookback_dates: list[date],
+    codes: list[str],
+    max_range: float,
+) -> set[str]:
+    """面板数据上的吸筹验证：按列切片后向量化计算区间振幅。"""
+    panel = market_data.panel
+    rows = [r for r in (panel.row(d) for d in lookback_dates) if r is not None]
+    known = [c for c in codes if c in panel.code_index]
+    if not rows or not known:
+        return set()
+    cols = [panel.code_index[c] for c in known]
+    valid = np.asarray(panel.valid)[np.ix_(rows, cols)]
+    highs = np.where(valid, np.asarray(panel.fields["high"])[np.ix_(rows, cols)], -np.inf)
+    lows = np.where(valid, np.asarray(panel.fields["low"])[np.ix_(rows, cols)], np.inf)
+    max_high = highs.max(axis=0).astype(float)
+    min_low = lows.min(axis=0).astype(float)
+    has_data = valid.any(axis=0)
+    return {
+        code for k, code in enumerate(known)
+        if has_data[k] and min_low[k] > 0
+        and (max_high[k] - min_low[k]) / min_low[k] <= max_range
+    }
+
+
 def _verify_accumulation_from_memory(
-    market_data: dict[date, dict[str, dict]],
+    market_data: Mapping[date, Mapping[str, dict]],
     trade_dates: list[date],
     codes: list[str],
     target_date: date,
@@ -121,6 +151,9 @@ def _verify_accumulation_from_memory(
     start_idx = max(0, idx - acc_days)
     lookback_dates = trade_dates[start_idx:idx]  # 不含当天
 
+    if isinstance(market_data, PanelMarketData):
+        return _verify_accumulation_from_panel(market_data, lookback_dates, codes, max_range)
+
     valid = set()
     for code in codes:
         highs, lows = [], []
@@ -146,7 +179,7 @@ async def run_backtest(
     start_date: date = date(2024, 7, 1),
     end_date: date = date(2025, 12, 31),
     *,
-    market_data: dict[date, dict[str, dict]] | None = None,
+    market_data: Mapping[date, Mapping[str, dict]] | None = None,
     t0_cache: dict[tuple, dict[date, list[str]]] | None = None,
     market_states: dict[date, str] | None = None,
     trade_dates: list[date] | None = None,
@@ -158,7 +191,7 @@ async def run_backtest(
         params: 策略参数，None 时使用 DEFAULT_PARAMS
         start_date: 回测起始日期
         end_date: 回测结束日期
-        market_data: 预加载的全市场行情 dict[date, dict[str, dict]]，有值时零 SQL
+        market_data: 预加载的全市场行情 {date: {ts_code: {...}}}（嵌套字典或 PanelMarketData），有值时零 SQL
         t0_cache: 预计算的 T0 事件缓存 dict[tuple_key, dict[date, list[str]]]
         market_states: 预计算的大盘状态 dict[date, str]
         trade_dates: 预加载的交易日列表，有值时跳过 SQL 查询
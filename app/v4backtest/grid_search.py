@@ -3,17 +3,23 @@
 支持两种模式：
 1. 传统模式：每组参数独立查 SQL（向后兼容）
 2. 零 SQL 模式：预加载全量数据到内存，回测阶段零 SQL（网格搜索默认）
+
+零 SQL 模式的行情默认来自内存映射面板缓存（app.data.panel_cache），
+按日期增量更新，多个优化进程共享；缓存不可用时回退到 _preload_market_data。
 """
 
 import asyncio
 import itertools
 import logging
 import time
+from collections.abc import Mapping
 from datetime import date
 
+import numpy as np
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.data.panel_cache import PanelMarketData, update_panel_cache
 from app.strategy.filters.market_filter import evaluate_market
 from app.v4backtest.engine import run_backtest
 from app.v4backtest.evaluator import evaluate_signals
@@ -107,13 +113,30 @@ async def _preload_market_data(
     return market_data
 
 
+async def _load_market_data(
+    session: AsyncSession, start_date: date, end_date: date,
+) -> Mapping[date, Mapping[str, dict]]:
+    """加载全市场行情：优先内存映射面板缓存，失败时回退到逐行预加载。"""
+    try:
+        panel = await update_panel_cache(session, start_date, end_date)
+        logger.info(
+            "[preload] 行情面板: %d 天 × %d 股（内存映射）",
+            len(panel.dates), len(panel.codes),
+        )
+        return PanelMarketData(panel)
+    except Exception:
+        logger.warning("[preload] 面板缓存不可用，回退到逐行预加载", exc_info=True)
+        return await _preload_market_data(session, start_date, end_date)
+
+
 def _precompute_t0_events(
-    market_data: dict[date, dict[str, dict]],
+    market_data: Mapping[date, Mapping[str, dict]],
     front_params_combos: list[dict],
 ) -> dict[tuple, dict[date, list[str]]]:
     """预计算所有前端参数组合的 T0 事件。
 
     缓存 key: (min_t0_pct_chg, min_t0_vol_ratio, accumulation_days)
+    面板数据按列向量化筛选，嵌套字典数据逐股筛选。
     """
     t0 = time.monotonic()
     cache: dict[tuple, dict[date, list[str]]] = {}
@@ -126,6 +149,17 @@ def _precompute_t0_events(
         if key in cache:
             continue
         t0_by_date: dict[date, list[str]] = {}
+        if isinstance(market_data, PanelMarketData):
+            panel = market_data.panel
+            mask = (
+                np.asarray(panel.valid)
+                & (np.asarray(panel.fields["pct_chg"]) >= key[0])
+                & (np.asarray(panel.fields["vol_ratio"]) >= key[1])
+            )
+            for i in np.flatnonzero(mask.any(axis=1)):
+                t0_by_date[panel.dates[i].astype(object)] = market_data.codes_where(mask[i])
+            cache[key] = t0_by_date
+            continue
         for d, stocks in market_data.items():
             codes = [
                 code for code, s in stocks.items()
@@ -158,7 +192,7 @@ async def _preload_market_states(
 
 def _fill_returns_from_memory(
     signals: list[BacktestSignal],
-    market_data: dict[date, dict[str, dict]],
+    market_data: Mapping[date, Mapping[str, dict]],
     trade_dates: list[date],
 ) -> None:
     """从内存数据计算信号后续收益，替代逐条 SQL 查询。"""
@@ -214,8 +248,8 @@ async def run_grid_search(
         ), {"s": start_date, "e": end_date})
         trade_dates = [row[0] for row in r]
 
-        # 2. 全市场行情
-        market_data = await _preload_market_data(session, start_date, end_date)
+        # 2. 全市场行情（内存映射面板缓存，按日期增量更新）
+        market_data = await _load_market_data(session, start_date, end_date)
 
         # 3. 大盘状态
         market_states = await _preload_market_states(session, trade_dates)
@@ -0,0 +1,125 @@
+"""代码集合过滤基准：N 个占位符 IN 列表 vs 数组参数。
+
+以 V2 Pipeline 财务补充查询（finance_indicator 上的 DISTINCT ON）为样本，
+对 N 个代码（默认 5,000，取自 stocks 表）分别用两种写法执行：
+
+- in_list：IN (:c0, :c1, ..., :cN)，每个代码一个绑定参数（旧写法）
+- any_array：ts_code = ANY(CAST(:codes AS text[]))（query_params.any_array）
+
+每种写法记录：
+- plan_ms：服务端 EXPLAIN (SUMMARY) 报告的 Planning Time
+- first_ms / repeat_ms：客户端首次执行与重复执行（asyncpg 预编译语句缓存命中）的耗时，
+  含 SQL 编译、参数绑定、解析与执行
+- sql_chars：发送的 SQL 文本长度
+
+只读（事务结束即回滚）。需要可连接的 PostgreSQL（DATABASE_URL）。
+
+用法：
+    python scripts/bench_code_filters.py
+    python scripts/bench_code_filters.py --codes 5000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import text
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.data.query_params import any_array  # noqa: E402
+from app.database import async_session_factory, engine  # noqa: E402
+
+TARGET_DATE = date(2026, 3, 9)
+
+_FINANCE_SQL = """
+    SELECT DISTINCT ON (ts_code) ts_code, pe_ttm, pb, roe
+    FROM finance_indicator
+    WHERE {clause}
+      AND ann_date <= :target_date
+    ORDER BY ts_code, end_date DESC
+"""
+
+
+async def load_codes(n: int) -> list[str]:
+    """从 stocks 表取前 n 个代码。"""
+    async with async_session_factory() as session:
+        result = await session.execute(
+            text("SELECT ts_code FROM stocks ORDER BY ts_code LIMIT :n"), {"n": n},
+        )
+        return [r[0] for r in result.fetchall()]
+
+
+def _statement(method: str, codes: list[str]) -> tuple[str, dict]:
+    """构造指定写法的 SQL 与参数。"""
+    if method == "in_list":
+        placeholders = ", ".join(f":c{i}" for i in range(len(codes)))
+        params = {f"c{i}": c for i, c in enumerate(codes)}
+        return _FINANCE_SQL.format(clause=f"ts_code IN ({placeholders})"), params
+    return _FINANCE_SQL.format(clause=any_array("ts_code")), {"codes": codes}
+
+
+async def run_method(method: str, codes: list[str], repeat: int) -> dict[str, float]:
+    """在一个事务内执行 EXPLAIN 与 repeat 次查询，结束时回滚。"""
+    async with async_session_factory() as session:
+        try:
+            start = time.perf_counter()
+            sql, params = _statement(method, codes)
+            await session.execute(text(sql), {**params, "target_date": TARGET_DATE})
+            first = time.perf_counter() - start
+
+            repeats = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                await session.execute(text(sql), {**params, "target_date": TARGET_DATE})
+                repeats.append(time.perf_counter() - start)
+
+            explain = await session.execute(
+                text(f"EXPLAIN (SUMMARY, FORMAT JSON) {sql}"), {**params, "target_date": TARGET_DATE},
+            )
+            plan = explain.scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+        finally:
+            await session.rollback()
+
+    return {
+        "plan_ms": float(plan[0]["Planning Time"]),
+        "first_ms": first * 1000,
+        "repeat_ms": min(repeats) * 1000 if repeats else 0.0,
+        "sql_chars": float(len(sql)),
+    }
+
+
+async def run(n: int, repeat: int) -> dict[str, dict[str, float]]:
+    try:
+        codes = await load_codes(n)
+        return {
+            method: await run_method(method, codes, repeat)
+            for method in ("in_list", "any_array")
+        }
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark IN-list vs array parameter code filters")
+    parser.add_argument("--codes", type=int, default=5000, help="Number of ts_codes in the filter")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeated executions per method (best time is kept)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.codes, args.repeat))
+    print(f"{'写法':<12}{'plan(ms)':>10}{'首次(ms)':>12}{'重复(ms)':>12}{'SQL长度':>10}")
+    for method, r in results.items():
+        print(
+            f"{method:<12}{r['plan_ms']:>10.2f}{r['first_ms']:>12.1f}"
+            f"{r['repeat_ms']:>12.1f}{int(r['sql_chars']):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
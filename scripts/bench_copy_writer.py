@@ -0,0 +1,164 @@
+"""COPY 写入基准：旧版逐批临时表 vs 常驻 UNLOGGED 暂存表 + 分片并行（rows/second）。
+
+在当前数据库中创建基准表 _bench_copy_writer（结构同 raw_tushare_daily 的主要列），
+用合成数据（默认 5,000,000 行）对比三种写入方式，每种分别测试空表写入与全量覆盖（UPSERT）：
+
+- legacy：每批 DROP/CREATE TEMP TABLE → COPY → INSERT ... ON CONFLICT（旧版 copy_insert）
+- staging：copy_insert(shards=1)，复用 UNLOGGED 暂存表，每批 TRUNCATE
+- sharded：copy_insert(shards=N)，按 ts_code 哈希拆分，多连接并行
+
+结束后删除基准表与暂存表。需要可连接的 PostgreSQL（DATABASE_URL）。
+
+用法：
+    python scripts/bench_copy_writer.py
+    python scripts/bench_copy_writer.py --rows 5000000 --shards 4
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Column, Date, MetaData, Numeric, String, Table, text
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.data import copy_writer  # noqa: E402
+from app.data.copy_writer import COPY_BATCH_SIZE, copy_insert, frame_records  # noqa: E402
+from app.database import engine, get_raw_connection  # noqa: E402
+
+BENCH_TABLE = Table(
+    "_bench_copy_writer",
+    MetaData(),
+    Column("ts_code", String(16), primary_key=True),
+    Column("trade_date", Date, primary_key=True),
+    Column("open", Numeric(12, 4)),
+    Column("high", Numeric(12, 4)),
+    Column("low", Numeric(12, 4)),
+    Column("close", Numeric(12, 4)),
+    Column("vol", Numeric(20, 4)),
+    Column("amount", Numeric(20, 4)),
+)
+
+
+def make_frame(rows: int, stocks: int = 5400, seed: int = 0) -> pd.DataFrame:
+    """构造 rows 行合成日线（stocks 只股票 × 连续日期）。"""
+    rng = np.random.default_rng(seed)
+    days = -(-rows // stocks)
+    codes = np.array([f"{600000 + i:06d}.SH" for i in range(stocks)])
+    dates = pd.date_range("2000-01-03", periods=days, freq="D").date
+    close = np.round(rng.uniform(2, 200, rows), 2)
+    return pd.DataFrame({
+        "ts_code": np.tile(codes, days)[:rows],
+        "trade_date": np.repeat(dates, stocks)[:rows],
+        "open": np.round(close * rng.uniform(0.97, 1.03, rows), 2),
+        "high": np.round(close * 1.03, 2),
+        "low": np.round(close * 0.97, 2),
+        "close": close,
+        "vol": np.round(rng.uniform(0, 1e6, rows), 2),
+        "amount": np.round(rng.uniform(0, 1e7, rows), 3),
+    })
+
+
+async def legacy_copy_insert(table: Table, frame: pd.DataFrame, batch_size: int = COPY_BATCH_SIZE) -> dict:
+    """旧版 copy_insert 算法：每批新建临时表，单连接串行。"""
+    columns = [c.name for c in table.columns]
+    pk_cols = [c.name for c in table.primary_key.columns]
+    tmp = f"_tmp_{table.name}"
+    col_list = ", ".join(f'"{c}"' for c in columns)
+    set_clause = ", ".join(f'"{c}" = EXCLUDED."{c}"' for c in columns if c not in pk_cols)
+    merge_sql = (
+        f'INSERT INTO "{table.name}" ({col_list}) SELECT {col_list} FROM "{tmp}" '
+        f'ON CONFLICT ({", ".join(pk_cols)}) DO UPDATE SET {set_clause}'
+    )
+    merge_s = 0.0
+    async with get_raw_connection() as raw_conn:
+        for offset in range(0, len(frame), batch_size):
+            records = frame_records(frame.iloc[offset : offset + batch_size], columns)
+            await raw_conn.execute(f'DROP TABLE IF EXISTS "{tmp}"')
+            await raw_conn.execute(f'CREATE TEMP TABLE "{tmp}" (LIKE "{table.name}" INCLUDING DEFAULTS)')
+            await raw_conn.copy_records_to_table(tmp, records=records, columns=columns)
+            merge_start = time.monotonic()
+            await raw_conn.execute(merge_sql)
+            merge_s += time.monotonic() - merge_start
+            await raw_conn.execute(f'DROP TABLE IF EXISTS "{tmp}"')
+    return {"merge_s": merge_s}
+
+
+async def staged_copy_insert(table: Table, frame: pd.DataFrame, shards: int) -> dict:
+    """当前 copy_insert：常驻暂存表，shards>1 时并行分片。"""
+    report: list[dict] = []
+    await copy_insert(table, frame, conflict="update", shards=shards, report=report)
+    return {"merge_s": sum(r["merge_s"] for r in report)}
+
+
+async def _reset_table(truncate_only: bool = False) -> None:
+    """创建（或清空）基准表。"""
+    async with engine.begin() as conn:
+        if truncate_only:
+            await conn.execute(text(f'TRUNCATE "{BENCH_TABLE.name}"'))
+        else:
+            await conn.run_sync(lambda c: BENCH_TABLE.drop(c, checkfirst=True))
+            await conn.run_sync(lambda c: BENCH_TABLE.create(c))
+
+
+async def _drop_all() -> None:
+    """删除基准表与其暂存表。"""
+    async with engine.begin() as conn:
+        result = await conn.execute(text(
+            "SELECT tablename FROM pg_tables WHERE tablename LIKE :pattern"
+        ), {"pattern": f"{copy_writer.STAGING_PREFIX}{BENCH_TABLE.name}%"})
+        for (name,) in result.fetchall():
+            await conn.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+        await conn.run_sync(lambda c: BENCH_TABLE.drop(c, checkfirst=True))
+    copy_writer._staging_ready.clear()
+
+
+async def run(rows: int, shards: int) -> list[dict]:
+    """对三种写入方式分别测量空表写入与全量覆盖耗时。"""
+    frame = make_frame(rows)
+    cases = {
+        "legacy": lambda: legacy_copy_insert(BENCH_TABLE, frame),
+        "staging": lambda: staged_copy_insert(BENCH_TABLE, frame, shards=1),
+        f"sharded x{shards}": lambda: staged_copy_insert(BENCH_TABLE, frame, shards=shards),
+    }
+    results = []
+    await _reset_table()
+    try:
+        for name, fn in cases.items():
+            await _reset_table(truncate_only=True)
+            for phase in ("insert", "upsert"):
+                start = time.monotonic()
+                stats = await fn()
+                elapsed = time.monotonic() - start
+                results.append({
+                    "method": name, "phase": phase, "rows": rows,
+                    "seconds": elapsed, "rps": rows / elapsed, "merge_s": stats["merge_s"],
+                })
+    finally:
+        await _drop_all()
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark legacy vs staged/sharded COPY writer")
+    parser.add_argument("--rows", type=int, default=5_000_000, help="Synthetic rows to write")
+    parser.add_argument("--shards", type=int, default=4, help="Parallel shards for the sharded case")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.rows, args.shards))
+    print(f"{'方式':<14}{'阶段':<8}{'行数':>12}{'耗时(s)':>10}{'rows/s':>12}{'合并(s)':>10}")
+    for r in results:
+        print(
+            f"{r['method']:<14}{r['phase']:<8}{r['rows']:>12,}{r['seconds']:>10.1f}"
+            f"{r['rps']:>12,.0f}{r['merge_s']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
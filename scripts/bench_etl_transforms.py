@@ -0,0 +1,137 @@
+"""ETL 转换基准：dict API vs 列式输出（rows/second）。
+
+用合成的全市场数据（默认 5,400 只股票）对比 etl.py 的 transform_tushare_* 与
+etl_columnar 的列式实现，分别测试单日与全年（243 个交易日）两种规模：
+
+- dict：transform_tushare_*(list[dict])，即 DataManager 同步路径；已转发到列式实现，
+  含 list[dict] → DataFrame 与 to_records 的往返开销
+- columnar：columnar_tushare_*(DataFrame)，输出列式数据
+- columnar+records：DataFrame 输入经列式转换后 to_records 转回 dict
+
+用法：
+    python scripts/bench_etl_transforms.py
+    python scripts/bench_etl_transforms.py --stocks 5400 --days 243 --repeat 3
+"""
+
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.data import etl, etl_columnar  # noqa: E402
+
+
+def _trade_dates(days: int) -> list[str]:
+    """生成 days 个工作日（YYYYMMDD）。"""
+    out, d = [], date(2024, 1, 2)
+    while len(out) < days:
+        if d.weekday() < 5:
+            out.append(d.strftime("%Y%m%d"))
+        d += timedelta(days=1)
+    return out
+
+
+def make_inputs(stocks: int, days: int, seed: int = 0) -> dict[str, pd.DataFrame]:
+    """构造 daily / adj_factor / daily_basic / moneyflow 合成数据（与 Tushare 返回的列一致）。"""
+    rng = np.random.default_rng(seed)
+    codes = np.array([f"{600000 + i:06d}.SH" for i in range(stocks)])
+    dates = _trade_dates(days)
+    n = stocks * days
+    ts_code = np.tile(codes, days)
+    trade_date = np.repeat(dates, stocks)
+
+    close = np.round(rng.uniform(2, 200, n), 2)
+    daily = pd.DataFrame({
+        "ts_code": ts_code,
+        "trade_date": trade_date,
+        "open": np.round(close * rng.uniform(0.97, 1.03, n), 2),
+        "high": np.round(close * 1.03, 2),
+        "low": np.round(close * 0.97, 2),
+        "close": close,
+        "pre_close": np.round(close * rng.uniform(0.9, 1.1, n), 2),
+        "change": np.round(rng.normal(0, 1, n), 2),
+        "pct_chg": np.round(rng.normal(0, 2, n), 4),
+        "vol": np.round(rng.uniform(0, 1e6, n), 2),
+        "amount": np.round(rng.uniform(0, 1e7, n), 3),
+    })
+    adj = pd.DataFrame({"ts_code": ts_code, "trade_date": trade_date,
+                        "adj_factor": np.round(rng.uniform(1, 10, n), 4)})
+    basic = pd.DataFrame({"ts_code": ts_code, "trade_date": trade_date,
+                          "turnover_rate": np.round(rng.uniform(0, 20, n), 4)})
+    moneyflow = pd.DataFrame({"ts_code": ts_code, "trade_date": trade_date})
+    for field in etl_columnar._MONEYFLOW_FIELDS:
+        moneyflow[field] = np.round(rng.uniform(0, 1e5, n), 2)
+    return {"daily": daily, "adj_factor": adj, "daily_basic": basic, "moneyflow": moneyflow}
+
+
+def _best(fn, repeat: int) -> float:
+    """多次运行取最短耗时（秒）。"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(stocks: int, days: int, repeat: int) -> list[dict]:
+    """对单一规模运行 daily 与 moneyflow 两个转换的三种实现。"""
+    frames = make_inputs(stocks, days)
+    # dict 版本的输入为 list[dict]（与从 raw 表查询得到的行一致），转换成本不计入
+    records = {name: df.to_dict("records") for name, df in frames.items()}
+    cases = {
+        "daily": (
+            lambda: etl.transform_tushare_daily(records["daily"], records["adj_factor"], records["daily_basic"]),
+            lambda: etl_columnar.columnar_tushare_daily(frames["daily"], frames["adj_factor"], frames["daily_basic"]),
+            lambda: etl_columnar.to_records(etl_columnar.columnar_tushare_daily(
+                frames["daily"], frames["adj_factor"], frames["daily_basic"])),
+        ),
+        "moneyflow": (
+            lambda: etl.transform_tushare_moneyflow(records["moneyflow"]),
+            lambda: etl_columnar.columnar_tushare_moneyflow(frames["moneyflow"]),
+            lambda: etl_columnar.to_records(etl_columnar.columnar_tushare_moneyflow(frames["moneyflow"])),
+        ),
+    }
+    rows = stocks * days
+    results = []
+    for name, (dict_fn, col_fn, rec_fn) in cases.items():
+        dict_s = _best(dict_fn, repeat)
+        col_s = _best(col_fn, repeat)
+        rec_s = _best(rec_fn, repeat)
+        results.append({
+            "transform": name,
+            "rows": rows,
+            "dict_rps": rows / dict_s,
+            "columnar_rps": rows / col_s,
+            "records_rps": rows / rec_s,
+            "speedup": dict_s / col_s,
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark dict vs columnar ETL transforms")
+    parser.add_argument("--stocks", type=int, default=5400, help="Number of stocks per trade date")
+    parser.add_argument("--days", type=int, default=243, help="Trade dates in the full-year case")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (best time is reported)")
+    args = parser.parse_args()
+
+    header = f"{'规模':<8}{'转换':<12}{'行数':>10}{'dict rows/s':>14}{'columnar rows/s':>18}{'+records rows/s':>18}{'加速比':>8}"
+    print(header)
+    for label, days, repeat in (("单日", 1, args.repeat), ("全年", args.days, 1)):
+        for r in run(args.stocks, days, repeat):
+            print(
+                f"{label:<8}{r['transform']:<12}{r['rows']:>10,}{r['dict_rps']:>14,.0f}"
+                f"{r['columnar_rps']:>18,.0f}{r['records_rps']:>18,.0f}{r['speedup']:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""V4 日常写入阶段基准：逐行语句 vs 批量语句。
+
+模拟 V4 日常执行器在观察池有 N 条（默认 2,000）活跃记录时的写入阶段：
+
+- t0_insert：新 T0 事件写入 strategy_watchpool
+- washout_update：观察中记录的洗盘进度（washout_days / min_washout_vol / min_washout_low）回写
+- picks_upsert：命中结果写入 strategy_picks
+
+每个阶段分别用旧版逐行语句（legacy）与当前批量语句（bulk）执行，
+全部在事务内进行并在结束时回滚，不在库中留下数据。需要可连接的 PostgreSQL（DATABASE_URL）。
+
+用法：
+    python scripts/bench_watchpool_writes.py
+    python scripts/bench_watchpool_writes.py --entries 2000 --repeat 3
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import text
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import async_session_factory, engine  # noqa: E402
+from app.strategy import pick_store  # noqa: E402
+from app.strategy.watchpool import manager as wpm  # noqa: E402
+
+BENCH_STRATEGY = "_bench-volume-price-pattern"
+BENCH_DATE = date(1990, 1, 2)
+
+LEGACY_T0_SQL = text("""
+    INSERT INTO strategy_watchpool
+        (ts_code, strategy_name, t0_date, t0_close, t0_open, t0_low, t0_volume, t0_pct_chg,
+         sector_score, market_score)
+    VALUES (:ts_code, :strategy_name, :t0_date, :t0_close, :t0_open, :t0_low, :t0_volume,
+            :t0_pct_chg, :sector_score, :market_score)
+    ON CONFLICT ON CONSTRAINT uq_watchpool_code_date_strategy DO NOTHING
+""")
+
+LEGACY_WASHOUT_SQL = text(
+    "UPDATE strategy_watchpool SET washout_days=:d, min_washout_vol=:v, "
+    "min_washout_low=:l, updated_at=NOW() WHERE id=:id"
+)
+
+LEGACY_PICK_SQL = text("""
+    INSERT INTO strategy_picks
+        (strategy_name, pick_date, ts_code, pick_score, pick_close)
+    VALUES
+        (:strategy_name, :pick_date, :ts_code, :pick_score, :pick_close)
+    ON CONFLICT ON CONSTRAINT uq_picks_strategy_date_code
+    DO UPDATE SET
+        pick_score = EXCLUDED.pick_score,
+        pick_close = EXCLUDED.pick_close,
+        updated_at = NOW()
+""")
+
+
+def make_entries(n: int) -> list[dict]:
+    """构造 n 条合成 T0 事件。"""
+    return [
+        {
+            "ts_code": f"{600000 + i:06d}.SH",
+            "strategy_name": BENCH_STRATEGY,
+            "t0_date": BENCH_DATE,
+            "t0_close": 10.0 + i % 50,
+            "t0_open": 9.5 + i % 50,
+            "t0_low": 9.4 + i % 50,
+            "t0_volume": 100_000 + i,
+            "t0_pct_chg": 9.9,
+            "sector_score": None,
+            "market_score": None,
+        }
+        for i in range(n)
+    ]
+
+
+async def _t0_ids(session) -> list[int]:
+    result = await session.execute(
+        text("SELECT id FROM strategy_watchpool WHERE strategy_name = :s ORDER BY id"),
+        {"s": BENCH_STRATEGY},
+    )
+    return [r[0] for r in result.fetchall()]
+
+
+async def run_case(entries: list[dict], bulk: bool) -> dict[str, float]:
+    """在一个事务内执行完整写入阶段并回滚，返回各阶段耗时。"""
+    timings: dict[str, float] = {}
+    async with async_session_factory() as session:
+        try:
+            start = time.monotonic()
+            if bulk:
+                await wpm.insert_t0_batch(session, entries)
+            else:
+                for e in entries:
+                    await session.execute(LEGACY_T0_SQL, e)
+            timings["t0_insert"] = time.monotonic() - start
+
+            ids = await _t0_ids(session)
+            updates = [(wid, 3, 50_000 + wid % 1000, 9.0) for wid in ids]
+            start = time.monotonic()
+            if bulk:
+                ids_, days, vols, lows = (list(col) for col in zip(*updates))
+                await session.execute(
+                    wpm.UPDATE_WASHOUT_SQL, {"ids": ids_, "days": days, "vols": vols, "lows": lows},
+                )
+            else:
+                for wid, d, v, low in updates:
+                    await session.execute(LEGACY_WASHOUT_SQL, {"id": wid, "d": d, "v": v, "l": low})
+            timings["washout_update"] = time.monotonic() - start
+
+            picks = [
+                {"strategy_name": BENCH_STRATEGY, "pick_date": BENCH_DATE, "ts_code": e["ts_code"],
+                 "pick_score": 50.0, "pick_close": e["t0_close"]}
+                for e in entries
+            ]
+            start = time.monotonic()
+            if bulk:
+                await session.execute(pick_store._UPSERT_PICKS_SQL, {
+                    "pick_date": BENCH_DATE,
+                    "strategy_names": [p["strategy_name"] for p in picks],
+                    "ts_codes": [p["ts_code"] for p in picks],
+                    "pick_scores": [p["pick_score"] for p in picks],
+                    "pick_closes": [p["pick_close"] for p in picks],
+                })
+            else:
+                for p in picks:
+                    await session.execute(LEGACY_PICK_SQL, p)
+            timings["picks_upsert"] = time.monotonic() - start
+        finally:
+            await session.rollback()
+    timings["total"] = sum(timings.values())
+    return timings
+
+
+async def run(n: int, repeat: int) -> dict[str, dict[str, float]]:
+    """两种方式各执行 repeat 次，取每个阶段的最小耗时。"""
+    entries = make_entries(n)
+    best: dict[str, dict[str, float]] = {}
+    try:
+        for _ in range(repeat):
+            for name, bulk in (("legacy", False), ("bulk", True)):
+                timings = await run_case(entries, bulk)
+                cur = best.setdefault(name, timings)
+                for k, v in timings.items():
+                    cur[k] = min(cur[k], v)
+    finally:
+        await engine.dispose()
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark per-row vs bulk V4 watchpool/pick writes")
+    parser.add_argument("--entries", type=int, default=2000, help="Active watchpool entries to simulate")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per method (best time is kept)")
+    args = parser.parse_args()
+
+    best = asyncio.run(run(args.entries, args.repeat))
+    phases = ["t0_insert", "washout_update", "picks_upsert", "total"]
+    print(f"{'阶段':<16}{'legacy(s)':>12}{'bulk(s)':>12}{'加速':>10}")
+    for phase in phases:
+        legacy, bulk = best["legacy"][phase], best["bulk"][phase]
+        speedup = legacy / bulk if bulk > 0 else float("inf")
+        print(f"{phase:<16}{legacy:>12.3f}{bulk:>12.3f}{speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
 """并行计算全市场技术指标。
 
-将标的列表分组，多协程并发计算，大幅提升全量计算速度。
+默认使用进程池（app.data.indicator_pool）：按分片读取行情，多进程计算，
+单一 COPY 写入器写入，可随 CPU 核数近线性扩展。
+--mode async 保留原有的多协程 + to_thread 方式。
 支持股票（stock）、板块（concept）或全部（all）。
 
 用法：
-    APP_ENV_FILE=.env.prod uv run python -m scripts.compute_indicators_parallel [--workers 8] [--target stock|concept|all]
+    APP_ENV_FILE=.env.prod uv run python -m scripts.compute_indicators_parallel [--workers 8] [--target stock|concept|all] [--mode process|async]
 """
 
 import argparse
@@ -22,6 +24,7 @@ from app.data.indicator import (
     _upsert_technical_rows_generic,
     compute_single_stock_indicators,
 )
+from app.data.indicator_pool import compute_all_parallel
 from app.database import async_session_factory
 from app.models.concept import ConceptDaily, ConceptTechnicalDaily
 from app.models.market import Stock, StockDaily
@@ -125,27 +128,57 @@ async def run_batch(
     )
 
 
-async def main(workers: int = 8, target: str = "all"):
+async def run_batch_process(
+    label: str,
+    codes: list[str],
+    workers: int,
+    source_table: Type[DeclarativeBase],
+    target_table: Type[DeclarativeBase],
+):
+    """多进程计算一批标的的技术指标。"""
+    total = len(codes)
+    start = time.time()
+
+    def _progress(done: int, total: int) -> None:
+        elapsed = time.time() - start
+        speed = done / elapsed if elapsed > 0 else 0
+        eta = (total - done) / speed if speed > 0 else 0
+        logger.info("[%s %d/%d] %.1f/s ETA %.0fs", label, done, total, speed, eta)
+
+    result = await compute_all_parallel(
+        async_session_factory, source_table, target_table, codes,
+        workers=workers, progress_callback=_progress,
+    )
+    logger.info(
+        "%s 完成：%d 成功, %d 失败, 耗时 %.1fs (%.1f分钟)",
+        label, result["success"], result["failed"],
+        result["elapsed_seconds"], result["elapsed_seconds"] / 60,
+    )
+
+
+async def main(workers: int = 8, target: str = "all", mode: str = "process"):
     """并行计算全市场技术指标。"""
+    runner = run_batch_process if mode == "process" else run_batch
 
     if target in ("stock", "all"):
         async with async_session_factory() as session:
             stmt = select(Stock.ts_code).where(Stock.list_status == "L")
             result = await session.execute(stmt)
             stock_codes = [row[0] for row in result.all()]
-        await run_batch("股票", stock_codes, workers, StockDaily, TechnicalDaily)
+        await runner("股票", stock_codes, workers, StockDaily, TechnicalDaily)
 
     if target in ("concept", "all"):
         async with async_session_factory() as session:
             stmt = select(ConceptDaily.ts_code).distinct()
             result = await session.execute(stmt)
             concept_codes = [row[0] for row in result.all()]
-        await run_batch("板块", concept_codes, workers, ConceptDaily, ConceptTechnicalDaily)
+        await runner("板块", concept_codes, workers, ConceptDaily, ConceptTechnicalDaily)
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="并行计算全市场技术指标")
-    parser.add_argument("--workers", type=int, default=8, help="并发数（默认 8）")
+    parser.add_argument("--workers", type=int, default=8, help="并发数 / 进程数（默认 8）")
     parser.add_argument("--target", choices=["stock", "concept", "all"], default="all", help="计算目标")
+    parser.add_argument("--mode", choices=["process", "async"], default="process", help="执行方式（默认 process）")
     args = parser.parse_args()
-    asyncio.run(main(workers=args.workers, target=args.target))
+    asyncio.run(main(workers=args.workers, target=args.target, mode=args.mode))
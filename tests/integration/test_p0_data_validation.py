@@ -264,6 +264,26 @@ class TestETLTransformCorrectness:
             ), f"stock_daily.adj_factor 为空"
 
 
+    @pytest.mark.asyncio
+    async def test_sql_etl_matches_python_transform(self):
+        """测试服务端 SQL ETL 与 Python transform 逐行一致。"""
+        from app.data.manager import DataManager
+
+        async with async_session_factory() as session:
+            result = await session.execute(select(func.max(RawTushareDaily.trade_date)))
+            trade_date = result.scalar()
+
+        if not trade_date:
+            pytest.skip("没有可用的 raw_tushare_daily 数据")
+
+        trade_date_obj = date(int(trade_date[:4]), int(trade_date[4:6]), int(trade_date[6:8]))
+        manager = DataManager(async_session_factory, {})
+        report = await manager.verify_etl_daily(trade_date_obj - timedelta(days=10), trade_date_obj)
+
+        assert report["sql_rows"] == report["python_rows"]
+        assert report["mismatches"] == 0, f"SQL ETL 与 Python transform 存在差异：{report['samples']}"
+
+
 class TestCrossTableConsistency:
     """测试跨表一致性。"""
 
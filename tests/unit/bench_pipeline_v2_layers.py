@@ -0,0 +1,242 @@
+"""V2 Pipeline Layer 1 / Layer 3 微基准：逐行循环 vs 按列计算。
+
+用合成的全市场候选（默认 5,000 只，约 40% 触发信号）对比：
+
+- layer1：iterrows 逐行构建 Layer1Result（旧实现）vs _layer1_frame 按列整理
+- layer3：逐股票循环融合打分后排序（旧实现）vs _layer3_fusion_ranking 按列打分 + argsort
+
+旧实现保留在本文件中作为对照，run 时顺带校验两者的前 top_n 结果一致。
+不依赖数据库；不以 test_ 开头，pytest 不会收集。
+
+用法：
+    python -m tests.unit.bench_pipeline_v2_layers
+    python -m tests.unit.bench_pipeline_v2_layers --stocks 5000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pandas as pd
+
+from app.strategy.market_regime import MarketRegime
+from app.strategy.pipeline_v2 import (
+    Layer1Result,
+    Layer2Signal,
+    StockPickV2,
+    _layer1_frame,
+    _layer3_fusion_ranking,
+)
+from app.strategy.weight_engine import get_signal_group_coefficient, get_style_bonus
+
+TARGET_DATE = date(2026, 3, 9)
+_GROUPS = ("aggressive", "trend", "bottom")
+_TRIGGERS = tuple(f"trigger-{i}" for i in range(6))
+
+
+def make_inputs(stocks: int, seed: int = 0) -> dict:
+    """构造 Layer 0 候选、Layer 1 向量化输出、Layer 2 信号与 Confirmer 加分。"""
+    rng = np.random.default_rng(seed)
+    codes = [f"{600000 + i:06d}.SH" for i in range(stocks)]
+    df = pd.DataFrame({
+        "ts_code": codes,
+        "name": codes,
+        "close": np.round(rng.uniform(2, 200, stocks), 2),
+        "pct_chg": np.round(rng.normal(0, 3, stocks), 2),
+    })
+    passed_guard = pd.Series(rng.random(stocks) < 0.8, index=df.index)
+    quality_scores = pd.Series(np.round(rng.uniform(0, 100, stocks), 2), index=df.index)
+    all_tags = {
+        style: pd.Series(np.where(rng.random(stocks) < 0.3, rng.random(stocks), 0.0), index=df.index)
+        for style in ("growth", "dividend", "momentum")
+    }
+
+    signals = []
+    for code in rng.choice(codes, size=int(stocks * 0.4), replace=False):
+        for trigger in rng.choice(_TRIGGERS, size=int(rng.integers(1, 4)), replace=False):
+            signals.append(Layer2Signal(
+                ts_code=str(code),
+                strategy_name=str(trigger),
+                signal_group=_GROUPS[_TRIGGERS.index(trigger) % 3],
+                confidence=float(rng.uniform(0.3, 1.0)),
+                static_weight=float(rng.uniform(0.5, 1.2)),
+            ))
+
+    confirmer_data = {
+        f"confirmer-{i}": {
+            "bonus_series": pd.Series(
+                np.where(rng.random(stocks) < 0.5, 0.2, 0.0), index=df["ts_code"].values,
+            ),
+            "applicable_groups": list(groups),
+        }
+        for i, groups in enumerate(((), ("aggressive",), ("trend", "bottom")))
+    }
+    return {
+        "df": df,
+        "passed_guard": passed_guard,
+        "quality_scores": quality_scores,
+        "all_tags": all_tags,
+        "signals": signals,
+        "confirmer_data": confirmer_data,
+        "rolling_performance": {t: float(rng.uniform(0.8, 1.2)) for t in _TRIGGERS[:4]},
+    }
+
+
+# ------------------------------------------------------------
+# 旧实现（逐行 / 逐股票循环），仅作对照
+# ------------------------------------------------------------
+
+
+def legacy_layer1_results(df, passed_guard, quality_scores, all_tags) -> list[Layer1Result]:
+    """iterrows 逐行构建 Layer1Result。"""
+    results = []
+    for idx, row in df.iterrows():
+        tags = {k: float(v.loc[idx]) for k, v in all_tags.items() if v.loc[idx] > 0}
+        results.append(Layer1Result(
+            ts_code=row["ts_code"],
+            passed_guard=bool(passed_guard.loc[idx]),
+            quality_score=float(quality_scores.loc[idx]),
+            tags=tags,
+        ))
+    return results
+
+
+def legacy_layer3(df, layer1_results, layer2_signals, market_regime, rolling_performance,
+                  confirmer_data, top_n) -> list[StockPickV2]:
+    """逐股票循环融合打分，最后整体排序截取 top_n。"""
+    layer1_dict = {r.ts_code: r for r in layer1_results}
+    signals_by_stock: dict[str, list[Layer2Signal]] = {}
+    for sig in layer2_signals:
+        signals_by_stock.setdefault(sig.ts_code, []).append(sig)
+    df_indexed = df.set_index("ts_code")
+
+    picks = []
+    for ts_code, signals in signals_by_stock.items():
+        layer1_result = layer1_dict.get(ts_code)
+        if not layer1_result or not layer1_result.passed_guard or ts_code not in df_indexed.index:
+            continue
+        stock_row = df_indexed.loc[ts_code]
+        signal_strength = sum(
+            sig.static_weight
+            * get_signal_group_coefficient(market_regime, sig.signal_group)
+            * rolling_performance.get(sig.strategy_name, 1.0)
+            * sig.confidence
+            for sig in signals
+        )
+        groups = {sig.signal_group for sig in signals}
+        total_bonus = 0.0
+        for data in confirmer_data.values():
+            applicable = data["applicable_groups"]
+            if not applicable or any(g in applicable for g in groups):
+                if ts_code in data["bonus_series"].index:
+                    total_bonus += float(data["bonus_series"].loc[ts_code])
+        confirmed_bonus = min(total_bonus, 0.6)
+        signal_strength += confirmed_bonus
+        style_bonus = get_style_bonus(layer1_result.tags, market_regime)
+        picks.append(StockPickV2(
+            ts_code=ts_code,
+            name=stock_row["name"],
+            close=float(stock_row["close"]),
+            pct_chg=float(stock_row["pct_chg"]),
+            quality_score=layer1_result.quality_score,
+            tags=layer1_result.tags,
+            triggered_signals=[
+                {"strategy": s.strategy_name, "group": s.signal_group,
+                 "confidence": s.confidence, "weight": s.static_weight}
+                for s in signals
+            ],
+            confirmed_bonus=confirmed_bonus,
+            dynamic_weight=sum(rolling_performance.get(s.strategy_name, 1.0) for s in signals) / len(signals),
+            style_bonus=style_bonus,
+            market_regime=market_regime.value,
+            final_score=signal_strength * 0.5 + layer1_result.quality_score / 100.0 * 0.4 + style_bonus * 0.1,
+        ))
+    picks.sort(key=lambda x: x.final_score, reverse=True)
+    return picks[:top_n]
+
+
+# ------------------------------------------------------------
+# 基准
+# ------------------------------------------------------------
+
+
+async def run_legacy(inputs: dict, top_n: int) -> list[StockPickV2]:
+    """旧实现：Layer 1 iterrows + Layer 3 逐股票循环。"""
+    layer1 = legacy_layer1_results(
+        inputs["df"], inputs["passed_guard"], inputs["quality_scores"], inputs["all_tags"],
+    )
+    passed = {r.ts_code for r in layer1 if r.passed_guard}
+    df_passed = inputs["df"][inputs["df"]["ts_code"].isin(passed)]
+    return legacy_layer3(
+        df_passed, layer1, inputs["signals"], MarketRegime.BULL,
+        inputs["rolling_performance"], inputs["confirmer_data"], top_n,
+    )
+
+
+async def run_vectorized(inputs: dict, top_n: int) -> list[StockPickV2]:
+    """当前实现：Layer 1 表 + Layer 3 按列打分。"""
+    layer1 = _layer1_frame(
+        inputs["df"], inputs["passed_guard"], inputs["quality_scores"], inputs["all_tags"],
+    )
+    df_passed = inputs["df"][layer1["passed_guard"].to_numpy(dtype=bool)]
+    return await _layer3_fusion_ranking(
+        session=AsyncMock(),
+        df=df_passed,
+        layer1_results=layer1,
+        layer2_signals=inputs["signals"],
+        target_date=TARGET_DATE,
+        market_regime=MarketRegime.BULL,
+        rolling_performance=inputs["rolling_performance"],
+        confirmer_data=inputs["confirmer_data"],
+        top_n=top_n,
+    )
+
+
+def picks_match(a: list[StockPickV2], b: list[StockPickV2], tol: float = 1e-9) -> bool:
+    """两组选股的代码顺序一致，数值字段在容差内相等。"""
+    if [p.ts_code for p in a] != [p.ts_code for p in b]:
+        return False
+    for x, y in zip(a, b):
+        for field in ("final_score", "confirmed_bonus", "dynamic_weight", "style_bonus", "quality_score"):
+            if abs(getattr(x, field) - getattr(y, field)) > tol:
+                return False
+        if x.tags.keys() != y.tags.keys() or x.triggered_signals != y.triggered_signals:
+            return False
+    return True
+
+
+async def run(stocks: int, top_n: int, repeat: int) -> dict[str, float]:
+    """两种实现各执行 repeat 次，取最小耗时，并校验结果一致。"""
+    inputs = make_inputs(stocks)
+    best: dict[str, float] = {}
+    outputs = {}
+    for name, fn in (("legacy", run_legacy), ("vectorized", run_vectorized)):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            outputs[name] = await fn(inputs, top_n)
+            best[name] = min(best.get(name, float("inf")), time.perf_counter() - start)
+    if not picks_match(outputs["legacy"], outputs["vectorized"]):
+        raise AssertionError("向量化结果与逐行实现不一致")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark row-loop vs vectorized V2 Layer 1/Layer 3")
+    parser.add_argument("--stocks", type=int, default=5000, help="Layer 0 candidates to simulate")
+    parser.add_argument("--top-n", type=int, default=50, help="Picks to return")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per method (best time is kept)")
+    args = parser.parse_args()
+
+    best = asyncio.run(run(args.stocks, args.top_n, args.repeat))
+    legacy, vectorized = best["legacy"], best["vectorized"]
+    print(f"{'实现':<12}{'耗时(ms)':>12}")
+    print(f"{'legacy':<12}{legacy * 1000:>12.1f}")
+    print(f"{'vectorized':<12}{vectorized * 1000:>12.1f}")
+    print(f"加速 {legacy / vectorized:.1f}x（{args.stocks} 只候选，结果一致）")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,20 @@
 
 from datetime import date
 from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
-import pytest
+from app.data.adj_factor import batch_update_adj_factor, batch_update_adj_factors, build_intervals
 
-from app.data.adj_factor import batch_update_adj_factor
 
-
-def _mock_session_factory(rowcount: int = 5):
-    """创建模拟的 async session factory。"""
+def _mock_session_factory(changed: dict[str, int] | None = None):
+    """创建模拟的 async session factory，区间 UPDATE 返回 {ts_code: 改写行数}。"""
     session = AsyncMock()
     result_mock = MagicMock()
-    result_mock.rowcount = rowcount
+    result_mock.fetchall.return_value = [
+        SimpleNamespace(ts_code=code, n=n, first_date=date(2024, 6, 19), last_date=date(2025, 6, 30))
+        for code, n in (changed or {}).items()
+    ]
     session.execute.return_value = result_mock
 
     ctx = AsyncMock()
@@ -25,31 +27,43 @@ def _mock_session_factory(rowcount: int = 5):
     return factory, session
 
 
+class TestBuildIntervals:
+    """除权日记录展开为区间。"""
+
+    def test_multiple_dividend_dates(self) -> None:
+        """相邻除权日构成左闭右开区间，末区间无上界，并追加首日之前的填充区间。"""
+        records = [
+            {"trade_date": "2024-12-20", "adj_factor": Decimal("0.964356")},
+            {"trade_date": "2024-06-19", "adj_factor": Decimal("0.949509")},
+        ]
+
+        intervals = build_intervals("600519.SH", records)
+
+        assert intervals == [
+            ("600519.SH", date(2024, 6, 19), date(2024, 12, 20), 0.949509, False),
+            ("600519.SH", date(2024, 12, 20), None, 0.964356, False),
+            ("600519.SH", None, date(2024, 6, 19), 0.949509, True),
+        ]
+
+    def test_empty_records(self) -> None:
+        """无记录时无区间。"""
+        assert build_intervals("600519.SH", []) == []
+
+
 class TestBatchUpdateAdjFactor:
     """批量更新复权因子测试。"""
 
     async def test_empty_records(self) -> None:
         """空记录列表应返回 0。"""
-        factory, _ = _mock_session_factory()
+        factory, session = _mock_session_factory()
         result = await batch_update_adj_factor(factory, "600519.SH", [])
         assert result == 0
+        session.execute.assert_not_awaited()
 
-    async def test_single_dividend_date(self) -> None:
-        """单个除权日应执行 2 次 UPDATE（区间 + 之前的填充）。"""
-        factory, session = _mock_session_factory(rowcount=100)
-        records = [
-            {"trade_date": "2024-06-19", "adj_factor": Decimal("0.949509")},
-        ]
-
-        result = await batch_update_adj_factor(factory, "600519.SH", records)
-
-        # 1 次区间更新（最后一个除权日到未来）+ 1 次之前的填充
-        assert session.execute.call_count == 2
-        session.commit.assert_called_once()
-
-    async def test_multiple_dividend_dates(self) -> None:
-        """多个除权日应按区间分别更新。"""
-        factory, session = _mock_session_factory(rowcount=50)
+    @patch("app.data.indicator_state.invalidate_indicator_state", new_callable=AsyncMock)
+    async def test_single_stock_statements(self, mock_invalidate) -> None:
+        """单只股票：建临时表、写入区间、一条区间 UPDATE，共 3 条语句、一次提交。"""
+        factory, session = _mock_session_factory({"600519.SH": 120})
         records = [
             {"trade_date": "2024-06-19", "adj_factor": Decimal("0.949509")},
             {"trade_date": "2024-12-20", "adj_factor": Decimal("0.964356")},
@@ -58,32 +72,51 @@ class TestBatchUpdateAdjFactor:
 
         result = await batch_update_adj_factor(factory, "600519.SH", records)
 
-        # 3 次区间更新 + 1 次之前的填充 = 4 次 execute
-        assert session.execute.call_count == 4
+        assert result == 120
+        assert session.execute.call_count == 3
         session.commit.assert_called_once()
+        stage_params = session.execute.call_args_list[1][0][1]
+        assert stage_params["start_dates"][:3] == [date(2024, 6, 19), date(2024, 12, 20), date(2025, 6, 26)]
+        assert stage_params["fill_only"] == [False, False, False, True]
 
-    async def test_records_sorted_by_date(self) -> None:
-        """乱序输入应自动按日期排序。"""
-        factory, session = _mock_session_factory(rowcount=10)
-        records = [
-            {"trade_date": "2024-12-20", "adj_factor": Decimal("0.964356")},
-            {"trade_date": "2024-06-19", "adj_factor": Decimal("0.949509")},
-        ]
-
-        await batch_update_adj_factor(factory, "600519.SH", records)
-
-        # 验证第一次 execute 使用的是较早的日期
-        first_call_params = session.execute.call_args_list[0][0][1]
-        assert first_call_params["start_date"] == date(2024, 6, 19)
-        assert first_call_params["end_date"] == date(2024, 12, 20)
-
-    async def test_no_matching_rows(self) -> None:
-        """无匹配行时应正常完成（rowcount=0）。"""
-        factory, session = _mock_session_factory(rowcount=0)
-        records = [
-            {"trade_date": "2099-01-01", "adj_factor": Decimal("1.000000")},
-        ]
+    @patch("app.data.indicator_state.invalidate_indicator_state", new_callable=AsyncMock)
+    async def test_no_change_skips_invalidation(self, mock_invalidate) -> None:
+        """因子未变化（无改写行）时返回 0，不失效递推状态。"""
+        factory, session = _mock_session_factory({})
+        records = [{"trade_date": "2099-01-01", "adj_factor": Decimal("1.000000")}]
 
         result = await batch_update_adj_factor(factory, "600519.SH", records)
+
         assert result == 0
         session.commit.assert_called_once()
+        mock_invalidate.assert_not_awaited()
+
+
+class TestBatchUpdateAdjFactors:
+    """多只股票的分块区间更新与变更检测。"""
+
+    @patch("app.data.indicator_state.invalidate_indicator_state", new_callable=AsyncMock, return_value=1)
+    async def test_chunks_and_invalidates_changed_codes(self, mock_invalidate) -> None:
+        """按 chunk_size 分块 UPDATE，只失效因子变化的标的，并标记列式镜像的改写月份。"""
+        factory, session = _mock_session_factory()
+        changed = MagicMock()
+        changed.fetchall.return_value = [SimpleNamespace(
+            ts_code="000002.SZ", n=30, first_date=date(2024, 6, 19), last_date=date(2024, 8, 1),
+        )]
+        unchanged = MagicMock()
+        unchanged.fetchall.return_value = []
+        session.execute.side_effect = [MagicMock(), MagicMock(), changed, unchanged]
+
+        records = {
+            code: [{"trade_date": "2024-06-19", "adj_factor": Decimal("0.9")}]
+            for code in ("000001.SZ", "000002.SZ", "600000.SH")
+        }
+        with patch("app.data.columnar_store.invalidate_columnar_range") as mock_mirror:
+            result = await batch_update_adj_factors(factory, records, chunk_size=2)
+
+        assert result == {"updated": 30, "changed_codes": ["000002.SZ"], "invalidated": 1}
+        update_params = [c[0][1] for c in session.execute.call_args_list[2:]]
+        assert update_params == [{"codes": ["000001.SZ", "000002.SZ"]}, {"codes": ["600000.SH"]}]
+        assert mock_invalidate.await_args.args[2] == ["000002.SZ"]
+        assert mock_mirror.call_args.args == (date(2024, 6, 19), date(2024, 8, 1))
+        assert mock_mirror.call_args.kwargs["datasets"] == ["stock_daily", "technical_daily"]
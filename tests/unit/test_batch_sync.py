@@ -16,7 +16,8 @@ from app.data.batch import batch_sync_daily
 def _mock_manager() -> MagicMock:
     """创建 mock 的 DataManager。"""
     manager = MagicMock()
-    manager.sync_raw_daily = AsyncMock(return_value={"daily": 5000, "adj_factor": 5000, "daily_basic": 5000})
+    manager.fetch_raw_daily = AsyncMock(return_value={})
+    manager.write_raw_daily = AsyncMock(return_value={"daily": 5000, "adj_factor": 5000, "daily_basic": 5000})
     manager.etl_daily = AsyncMock(return_value={"inserted": 5000})
     return manager
 
@@ -42,8 +43,10 @@ class TestBatchSyncBasic:
         assert result["success"] == 3
         assert result["failed"] == 0
         assert result["failed_dates"] == []
-        assert manager.sync_raw_daily.call_count == 3
+        assert manager.fetch_raw_daily.call_count == 3
+        assert manager.write_raw_daily.call_count == 3
         assert manager.etl_daily.call_count == 3
+        assert result["stages"]["write"]["items"] == 3
 
     async def test_empty_date_list(self) -> None:
         """空日期列表应返回全零结果。"""
@@ -57,7 +60,7 @@ class TestBatchSyncBasic:
 
         assert result["success"] == 0
         assert result["failed"] == 0
-        assert manager.sync_raw_daily.call_count == 0
+        assert manager.fetch_raw_daily.call_count == 0
 
 
 # ============================================================
@@ -79,7 +82,7 @@ class TestErrorIsolation:
                 raise RuntimeError("network error")
             return {"daily": 5000, "adj_factor": 5000, "daily_basic": 5000}
 
-        manager.sync_raw_daily = AsyncMock(side_effect=_sync_with_failure)
+        manager.fetch_raw_daily = AsyncMock(side_effect=_sync_with_failure)
 
         dates = [date(2026, 2, 10), date(2026, 2, 11), date(2026, 2, 12)]
         result = await batch_sync_daily(
@@ -96,7 +99,7 @@ class TestErrorIsolation:
     async def test_all_failures(self) -> None:
         """全部失败时应正确统计。"""
         manager = _mock_manager()
-        manager.sync_raw_daily = AsyncMock(side_effect=RuntimeError("fail"))
+        manager.write_raw_daily = AsyncMock(side_effect=RuntimeError("fail"))
 
         dates = [date(2026, 2, 10), date(2026, 2, 11)]
         result = await batch_sync_daily(
@@ -0,0 +1,243 @@
+"""本地列式镜像（columnar_store）的单元测试。
+
+验证按月分区写入、重复写入去重、按日期/标的读取列数组，以及增量同步水位、
+最近月份校验窗口与显式失效。
+"""
+
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from app.data.columnar_store import (  # noqa: E402
+    DATASETS,
+    _month_ranges,
+    check_columnar_watermark,
+    invalidate_columnar_range,
+    read_columns,
+    read_frame,
+    read_manifest,
+    sync_columnar_store,
+    write_partitions,
+)
+
+ADJ = DATASETS["adj_factor"]
+
+
+def _adj_df(dates: list[date], codes: list[str], value: float = 1.0) -> pd.DataFrame:
+    return pd.DataFrame([
+        {"ts_code": c, "trade_date": d, "adj_factor": value + i}
+        for d in dates for i, c in enumerate(codes)
+    ])
+
+
+class TestPartitions:
+    """测试分区写入与读取。"""
+
+    def test_write_month_partitions(self, tmp_path):
+        """跨月数据写入各自的 year=/month= 分区。"""
+        df = _adj_df([date(2025, 1, 31), date(2025, 2, 3)], ["600000.SH"])
+        write_partitions(ADJ, df, tmp_path)
+
+        assert (tmp_path / "adj_factor/year=2025/month=01/data.parquet").exists()
+        assert (tmp_path / "adj_factor/year=2025/month=02/data.parquet").exists()
+
+    def test_rewrite_dedupes_keep_latest(self, tmp_path):
+        """同一 (ts_code, trade_date) 重复写入时保留新值。"""
+        write_partitions(ADJ, _adj_df([date(2025, 1, 2)], ["600000.SH"], 1.0), tmp_path)
+        write_partitions(ADJ, _adj_df([date(2025, 1, 2)], ["600000.SH"], 2.0), tmp_path)
+
+        df = read_frame("adj_factor", date(2025, 1, 1), date(2025, 1, 31), root=tmp_path)
+        assert len(df) == 1
+        assert df.loc[0, "adj_factor"] == 2.0
+
+    def test_read_filters_range_and_codes(self, tmp_path):
+        """按日期区间和标的集合过滤，返回列数组。"""
+        dates = [date(2024, 12, 31), date(2025, 1, 2), date(2025, 1, 3)]
+        write_partitions(ADJ, _adj_df(dates, ["600000.SH", "000001.SZ"]), tmp_path)
+
+        cols = read_columns(
+            "adj_factor", date(2025, 1, 1), date(2025, 1, 3), codes=["000001.SZ"], root=tmp_path,
+        )
+        assert cols["ts_code"].tolist() == ["000001.SZ", "000001.SZ"]
+        assert cols["trade_date"].dtype == np.dtype("datetime64[D]")
+        np.testing.assert_array_equal(cols["adj_factor"], [2.0, 2.0])
+
+    def test_read_missing_dataset(self, tmp_path):
+        """镜像不存在时返回空结果。"""
+        df = read_frame("stock_daily", date(2025, 1, 1), date(2025, 1, 2), root=tmp_path)
+        assert df.empty
+        assert "close" in df.columns
+
+    def test_month_ranges(self):
+        """区间按自然月切分。"""
+        assert _month_ranges(date(2025, 1, 15), date(2025, 3, 2)) == [
+            (date(2025, 1, 15), date(2025, 1, 31)),
+            (date(2025, 2, 1), date(2025, 2, 28)),
+            (date(2025, 3, 1), date(2025, 3, 2)),
+        ]
+
+
+def _mock_session_factory(rows: list[tuple], max_date: str, count: int, stats_calls: list | None = None):
+    """模拟 raw_tushare_adj_factor 查询：MAX(trade_date)、COUNT、按月校验值、区间数据。
+
+    stats_calls 传入时记录每次按月校验查询的 since 参数（None 表示全表扫描）。
+    """
+    session = AsyncMock()
+
+    async def _execute(sql, params=None):
+        result = MagicMock()
+        sql_text = str(sql)
+        if "GROUP BY" in sql_text:
+            since = (params or {}).get("since")
+            if stats_calls is not None:
+                stats_calls.append(since)
+            stats: dict[str, list] = {}
+            for _, d, value in rows:
+                if since is not None and d < since:
+                    continue
+                entry = stats.setdefault(f"{d[:4]}-{d[4:6]}", [0, 0.0])
+                entry[0] += 1
+                entry[1] += value
+            result.all.return_value = [(k, n, total) for k, (n, total) in stats.items()]
+        elif "MAX(trade_date)" in sql_text:
+            result.scalar.return_value = max_date
+        elif "COUNT(*)" in sql_text:
+            result.scalar.return_value = count
+        else:
+            result.all.return_value = [
+                r for r in rows if params["start"] <= r[1] <= params["end"]
+            ]
+        return result
+
+    session.execute = _execute
+    ctx = AsyncMock()
+    ctx.__aenter__ = AsyncMock(return_value=session)
+    ctx.__aexit__ = AsyncMock(return_value=False)
+    return MagicMock(return_value=ctx)
+
+
+class TestSyncAndWatermark:
+    """测试增量同步与水位检查。"""
+
+    @pytest.mark.asyncio
+    async def test_incremental_sync(self, tmp_path):
+        """首次同步写入全部区间，再次同步从水位次日开始。"""
+        rows = [("600000.SH", "20250102", 1.0), ("600000.SH", "20250203", 1.1)]
+        factory = _mock_session_factory(rows, "20250203", 1)
+
+        first = await sync_columnar_store(
+            factory, datasets=["adj_factor"], start_date=date(2025, 1, 1), root=tmp_path,
+        )
+        assert first["adj_factor"]["rows"] == 2
+        assert read_manifest("adj_factor", tmp_path)["max_trade_date"] == "2025-02-03"
+
+        second = await sync_columnar_store(factory, datasets=["adj_factor"], root=tmp_path)
+        assert second["adj_factor"]["start"] == "2025-02-04"
+        assert second["adj_factor"]["rows"] == 0
+
+        status = await check_columnar_watermark(factory, datasets=["adj_factor"], root=tmp_path)
+        assert status["adj_factor"]["in_sync"] is True
+
+    @pytest.mark.asyncio
+    async def test_watermark_detects_lag(self, tmp_path):
+        """数据库有更新的交易日时判定为不一致。"""
+        write_partitions(ADJ, _adj_df([date(2025, 1, 2)], ["600000.SH"]), tmp_path)
+        factory = _mock_session_factory([], "20250103", 1)
+
+        status = await check_columnar_watermark(factory, datasets=["adj_factor"], root=tmp_path)
+        assert status["adj_factor"]["in_sync"] is False
+        assert status["adj_factor"]["db_max_date"] == "2025-01-03"
+
+    @pytest.mark.asyncio
+    async def test_historical_rewrite_detected_and_resynced(self, tmp_path):
+        """水位之前的数据被改写（复权因子重算）时，检查判定不一致，同步整月重写该分区。"""
+        rows = [
+            ("600000.SH", "20250102", 1.0),
+            ("600000.SH", "20250103", 1.0),
+            ("600000.SH", "20250203", 1.0),
+        ]
+        factory = _mock_session_factory(rows, "20250203", 1)
+        await sync_columnar_store(
+            factory, datasets=["adj_factor"], start_date=date(2025, 1, 1), root=tmp_path,
+        )
+
+        rows[0] = ("600000.SH", "20250102", 1.5)
+        del rows[1]
+        status = await check_columnar_watermark(factory, datasets=["adj_factor"], root=tmp_path)
+        assert status["adj_factor"]["in_sync"] is False
+        assert status["adj_factor"]["stale_partitions"] == ["2025-01"]
+
+        result = await sync_columnar_store(factory, datasets=["adj_factor"], root=tmp_path)
+        assert result["adj_factor"]["rewritten_partitions"] == ["2025-01"]
+        df = read_frame("adj_factor", date(2025, 1, 1), date(2025, 1, 31), root=tmp_path)
+        assert df["adj_factor"].tolist() == [1.5]
+        assert read_manifest("adj_factor", tmp_path)["rows"] == 2
+
+        status = await check_columnar_watermark(factory, datasets=["adj_factor"], root=tmp_path)
+        assert status["adj_factor"]["in_sync"] is True
+
+    @pytest.mark.asyncio
+    async def test_recheck_window_bounds_checksum_scan(self, tmp_path):
+        """默认只比对最近月份（窗口外的改写不扫描），verify=True 时全表比对并重写。"""
+        rows = [
+            ("600000.SH", "20241202", 1.0),
+            ("600000.SH", "20250102", 1.0),
+            ("600000.SH", "20250203", 1.0),
+        ]
+        calls: list = []
+        factory = _mock_session_factory(rows, "20250203", 1, stats_calls=calls)
+        await sync_columnar_store(
+            factory, datasets=["adj_factor"], start_date=date(2024, 12, 1), root=tmp_path,
+        )
+        assert calls == ["20250101"]
+
+        rows[0] = ("600000.SH", "20241202", 2.0)
+        status = await check_columnar_watermark(factory, datasets=["adj_factor"], root=tmp_path)
+        assert status["adj_factor"]["stale_partitions"] == []
+
+        status = await check_columnar_watermark(
+            factory, datasets=["adj_factor"], root=tmp_path, verify=True,
+        )
+        assert status["adj_factor"]["stale_partitions"] == ["2024-12"]
+        assert calls[-1] is None
+
+        result = await sync_columnar_store(factory, datasets=["adj_factor"], root=tmp_path, verify=True)
+        assert result["adj_factor"]["rewritten_partitions"] == ["2024-12"]
+        df = read_frame("adj_factor", date(2024, 12, 1), date(2024, 12, 31), root=tmp_path)
+        assert df["adj_factor"].tolist() == [2.0]
+
+    @pytest.mark.asyncio
+    async def test_invalidated_partitions_rewritten_on_next_sync(self, tmp_path):
+        """invalidate_columnar_range 标记的窗口外分区在下次同步时整月重写，标记随之清除。"""
+        rows = [
+            ("600000.SH", "20241202", 1.0),
+            ("600000.SH", "20241203", 1.0),
+            ("600000.SH", "20250203", 1.0),
+        ]
+        factory = _mock_session_factory(rows, "20250203", 1)
+        await sync_columnar_store(
+            factory, datasets=["adj_factor"], start_date=date(2024, 12, 1), root=tmp_path,
+        )
+        assert invalidate_columnar_range(date(2030, 1, 1), date(2030, 1, 2), datasets=["stock_daily"],
+                                         root=tmp_path) == {}
+
+        rows[0] = ("600000.SH", "20241202", 1.5)
+        del rows[1]
+        marked = invalidate_columnar_range(date(2024, 12, 2), date(2024, 12, 2), root=tmp_path)
+        assert marked == {"adj_factor": ["2024-12"]}
+
+        status = await check_columnar_watermark(factory, datasets=["adj_factor"], root=tmp_path)
+        assert status["adj_factor"]["stale_partitions"] == ["2024-12"]
+
+        result = await sync_columnar_store(factory, datasets=["adj_factor"], root=tmp_path)
+        assert result["adj_factor"]["rewritten_partitions"] == ["2024-12"]
+        df = read_frame("adj_factor", date(2024, 12, 1), date(2024, 12, 31), root=tmp_path)
+        assert df["adj_factor"].tolist() == [1.5]
+        manifest = read_manifest("adj_factor", tmp_path)
+        assert manifest["invalidated"] == []
+        assert manifest["rows"] == 2
@@ -4,13 +4,19 @@
 - copy_insert 函数的参数处理
 - 大批量自动分批
 - 空数据处理
+- copy_upsert_frame 列式写入（直接 COPY / 暂存表合并）
+- project_frame 列投影与主键去重、copy_insert 接受 DataFrame
+- 常驻 UNLOGGED 暂存表复用与按 ts_code 分片并行写入
 """
 
+from datetime import date
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
+import pandas as pd
 import pytest
 
-from app.data.copy_writer import COPY_BATCH_SIZE, copy_insert
+from app.data.copy_writer import COPY_BATCH_SIZE, copy_insert, copy_upsert_frame, project_frame
 
 
 def _make_mock_table(name: str, columns: list[str], pk_cols: list[str]):
@@ -143,3 +149,208 @@ class TestCopyInsertConflictModes:
         insert_sql = [c for c in calls if "INSERT INTO" in str(c)]
         assert len(insert_sql) > 0
         assert "DO UPDATE SET" in str(insert_sql[0])
+
+    @pytest.mark.asyncio
+    async def test_conflict_update_refreshes_fetched_at(self):
+        """raw 表冲突更新时 fetched_at 刷新为 NOW()（不取 EXCLUDED 值），下游据此感知重新拉取。"""
+        table = _make_mock_table(
+            "raw_tushare_daily_basic", ["ts_code", "trade_date", "pe_ttm", "fetched_at"], ["ts_code", "trade_date"],
+        )
+        rows = [{"ts_code": "600519.SH", "trade_date": "20260101", "pe_ttm": 30.0}]
+        mock_raw_conn, mock_ctx = _make_mock_ctx()
+
+        with patch("app.data.copy_writer.get_raw_connection", return_value=mock_ctx):
+            await copy_insert(table, rows, conflict="update")
+
+        insert_sql = [str(c) for c in mock_raw_conn.execute.call_args_list if "INSERT INTO" in str(c)]
+        assert '"fetched_at" = NOW()' in insert_sql[0]
+        assert 'EXCLUDED."fetched_at"' not in insert_sql[0]
+
+
+def _make_mock_ctx(exists: bool = False):
+    """创建模拟的 raw 连接上下文，fetchval 返回目标范围是否已有数据。"""
+    mock_raw_conn = AsyncMock()
+    mock_raw_conn.fetchval = AsyncMock(return_value=exists)
+    mock_ctx = AsyncMock()
+    mock_ctx.__aenter__ = AsyncMock(return_value=mock_raw_conn)
+    mock_ctx.__aexit__ = AsyncMock(return_value=False)
+    return mock_raw_conn, mock_ctx
+
+
+class TestCopyUpsertFrame:
+    """列式 COPY 写入测试。"""
+
+    def _frame(self, n: int = 5) -> pd.DataFrame:
+        return pd.DataFrame({
+            "ts_code": [f"00000{i}.SZ" for i in range(n)],
+            "trade_date": [date(2026, 1, 2)] * n,
+            "ma5": np.arange(n, dtype=float),
+            "extra": np.zeros(n),
+        })
+
+    @pytest.mark.asyncio
+    async def test_empty_frame_returns_zero(self):
+        """空 DataFrame 不触发数据库操作。"""
+        table = _make_mock_table("technical_daily", ["ts_code", "trade_date", "ma5"], ["ts_code", "trade_date"])
+        with patch("app.data.copy_writer.get_raw_connection") as mock_conn:
+            assert await copy_upsert_frame(table, pd.DataFrame()) == 0
+            mock_conn.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_auto_direct_when_range_empty(self):
+        """目标范围为空时直接 COPY 到目标表，不使用暂存表。"""
+        table = _make_mock_table("technical_daily", ["ts_code", "trade_date", "ma5"], ["ts_code", "trade_date"])
+        mock_raw_conn, mock_ctx = _make_mock_ctx(exists=False)
+
+        with patch("app.data.copy_writer.get_raw_connection", return_value=mock_ctx):
+            result = await copy_upsert_frame(table, self._frame())
+
+        assert result == 5
+        call = mock_raw_conn.copy_to_table.call_args
+        assert call.args[0] == "technical_daily"
+        assert call.kwargs["columns"] == ["ts_code", "trade_date", "ma5"]
+        assert not any("TRUNCATE" in str(c) for c in mock_raw_conn.execute.call_args_list)
+
+    @pytest.mark.asyncio
+    async def test_auto_merge_when_range_has_rows(self):
+        """目标范围已有数据时经常驻暂存表合并（与 copy_insert 共用槽位），并刷新 updated_at。"""
+        from app.data import copy_writer
+
+        table = _make_mock_table(
+            "frame_merge_test", ["ts_code", "trade_date", "ma5", "updated_at"], ["ts_code", "trade_date"],
+        )
+        mock_raw_conn, mock_ctx = _make_mock_ctx(exists=True)
+
+        with patch("app.data.copy_writer.get_raw_connection", return_value=mock_ctx):
+            await copy_upsert_frame(table, self._frame(), batch_size=2)
+            await copy_upsert_frame(table, self._frame(), batch_size=2)
+
+        assert mock_raw_conn.copy_to_table.call_count == 6
+        assert mock_raw_conn.copy_to_table.call_args.args[0] == "_stg_frame_merge_test_0"
+        sqls = [str(c.args[0]) for c in mock_raw_conn.execute.call_args_list]
+        assert sum("CREATE UNLOGGED TABLE" in s for s in sqls) == 1
+        assert sum(s.startswith("TRUNCATE") for s in sqls) == 6
+        assert not any("TEMP" in s or "DROP" in s for s in sqls)
+        insert_sql = [s for s in sqls if "INSERT INTO" in s]
+        assert len(insert_sql) == 6
+        assert 'FROM "_stg_frame_merge_test_0"' in insert_sql[0]
+        assert '"updated_at" = NOW()' in insert_sql[0]
+        assert not copy_writer._busy_slots
+
+    @pytest.mark.asyncio
+    async def test_csv_encodes_nan_as_null(self):
+        """NaN 编码为空字段（NULL），日期编码为 YYYY-MM-DD。"""
+        table = _make_mock_table("technical_daily", ["ts_code", "trade_date", "ma5"], ["ts_code", "trade_date"])
+        frame = self._frame(1)
+        frame.loc[0, "ma5"] = np.nan
+        mock_raw_conn, mock_ctx = _make_mock_ctx(exists=False)
+
+        with patch("app.data.copy_writer.get_raw_connection", return_value=mock_ctx):
+            await copy_upsert_frame(table, frame, mode="direct")
+
+        payload = mock_raw_conn.copy_to_table.call_args.kwargs["source"].getvalue()
+        assert payload == b"000000.SZ,2026-01-02,\n"
+        mock_raw_conn.fetchval.assert_not_called()
+
+
+class TestProjectFrame:
+    """raw 表列式写入：列投影、主键去重与 DataFrame COPY。"""
+
+    def test_project_dedupe_and_filter(self):
+        """去掉表外列、主键为空的行，重复主键保留最后一条。"""
+        table = _make_mock_table("raw_tushare_daily", ["ts_code", "trade_date", "close"], ["ts_code", "trade_date"])
+        frame = pd.DataFrame({
+            "ts_code": ["600519.SH", "600519.SH", None, "000001.SZ"],
+            "trade_date": ["20250102"] * 4,
+            "close": [1.0, 2.0, 3.0, np.nan],
+            "extra": [0, 0, 0, 0],
+        })
+        out = project_frame(table, frame)
+        assert list(out.columns) == ["ts_code", "trade_date", "close"]
+        assert out["ts_code"].tolist() == ["600519.SH", "000001.SZ"]
+        assert out["close"].iloc[0] == 2.0
+
+    def test_missing_pk_column(self):
+        """缺少主键列时返回空结果（与逐行路径一致）。"""
+        table = _make_mock_table("raw_tushare_daily", ["ts_code", "trade_date", "close"], ["ts_code", "trade_date"])
+        assert project_frame(table, pd.DataFrame({"ts_code": ["600519.SH"], "close": [1.0]})).empty
+
+    @pytest.mark.asyncio
+    async def test_copy_insert_accepts_frame(self):
+        """copy_insert 接受 DataFrame，按列构建记录，NaN 写为 None。"""
+        table = _make_mock_table("raw_tushare_daily", ["ts_code", "trade_date", "close"], ["ts_code", "trade_date"])
+        frame = pd.DataFrame({"ts_code": ["600519.SH", "000001.SZ"], "trade_date": ["20250102"] * 2,
+                              "close": [1.5, np.nan]})
+        mock_raw_conn, mock_ctx = _make_mock_ctx()
+
+        with patch("app.data.copy_writer.get_raw_connection", return_value=mock_ctx):
+            assert await copy_insert(table, frame, conflict="update") == 2
+
+        records = mock_raw_conn.copy_records_to_table.call_args.kwargs["records"]
+        assert records == [("600519.SH", "20250102", 1.5), ("000001.SZ", "20250102", None)]
+
+
+class TestCopyInsertStaging:
+    """常驻暂存表与分片并行写入测试。"""
+
+    @pytest.mark.asyncio
+    async def test_reuses_unlogged_staging(self):
+        """暂存表只创建一次，之后每批在事务内 TRUNCATE 复用，不再建临时表。"""
+        table = _make_mock_table("raw_stage_test", ["id", "val"], ["id"])
+        rows = [{"id": i, "val": i} for i in range(4)]
+        mock_raw_conn, mock_ctx = _make_mock_ctx()
+        report: list[dict] = []
+
+        with patch("app.data.copy_writer.get_raw_connection", return_value=mock_ctx):
+            await copy_insert(table, rows, batch_size=2, report=report)
+            await copy_insert(table, rows, batch_size=2)
+
+        sqls = [str(c.args[0]) for c in mock_raw_conn.execute.call_args_list]
+        assert sum("CREATE UNLOGGED TABLE" in s for s in sqls) == 1
+        assert sum(s.startswith("TRUNCATE") for s in sqls) == 4
+        assert not any("TEMP" in s for s in sqls)
+        assert mock_raw_conn.copy_records_to_table.call_args.args[0] == "_stg_raw_stage_test_0"
+        assert [r["rows"] for r in report] == [2, 2]
+        assert all(r["merge_s"] >= 0 and r["shard"] == 0 for r in report)
+
+    @pytest.mark.asyncio
+    async def test_shards_by_ts_code(self):
+        """分片写入：同一 ts_code 只落在一个分片，各分片使用独立连接与暂存表。"""
+        table = _make_mock_table("raw_shard_test", ["ts_code", "trade_date", "close"], ["ts_code", "trade_date"])
+        frame = pd.DataFrame({
+            "ts_code": [f"{i % 50:06d}.SZ" for i in range(400)],
+            "trade_date": [f"2025{1 + i // 50:04d}" for i in range(400)],
+            "close": np.arange(400, dtype=float),
+        })
+        conns = []
+
+        def _ctx():
+            mock_raw_conn, mock_ctx = _make_mock_ctx()
+            conns.append(mock_raw_conn)
+            return mock_ctx
+
+        with patch("app.data.copy_writer.get_raw_connection", side_effect=_ctx):
+            assert await copy_insert(table, frame, conflict="update", shards=4) == 400
+
+        assert len(conns) == 4
+        stagings = {c.copy_records_to_table.call_args.args[0] for c in conns}
+        assert len(stagings) == 4
+        codes = [{r[0] for r in c.copy_records_to_table.call_args.kwargs["records"]} for c in conns]
+        assert sum(len(c) for c in codes) == 50
+        assert len(set().union(*codes)) == 50
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_rolls_back(self):
+        """合并失败时回滚事务并抛出，暂存表槽位被释放。"""
+        from app.data import copy_writer
+
+        table = _make_mock_table("raw_fail_test", ["id", "val"], ["id"])
+        mock_raw_conn, mock_ctx = _make_mock_ctx()
+        mock_raw_conn.copy_records_to_table.side_effect = RuntimeError("boom")
+
+        with patch("app.data.copy_writer.get_raw_connection", return_value=mock_ctx):
+            with pytest.raises(RuntimeError):
+                await copy_insert(table, [{"id": 1, "val": 1}])
+
+        assert mock_raw_conn.execute.call_args.args[0] == "ROLLBACK"
+        assert not copy_writer._busy_slots
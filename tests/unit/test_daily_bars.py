@@ -0,0 +1,117 @@
+"""日线列式读取与向量化复权的单元测试。"""
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from app.data.daily_bars import adjustment_ratio, apply_adjustment, columns_to_arrow, rows_to_columns
+from app.data.manager import DataManager
+
+D1, D2, D3 = date(2025, 1, 2), date(2025, 1, 3), date(2025, 1, 6)
+
+
+class TestAdjustmentRatio:
+    """测试多标的一次性复权系数。"""
+
+    def test_qfq_uses_latest_factor_per_code(self):
+        """前复权按各标的最后一个非空因子折算，因子全空的标的系数为 1。"""
+        codes = np.array(["A", "A", "A", "B", "B", "C"], dtype=object)
+        factors = np.array([1.0, 2.0, np.nan, 3.0, 3.0, np.nan])
+
+        ratio = adjustment_ratio(codes, factors, "qfq")
+
+        assert ratio[:2] == pytest.approx([0.5, 1.0])
+        assert np.isnan(ratio[2])
+        assert ratio[3:] == pytest.approx([1.0, 1.0, 1.0])
+
+    def test_hfq_and_unadjusted(self):
+        """后复权系数即因子本身；其他 adj 值不复权。"""
+        codes = np.array(["A", "B"], dtype=object)
+        factors = np.array([1.5, np.nan])
+
+        assert adjustment_ratio(codes, factors, "hfq") == pytest.approx([1.5, 1.0])
+        assert adjustment_ratio(codes, factors, None) is None
+
+
+class TestRowsToColumns:
+    """测试查询行转列数组。"""
+
+    def test_numeric_and_zero_fill(self):
+        """Decimal 转 float，NULL 转 NaN，成交量 NULL 转 0。"""
+        rows = [("A", D1, Decimal("10.5"), None), ("A", D2, None, Decimal("100"))]
+
+        columns = rows_to_columns(rows, ["ts_code", "trade_date", "close", "vol"])
+
+        assert columns["trade_date"].tolist() == [D1, D2]
+        assert columns["close"][0] == pytest.approx(10.5)
+        assert np.isnan(columns["close"][1])
+        assert columns["vol"].tolist() == [0.0, 100.0]
+
+    def test_arrow_output(self):
+        """Arrow 输出中 NaN 为 null，trade_date 为 date32。"""
+        pa = pytest.importorskip("pyarrow")
+        columns = rows_to_columns([("A", D1, None)], ["ts_code", "trade_date", "close"])
+
+        table = columns_to_arrow(columns)
+
+        assert table.schema.field("trade_date").type == pa.date32()
+        assert table.column("close").null_count == 1
+
+
+class TestGetDailyBarsColumnar:
+    """测试 DataManager 的列式查询。"""
+
+    @staticmethod
+    def _manager(rows):
+        result = MagicMock()
+        result.all.return_value = rows
+        session = AsyncMock()
+        session.execute.return_value = result
+        ctx = AsyncMock()
+        ctx.__aenter__ = AsyncMock(return_value=session)
+        ctx.__aexit__ = AsyncMock(return_value=False)
+        return DataManager(MagicMock(return_value=ctx), {})
+
+    async def test_selected_fields_with_qfq(self):
+        """只查询所需列（含复权所需的 adj_factor），输出按 fields 顺序并已复权。"""
+        # 查询列顺序：close, trade_date, ts_code, adj_factor
+        rows = [
+            (Decimal("10"), D1, "A", Decimal("1")),
+            (Decimal("20"), D2, "A", Decimal("2")),
+            (Decimal("30"), D3, "B", None),
+        ]
+        mgr = self._manager(rows)
+
+        columns = await mgr.get_daily_bars_columnar(
+            ["A", "B"], D1, D3, adj="qfq", fields=["close", "trade_date"],
+        )
+
+        assert list(columns) == ["close", "trade_date"]
+        assert columns["close"] == pytest.approx([5.0, 20.0, 30.0])
+
+    async def test_dataframe_wrapper(self):
+        """get_daily_bars 返回与列式结果一致的 DataFrame；无数据时返回空表。"""
+        mgr = self._manager([(Decimal("10"), D1, "A", Decimal("1"))])
+        df = await mgr.get_daily_bars(["A"], D1, D1, fields=["close", "trade_date"])
+        assert df.to_dict("records") == [{"close": 10.0, "trade_date": D1}]
+
+        empty = await self._manager([]).get_daily_bars(["A"], D1, D1)
+        assert empty.empty
+        assert "close" in empty.columns
+
+
+class TestApplyAdjustmentColumns:
+    """测试列数组原地复权。"""
+
+    def test_removes_factor(self):
+        """未提供 adj_factor 时列数组保持不变；复权后移除 adj_factor。"""
+        columns = {"ts_code": np.array(["A"], dtype=object), "close": np.array([10.0])}
+        assert apply_adjustment(columns, "qfq") is columns
+
+        columns["adj_factor"] = np.array([2.0])
+        apply_adjustment(columns, "hfq")
+        assert "adj_factor" not in columns
+        assert columns["close"] == pytest.approx([20.0])
@@ -0,0 +1,94 @@
+"""run_date_pipeline 单元测试（拉取/写入流水线）。"""
+
+import asyncio
+import time
+from datetime import date, timedelta
+
+from app.data.date_pipeline import run_date_pipeline
+
+DATES = [date(2026, 2, 2) + timedelta(days=i) for i in range(6)]
+
+
+class TestDatePipeline:
+    """流水线并发、背压与错误处理测试。"""
+
+    async def test_overlaps_fetch_and_write(self) -> None:
+        """拉取与写入重叠：总耗时接近 max(拉取, 写入) 而非两者之和。"""
+        async def fetch(td):
+            await asyncio.sleep(0.05)
+            return td.day
+
+        async def write(td, data):
+            await asyncio.sleep(0.05)
+            return data
+
+        start = time.monotonic()
+        result = await run_date_pipeline(DATES, fetch, write, fetchers=1, writers=1, queue_size=2)
+        elapsed = time.monotonic() - start
+
+        assert result["results"] == {td: td.day for td in DATES}
+        assert result["errors"] == {}
+        assert result["stages"]["fetch"]["items"] == 6
+        assert result["stages"]["write"]["busy_s"] >= 0.25
+        # 串行需要 0.6s，流水线约 0.35s
+        assert elapsed < 0.5
+
+    async def test_backpressure_bounds_buffered_dates(self) -> None:
+        """写入慢时拉取被队列阻塞，已拉取未写入的日期数不超过上限。"""
+        in_flight = 0
+        peak = 0
+
+        async def fetch(td):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            return td
+
+        async def write(td, data):
+            nonlocal in_flight
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        result = await run_date_pipeline(DATES, fetch, write, fetchers=2, writers=1, queue_size=1)
+
+        # 队列 1 + 拉取任务 2 + 写入任务 1
+        assert peak <= 4
+        assert result["stages"]["bottleneck"] == "write"
+        assert result["stages"]["fetch"]["wait_s"] > 0
+
+    async def test_errors_isolated_per_date(self) -> None:
+        """单个日期拉取或写入失败只记录该日期。"""
+        async def fetch(td):
+            if td == DATES[1]:
+                raise RuntimeError("fetch")
+            return td
+
+        async def write(td, data):
+            if td == DATES[2]:
+                raise RuntimeError("write")
+            return 1
+
+        result = await run_date_pipeline(DATES, fetch, write, fetchers=1, writers=1)
+
+        assert set(result["errors"]) == {DATES[1], DATES[2]}
+        assert len(result["results"]) == 4
+        assert result["stages"]["fetch"]["failed"] == 1
+        assert result["stages"]["write"]["failed"] == 1
+
+    async def test_stop_on_error(self) -> None:
+        """stop_on_error 时失败后不再发起新的拉取。"""
+        fetched = []
+
+        async def fetch(td):
+            fetched.append(td)
+            if td == DATES[0]:
+                raise RuntimeError("fetch")
+            return td
+
+        async def write(td, data):
+            return 1
+
+        result = await run_date_pipeline(DATES, fetch, write, fetchers=1, writers=1, stop_on_error=True)
+
+        assert fetched == [DATES[0]]
+        assert set(result["errors"]) == {DATES[0]}
@@ -346,3 +346,66 @@ class TestTransformTushareConceptMember:
     def test_empty(self):
         from app.data.etl import transform_tushare_concept_member
         assert transform_tushare_concept_member([]) == []
+
+
+# ---------------------------------------------------------------------------
+# stock_daily 服务端 SQL ETL 测试
+# ---------------------------------------------------------------------------
+
+
+class TestDailySqlEtl:
+    """ETL_DAILY_SQL 与 compare_daily_rows 测试。"""
+
+    def test_upsert_statement(self):
+        """INSERT ... SELECT 覆盖全部业务列，冲突时更新非主键列。"""
+        from app.data.etl import ETL_DAILY_SQL
+
+        assert ETL_DAILY_SQL.startswith("INSERT INTO stock_daily (ts_code, trade_date, open")
+        assert "amount * 1000" in ETL_DAILY_SQL
+        assert "ON CONFLICT (ts_code, trade_date) DO UPDATE SET open = EXCLUDED.open" in ETL_DAILY_SQL
+        assert "ts_code = EXCLUDED.ts_code" not in ETL_DAILY_SQL
+
+    def _py_rows(self):
+        from app.data.etl import transform_tushare_daily
+
+        raw_daily = [
+            {"ts_code": "600519.SH", "trade_date": "20260216", "open": Decimal("10.1250"),
+             "high": Decimal("10.5"), "low": Decimal("10"), "close": Decimal("10.3"),
+             "pre_close": Decimal("10.2"), "pct_chg": Decimal("0.9804"),
+             "vol": Decimal("0"), "amount": None},
+        ]
+        raw_adj = [{"ts_code": "600519.SH", "trade_date": "20260216", "adj_factor": Decimal("1.5")}]
+        return transform_tushare_daily(raw_daily, raw_adj, [])
+
+    def _sql_row(self, **overrides):
+        row = {
+            "ts_code": "600519.SH", "trade_date": date(2026, 2, 16),
+            "open": Decimal("10.1250"), "high": Decimal("10.5000"), "low": Decimal("10.0000"),
+            "close": Decimal("10.3000"), "pre_close": Decimal("10.2000"), "pct_chg": Decimal("0.9804"),
+            "vol": Decimal("0"), "amount": 0, "adj_factor": Decimal("1.500000"),
+            "turnover_rate": None, "trade_status": "0", "data_source": "tushare",
+        }
+        row.update(overrides)
+        return row
+
+    def test_rows_match_after_column_rounding(self):
+        """按目标列精度舍入后，SQL 结果与 Python transform 一致。"""
+        from app.data.etl import compare_daily_rows
+        from app.models.market import StockDaily
+
+        assert compare_daily_rows([self._sql_row()], self._py_rows(), StockDaily.__table__) == []
+
+    def test_detects_mismatch_and_missing_rows(self):
+        """列值差异和单侧缺失的行都会被报告。"""
+        from app.data.etl import compare_daily_rows
+        from app.models.market import StockDaily
+
+        sql_rows = [
+            self._sql_row(trade_status="1"),
+            self._sql_row(ts_code="000001.SZ"),
+        ]
+        diffs = compare_daily_rows(sql_rows, self._py_rows(), StockDaily.__table__)
+        assert {(d["ts_code"], d["column"]) for d in diffs} == {
+            ("600519.SH", "trade_status"),
+            ("000001.SZ", "<missing>"),
+        }
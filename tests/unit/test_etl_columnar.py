@@ -0,0 +1,246 @@
+"""列式 ETL 转换（etl_columnar）的单元测试。
+
+验证列式实现的过滤条件、缺省值、字段映射与去重（期望值与原 etl.py 逐行实现一致），
+以及输出列类型可直接用于 COPY。
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.data import etl
+from app.data.etl_columnar import (
+    columnar_tushare_concept_daily,
+    columnar_tushare_daily,
+    columnar_tushare_limit_list_d,
+    to_arrow,
+    to_records,
+    transform_rows,
+)
+
+
+def _assert_same_rows(got: list[dict], expected: list[dict], key: tuple[str, ...]) -> None:
+    """按主键排序后逐字段比较（数值按值比较）。"""
+    def _sort(rows):
+        return sorted(rows, key=lambda r: tuple(str(r[k]) for k in key))
+
+    assert len(got) == len(expected)
+    for g, e in zip(_sort(got), _sort(expected)):
+        assert list(g) == list(e)
+        for field, value in e.items():
+            assert g[field] == value, (field, g[field], value)
+
+
+DAILY = [
+    {"ts_code": "600519.SH", "trade_date": "20250102", "open": Decimal("1500.10"), "high": "1510.5",
+     "low": 1490.0, "close": 1505.25, "pre_close": 1499.0, "pct_chg": 0.42, "vol": 12345.0, "amount": 1850000.5},
+    {"ts_code": "000001.SZ", "trade_date": "20250102", "open": 11.2, "high": 11.3, "low": 11.1,
+     "close": 11.25, "pre_close": 11.2, "pct_chg": None, "vol": 0, "amount": 0},
+    {"ts_code": "000002.SZ", "trade_date": "20250102", "open": "--", "high": None, "low": float("nan"),
+     "close": 8.1, "pre_close": 8.0, "pct_chg": 1.25, "vol": None, "amount": None},
+    {"ts_code": "000003.SZ", "trade_date": None, "close": 1.0},
+]
+ADJ = [
+    {"ts_code": "600519.SH", "trade_date": "20250102", "adj_factor": 7.0},
+    {"ts_code": "600519.SH", "trade_date": "20250102", "adj_factor": 8.123456},
+    {"ts_code": "000001.SZ", "trade_date": "20250102", "adj_factor": None},
+]
+BASIC = [{"ts_code": "000001.SZ", "trade_date": "20250102", "turnover_rate": 0.5521}]
+
+
+def _pick(rows: list[dict], fields: tuple[str, ...]) -> list[dict]:
+    return [{f: r[f] for f in fields} for r in rows]
+
+
+D = Decimal
+
+
+class TestColumnarTransforms:
+    """测试列式转换的清洗语义（过滤条件、缺省值、字段映射、去重）。
+
+    etl.transform_tushare_* 转发到本模块，期望值即原 dict 实现的输出。
+    """
+
+    def test_daily(self):
+        """合并 adj_factor（重复键取最后一条）/daily_basic、amount 千元换算、缺失记 0、停牌标记。"""
+        got = transform_rows("daily", DAILY, ADJ, BASIC)
+        _assert_same_rows(got, [
+            {"ts_code": "600519.SH", "trade_date": date(2025, 1, 2), "open": D("1500.1"), "high": D("1510.5"),
+             "low": D("1490.0"), "close": D("1505.25"), "pre_close": D("1499.0"), "pct_chg": D("0.42"),
+             "vol": D("12345.0"), "amount": D("1850000500.0"), "adj_factor": D("8.123456"),
+             "turnover_rate": None, "trade_status": "1", "data_source": "tushare"},
+            {"ts_code": "000001.SZ", "trade_date": date(2025, 1, 2), "open": D("11.2"), "high": D("11.3"),
+             "low": D("11.1"), "close": D("11.25"), "pre_close": D("11.2"), "pct_chg": None,
+             "vol": D("0"), "amount": D("0"), "adj_factor": None,
+             "turnover_rate": D("0.5521"), "trade_status": "0", "data_source": "tushare"},
+            {"ts_code": "000002.SZ", "trade_date": date(2025, 1, 2), "open": None, "high": None,
+             "low": None, "close": D("8.1"), "pre_close": D("8.0"), "pct_chg": D("1.25"),
+             "vol": D("0"), "amount": D("0"), "adj_factor": None,
+             "turnover_rate": None, "trade_status": "1", "data_source": "tushare"},
+        ], ("ts_code",))
+        assert etl.transform_tushare_daily(DAILY, ADJ, BASIC) == got
+
+    def test_moneyflow_and_top_list(self):
+        """缺失记 0、字段重命名、空代码/无效日期过滤。"""
+        rows = [
+            {"ts_code": "600519.SH", "trade_date": "20250102", "buy_sm_vol": 100, "net_mf_amount": "-12.5",
+             "l_buy": 1000.5, "l_sell": None, "net_amount": 10.0, "reason": "", "name": "贵州茅台"},
+            {"ts_code": "", "trade_date": "20250102", "buy_sm_vol": 1},
+            {"ts_code": "000001.SZ", "trade_date": "2025-01-03", "buy_sm_vol": None, "reason": "涨幅偏离"},
+            {"ts_code": "000002.SZ", "trade_date": "bad"},
+        ]
+        fields = ("ts_code", "trade_date", "buy_sm_vol", "sell_sm_vol", "net_mf_amount")
+        assert _pick(transform_rows("moneyflow", rows), fields) == [
+            {"ts_code": "600519.SH", "trade_date": date(2025, 1, 2),
+             "buy_sm_vol": D("100"), "sell_sm_vol": D("0"), "net_mf_amount": D("-12.5")},
+            {"ts_code": "000001.SZ", "trade_date": date(2025, 1, 3),
+             "buy_sm_vol": D("0"), "sell_sm_vol": D("0"), "net_mf_amount": D("0")},
+        ]
+        fields = ("ts_code", "reason", "buy_total", "sell_total", "net_buy", "list_name")
+        assert _pick(transform_rows("top_list", rows), fields) == [
+            {"ts_code": "600519.SH", "reason": None, "buy_total": D("1000.5"), "sell_total": None,
+             "net_buy": D("10.0"), "list_name": "贵州茅台"},
+            {"ts_code": "000001.SZ", "reason": "涨幅偏离", "buy_total": None, "sell_total": None,
+             "net_buy": None, "list_name": None},
+        ]
+
+    def test_index_and_concept(self):
+        """指数过滤 OHLC 不完整行；板块 open/high/low 缺失或为 0 时取 close。"""
+        rows = [
+            {"ts_code": "000300.SH", "trade_date": "20250102", "open": 1.0, "high": 2.0, "low": 0.5,
+             "close": 1.5, "vol": None, "amount": 3.0},
+            {"ts_code": "000905.SH", "trade_date": "20250102", "open": None, "high": 2.0, "low": 0.5, "close": 1.5},
+            {"ts_code": "885001.TI", "trade_date": "20250103", "open": 0, "high": None, "low": 1.2, "close": 1.4},
+            {"ts_code": "885002.TI", "trade_date": "20250103", "close": None},
+        ]
+        fields = ("ts_code", "open", "high", "low", "close", "vol", "amount")
+        assert _pick(transform_rows("index_daily", rows), fields) == [
+            {"ts_code": "000300.SH", "open": D("1.0"), "high": D("2.0"), "low": D("0.5"), "close": D("1.5"),
+             "vol": D("0"), "amount": D("3.0")},
+        ]
+        assert _pick(transform_rows("concept_daily", rows), fields) == [
+            {"ts_code": "000300.SH", "open": D("1.0"), "high": D("2.0"), "low": D("0.5"), "close": D("1.5"),
+             "vol": D("0"), "amount": D("3.0")},
+            {"ts_code": "000905.SH", "open": D("1.5"), "high": D("2.0"), "low": D("0.5"), "close": D("1.5"),
+             "vol": D("0"), "amount": D("0")},
+            {"ts_code": "885001.TI", "open": D("1.4"), "high": D("1.4"), "low": D("1.2"), "close": D("1.4"),
+             "vol": D("0"), "amount": D("0")},
+        ]
+
+        factor = [{"ts_code": "000300.SH", "trade_date": "20250102", "ma_bfq_90": 3900.12, "wr_bfq": -20.5}]
+        technical = transform_rows("index_technical", factor)[0]
+        assert {k: v for k, v in technical.items() if v is not None} == {
+            "ts_code": "000300.SH", "trade_date": date(2025, 1, 2),
+            "ma120": D("3900.12"), "willr14": D("-20.5"), "wr": D("-20.5"),
+        }
+        weight = [{"index_code": "000300.SH", "con_code": "600519.SH", "trade_date": "20250102", "weight": 5.1}]
+        assert transform_rows("index_weight", weight) == [
+            {"index_code": "000300.SH", "con_code": "600519.SH", "trade_date": date(2025, 1, 2), "weight": D("5.1")},
+        ]
+
+    def test_financials_dedupe(self):
+        """财务三表只保留合并报表并按主键去重保留最后一条；fina_indicator 过滤无公告日的行。"""
+        rows = [
+            {"ts_code": "600519.SH", "end_date": "20241231", "ann_date": "20250301", "report_type": "1",
+             "total_revenue": 1.0, "total_assets": 2.0, "n_cashflow_act": 3.0, "eps": 1.5, "update_flag": "0"},
+            {"ts_code": "600519.SH", "end_date": "20241231", "ann_date": "20250302", "report_type": None,
+             "total_revenue": 9.0, "total_assets": 8.0, "n_cashflow_act": 7.0, "eps": 2.5, "update_flag": None},
+            {"ts_code": "600519.SH", "end_date": "20241231", "ann_date": None, "report_type": "2"},
+            {"ts_code": "000001.SZ", "end_date": None, "ann_date": "20250301"},
+        ]
+        key = ("ts_code", "end_date", "ann_date", "report_type")
+        for name, field, value in (
+            ("income", "total_revenue", D("9.0")),
+            ("balancesheet", "total_assets", D("8.0")),
+            ("cashflow", "n_cashflow_act", D("7.0")),
+        ):
+            assert _pick(transform_rows(name, rows), (*key, field)) == [
+                {"ts_code": "600519.SH", "end_date": date(2024, 12, 31), "ann_date": date(2025, 3, 2),
+                 "report_type": "1", field: value},
+            ]
+        assert _pick(transform_rows("fina_indicator", rows), (*key, "eps")) == [
+            {"ts_code": "600519.SH", "end_date": date(2024, 12, 31), "ann_date": date(2025, 3, 1),
+             "report_type": "0", "eps": D("1.5")},
+            {"ts_code": "600519.SH", "end_date": date(2024, 12, 31), "ann_date": date(2025, 3, 2),
+             "report_type": "", "eps": D("2.5")},
+        ]
+
+    def test_suspend_and_limit_list(self):
+        """停复牌日期映射、空串视为 NULL，涨跌停整数列保持 int。"""
+        rows = [
+            {"ts_code": "600519.SH", "suspend_date": "20250102", "trade_date": "20250102", "resume_date": None,
+             "reason_type": "", "suspend_timing": "全天", "open_times": 3, "limit_times": None, "close": 10.1},
+            {"ts_code": "000001.SZ", "suspend_date": None, "trade_date": "20250102", "open_times": None},
+        ]
+        assert transform_rows("suspend_d", rows) == [
+            {"ts_code": "600519.SH", "trade_date": date(2025, 1, 2), "suspend_timing": "全天",
+             "suspend_type": None, "suspend_reason": None, "resume_date": None, "data_source": "tushare"},
+        ]
+        fields = ("ts_code", "close", "open_times", "limit_times")
+        assert _pick(transform_rows("limit_list_d", rows), fields) == [
+            {"ts_code": "600519.SH", "close": D("10.1"), "open_times": 3, "limit_times": None},
+            {"ts_code": "000001.SZ", "close": None, "open_times": None, "limit_times": None},
+        ]
+
+    def test_etl_forwards_to_columnar(self):
+        """etl.py 的 dict API 与列式实现输出相同。"""
+        assert etl.transform_tushare_moneyflow([]) == []
+        assert etl.transform_tushare_suspend_d(
+            [{"ts_code": "600519.SH", "suspend_date": "20250102"}]
+        ) == transform_rows("suspend_d", [{"ts_code": "600519.SH", "suspend_date": "20250102"}])
+
+    def test_unknown_name(self):
+        """未知转换名报错。"""
+        with pytest.raises(ValueError):
+            transform_rows("bogus", [])
+
+
+class TestColumnarOutput:
+    """测试列式输出的类型与边界。"""
+
+    def test_typed_columns(self):
+        """数值列为 float64、整数列为 Int64、日期列为 datetime64。"""
+        frame = columnar_tushare_daily(pd.DataFrame(DAILY), pd.DataFrame(ADJ), pd.DataFrame(BASIC))
+        assert frame["close"].dtype == np.float64
+        assert pd.api.types.is_datetime64_any_dtype(frame["trade_date"])
+        assert frame.loc[frame["ts_code"] == "600519.SH", "adj_factor"].item() == 8.123456
+        assert frame.loc[frame["ts_code"] == "600519.SH", "amount"].item() == pytest.approx(1850000500.0)
+
+        limits = columnar_tushare_limit_list_d(DAILY[:1] + [{"ts_code": "1", "trade_date": "20250102",
+                                                           "open_times": 2}])
+        assert isinstance(limits["open_times"].dtype, pd.Int64Dtype)
+        assert to_records(limits)[1]["open_times"] == 2
+
+    def test_empty_input(self):
+        """空输入返回空结果。"""
+        assert columnar_tushare_daily([], [], []).empty
+        assert transform_rows("moneyflow", []) == []
+        assert columnar_tushare_concept_daily(pd.DataFrame()).empty
+
+    def test_transform_rows_keeps_exact_decimal(self):
+        """dict 兼容包装按原始字符串解析 Decimal，超出 float64 精度的数值原样保留。"""
+        raw = [{"ts_code": "600519.SH", "end_date": "20241231", "report_type": "1",
+                "ann_date": "20250320", "total_assets": "123456789012345.6789", "goodwill": "--"}]
+        row = transform_rows("balancesheet", raw)[0]
+        assert row["total_assets"] == etl.parse_decimal("123456789012345.6789")
+        assert str(row["total_assets"]) == "123456789012345.6789"
+        assert row["goodwill"] is None
+
+        daily = [{**DAILY[0], "close": "1505.123456789012345678", "amount": "98765432109876.54321"}]
+        row = transform_rows("daily", daily, [], [])[0]
+        assert str(row["close"]) == "1505.123456789012345678"
+        assert row["amount"] == D("98765432109876543.21000")
+        assert row["open"] == D("1500.10")
+
+        flows = transform_rows("moneyflow", [{"ts_code": "600519.SH", "trade_date": "20250102"}])
+        assert flows[0]["net_mf_amount"] == D("0")
+
+    def test_to_arrow_date32(self):
+        """转为 Arrow 时日期列为 date32。"""
+        pa = pytest.importorskip("pyarrow")
+        table = to_arrow(columnar_tushare_daily(DAILY, ADJ, BASIC))
+        assert table.schema.field("trade_date").type == pa.date32()
+        assert table.column("trade_date")[0].as_py() == date(2025, 1, 2)
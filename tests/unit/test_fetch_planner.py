@@ -0,0 +1,51 @@
+"""fetch_planner 拉取方式规划的单元测试。"""
+
+from datetime import date, timedelta
+
+from app.data.fetch_planner import API_ROW_CAPS, plan_fetch, range_windows
+
+SPAN = [date(2020, 1, 1) + timedelta(days=i) for i in range(1000)]
+
+
+class TestRangeWindows:
+    """区间切片测试。"""
+
+    def test_windows_respect_row_cap(self):
+        """每段交易日数不超过单次行数上限，且首尾相接覆盖全部日期。"""
+        windows = range_windows(SPAN, 300)
+        assert windows[0] == (SPAN[0], SPAN[299])
+        assert windows[-1] == (SPAN[900], SPAN[-1])
+        assert len(windows) == 4
+
+
+class TestPlanFetch:
+    """按缺口形状选择拉取方式。"""
+
+    def test_full_market_gap_by_date(self):
+        """全市场一年缺口：逐日拉取（243 次）远少于逐代码（5400 次）。"""
+        dates = SPAN[:243]
+        plan = plan_fetch(dates, dates, 5400, 5400, ["daily", "adj_factor"])
+        assert plan.mode == "by_date"
+        assert plan.calls == 243
+        assert plan.by_code_calls == 5400
+
+    def test_few_codes_deep_gap_by_code(self):
+        """少量代码的多年缺口：逐代码区间拉取，区间按行数上限切片。"""
+        plan = plan_fetch(SPAN, SPAN, 20, 5400, ["moneyflow"])
+        assert plan.mode == "by_code"
+        assert plan.calls == 20
+        assert plan.windows == ((SPAN[0], SPAN[-1]),)
+
+    def test_sparse_dates_span_counts(self):
+        """稀疏缺口按首尾区间的交易日数计算代码方式的调用次数。"""
+        cap = API_ROW_CAPS["ths_daily"]
+        span = [date(2000, 1, 1) + timedelta(days=i) for i in range(cap * 2)]
+        plan = plan_fetch([span[0], span[-1]], span, 1, 5400, ["ths_daily"])
+        # 按日期：2 日 × 2 页；按代码：1 只 × 2 段
+        assert plan.by_date_calls == 4
+        assert plan.by_code_calls == 2
+        assert plan.mode == "by_code"
+
+    def test_empty_gap(self):
+        """无缺失日期时保持按日期方式。"""
+        assert plan_fetch([], [], 10, 5400, ["daily"]).mode == "by_date"
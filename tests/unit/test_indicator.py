@@ -497,3 +497,34 @@ class TestComputeDonchian:
         upper, lower = _compute_donchian(df["high"], df["low"], period=20)
         valid = upper.dropna() >= lower.dropna()
         assert valid.all()
+
+
+# ============================================================
+# 列式写入帧测试
+# ============================================================
+
+from app.data.indicator import (  # noqa: E402
+    INDICATOR_COLUMNS,
+    _build_indicator_row,
+    build_indicator_frame,
+)
+
+
+class TestBuildIndicatorFrame:
+    """测试 build_indicator_frame 与逐行 _build_indicator_row 一致。"""
+
+    def test_matches_row_builder(self):
+        """舍入、NaN 与超限置空规则与逐行构建一致。"""
+        df = compute_single_stock_indicators(_make_daily_df(days=80))
+        df.loc[5, "ma5"] = 1e9  # 超出 Numeric(12, 4) 范围
+        df.loc[6, "obv"] = 1e12  # Numeric(20, 2) 范围内
+
+        frame = build_indicator_frame("600519.SH", df["trade_date"].to_numpy(), df)
+        expected = [
+            _build_indicator_row("600519.SH", row["trade_date"], row)
+            for _, row in df.iterrows()
+        ]
+
+        assert list(frame.columns) == ["ts_code", "trade_date", *INDICATOR_COLUMNS]
+        records = frame.astype(object).where(frame.notna(), None).to_dict("records")
+        assert records == expected
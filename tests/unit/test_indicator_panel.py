@@ -0,0 +1,152 @@
+"""面板指标引擎（indicator_panel）的单元测试。
+
+验证 date × stock 面板的构建（右对齐、NaN 填充）以及
+compute_indicators_panel() 与逐股 compute_indicators_generic() 结果一致。
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.data.indicator import INDICATOR_COLUMNS, compute_indicators_generic
+from app.data.indicator_panel import (
+    build_price_panel,
+    compute_indicators_panel,
+    panel_rows_for_date,
+)
+
+
+def _make_long_df(lengths: list[int], seed: int = 7) -> pd.DataFrame:
+    """构造多只股票的长表行情，每只股票历史长度不同，日期互相错开。"""
+    rng = np.random.default_rng(seed)
+    records = []
+    for i, n in enumerate(lengths):
+        ts_code = f"{600000 + i}.SH"
+        closes = 10.0 * np.cumprod(1 + rng.normal(0, 0.02, n))
+        end = date(2025, 6, 30)
+        for k in range(n):
+            c = round(float(closes[k]), 2)
+            records.append({
+                "ts_code": ts_code,
+                # 每只股票的最后一根 K 线都在 end，更早的日期间隔不同（模拟停牌）
+                "trade_date": end - timedelta(days=(n - 1 - k) * (1 + i % 3)),
+                "open": Decimal(str(round(c * 0.99, 2))),
+                "high": Decimal(str(round(c * 1.02, 2))),
+                "low": Decimal(str(round(c * 0.98, 2))),
+                "close": Decimal(str(c)),
+                "vol": Decimal(str(round(float(rng.uniform(500, 1500)), 2))),
+            })
+    # 打乱顺序，验证构建过程不依赖输入排序
+    return pd.DataFrame(records).sample(frac=1.0, random_state=1).reset_index(drop=True)
+
+
+def _per_stock_indicators(df: pd.DataFrame, ts_code: str) -> pd.DataFrame:
+    """按逐股路径的方式计算单只股票的指标。"""
+    g = df[df["ts_code"] == ts_code].sort_values("trade_date")
+    single = pd.DataFrame({
+        col: [float(v) if v else 0.0 for v in g[col]]
+        for col in ("open", "high", "low", "close", "vol")
+    })
+    single["trade_date"] = g["trade_date"].to_numpy()
+    return compute_indicators_generic(single)
+
+
+class TestBuildPricePanel:
+    """测试长表 → 面板转换。"""
+
+    def test_right_aligned_with_nan_padding(self):
+        """历史较短的标的在顶部填充 NaN，最后一行为最新 K 线。"""
+        df = _make_long_df([5, 3])
+        panel = build_price_panel(df)
+
+        assert panel.codes == ["600000.SH", "600001.SH"]
+        assert panel.depth == 5
+        assert np.isnan(panel.close[:2, 1]).all()
+        assert not np.isnan(panel.close[2:, 1]).any()
+        assert (panel.trade_dates[-1] == np.datetime64(date(2025, 6, 30))).all()
+
+    def test_empty_dataframe(self):
+        """空输入返回空面板。"""
+        df = pd.DataFrame(columns=["ts_code", "trade_date", "open", "high", "low", "close", "vol"])
+        panel = build_price_panel(df)
+        assert panel.codes == []
+        assert panel.depth == 0
+
+    def test_null_values_become_zero(self):
+        """NULL 价格与逐股路径一致按 0.0 处理。"""
+        df = _make_long_df([3])
+        df.loc[0, "vol"] = None
+        panel = build_price_panel(df)
+        assert not np.isnan(panel.vol).any()
+        assert (panel.vol == 0.0).sum() == 1
+
+
+@pytest.fixture(scope="module")
+def data():
+    """多只不同历史长度股票的长表、面板及完整指标。"""
+    df = _make_long_df([300, 260, 120, 30, 9, 1])
+    panel = build_price_panel(df)
+    return df, panel, compute_indicators_panel(panel)
+
+
+class TestPanelMatchesPerStock:
+    """面板计算结果与逐股计算一致。"""
+
+    def test_all_rows_match(self, data):
+        """全部行、全部指标与逐股结果一致（浮点误差内）。"""
+        df, panel, full = data
+        for j, ts_code in enumerate(panel.codes):
+            expected = _per_stock_indicators(df, ts_code)
+            n = len(expected)
+            for col in INDICATOR_COLUMNS:
+                np.testing.assert_allclose(
+                    full[col][-n:, j], expected[col].to_numpy(dtype=float),
+                    rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=f"{ts_code} {col}",
+                )
+
+    def test_padding_rows_are_nan(self, data):
+        """填充行不产生指标值。"""
+        _, panel, full = data
+        padding = ~panel.valid
+        for col in INDICATOR_COLUMNS:
+            assert np.isnan(full[col][padding]).all(), col
+
+    def test_tail_matches_full(self, data):
+        """tail=1 仅计算最后一行，结果与完整计算的最后一行一致。"""
+        _, panel, full = data
+        last = compute_indicators_panel(panel, tail=1)
+        for col in INDICATOR_COLUMNS:
+            assert last[col].shape == (1, len(panel.codes))
+            np.testing.assert_allclose(last[col][0], full[col][-1], equal_nan=True)
+
+    def test_flat_price_edge_cases(self):
+        """价格不变时 KDJ/WR/CCI/RSI 的边界处理与逐股一致。"""
+        df = _make_long_df([40])
+        df["open"] = df["high"] = df["low"] = df["close"] = Decimal("8.00")
+        panel = build_price_panel(df)
+        full = compute_indicators_panel(panel)
+        expected = _per_stock_indicators(df, panel.codes[0])
+        for col in ("kdj_k", "kdj_d", "wr", "cci", "rsi6", "boll_upper"):
+            np.testing.assert_allclose(
+                full[col][:, 0], expected[col].to_numpy(dtype=float), equal_nan=True,
+            )
+
+
+class TestPanelRowsForDate:
+    """测试写入行构建。"""
+
+    def test_rows_only_for_target_date(self):
+        """仅返回最新 K 线为目标日的标的，NaN 转为 None。"""
+        df = _make_long_df([30, 3])
+        panel = build_price_panel(df)
+        indicators = compute_indicators_panel(panel, tail=1)
+
+        rows = panel_rows_for_date(panel, indicators, date(2025, 6, 30))
+        assert [r["ts_code"] for r in rows] == panel.codes
+        assert rows[0]["ma20"] is not None
+        assert rows[1]["ma20"] is None
+
+        assert panel_rows_for_date(panel, indicators, date(2025, 6, 29)) == []
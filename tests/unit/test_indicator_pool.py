@@ -0,0 +1,90 @@
+"""多进程技术指标计算（indicator_pool）的单元测试。
+
+验证分片计算结果与逐股路径一致、失败标的隔离，以及工作进程吞吐汇总。
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.data.indicator import build_indicator_frame, compute_single_stock_indicators
+from app.data.indicator_pool import _compute_shard, summarize_workers
+
+
+def _make_shard(codes: list[str], days: int = 60) -> pd.DataFrame:
+    """构造按 ts_code, trade_date 排序的分片行情长表。"""
+    rng = np.random.default_rng(11)
+    records = []
+    for ts_code in codes:
+        closes = 10.0 * np.cumprod(1 + rng.normal(0, 0.02, days))
+        for k in range(days):
+            c = float(closes[k])
+            records.append({
+                "ts_code": ts_code,
+                "trade_date": date(2025, 1, 1) + timedelta(days=k),
+                "open": c * 0.99,
+                "high": c * 1.02,
+                "low": c * 0.98,
+                "close": c,
+                "vol": float(rng.uniform(500, 1500)),
+            })
+    return pd.DataFrame(records)
+
+
+class TestComputeShard:
+    """测试工作进程分片计算。"""
+
+    def test_matches_per_stock(self):
+        """分片结果与逐股计算 + 列式构建一致。"""
+        df = _make_shard(["600000.SH", "600001.SH"])
+        r = _compute_shard(df)
+
+        assert r["codes"] == 2
+        assert r["failed"] == []
+        assert r["rows"] == 120
+
+        g = df[df["ts_code"] == "600001.SH"].drop(columns="ts_code").reset_index(drop=True)
+        single = compute_single_stock_indicators(g)
+        expected = build_indicator_frame("600001.SH", single["trade_date"].to_numpy(), single)
+        actual = r["frame"][r["frame"]["ts_code"] == "600001.SH"].reset_index(drop=True)
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_failed_code_isolated(self):
+        """单个标的计算失败不影响同分片其他标的。"""
+        df = _make_shard(["600000.SH", "600001.SH"])
+        df["close"] = df["close"].astype(object)
+        df.loc[df["ts_code"] == "600001.SH", "close"] = "bad"
+        r = _compute_shard(df)
+
+        assert r["codes"] == 1
+        assert r["failed"] == ["600001.SH"]
+        assert set(r["frame"]["ts_code"]) == {"600000.SH"}
+
+    def test_runs_in_spawned_process(self):
+        """分片函数可在 spawn 进程池中执行（可序列化、无需数据库连接）。"""
+        df = _make_shard(["600000.SH"], days=30)
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            r = pool.submit(_compute_shard, df).result()
+        assert r["rows"] == 30
+
+
+class TestSummarizeWorkers:
+    """测试工作进程吞吐汇总。"""
+
+    def test_aggregate_by_pid(self):
+        """按 PID 聚合分片数、标的数、行数和吞吐。"""
+        results = [
+            {"pid": 1, "codes": 10, "rows": 1000, "seconds": 1.0},
+            {"pid": 1, "codes": 10, "rows": 1000, "seconds": 1.0},
+            {"pid": 2, "codes": 5, "rows": 500, "seconds": 0.0},
+        ]
+        stats = summarize_workers(results)
+
+        assert stats[1]["shards"] == 2
+        assert stats[1]["codes_per_second"] == 10.0
+        assert stats[1]["rows_per_second"] == 1000
+        assert stats[2]["codes_per_second"] == 0.0
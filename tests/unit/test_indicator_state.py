@@ -0,0 +1,158 @@
+"""技术指标递推状态（indicator_state）的单元测试。
+
+验证状态序列化往返、逐日推进与全历史计算一致、同一日期重跑从上一根状态推进，
+以及推进/重算的划分规则。
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.data.indicator import INDICATOR_COLUMNS
+from app.data.indicator_panel import (
+    advance_indicator_state,
+    build_price_panel,
+    compute_indicators_panel,
+    seed_indicator_state,
+)
+from app.data.indicator_state import (
+    _adj_changed,
+    base_state,
+    plan_state_update,
+    state_from_rows,
+    state_to_rows,
+)
+
+
+def _make_df(lengths: list[int], seed: int = 3) -> pd.DataFrame:
+    """构造多只股票连续交易日行情，最后一根 K 线都在同一天。"""
+    rng = np.random.default_rng(seed)
+    end = date(2025, 6, 30)
+    records = []
+    for i, n in enumerate(lengths):
+        closes = 10.0 * np.cumprod(1 + rng.normal(0, 0.02, n))
+        for k in range(n):
+            c = round(float(closes[k]), 2)
+            records.append({
+                "ts_code": f"{600000 + i}.SH",
+                "trade_date": end - timedelta(days=n - 1 - k),
+                "open": c * 0.99,
+                "high": c * 1.02,
+                "low": c * 0.98,
+                "close": c,
+                "vol": float(rng.uniform(500, 1500)),
+            })
+    return pd.DataFrame(records)
+
+
+class TestStateSerialization:
+    """测试 PanelState ↔ 表行转换。"""
+
+    def test_round_trip(self):
+        """序列化后还原的状态与原状态一致（NaN 与窗口填充保持不变）。"""
+        panel = build_price_panel(_make_df([80, 5]))
+        _, state = seed_indicator_state(panel, np.array([1.5, np.nan]))
+
+        rows = state_to_rows(state, "technical_daily")
+        assert rows[0]["adj_factor"] == 1.5
+        assert rows[1]["adj_factor"] is None
+        assert len(rows[1]["window_close"]) == 5
+        assert rows[0]["trade_date"] == date(2025, 6, 30)
+
+        restored = state_from_rows(list(reversed(rows)), state.codes)
+        np.testing.assert_array_equal(restored.bar_count, state.bar_count)
+        np.testing.assert_array_equal(restored.trade_dates, state.trade_dates)
+        for col, val in state.values.items():
+            np.testing.assert_array_equal(restored.values[col], val, err_msg=col)
+        for field, window in state.windows.items():
+            np.testing.assert_array_equal(restored.windows[field], window, err_msg=field)
+
+
+class TestAdvanceMatchesFull:
+    """从持久化状态推进的结果与全历史计算一致。"""
+
+    def test_advance_through_storage(self):
+        """种子状态经序列化往返后逐日推进 3 根 K 线，结果与全历史计算最后一行一致。"""
+        df = _make_df([300, 40, 10, 4])
+        dates = sorted(df["trade_date"].unique())
+        cutoff = dates[-4]
+
+        _, state = seed_indicator_state(build_price_panel(df[df["trade_date"] <= cutoff]))
+        for d in dates[-3:]:
+            bars = build_price_panel(df[df["trade_date"] == d])
+            state = state_from_rows(state_to_rows(state, "technical_daily"), bars.codes)
+            out, state = advance_indicator_state(state, bars)
+
+        full = compute_indicators_panel(build_price_panel(df), tail=1)
+        for col in INDICATOR_COLUMNS:
+            np.testing.assert_allclose(
+                out[col][0], full[col][0], rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=col,
+            )
+
+
+class TestSameDateRerun:
+    """同一日期重跑从保存的上一根 K 线状态推进。"""
+
+    def test_rerun_advances_from_prev_state(self):
+        """推进时保存 prev_state；重跑同一日期从该状态推进，结果与首次推进一致。"""
+        df = _make_df([120, 30])
+        dates = sorted(df["trade_date"].unique())
+        target = dates[-1]
+
+        _, seed = seed_indicator_state(build_price_panel(df[df["trade_date"] < target]), np.array([1.0, 1.0]))
+        seed_rows = {r["ts_code"]: r for r in state_to_rows(seed, "technical_daily")}
+        assert all(r["prev_state"] is None for r in seed_rows.values())
+
+        bars = build_price_panel(df[df["trade_date"] == target])
+        first, state = advance_indicator_state(state_from_rows(list(seed_rows.values()), bars.codes), bars)
+        saved = {r["ts_code"]: r for r in state_to_rows(state, "technical_daily", seed_rows)}
+        assert saved[bars.codes[0]]["prev_state"]["trade_date"] == dates[-2].isoformat()
+
+        base = {c: base_state(saved[c], target) for c in bars.codes}
+        assert all(b["trade_date"] == dates[-2] for b in base.values())
+        rerun, _ = advance_indicator_state(state_from_rows(list(base.values()), bars.codes), bars)
+        for col in INDICATOR_COLUMNS:
+            np.testing.assert_array_equal(rerun[col], first[col], err_msg=col)
+
+    def test_base_state_cases(self):
+        """早于目标日用当前状态；同日无上一根状态或状态晚于目标日时无起点。"""
+        target = date(2025, 7, 1)
+        st = {"ts_code": "A", "trade_date": date(2025, 6, 30), "adj_factor": 1.0}
+        assert base_state(st, target) is st
+        assert base_state(None, target) is None
+        assert base_state({**st, "trade_date": target, "prev_state": None}, target) is None
+        assert base_state({**st, "trade_date": date(2025, 7, 2)}, target) is None
+
+
+class TestPlanStateUpdate:
+    """测试推进/重算划分规则。"""
+
+    def test_partition(self):
+        """无状态、缺口、复权变化、无上一根状态的重跑、补算历史日期走全历史重算；
+        有上一根状态的重跑逐日推进。"""
+        target = date(2025, 7, 1)
+        prev = date(2025, 6, 30)
+        snapshot = {"trade_date": prev.isoformat(), "adj_factor": 1.0}
+        states = {
+            "A": {"ts_code": "A", "trade_date": prev, "adj_factor": 1.0},
+            "C": {"ts_code": "C", "trade_date": prev, "adj_factor": 1.0},
+            "D": {"ts_code": "D", "trade_date": prev, "adj_factor": 1.0},
+            "E": {"ts_code": "E", "trade_date": target, "adj_factor": 1.0, "prev_state": None},
+            "F": {"ts_code": "F", "trade_date": prev, "adj_factor": None},
+            "G": {"ts_code": "G", "trade_date": target, "adj_factor": 1.0, "prev_state": snapshot},
+            "H": {"ts_code": "H", "trade_date": date(2025, 7, 2), "adj_factor": 1.0, "prev_state": snapshot},
+        }
+        bar_adj = {"A": 1.0, "B": 1.0, "C": 1.0, "D": 1.2, "E": 1.0, "F": None, "G": 1.0, "H": 1.0}
+        advance, rebuild = plan_state_update(
+            ["A", "B", "C", "D", "E", "F", "G", "H"], states, bar_adj, {"C"}, target,
+        )
+        assert advance == ["A", "F", "G"]
+        assert rebuild == ["B", "C", "D", "E", "H"]
+
+    def test_adj_changed(self):
+        """复权因子按 6 位小数比较，缺失一侧视为变化。"""
+        assert not _adj_changed(1.0, 1.0000001)
+        assert _adj_changed(1.0, 1.01)
+        assert _adj_changed(None, 1.0)
+        assert not _adj_changed(None, None)
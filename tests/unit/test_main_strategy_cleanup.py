@@ -35,6 +35,7 @@ async def test_cleanup_obsolete_strategy_data_deletes_related_rows() -> None:
         _Result(rowcount=1),
         _Result(rowcount=8),
         _Result(rowcount=7),
+        _Result(rowcount=6),
         _Result(rowcount=3),
         _Result(rowcount=0),
         _Result(rowcount=4),
@@ -54,3 +55,4 @@ async def test_cleanup_obsolete_strategy_data_deletes_related_rows() -> None:
     sql_texts = [str(call.args[0]) for call in session.execute.call_args_list]
     assert any("DELETE FROM strategies" in sql for sql in sql_texts)
     assert any("DELETE FROM strategy_picks" in sql for sql in sql_texts)
+    assert any("DELETE FROM strategy_hit_daily" in sql for sql in sql_texts)
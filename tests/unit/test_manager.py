@@ -54,3 +54,172 @@ class TestApplyAdjustment:
         df = pd.DataFrame(columns=["ts_code", "open", "close", "adj_factor"])
         result = DataManager._apply_adjustment(df, "qfq")
         assert result.empty
+
+
+class TestEtlDailyMode:
+    """etl_daily 的 SQL / Python 两种方式。"""
+
+    @staticmethod
+    def _manager():
+        from unittest.mock import AsyncMock, MagicMock
+
+        session = AsyncMock()
+        ctx = AsyncMock()
+        ctx.__aenter__ = AsyncMock(return_value=session)
+        ctx.__aexit__ = AsyncMock(return_value=False)
+        return DataManager(MagicMock(return_value=ctx), {})
+
+    async def test_sql_mode_chunks_range(self):
+        """SQL 方式按不超过 _ETL_RANGE_DAYS 的区间分段执行。"""
+        from datetime import date
+        from unittest.mock import AsyncMock, patch
+
+        mgr = self._manager()
+        with patch("app.data.manager.etl_daily_sql", new=AsyncMock(return_value=100)) as sql:
+            result = await mgr.etl_daily(date(2025, 1, 1), end_date=date(2025, 3, 10), mode="sql")
+
+        assert result == {"inserted": 300}
+        spans = [c.args[1:] for c in sql.await_args_list]
+        assert spans == [
+            ("20250101", "20250131"), ("20250201", "20250303"), ("20250304", "20250310"),
+        ]
+
+    async def test_sql_failure_falls_back_to_python(self):
+        """SQL 方式失败时降级为 Python transform + batch_insert。"""
+        from datetime import date
+        from unittest.mock import AsyncMock, patch
+
+        mgr = self._manager()
+        raw_daily = [{"ts_code": "600519.SH", "trade_date": "20250102", "close": 10, "vol": 1, "amount": 2}]
+        mgr._load_raw_daily = AsyncMock(return_value=(raw_daily, [], []))
+        with patch("app.data.manager.etl_daily_sql", new=AsyncMock(side_effect=RuntimeError("x"))), \
+                patch("app.data.manager.batch_insert", new=AsyncMock(return_value=1)) as insert:
+            result = await mgr.etl_daily(date(2025, 1, 2), mode="sql")
+
+        assert result == {"inserted": 1}
+        rows = insert.await_args.args[2]
+        assert rows[0]["amount"] == 2000
+
+
+class TestUpsertRawFrame:
+    """raw 表列式写入路径。"""
+
+    async def test_frame_copy_after_projection(self):
+        """去重、列投影后以 DataFrame 整批交给 copy_insert。"""
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        from app.models.raw import RawTushareDaily
+
+        frame = pd.DataFrame({
+            "ts_code": ["600519.SH", "600519.SH"], "trade_date": ["20250102"] * 2,
+            "close": [1.0, 2.0], "unknown_field": [0, 0],
+        })
+        mgr = DataManager(MagicMock(), {})
+        with patch("app.data.copy_writer.copy_insert", new=AsyncMock(return_value=1)) as copy:
+            assert await mgr._upsert_raw_frame(AsyncMock(), RawTushareDaily.__table__, frame) == 1
+
+        written = copy.await_args.args[1]
+        assert "unknown_field" not in written.columns
+        assert written["close"].tolist() == [2.0]
+        assert copy.await_args.kwargs["conflict"] == "update"
+
+    async def test_copy_failure_falls_back_to_insert(self):
+        """列式 COPY 失败时直接走 INSERT，不再经 _upsert_raw 重试 COPY；NaN 写为 None。"""
+        from unittest.mock import AsyncMock, MagicMock, patch
+
+        from app.models.raw import RawTushareDaily
+
+        frame = pd.DataFrame({
+            "ts_code": ["600519.SH", "000001.SZ"], "trade_date": ["20250102"] * 2,
+            "close": [1.0, float("nan")],
+        })
+        mgr = DataManager(MagicMock(), {})
+        mgr._upsert_raw = AsyncMock()
+        session = AsyncMock()
+        copy = AsyncMock(side_effect=RuntimeError("x"))
+        with patch("app.data.copy_writer.copy_insert", new=copy):
+            assert await mgr._upsert_raw_frame(session, RawTushareDaily.__table__, frame) == 2
+
+        copy.assert_awaited_once()
+        mgr._upsert_raw.assert_not_awaited()
+        session.execute.assert_awaited_once()
+        params = session.execute.await_args.args[0].compile().params
+        assert params["close_m0"] == 1.0
+        assert params["close_m1"] is None
+
+
+class TestUpdatePickReturns:
+    """集合式回填选股收益。"""
+
+    async def test_batched_set_based_update(self):
+        """每批一条 UPDATE ... FROM 语句；pick_close 为 0 或无后续行情的记录计为跳过。"""
+        from datetime import date
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock
+
+        pending = [SimpleNamespace(id=i, pick_close=0 if i == 4 else 10.0) for i in range(1, 6)]
+        session = AsyncMock()
+        session.execute = AsyncMock(side_effect=[
+            MagicMock(fetchall=MagicMock(return_value=pending)),
+            MagicMock(fetchall=MagicMock(return_value=[(1,), (2,)])),
+            MagicMock(fetchall=MagicMock(return_value=[(3,)])),
+        ])
+        ctx = AsyncMock()
+        ctx.__aenter__ = AsyncMock(return_value=session)
+        ctx.__aexit__ = AsyncMock(return_value=False)
+        mgr = DataManager(MagicMock(return_value=ctx), {})
+        mgr._PICK_RETURNS_BATCH = 2
+
+        result = await mgr.update_pick_returns(date(2026, 3, 2))
+
+        assert result == {"updated": 3, "skipped": 2}
+        batches = [c.args[1] for c in session.execute.await_args_list[1:]]
+        assert [b["ids"] for b in batches] == [[1, 2], [3, 5]]
+        assert "UPDATE strategy_picks" in str(session.execute.await_args_list[1].args[0])
+        session.commit.assert_awaited_once()
+
+    async def test_nothing_pending(self):
+        """无待回填记录时不执行更新。"""
+        from unittest.mock import AsyncMock, MagicMock
+
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=MagicMock(fetchall=MagicMock(return_value=[])))
+        ctx = AsyncMock()
+        ctx.__aenter__ = AsyncMock(return_value=session)
+        ctx.__aexit__ = AsyncMock(return_value=False)
+        mgr = DataManager(MagicMock(return_value=ctx), {})
+
+        assert await mgr.update_pick_returns() == {"updated": 0, "skipped": 0}
+        assert session.execute.await_count == 1
+
+
+class TestComputeHitStats:
+    """SQL 端命中率统计。"""
+
+    async def test_refresh_then_single_aggregation(self):
+        """先增量刷新日汇总，再以一条 SQL 聚合并 UPSERT 全部策略/周期。"""
+        from datetime import date
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock, MagicMock
+
+        written = [SimpleNamespace(strategy_name=n) for n in ("a", "a", "b")]
+        session = AsyncMock()
+        session.execute = AsyncMock(side_effect=[
+            MagicMock(rowcount=4),
+            MagicMock(fetchall=MagicMock(return_value=written)),
+        ])
+        ctx = AsyncMock()
+        ctx.__aenter__ = AsyncMock(return_value=session)
+        ctx.__aexit__ = AsyncMock(return_value=False)
+        mgr = DataManager(MagicMock(return_value=ctx), {})
+
+        result = await mgr.compute_hit_stats(date(2026, 3, 2))
+
+        assert result == {"upserted": 3, "strategies": 2}
+        refresh_sql, stats_sql = (str(c.args[0]) for c in session.execute.await_args_list)
+        assert "INSERT INTO strategy_hit_daily" in refresh_sql
+        assert "refreshed_at" in refresh_sql
+        assert "percentile_cont(0.5)" in stats_sql
+        assert "FROM strategy_hit_daily" in stats_sql
+        assert session.execute.await_args_list[1].args[1] == {"stat_date": date(2026, 3, 2)}
+        session.commit.assert_awaited_once()
@@ -8,19 +8,25 @@ import pytest
 
 from app.optimization.market_optimizer import MarketOptimizer
 
+_PICKS = SimpleNamespace(
+    picks=[
+        SimpleNamespace(ts_code="000001.SZ"),
+        SimpleNamespace(ts_code="000002.SZ"),
+    ]
+)
+
 
 @pytest.mark.asyncio
 @patch("app.optimization.market_optimizer.execute_pipeline_v2", new_callable=AsyncMock)
-async def test_evaluate_params_for_v2_trigger(mock_execute_pipeline_v2: AsyncMock) -> None:
-    """V2 trigger 应走 execute_pipeline_v2 并按新公式评分。"""
+@patch("app.optimization.market_optimizer.execute_pipeline_v2_batch", new_callable=AsyncMock)
+async def test_evaluate_params_for_v2_trigger(
+    mock_batch: AsyncMock,
+    mock_execute_pipeline_v2: AsyncMock,
+) -> None:
+    """V2 trigger 应对全部采样日期批量执行一次 Pipeline 并按新公式评分。"""
     optimizer = MarketOptimizer(session_factory=object(), max_concurrency=1)
     sample_date = date(2026, 3, 7)
-    mock_execute_pipeline_v2.return_value = SimpleNamespace(
-        picks=[
-            SimpleNamespace(ts_code="000001.SZ"),
-            SimpleNamespace(ts_code="000002.SZ"),
-        ]
-    )
+    mock_batch.return_value = {sample_date: _PICKS}
 
     result = await optimizer._evaluate_params(
         strategy_name="volume-breakout-trigger-v2",
@@ -32,7 +38,38 @@ async def test_evaluate_params_for_v2_trigger(mock_execute_pipeline_v2: AsyncMoc
         },
     )
 
+    mock_batch.assert_awaited_once()
+    assert mock_batch.await_args.kwargs["target_dates"] == [sample_date]
+    mock_execute_pipeline_v2.assert_not_awaited()
     assert result.total_picks == 2
     assert result.hit_rate_5d == pytest.approx(0.5)
     assert result.profit_loss_ratio == pytest.approx(2.0)
     assert result.score == pytest.approx(0.8875)
+
+
+@pytest.mark.asyncio
+@patch("app.optimization.market_optimizer.execute_pipeline_v2", new_callable=AsyncMock)
+@patch("app.optimization.market_optimizer.execute_pipeline_v2_batch", new_callable=AsyncMock)
+async def test_evaluate_params_falls_back_to_per_date(
+    mock_batch: AsyncMock,
+    mock_execute_pipeline_v2: AsyncMock,
+) -> None:
+    """批量执行失败时回退逐日执行，评分结果不变。"""
+    optimizer = MarketOptimizer(session_factory=object(), max_concurrency=1)
+    sample_date = date(2026, 3, 7)
+    mock_batch.side_effect = RuntimeError("boom")
+    mock_execute_pipeline_v2.return_value = _PICKS
+
+    result = await optimizer._evaluate_params(
+        strategy_name="volume-breakout-trigger-v2",
+        params={"min_vol_ratio": 2.0},
+        sample_dates=[sample_date],
+        returns_cache={
+            (sample_date, "000001.SZ"): 0.10,
+            (sample_date, "000002.SZ"): -0.05,
+        },
+    )
+
+    mock_execute_pipeline_v2.assert_awaited_once()
+    assert result.total_picks == 2
+    assert result.score == pytest.approx(0.8875)
@@ -0,0 +1,93 @@
+"""每日市场快照构建与读取的单元测试。"""
+
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.data.market_snapshot import (
+    SNAPSHOT_COLUMNS,
+    build_market_snapshot,
+    build_market_snapshot_range,
+    fresh_snapshot_dates,
+)
+from app.models.snapshot import MarketSnapshotDaily
+
+TD = date(2026, 3, 9)
+
+
+def _session_factory(rowcount: int = 0):
+    session = AsyncMock()
+    result = MagicMock()
+    result.rowcount = rowcount
+    session.execute.return_value = result
+    ctx = AsyncMock()
+    ctx.__aenter__ = AsyncMock(return_value=session)
+    ctx.__aexit__ = AsyncMock(return_value=False)
+    return MagicMock(return_value=ctx), session
+
+
+class TestBuildMarketSnapshot:
+    """测试快照构建。"""
+
+    def test_columns_match_model(self):
+        """构建 SQL 写入的列与表模型一致（除 built_at）。"""
+        model_cols = [c.name for c in MarketSnapshotDaily.__table__.columns if c.name != "built_at"]
+        assert list(SNAPSHOT_COLUMNS) == model_cols
+
+    async def test_delete_then_insert_in_one_transaction(self):
+        """先删除当日旧快照再插入，一次提交；daily_basic 按 YYYYMMDD 匹配。"""
+        factory, session = _session_factory(rowcount=5123)
+
+        result = await build_market_snapshot(factory, TD)
+
+        assert result["rows"] == 5123
+        assert session.execute.await_count == 2
+        assert "DELETE FROM market_snapshot_daily" in str(session.execute.await_args_list[0].args[0])
+        params = session.execute.await_args_list[1].args[1]
+        assert params == {"trade_date": TD, "trade_date_str": "20260309"}
+        session.commit.assert_awaited_once()
+
+    async def test_range_isolates_failures(self):
+        """区间构建中单日失败不影响其他日期。"""
+        dates = [date(2026, 3, 5), date(2026, 3, 6), TD]
+
+        async def _build(factory, td):
+            if td == dates[1]:
+                raise RuntimeError("boom")
+            return {"trade_date": td, "rows": 10, "elapsed_seconds": 0.1}
+
+        with patch("app.data.market_snapshot.build_market_snapshot", side_effect=_build):
+            result = await build_market_snapshot_range(MagicMock(), dates)
+
+        assert result == {"success": 2, "failed": 1, "failed_dates": [dates[1]], "rows": 20}
+
+
+class TestSnapshotFreshness:
+    """测试快照来源水位检查。"""
+
+    async def test_returns_only_fresh_dates(self):
+        """只返回 SQL 判定为已构建且未过期的日期，按来源表 updated_at 与 built_at 比较。"""
+        dates = [date(2026, 3, 6), TD]
+        session = AsyncMock()
+        result = MagicMock()
+        result.fetchall.return_value = [(TD,)]
+        session.execute.return_value = result
+
+        fresh = await fresh_snapshot_dates(session, dates)
+
+        assert fresh == {TD}
+        sql = str(session.execute.await_args.args[0])
+        assert "stock_daily sd" in sql and "technical_daily td" in sql
+        assert "updated_at > m.built_at" in sql
+        # 前一交易日（*_prev 列）、每日指标、财报与股票基础信息同样参与过期判断
+        assert "IN (m.trade_date, m.prev_date)" in sql
+        assert "db.fetched_at > m.built_at" in sql
+        assert "f.ann_date <= m.trade_date" in sql
+        assert "IS DISTINCT FROM (s.name, s.industry, s.market, s.list_status, s.list_date)" in sql
+        assert session.execute.await_args.args[1] == {"dates": dates}
+
+    async def test_empty_dates_skip_query(self):
+        """空日期列表不查询数据库。"""
+        session = AsyncMock()
+
+        assert await fresh_snapshot_dates(session, []) == set()
+        session.execute.assert_not_awaited()
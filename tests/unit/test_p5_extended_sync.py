@@ -3,6 +3,7 @@
 from datetime import date
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pandas as pd
 import pytest
 
 from app.data.manager import DataManager
@@ -20,8 +21,8 @@ def _make_manager():
         clients={"tushare": client},
         primary="tushare",
     )
-    # mock _upsert_raw 返回写入行数
-    mgr._upsert_raw = AsyncMock(return_value=5)
+    # mock _upsert_raw_frame 返回写入行数
+    mgr._upsert_raw_frame = AsyncMock(return_value=5)
     return mgr, client
 
 
@@ -31,36 +32,36 @@ class TestBasicSupplementarySync:
     @pytest.mark.asyncio
     async def test_sync_raw_namechange(self):
         mgr, client = _make_manager()
-        client.fetch_raw_namechange.return_value = [{"ts_code": "000001.SZ"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"ts_code": "000001.SZ"}])
         result = await mgr.sync_raw_namechange()
         assert result["namechange"] == 5
-        client.fetch_raw_namechange.assert_called_once()
+        client.fetch_raw_frame.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_sync_raw_stk_managers(self):
         mgr, client = _make_manager()
-        client.fetch_raw_stk_managers.return_value = [{"ts_code": "000001.SZ"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"ts_code": "000001.SZ"}])
         result = await mgr.sync_raw_stk_managers()
         assert result["stk_managers"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_stk_rewards(self):
         mgr, client = _make_manager()
-        client.fetch_raw_stk_rewards.return_value = [{"ts_code": "000001.SZ"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"ts_code": "000001.SZ"}])
         result = await mgr.sync_raw_stk_rewards()
         assert result["stk_rewards"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_new_share(self):
         mgr, client = _make_manager()
-        client.fetch_raw_new_share.return_value = [{"ts_code": "000001.SZ"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"ts_code": "000001.SZ"}])
         result = await mgr.sync_raw_new_share()
         assert result["new_share"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_stk_list_his(self):
         mgr, client = _make_manager()
-        client.fetch_raw_stk_list_his.return_value = [{"ts_code": "000001.SZ"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"ts_code": "000001.SZ"}])
         result = await mgr.sync_raw_stk_list_his()
         assert result["stk_list_his"] == 5
 
@@ -68,10 +69,10 @@ class TestBasicSupplementarySync:
     async def test_sync_raw_empty_data(self):
         """空数据时返回 0。"""
         mgr, client = _make_manager()
-        client.fetch_raw_namechange.return_value = []
+        client.fetch_raw_frame.return_value = pd.DataFrame()
         result = await mgr.sync_raw_namechange()
         assert result["namechange"] == 0
-        mgr._upsert_raw.assert_not_called()
+        mgr._upsert_raw_frame.assert_not_called()
 
 
 class TestQuoteSupplementarySync:
@@ -80,15 +81,15 @@ class TestQuoteSupplementarySync:
     @pytest.mark.asyncio
     async def test_sync_raw_hsgt_top10(self):
         mgr, client = _make_manager()
-        client.fetch_raw_hsgt_top10.return_value = [{"trade_date": "20260219"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"trade_date": "20260219"}])
         result = await mgr.sync_raw_hsgt_top10(date(2026, 2, 19))
         assert result["hsgt_top10"] == 5
-        client.fetch_raw_hsgt_top10.assert_called_once_with(trade_date="20260219")
+        client.fetch_raw_frame.assert_called_once_with("hsgt_top10", trade_date="20260219")
 
     @pytest.mark.asyncio
     async def test_sync_raw_ggt_daily(self):
         mgr, client = _make_manager()
-        client.fetch_raw_ggt_daily.return_value = [{"trade_date": "20260219"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"trade_date": "20260219"}])
         result = await mgr.sync_raw_ggt_daily(date(2026, 2, 19))
         assert result["ggt_daily"] == 5
 
@@ -99,28 +100,28 @@ class TestMarketReferenceSync:
     @pytest.mark.asyncio
     async def test_sync_raw_pledge_stat(self):
         mgr, client = _make_manager()
-        client.fetch_raw_pledge_stat.return_value = [{"ts_code": "000001.SZ"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"ts_code": "000001.SZ"}])
         result = await mgr.sync_raw_pledge_stat()
         assert result["pledge_stat"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_pledge_detail(self):
         mgr, client = _make_manager()
-        client.fetch_raw_pledge_detail.return_value = [{"ts_code": "000001.SZ"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"ts_code": "000001.SZ"}])
         result = await mgr.sync_raw_pledge_detail()
         assert result["pledge_detail"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_repurchase(self):
         mgr, client = _make_manager()
-        client.fetch_raw_repurchase.return_value = [{"ts_code": "000001.SZ"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"ts_code": "000001.SZ"}])
         result = await mgr.sync_raw_repurchase()
         assert result["repurchase"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_share_float(self):
         mgr, client = _make_manager()
-        client.fetch_raw_share_float.return_value = [{"ann_date": "20260219"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"ann_date": "20260219"}])
         result = await mgr.sync_raw_share_float(date(2026, 2, 19))
         assert result["share_float"] == 5
 
@@ -131,49 +132,49 @@ class TestSpecialtyDataSync:
     @pytest.mark.asyncio
     async def test_sync_raw_report_rc(self):
         mgr, client = _make_manager()
-        client.fetch_raw_report_rc.return_value = [{"ts_code": "000001.SZ"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"ts_code": "000001.SZ"}])
         result = await mgr.sync_raw_report_rc(date(2026, 2, 19))
         assert result["report_rc"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_cyq_perf(self):
         mgr, client = _make_manager()
-        client.fetch_raw_cyq_perf.return_value = [{"trade_date": "20260219"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"trade_date": "20260219"}])
         result = await mgr.sync_raw_cyq_perf(date(2026, 2, 19))
         assert result["cyq_perf"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_cyq_chips(self):
         mgr, client = _make_manager()
-        client.fetch_raw_cyq_chips.return_value = [{"trade_date": "20260219"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"trade_date": "20260219"}])
         result = await mgr.sync_raw_cyq_chips(date(2026, 2, 19))
         assert result["cyq_chips"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_ccass_hold(self):
         mgr, client = _make_manager()
-        client.fetch_raw_ccass_hold.return_value = [{"trade_date": "20260219"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"trade_date": "20260219"}])
         result = await mgr.sync_raw_ccass_hold(date(2026, 2, 19))
         assert result["ccass_hold"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_ccass_hold_detail(self):
         mgr, client = _make_manager()
-        client.fetch_raw_ccass_hold_detail.return_value = [{"trade_date": "20260219"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"trade_date": "20260219"}])
         result = await mgr.sync_raw_ccass_hold_detail(date(2026, 2, 19))
         assert result["ccass_hold_detail"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_hk_hold(self):
         mgr, client = _make_manager()
-        client.fetch_raw_hk_hold.return_value = [{"trade_date": "20260219"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"trade_date": "20260219"}])
         result = await mgr.sync_raw_hk_hold(date(2026, 2, 19))
         assert result["hk_hold"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_stk_surv(self):
         mgr, client = _make_manager()
-        client.fetch_raw_stk_surv.return_value = [{"ts_code": "000001.SZ"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"ts_code": "000001.SZ"}])
         result = await mgr.sync_raw_stk_surv()
         assert result["stk_surv"] == 5
 
@@ -183,7 +184,7 @@ class TestMarginSupplementarySync:
     @pytest.mark.asyncio
     async def test_sync_raw_slb_len(self):
         mgr, client = _make_manager()
-        client.fetch_raw_slb_len.return_value = [{"trade_date": "20260219"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"trade_date": "20260219"}])
         result = await mgr.sync_raw_slb_len(date(2026, 2, 19))
         assert result["slb_len"] == 5
 
@@ -194,59 +195,59 @@ class TestBoardHittingSync:
     @pytest.mark.asyncio
     async def test_sync_raw_limit_step(self):
         mgr, client = _make_manager()
-        client.fetch_raw_limit_step.return_value = [{"trade_date": "20260219"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"trade_date": "20260219"}])
         result = await mgr.sync_raw_limit_step(date(2026, 2, 19))
         assert result["limit_step"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_hm_detail(self):
         mgr, client = _make_manager()
-        client.fetch_raw_hm_detail.return_value = [{"trade_date": "20260219"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"trade_date": "20260219"}])
         result = await mgr.sync_raw_hm_detail(date(2026, 2, 19))
         assert result["hm_detail"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_stk_auction(self):
         mgr, client = _make_manager()
-        client.fetch_raw_stk_auction.return_value = [{"trade_date": "20260219"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"trade_date": "20260219"}])
         result = await mgr.sync_raw_stk_auction(date(2026, 2, 19))
         assert result["stk_auction"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_stk_auction_o(self):
         mgr, client = _make_manager()
-        client.fetch_raw_stk_auction_o.return_value = [{"trade_date": "20260219"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"trade_date": "20260219"}])
         result = await mgr.sync_raw_stk_auction_o(date(2026, 2, 19))
         assert result["stk_auction_o"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_kpl_list(self):
         mgr, client = _make_manager()
-        client.fetch_raw_kpl_list.return_value = [{"trade_date": "20260219"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"trade_date": "20260219"}])
         result = await mgr.sync_raw_kpl_list(date(2026, 2, 19))
         assert result["kpl_list"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_kpl_concept(self):
         mgr, client = _make_manager()
-        client.fetch_raw_kpl_concept.return_value = [{"trade_date": "20260219"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"trade_date": "20260219"}])
         result = await mgr.sync_raw_kpl_concept(date(2026, 2, 19))
         assert result["kpl_concept"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_broker_recommend(self):
         mgr, client = _make_manager()
-        client.fetch_raw_broker_recommend.return_value = [{"date": "20260219"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"date": "20260219"}])
         result = await mgr.sync_raw_broker_recommend(date(2026, 2, 19))
         assert result["broker_recommend"] == 5
 
     @pytest.mark.asyncio
     async def test_sync_raw_ggt_monthly(self):
         mgr, client = _make_manager()
-        client.fetch_raw_ggt_monthly.return_value = [{"month": "202602"}]
+        client.fetch_raw_frame.return_value = pd.DataFrame([{"month": "202602"}])
         result = await mgr.sync_raw_ggt_monthly(date(2026, 2, 19))
         assert result["ggt_monthly"] == 5
-        client.fetch_raw_ggt_monthly.assert_called_once_with(month="202602")
+        client.fetch_raw_frame.assert_called_once_with("ggt_monthly", month="202602")
 
 
 class TestSyncP5CoreIntegration:
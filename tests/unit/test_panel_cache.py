@@ -0,0 +1,205 @@
+"""内存映射行情面板缓存（panel_cache）的单元测试。
+
+验证面板合并（股票 ID 稳定、重叠日期覆盖）、.npy 持久化与内存映射加载，
+PanelMarketData 与 _preload_market_data 嵌套字典在 V4 回测中的结果逐位一致，
+以及失效标记与上市状态变化触发的增量重拉。
+"""
+
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pandas as pd
+
+from app.data.panel_cache import (
+    PANEL_FIELDS,
+    PanelMarketData,
+    invalidate_panel_cache,
+    load_panel_cache,
+    merge_panel,
+    update_panel_cache,
+    write_panel_cache,
+)
+from app.v4backtest.engine import _verify_accumulation_from_memory
+from app.v4backtest.grid_search import _precompute_t0_events
+
+
+def _make_rows(dates: list[date], codes: list[str], seed: int = 5) -> pd.DataFrame:
+    """构造与 _preload_market_data 查询结果同列的长表。"""
+    rng = np.random.default_rng(seed)
+    records = []
+    for d in dates:
+        for c in codes:
+            close = round(float(rng.uniform(5, 20)), 2)
+            records.append({
+                "trade_date": d, "ts_code": c,
+                "close": close, "open": round(close * 0.99, 2),
+                "high": round(close * 1.03, 2), "low": round(close * 0.97, 2),
+                "vol": float(rng.integers(1000, 100000)),
+                "pct_chg": round(float(rng.uniform(-10, 10)), 4),
+                "turnover_rate": round(float(rng.uniform(0, 5)), 4),
+                "vol_ratio": round(float(rng.uniform(0, 5)), 4),
+                "ma10": close, "ma20": None,
+            })
+    return pd.DataFrame(records)
+
+
+def _nested(df: pd.DataFrame) -> dict[date, dict[str, dict]]:
+    """按 _preload_market_data 的方式构建嵌套字典。"""
+    out: dict[date, dict[str, dict]] = {}
+    for row in df.sort_values(["trade_date", "ts_code"]).itertuples(index=False):
+        rec = row._asdict()
+        item = {
+            k: float(rec[k] or 0) for k in PANEL_FIELDS if k != "vol"
+        }
+        item["vol"] = int(rec["vol"] or 0)
+        out.setdefault(rec["trade_date"], {})[rec["ts_code"]] = item
+    return out
+
+
+DATES = [date(2025, 3, 3) + timedelta(days=i) for i in range(12)]
+
+
+class TestMergePanel:
+    """测试面板构建与增量合并。"""
+
+    def test_incremental_keeps_ids_and_replaces_overlap(self):
+        """增量合并时已有股票 ID 不变、新股票追加、重叠日期被新数据覆盖。"""
+        old = merge_panel(None, _make_rows(DATES[:5], ["600000.SH", "000001.SZ"]))
+        assert old.codes == ["000001.SZ", "600000.SH"]
+
+        new_rows = _make_rows(DATES[4:8], ["600000.SH", "300001.SZ"], seed=9)
+        merged = merge_panel(old, new_rows)
+
+        assert merged.codes == ["000001.SZ", "600000.SH", "300001.SZ"]
+        assert len(merged.dates) == 8
+        j = merged.code_index["600000.SH"]
+        expected = new_rows[(new_rows["trade_date"] == DATES[4]) & (new_rows["ts_code"] == "600000.SH")]
+        assert merged.fields["close"][4, j] == expected["close"].iloc[0]
+        # 000001.SZ 在新数据中缺失的日期无行情
+        assert not merged.valid[4:, merged.code_index["000001.SZ"]].any()
+        np.testing.assert_array_equal(merged.fields["close"][:4, :2], old.fields["close"][:4])
+
+    def test_persist_and_mmap_load(self, tmp_path):
+        """写入后以内存映射只读加载，数据与索引一致。"""
+        panel = merge_panel(None, _make_rows(DATES, ["600000.SH", "000001.SZ"]))
+        write_panel_cache(panel, tmp_path)
+        write_panel_cache(panel, tmp_path)  # 再次写入会清理旧版本
+
+        loaded = load_panel_cache(tmp_path)
+        assert isinstance(loaded.fields["close"], np.memmap)
+        assert loaded.fields["vol"].dtype == np.int64
+        assert loaded.codes == panel.codes
+        np.testing.assert_array_equal(loaded.dates, panel.dates)
+        np.testing.assert_array_equal(loaded.fields["high"], panel.fields["high"])
+        assert len([p for p in tmp_path.iterdir() if p.is_dir()]) == 1
+
+        sliced = loaded.slice_dates(DATES[2], DATES[4])
+        assert len(sliced.dates) == 3
+
+    def test_missing_cache(self, tmp_path):
+        """缓存不存在时返回 None。"""
+        assert load_panel_cache(tmp_path) is None
+
+
+class TestPanelMarketData:
+    """PanelMarketData 与嵌套字典行为一致。"""
+
+    def test_mapping_matches_nested_dict(self):
+        """按日期/代码取值、迭代顺序与嵌套字典一致，缺失返回默认值。"""
+        df = _make_rows(DATES[:3], ["600000.SH", "000001.SZ", "300001.SZ"])
+        df = df[~((df["trade_date"] == DATES[1]) & (df["ts_code"] == "000001.SZ"))]
+        nested = _nested(df)
+        view = PanelMarketData(merge_panel(None, df))
+
+        assert list(view) == list(nested)
+        for d in nested:
+            assert list(view[d]) == list(nested[d])
+            assert dict(view[d].items()) == nested[d]
+        assert view.get(DATES[1], {}).get("000001.SZ") is None
+        assert view.get(date(2020, 1, 1), {}) == {}
+
+    def test_boundary_values_exact(self):
+        """取值与 float(Decimal) 逐位一致，阈值边界（pct_chg == 9.9）不因精度翻转。"""
+        df = _make_rows(DATES[:1], ["600000.SH"])
+        df["pct_chg"] = 9.9
+        view = PanelMarketData(merge_panel(None, df))
+        assert view[DATES[0]]["600000.SH"]["pct_chg"] == 9.9
+        assert view[DATES[0]]["600000.SH"]["pct_chg"] >= 9.9
+
+    def test_t0_events_and_accumulation_match(self):
+        """T0 预计算与吸筹验证在面板和嵌套字典上结果一致。"""
+        codes = [f"{600000 + i}.SH" for i in range(30)]
+        df = _make_rows(DATES, codes)
+        nested = _nested(df)
+        view = PanelMarketData(merge_panel(None, df))
+        combos = [{"min_t0_pct_chg": 5.0, "min_t0_vol_ratio": 2.0, "accumulation_days": 5}]
+
+        assert _precompute_t0_events(view, combos) == _precompute_t0_events(nested, combos)
+
+        params = {"accumulation_days": 5, "max_accumulation_range": 0.3}
+        for target in DATES[1:]:
+            assert _verify_accumulation_from_memory(view, DATES, codes, target, params) == \
+                _verify_accumulation_from_memory(nested, DATES, codes, target, params)
+
+
+def _mock_session(df: pd.DataFrame, listed: list[str], fetches: list[tuple]):
+    """模拟面板更新的查询：上市列表、重新上市股票的历史、区间行情（记录拉取区间）。"""
+    session = AsyncMock()
+
+    async def _execute(sql, params=None):
+        result = MagicMock()
+        sql_text = str(sql)
+        if "list_status = 'L'" in sql_text:
+            result.all.return_value = [(c,) for c in listed]
+        elif "DISTINCT ts_code" in sql_text:
+            result.all.return_value = []
+        else:
+            fetches.append((params["start"], params["end"]))
+            part = df[(df["trade_date"] >= params["start"]) & (df["trade_date"] <= params["end"])]
+            part = part[part["ts_code"].isin(listed)]
+            result.all.return_value = list(
+                part[["trade_date", "ts_code", *PANEL_FIELDS]].itertuples(index=False, name=None)
+            )
+        return result
+
+    session.execute = _execute
+    return session
+
+
+class TestUpdatePanelCache:
+    """测试失效标记与上市状态变化下的增量更新。"""
+
+    async def test_invalidation_refetches_from_marked_date(self, tmp_path):
+        """标记失效后从标记日重新拉取到缓存末尾，改写的历史值生效，标记清除。"""
+        codes = ["600000.SH", "000001.SZ"]
+        df = _make_rows(DATES, codes)
+        fetches: list[tuple] = []
+        await update_panel_cache(_mock_session(df, codes, fetches), DATES[0], DATES[-1], tmp_path)
+        assert fetches == [(DATES[0], DATES[-1])]
+        assert not invalidate_panel_cache(DATES[3], tmp_path / "missing")
+
+        df.loc[(df["trade_date"] == DATES[3]) & (df["ts_code"] == "600000.SH"), "close"] = 99.0
+        assert invalidate_panel_cache(DATES[3], tmp_path)
+        assert not invalidate_panel_cache(DATES[5], tmp_path)
+
+        panel = await update_panel_cache(_mock_session(df, codes, fetches), DATES[0], DATES[6], tmp_path)
+        assert fetches[-1] == (DATES[3], DATES[-1])
+        assert PanelMarketData(panel)[DATES[3]]["600000.SH"]["close"] == 99.0
+        assert len(load_panel_cache(tmp_path).dates) == len(DATES)
+
+        await update_panel_cache(_mock_session(df, codes, fetches), DATES[0], DATES[6], tmp_path)
+        assert len(fetches) == 2
+
+    async def test_delisted_codes_dropped(self, tmp_path):
+        """不再上市的股票所有交易日置为无行情，与 SQL 预加载的 list_status 过滤一致。"""
+        codes = ["600000.SH", "000001.SZ"]
+        df = _make_rows(DATES, codes)
+        fetches: list[tuple] = []
+        await update_panel_cache(_mock_session(df, codes, fetches), DATES[0], DATES[-1], tmp_path)
+
+        panel = await update_panel_cache(
+            _mock_session(df, ["600000.SH"], fetches), DATES[0], DATES[-1], tmp_path,
+        )
+        view = PanelMarketData(panel)
+        assert all(list(view[d]) == ["600000.SH"] for d in DATES)
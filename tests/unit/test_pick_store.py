@@ -36,4 +36,35 @@ async def test_save_strategy_picks_fallback_to_weighted_score():
 
     assert count == 1
     params = session.execute.await_args_list[0].args[1]
-    assert params["pick_score"] == pytest.approx(88.6)
+    assert params["pick_scores"][0] == pytest.approx(88.6)
+
+
+@pytest.mark.asyncio
+async def test_save_strategy_picks_single_bulk_statement():
+    """多条选股去重后以一条多行 UPSERT 写入，并只提交一次。"""
+    picks = [
+        StockPick(
+            ts_code=code, name=code, close=10.0, pct_chg=1.0,
+            matched_strategies=["a", "b"], match_count=2, weighted_score=50.0,
+        )
+        for code in ("600519.SH", "000001.SZ", "600519.SH")
+    ]
+
+    session = AsyncMock()
+    session.__aenter__.return_value = session
+    session.__aexit__.return_value = False
+
+    count = await save_strategy_picks(
+        session_factory=MagicMock(return_value=session),
+        strategy_names=["a"],
+        target_date=date(2026, 3, 7),
+        picks=picks,
+    )
+
+    assert count == 2
+    session.execute.assert_awaited_once()
+    params = session.execute.await_args.args[1]
+    assert params["ts_codes"] == ["600519.SH", "000001.SZ"]
+    assert params["strategy_names"] == ["a", "a"]
+    assert params["pick_date"] == date(2026, 3, 7)
+    session.commit.assert_awaited_once()
@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock, patch
 import pandas as pd
 import pytest
 
+from app.strategy.base import BaseStrategyV2
 from app.strategy.market_regime import MarketRegime
 from app.strategy.pipeline_v2 import (
     Layer1Result,
@@ -299,3 +300,391 @@ async def test_layer3_caps_confirmer_bonus_with_three_mixed_triggers() -> None:
     assert pick.confirmed_bonus == pytest.approx(0.6)
     assert pick.style_bonus == pytest.approx(0.0)
     assert pick.final_score == pytest.approx(1.75)
+
+
+async def test_layer0_reads_snapshot_and_applies_filters() -> None:
+    """快照存在时 Layer 0 直接返回快照列（含财务字段），并按行业过滤。"""
+    from unittest.mock import MagicMock
+
+    from app.strategy.pipeline_v2 import _LAYER0_SNAPSHOT_COLUMNS, _layer0_from_snapshot
+
+    def _row(code: str, industry: str) -> tuple:
+        values = {c: 1.0 for c in _LAYER0_SNAPSHOT_COLUMNS}
+        values.update(ts_code=code, name=code, industry=industry, market="主板", trade_date=date(2026, 3, 9))
+        return tuple(values[c] for c in _LAYER0_SNAPSHOT_COLUMNS)
+
+    fresh = MagicMock()
+    fresh.fetchall.return_value = [(date(2026, 3, 9),)]
+    result = MagicMock()
+    result.fetchall.return_value = [_row("600519.SH", "白酒"), _row("000001.SZ", "银行")]
+    session = AsyncMock()
+    session.execute.side_effect = [fresh, result]
+
+    df = await _layer0_from_snapshot(session, date(2026, 3, 9), industries=["银行"])
+
+    assert df["ts_code"].tolist() == ["000001.SZ"]
+    assert {"roe", "pe_ttm", "dividend_yield", "close_prev"} <= set(df.columns)
+    assert "FROM market_snapshot_daily" in str(session.execute.await_args.args[0])
+
+
+async def test_layer0_snapshot_missing_or_stale_returns_none() -> None:
+    """当日快照未构建或来源数据在构建后被改写时返回 None，由调用方回退到多表查询。"""
+    from unittest.mock import MagicMock
+
+    from app.strategy.pipeline_v2 import _layer0_from_snapshot
+
+    not_fresh = MagicMock()
+    not_fresh.fetchall.return_value = []
+    session = AsyncMock()
+    session.execute.return_value = not_fresh
+
+    assert await _layer0_from_snapshot(session, date(2026, 3, 9)) is None
+    session.execute.assert_awaited_once()
+    assert "updated_at > m.built_at" in str(session.execute.await_args.args[0])
+
+
+class _Guard:
+    async def execute(self, df: pd.DataFrame, target_date: date) -> pd.Series:
+        return df["close"] > 5.0
+
+
+class _Scorer:
+    async def execute(self, df: pd.DataFrame, target_date: date) -> pd.Series:
+        return (df["close"] * 3.0).clip(upper=100.0)
+
+
+class _Tagger:
+    async def execute(self, df: pd.DataFrame, target_date: date) -> dict[str, pd.Series]:
+        return {"momentum": (df["pct_chg"] / 10.0).clip(lower=0.0)}
+
+
+class _Trigger:
+    def __init__(self, min_pct: float) -> None:
+        self.min_pct = min_pct
+
+    async def execute(self, df: pd.DataFrame, target_date: date) -> list:
+        from app.strategy.base import StrategySignal
+
+        mask = df["pct_chg"] > self.min_pct
+        return [
+            StrategySignal(ts_code=code, confidence=min(pct / 5.0, 1.0))
+            for code, pct in zip(df.loc[mask, "ts_code"], df.loc[mask, "pct_chg"])
+        ]
+
+
+class _Confirmer:
+    applicable_groups: list[str] = []
+
+    async def execute(self, df: pd.DataFrame, target_date: date) -> pd.Series:
+        return pd.Series((df["pct_chg"] / 20.0).values, index=df["ts_code"].values)
+
+
+def _role_metas(role) -> list:
+    from app.strategy.base import SignalGroup, StrategyRole
+
+    metas = {
+        StrategyRole.GUARD: [SimpleNamespace(name="g", strategy_cls=_Guard)],
+        StrategyRole.SCORER: [SimpleNamespace(name="s", strategy_cls=_Scorer)],
+        StrategyRole.TAGGER: [SimpleNamespace(name="t", strategy_cls=_Tagger)],
+        StrategyRole.CONFIRMER: [SimpleNamespace(name="c", strategy_cls=_Confirmer)],
+        StrategyRole.TRIGGER: [
+            SimpleNamespace(name="trig-a", signal_group=SignalGroup.AGGRESSIVE, ai_rating=8.32),
+            SimpleNamespace(name="trig-b", signal_group=SignalGroup.TREND, ai_rating=4.16),
+        ],
+    }
+    return metas.get(role, [])
+
+
+def _day_frame(day_index: int) -> pd.DataFrame:
+    codes = ["000001.SZ", "000002.SZ", "600000.SH", "600519.SH", "300750.SZ"]
+    return pd.DataFrame({
+        "ts_code": codes,
+        "name": codes,
+        "close": [4.0 + day_index + i * 2.5 for i in range(len(codes))],
+        "pct_chg": [((i + day_index) % 5) * 1.1 for i in range(len(codes))],
+    })
+
+
+async def test_batch_matches_single_date_pipeline() -> None:
+    """批量执行各日期的选股与逐日执行 execute_pipeline_v2 完全一致（含排序与分层统计）。"""
+    from unittest.mock import MagicMock
+
+    from app.strategy.pipeline_v2 import execute_pipeline_v2, execute_pipeline_v2_batch
+
+    dates = [date(2026, 3, 5), date(2026, 3, 6), date(2026, 3, 9)]
+    frames = {d: _day_frame(i) for i, d in enumerate(dates)}
+    panel = pd.concat([f.assign(trade_date=d) for d, f in frames.items()], ignore_index=True)
+    regimes = {dates[0]: MarketRegime.BULL, dates[1]: MarketRegime.RANGE, dates[2]: MarketRegime.BEAR}
+    rolling = {dates[0]: {"trig-a": 1.2}, dates[1]: {"trig-b": 0.8}, dates[2]: {}}
+
+    ctx = AsyncMock()
+    ctx.__aenter__ = AsyncMock(return_value=AsyncMock())
+    ctx.__aexit__ = AsyncMock(return_value=False)
+    session_factory = MagicMock(return_value=ctx)
+
+    def _get_strategy(name, params=None):
+        return _Trigger(min_pct=(params or {}).get("min_pct", 1.0) + (0.5 if name == "trig-b" else 0.0))
+
+    with (
+        patch("app.strategy.pipeline_v2.StrategyFactoryV2.get_by_role", side_effect=_role_metas),
+        patch("app.strategy.pipeline_v2.StrategyFactoryV2.get_strategy", side_effect=_get_strategy),
+        patch("app.strategy.pipeline_v2.get_market_regime",
+              AsyncMock(side_effect=lambda sf, d: regimes[d])),
+        patch("app.strategy.pipeline_v2.compute_rolling_performance",
+              AsyncMock(side_effect=lambda s, names, d: rolling[d])),
+        patch("app.strategy.pipeline_v2._layer0_from_snapshot",
+              AsyncMock(side_effect=lambda s, d, **kw: frames[d].copy())),
+        patch("app.strategy.pipeline_v2._layer0_panel", AsyncMock(return_value=panel)),
+    ):
+        params = {"trig-a": {"min_pct": 0.5}}
+        single = {
+            d: await execute_pipeline_v2(d, session_factory, strategy_params=params, top_n=3)
+            for d in dates
+        }
+        batch = await execute_pipeline_v2_batch(dates, session_factory, strategy_params=params, top_n=3)
+
+    assert list(batch) == dates
+    for d in dates:
+        assert batch[d].picks, d
+        assert batch[d].picks == single[d].picks
+        # trigger 耗时在批量路径为整批耗时，其余分层统计逐日一致
+        def _counts(stats: dict) -> dict:
+            return {k: v for k, v in stats.items() if not k.endswith(":elapsed_ms")}
+
+        assert _counts(batch[d].layer_stats) == _counts(single[d].layer_stats)
+        assert batch[d].layer_stats["layer2:trig-a:signals"] == single[d].layer_stats["layer2:trig-a:signals"]
+        assert batch[d].market_regime == single[d].market_regime
+
+
+async def test_batch_empty_dates_returns_empty() -> None:
+    """空日期列表不访问数据库。"""
+    from unittest.mock import MagicMock
+
+    from app.strategy.pipeline_v2 import execute_pipeline_v2_batch
+
+    session_factory = MagicMock()
+    assert await execute_pipeline_v2_batch([], session_factory) == {}
+    session_factory.assert_not_called()
+
+
+async def test_layer0_panel_reads_snapshot_once_and_falls_back() -> None:
+    """快照可用的日期一次查询，未构建或已过期的日期逐日回退到多表查询。"""
+    from unittest.mock import MagicMock
+
+    from app.strategy.pipeline_v2 import _LAYER0_SNAPSHOT_COLUMNS, _layer0_panel
+
+    built_day, missing_day = date(2026, 3, 6), date(2026, 3, 9)
+    values = {c: 1.0 for c in _LAYER0_SNAPSHOT_COLUMNS}
+    values.update(ts_code="600519.SH", name="贵州茅台", industry="白酒", market="主板", trade_date=built_day)
+
+    built = MagicMock()
+    built.fetchall.return_value = [(built_day,)]
+    rows = MagicMock()
+    rows.fetchall.return_value = [tuple(values[c] for c in _LAYER0_SNAPSHOT_COLUMNS)]
+    session = AsyncMock()
+    session.execute.side_effect = [built, rows]
+    legacy = pd.DataFrame({"ts_code": ["000001.SZ"], "trade_date": [missing_day]})
+
+    with (
+        patch("app.strategy.pipeline_v2._layer0_sql_filter", AsyncMock(return_value=legacy)) as sql_filter,
+        patch("app.strategy.pipeline_v2._enrich_finance_data_v2",
+              AsyncMock(side_effect=lambda s, df, d: df)) as enrich,
+    ):
+        panel = await _layer0_panel(session, [built_day, missing_day])
+
+    assert panel["ts_code"].tolist() == ["600519.SH", "000001.SZ"]
+    assert session.execute.await_args_list[1].args[1]["min_list_dates"] == [date(2025, 3, 6)]
+    sql_filter.assert_awaited_once()
+    assert sql_filter.await_args.args[1] == missing_day
+    enrich.assert_awaited_once()
+
+
+async def test_vectorized_layers_match_row_loop() -> None:
+    """按列计算的 Layer 1/3 与逐行实现（微基准中的对照版本）结果一致。"""
+    from tests.unit.bench_pipeline_v2_layers import make_inputs, picks_match, run_legacy, run_vectorized
+
+    inputs = make_inputs(400, seed=7)
+    legacy = await run_legacy(inputs, top_n=30)
+    vectorized = await run_vectorized(inputs, top_n=30)
+
+    assert len(vectorized) == 30
+    assert picks_match(legacy, vectorized)
+
+
+async def test_layer3_sorts_descending_and_applies_top_n() -> None:
+    """Layer 3 按 final_score 降序返回，同分保持信号出现顺序，只保留前 top_n。"""
+    df = pd.DataFrame(
+        {
+            "ts_code": ["A", "B", "C"],
+            "name": ["A", "B", "C"],
+            "close": [1.0, 2.0, 3.0],
+            "pct_chg": [0.0, 0.0, 0.0],
+        }
+    )
+    layer1 = [
+        Layer1Result(ts_code=code, passed_guard=True, quality_score=score, tags={})
+        for code, score in (("A", 10.0), ("B", 50.0), ("C", 10.0))
+    ]
+    signals = [
+        Layer2Signal(ts_code=code, strategy_name="t", signal_group="trend", confidence=1.0, static_weight=1.0)
+        for code in ("C", "A", "B")
+    ]
+
+    with patch("app.strategy.pipeline_v2.StrategyFactoryV2.get_by_role", return_value=[]):
+        picks = await _layer3_fusion_ranking(
+            session=AsyncMock(),
+            df=df,
+            layer1_results=layer1,
+            layer2_signals=signals,
+            target_date=date(2026, 3, 7),
+            market_regime=MarketRegime.BULL,
+            rolling_performance={},
+            top_n=2,
+        )
+
+    assert [p.ts_code for p in picks] == ["B", "C"]
+    assert picks[0].final_score > picks[1].final_score
+
+
+def test_layer1_frame_round_trips_results() -> None:
+    """Layer 1 表与 Layer1Result 列表互转一致（只保留强度为正的标签）。"""
+    from app.strategy.pipeline_v2 import _layer1_frame, _layer1_frame_from_results, _layer1_results
+
+    df = pd.DataFrame({"ts_code": ["A", "B"]}, index=[10, 11])
+    frame = _layer1_frame(
+        df,
+        pd.Series([True, False], index=df.index),
+        pd.Series([80.0, 20.0], index=df.index),
+        {"growth": pd.Series([0.5, -0.2], index=df.index), "dividend": pd.Series([0.0, float("nan")], index=df.index)},
+    )
+    results = _layer1_results(frame)
+
+    assert results == [
+        Layer1Result(ts_code="A", passed_guard=True, quality_score=80.0, tags={"growth": 0.5}),
+        Layer1Result(ts_code="B", passed_guard=False, quality_score=20.0, tags={}),
+    ]
+    assert _layer1_results(_layer1_frame_from_results(results)) == results
+
+
+class _SlowTrigger(BaseStrategyV2):
+    """记录执行线程并阻塞一段时间的 trigger。"""
+
+    def __init__(self, name: str, delay: float, threads: set) -> None:
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.threads = threads
+
+    async def execute(self, df: pd.DataFrame, target_date: date) -> list:
+        import threading
+        import time as _time
+
+        from app.strategy.base import StrategySignal
+
+        self.threads.add(threading.get_ident())
+        _time.sleep(self.delay)
+        return [StrategySignal(ts_code=code) for code in df["ts_code"].iloc[: len(self.name)]]
+
+
+async def test_layer2_runs_triggers_concurrently_and_records_stats() -> None:
+    """trigger 在线程池中并发执行，信号顺序与 trigger 顺序一致，并记录每个 trigger 的统计。"""
+    import time as _time
+
+    from app.strategy.base import SignalGroup
+    from app.strategy.pipeline_v2 import _layer2_trigger_signals
+
+    df = pd.DataFrame({"ts_code": ["A", "B", "C", "D"]})
+    metas = [
+        SimpleNamespace(name="a", signal_group=SignalGroup.TREND, ai_rating=8.32),
+        SimpleNamespace(name="bbb", signal_group=SignalGroup.BOTTOM, ai_rating=8.32),
+        SimpleNamespace(name="cc", signal_group=None, ai_rating=4.16),
+    ]
+    threads: set = set()
+    delays = {"a": 0.2, "bbb": 0.2, "cc": 0.2}
+    stats: dict[str, int] = {}
+
+    with (
+        patch("app.strategy.pipeline_v2.StrategyFactoryV2.get_by_role", return_value=metas),
+        patch("app.strategy.pipeline_v2.StrategyFactoryV2.get_strategy",
+              side_effect=lambda name, params=None: _SlowTrigger(name, delays[name], threads)),
+        patch("app.config.settings.pipeline_trigger_workers", 3),
+    ):
+        start = _time.perf_counter()
+        signals = await _layer2_trigger_signals(df, date(2026, 3, 9), trigger_stats=stats)
+        elapsed = _time.perf_counter() - start
+
+    assert elapsed < 0.5
+    assert len(threads) == 3
+    assert [(s.strategy_name, s.ts_code) for s in signals] == [
+        ("a", "A"), ("bbb", "A"), ("bbb", "B"), ("bbb", "C"), ("cc", "A"), ("cc", "B"),
+    ]
+    assert signals[-1].signal_group == "unknown"
+    assert stats["layer2:bbb:signals"] == 3
+    assert stats["layer2:cc:candidates"] == 4
+    assert stats["layer2:a:elapsed_ms"] >= 150
+
+
+def test_trigger_pool_reused_and_execute_sync_without_loop() -> None:
+    """线程池在进程内复用；execute_sync 不创建事件循环，挂起等待 I/O 的 execute 报错。"""
+    import asyncio
+
+    from app.strategy.pipeline_v2 import _trigger_pool
+
+    assert _trigger_pool(2) is _trigger_pool(2)
+    assert _trigger_pool(3) is not _trigger_pool(2)
+
+    trigger = _SlowTrigger("ab", 0.0, set())
+    assert [s.ts_code for s in trigger.execute_sync(pd.DataFrame({"ts_code": ["A", "B", "C"]}), date(2026, 3, 9))] \
+        == ["A", "B"]
+
+    class _IOTrigger(BaseStrategyV2):
+        async def execute(self, df, target_date):
+            await asyncio.sleep(0)
+            return []
+
+    with pytest.raises(RuntimeError):
+        _IOTrigger().execute_sync(pd.DataFrame(), date(2026, 3, 9))
+
+
+async def test_layer2_serial_when_single_worker() -> None:
+    """workers=1 时在事件循环内串行执行。"""
+    import threading
+
+    from app.strategy.base import SignalGroup
+    from app.strategy.pipeline_v2 import _layer2_trigger_signals
+
+    df = pd.DataFrame({"ts_code": ["A"]})
+    metas = [SimpleNamespace(name=n, signal_group=SignalGroup.TREND, ai_rating=8.32) for n in ("a", "b")]
+    threads: set = set()
+
+    with (
+        patch("app.strategy.pipeline_v2.StrategyFactoryV2.get_by_role", return_value=metas),
+        patch("app.strategy.pipeline_v2.StrategyFactoryV2.get_strategy",
+              side_effect=lambda name, params=None: _SlowTrigger(name, 0.0, threads)),
+        patch("app.config.settings.pipeline_trigger_workers", 1),
+    ):
+        signals = await _layer2_trigger_signals(df, date(2026, 3, 9))
+
+    assert threads == {threading.get_ident()}
+    assert [s.strategy_name for s in signals] == ["a", "b"]
+
+
+async def test_enrich_finance_binds_codes_as_single_array() -> None:
+    """财务补充按一个数组参数传入代码集合，不再为每只股票生成占位符。"""
+    from unittest.mock import MagicMock
+
+    from app.strategy.pipeline_v2 import _enrich_finance_data_v2
+
+    empty = MagicMock()
+    empty.fetchall.return_value = []
+    session = AsyncMock()
+    session.execute.return_value = empty
+    codes = [f"{i:06d}.SZ" for i in range(300)]
+
+    await _enrich_finance_data_v2(session, pd.DataFrame({"ts_code": codes}), date(2026, 3, 9))
+
+    for call in session.execute.await_args_list:
+        sql, params = str(call.args[0]), call.args[1]
+        assert "ANY(CAST(:codes AS text[]))" in sql
+        assert params["codes"] == codes
+        assert "c0" not in params
@@ -0,0 +1,32 @@
+"""集合参数查询辅助（app.data.query_params）的单元测试。"""
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.data.query_params import any_array, any_of
+from app.models.market import StockDaily
+
+
+class TestAnyArray:
+    """测试数组参数条件片段。"""
+
+    def test_default_text_codes(self):
+        """默认按 text[] 绑定 :codes。"""
+        assert any_array("td.ts_code") == "td.ts_code = ANY(CAST(:codes AS text[]))"
+
+    def test_custom_param_and_type(self):
+        """可指定参数名与元素类型。"""
+        assert any_array("trade_date", "dates", "date") == "trade_date = ANY(CAST(:dates AS date[]))"
+
+    def test_orm_any_of_binds_single_array(self):
+        """ORM 版本只生成一个数组绑定参数，SQL 文本与集合大小无关。"""
+        dialect = postgresql.asyncpg.dialect()
+        small = select(StockDaily.ts_code).where(any_of(StockDaily.ts_code, ["600519.SH"]))
+        large = select(StockDaily.ts_code).where(
+            any_of(StockDaily.ts_code, [f"{i:06d}.SZ" for i in range(5000)])
+        )
+        compiled = small.compile(dialect=dialect)
+
+        assert "= ANY (" in str(compiled)
+        assert str(compiled) == str(large.compile(dialect=dialect))
+        assert list(compiled.params.values()) == [["600519.SH"]]
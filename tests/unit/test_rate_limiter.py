@@ -0,0 +1,135 @@
+"""Tushare 自适应限流器（rate_limiter）的单元测试。
+
+验证滑动窗口放行、AIMD 速率调整、每接口并发控制、文件后端跨实例共享配额，
+以及 TushareClient 遇到限流错误时下调速率。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from app.data.rate_limiter import (
+    AI_STEP,
+    MD_FACTOR,
+    AdaptiveRateLimiter,
+    _admit,
+    _cut,
+    _FileBackend,
+    _new_state,
+)
+from app.data.tushare import TushareClient
+
+
+class TestWindowState:
+    """测试窗口状态的纯函数逻辑。"""
+
+    def test_admit_until_window_full(self):
+        """窗口未满时放行并加性增，满后返回等待时间。"""
+        state = _new_state(3.0)
+        state["rate"] = 2.0
+        assert _admit(state, 100.0, 3.0) == 0.0
+        assert state["rate"] == min(3.0, 2.0 + AI_STEP / 2.0)
+        assert _admit(state, 101.0, 3.0) == 0.0
+        assert _admit(state, 102.0, 3.0) == 0.0
+        assert _admit(state, 103.0, 3.0) == pytest.approx(57.0)
+        # 最早的调用滑出窗口后再次放行
+        assert _admit(state, 160.5, 3.0) == 0.0
+
+    def test_cut_with_cooldown(self):
+        """限流时乘性减，冷却期内重复限流只计数。"""
+        state = _new_state(400.0)
+        _cut(state, 10.0)
+        assert state["rate"] == 400.0 * MD_FACTOR
+        assert state["learned"] == 400.0
+        _cut(state, 11.0)
+        assert state["rate"] == 400.0 * MD_FACTOR
+        assert state["throttled"] == 2
+
+    def test_wait_after_cut(self):
+        """速率下调后需等待多次调用滑出窗口。"""
+        state = _new_state(4.0)
+        for t in range(4):
+            _admit(state, 100.0 + t, 4.0)
+        _cut(state, 104.0)  # rate → 2
+        # 需要滑出 3 次调用（t=100,101,102）才能放行
+        assert _admit(state, 105.0, 4.0) == pytest.approx(102.0 + 60.0 - 105.0)
+
+
+class TestAdaptiveRateLimiter:
+    """测试限流器的并发控制、跨实例共享与利用率导出。"""
+
+    @pytest.mark.asyncio
+    async def test_per_api_concurrency(self):
+        """每个接口的在途请求数不超过配置的并发数。"""
+        limiter = AdaptiveRateLimiter(1000, max_concurrency=2, backend="local")
+        peak = 0
+
+        async def _call():
+            nonlocal peak
+            async with limiter.slot("daily"):
+                peak = max(peak, limiter._in_flight["daily"])
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(_call() for _ in range(6)))
+        assert peak == 2
+        assert limiter._in_flight["daily"] == 0
+
+    @pytest.mark.asyncio
+    async def test_file_backend_shared_between_instances(self, tmp_path):
+        """两个实例（模拟两个进程）通过状态文件共享同一份配额。"""
+        a = _FileBackend(tmp_path)
+        b = _FileBackend(tmp_path)
+        assert await a.admit("daily", 2.0) == 0.0
+        assert await b.admit("daily", 2.0) == 0.0
+        assert await a.admit("daily", 2.0) > 0
+
+        rate = await b.throttle("daily", 2.0)
+        assert (await a.states())["daily"]["rate"] == rate
+
+    @pytest.mark.asyncio
+    async def test_snapshot_utilization(self):
+        """导出每个接口的窗口使用量和利用率。"""
+        limiter = AdaptiveRateLimiter(100, api_rates={"stk_auction": 8}, backend="local")
+        for _ in range(4):
+            async with limiter.slot("stk_auction"):
+                pass
+        await limiter.on_throttle("stk_auction")
+
+        snap = await limiter.snapshot()
+        assert snap["stk_auction"]["used_last_minute"] == 4
+        assert snap["stk_auction"]["utilization"] == 0.5
+        assert snap["stk_auction"]["ceiling"] == 8.0
+        assert snap["stk_auction"]["throttled"] == 1
+        assert snap["stk_auction"]["rate"] == 4.0
+
+
+class TestClientThrottle:
+    """测试 TushareClient 与限流器的集成。"""
+
+    @pytest.mark.asyncio
+    async def test_throttle_error_cuts_rate(self):
+        """限流错误触发乘性减，重试成功后返回数据。"""
+        api = MagicMock()
+        api.query.side_effect = [
+            Exception("抱歉，您每分钟最多访问该接口400次"),
+            pd.DataFrame({"ts_code": ["600000.SH"]}),
+        ]
+        limiter = AdaptiveRateLimiter(400, backend="local")
+        with patch("app.data.tushare.ts.pro_api", return_value=api):
+            client = TushareClient(token="t", retry_count=1, limiter=limiter)
+
+        with patch("app.data.tushare.asyncio.sleep", new=_no_sleep):
+            rows = await client.fetch_raw_daily("20250102")
+
+        assert rows == [{"ts_code": "600000.SH"}]
+        snap = await limiter.snapshot()
+        assert snap["daily"]["throttled"] == 1
+        assert snap["daily"]["rate"] < 400
+
+
+async def _no_sleep(_seconds: float) -> None:
+    return None
@@ -34,10 +34,11 @@ class TestRetryFailedStocksJob:
 
         mock_mgr.release_sync_lock.assert_called_once()
 
+    @patch("app.scheduler.jobs.snapshot_step", new_callable=AsyncMock)
     @patch("app.scheduler.jobs.pipeline_step", new_callable=AsyncMock)
     @patch("app.scheduler.jobs._build_manager")
-    async def test_retry_success_triggers_pipeline(self, mock_build, mock_pipeline) -> None:
-        """重试成功且完成率达标时补跑策略。"""
+    async def test_retry_success_triggers_pipeline(self, mock_build, mock_pipeline, mock_snapshot) -> None:
+        """重试成功且完成率达标时先重建市场快照，再补跑策略。"""
         mock_mgr = AsyncMock()
         mock_mgr.acquire_sync_lock.return_value = True
         mock_mgr.get_failed_stocks.side_effect = [
@@ -60,14 +61,21 @@ class TestRetryFailedStocksJob:
         mock_session_factory.return_value.__aexit__.return_value = False
         mock_mgr.session_factory = mock_session_factory
 
+        call_order = []
+        mock_snapshot.side_effect = lambda d: call_order.append("snapshot")
+        mock_pipeline.side_effect = lambda d: call_order.append("pipeline")
+
         await retry_failed_stocks_job()
 
+        mock_snapshot.assert_awaited_once_with(date.today())
         mock_pipeline.assert_called_once()
+        assert call_order == ["snapshot", "pipeline"]
         mock_mgr.release_sync_lock.assert_called_once()
 
+    @patch("app.scheduler.jobs.snapshot_step", new_callable=AsyncMock)
     @patch("app.scheduler.jobs.pipeline_step", new_callable=AsyncMock)
     @patch("app.scheduler.jobs._build_manager")
-    async def test_retry_below_threshold_skips_pipeline(self, mock_build, mock_pipeline) -> None:
+    async def test_retry_below_threshold_skips_pipeline(self, mock_build, mock_pipeline, mock_snapshot) -> None:
         """重试后完成率不达标时跳过策略。"""
         mock_mgr = AsyncMock()
         mock_mgr.acquire_sync_lock.return_value = True
@@ -0,0 +1,191 @@
+"""DataManager.sync_raw_tables 并发调度的单元测试。
+
+验证跨表并发执行、依赖前序 raw 表的 ETL 等待、区间 ETL 批量执行，
+以及失败表不执行 ETL、不推进 raw_sync_progress。
+"""
+
+import asyncio
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.data.manager import DataManager
+
+DATES = [date(2025, 3, 3), date(2025, 3, 4), date(2025, 3, 5), date(2025, 3, 6)]
+
+TEST_GROUP = {
+    "t": [
+        ("raw_a", "sync_a", "daily", None),
+        ("raw_b", "sync_b", "daily", "etl_b"),
+        ("raw_c", "sync_c", "daily", "etl_c"),
+    ],
+}
+
+
+def _manager(events: list, fail: set[str] | None = None) -> DataManager:
+    """构造带模拟同步/ETL 方法的 DataManager，记录调用事件。"""
+    mgr = DataManager(MagicMock(), {})
+    mgr.get_trade_calendar = AsyncMock(return_value=DATES)
+    mgr._update_raw_sync_progress = AsyncMock()
+    state = {"in_flight": 0, "peak": 0}
+    mgr._test_state = state
+
+    def _sync(name: str):
+        async def _fn(td):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await asyncio.sleep(0.01)
+            state["in_flight"] -= 1
+            if fail and name in fail:
+                raise RuntimeError("boom")
+            events.append(("sync", name, td))
+            return {name: 10}
+        return _fn
+
+    async def etl_b(trade_date):
+        events.append(("etl", "b", trade_date, None))
+
+    async def etl_c(trade_date, *, end_date=None):
+        events.append(("etl", "c", trade_date, end_date))
+
+    mgr.sync_a = _sync("a")
+    mgr.sync_b = _sync("b")
+    mgr.sync_c = _sync("c")
+    mgr.etl_b = etl_b
+    mgr.etl_c = etl_c
+    return mgr
+
+
+class TestSyncRawTablesParallel:
+    """测试 sync_raw_tables 的并发调度。"""
+
+    @pytest.mark.asyncio
+    async def test_tables_run_concurrently(self):
+        """不同表的工作单元并发执行，每张表的行数与进度正确汇总。"""
+        events: list = []
+        mgr = _manager(events)
+        with patch.dict(DataManager.TABLE_GROUP_MAP, TEST_GROUP):
+            result = await mgr.sync_raw_tables("t", DATES[0], DATES[-1], mode="full", concurrency=3)
+
+        assert mgr._test_state["peak"] == 3
+        assert result == {
+            "raw_a": {"rows": 40, "error": None},
+            "raw_b": {"rows": 40, "error": None},
+            "raw_c": {"rows": 40, "error": None},
+        }
+        assert mgr._update_raw_sync_progress.await_count == 3
+        mgr._update_raw_sync_progress.assert_any_await("raw_c", DATES[-1], 40)
+
+    @pytest.mark.asyncio
+    async def test_etl_batched_and_waits_for_feeders(self):
+        """支持区间的 ETL 只调用一次；ETL 在前序 raw 表同步完成后执行。"""
+        events: list = []
+        mgr = _manager(events)
+        with patch.dict(DataManager.TABLE_GROUP_MAP, TEST_GROUP):
+            await mgr.sync_raw_tables("t", DATES[0], DATES[-1], mode="full", concurrency=4)
+
+        etl_c = [e for e in events if e[:2] == ("etl", "c")]
+        assert etl_c == [("etl", "c", DATES[0], DATES[-1])]
+        # 不支持区间的 ETL 逐日执行
+        assert [e[2] for e in events if e[:2] == ("etl", "b")] == DATES
+
+        first_etl_b = events.index(next(e for e in events if e[:2] == ("etl", "b")))
+        last_sync_a = max(i for i, e in enumerate(events) if e[:2] == ("sync", "a"))
+        assert last_sync_a < first_etl_b
+
+    @pytest.mark.asyncio
+    async def test_failed_table_skips_etl_and_progress(self):
+        """失败表记录错误，不执行 ETL、不推进进度；其他表不受影响。"""
+        events: list = []
+        mgr = _manager(events, fail={"c"})
+        with patch.dict(DataManager.TABLE_GROUP_MAP, TEST_GROUP):
+            result = await mgr.sync_raw_tables("t", DATES[0], DATES[-1], mode="full")
+
+        assert "boom" in result["raw_c"]["error"]
+        assert result["raw_b"]["error"] is None
+        assert not [e for e in events if e[:2] == ("etl", "c")]
+        tables = [c.args[0] for c in mgr._update_raw_sync_progress.await_args_list]
+        assert sorted(tables) == ["raw_a", "raw_b"]
+
+    @pytest.mark.asyncio
+    async def test_incremental_single_date(self):
+        """增量模式每张表只同步 end_date 一天。"""
+        events: list = []
+        mgr = _manager(events)
+        with patch.dict(DataManager.TABLE_GROUP_MAP, TEST_GROUP):
+            await mgr.sync_raw_tables("t", DATES[-1], DATES[-1], mode="incremental")
+
+        assert sorted(e[1] for e in events if e[0] == "sync") == ["a", "b", "c"]
+        assert ("etl", "c", DATES[-1], None) in events
+        mgr.get_trade_calendar.assert_not_awaited()
+
+
+class TestSyncRawTablesRangeFetch:
+    """测试支持区间拉取的表按缺口形状选择拉取方式。"""
+
+    @staticmethod
+    def _range_manager() -> DataManager:
+        mgr = DataManager(MagicMock(), {})
+        mgr.get_trade_calendar = AsyncMock(return_value=DATES)
+        mgr.get_stock_list = AsyncMock(return_value=[{"ts_code": f"{i:06d}.SZ"} for i in range(5000)])
+        mgr._update_raw_sync_progress = AsyncMock()
+        mgr.sync_raw_moneyflow = AsyncMock(return_value={"moneyflow": 5})
+        mgr._sync_raw_range = AsyncMock(return_value={"moneyflow": 7})
+        return mgr
+
+    @pytest.mark.asyncio
+    async def test_few_codes_use_range_units(self):
+        """少量代码的缺口按代码区间拉取，行数照常汇总并推进进度。"""
+        mgr = self._range_manager()
+        group = {"t": [("raw_tushare_moneyflow", "sync_raw_moneyflow", "daily", None)]}
+        with patch.dict(DataManager.TABLE_GROUP_MAP, group):
+            result = await mgr.sync_raw_tables(
+                "t", DATES[0], DATES[-1], mode="full", codes=["600519.SH", "000001.SZ"],
+            )
+
+        mgr.sync_raw_moneyflow.assert_not_awaited()
+        mgr._sync_raw_range.assert_awaited_once_with(
+            "raw_tushare_moneyflow", ["600519.SH", "000001.SZ"], ((DATES[0], DATES[-1]),),
+        )
+        assert result == {"raw_tushare_moneyflow": {"rows": 7, "error": None}}
+        mgr._update_raw_sync_progress.assert_awaited_once_with("raw_tushare_moneyflow", DATES[-1], 7)
+
+    @pytest.mark.asyncio
+    async def test_full_market_keeps_by_date(self):
+        """全市场缺口仍按日期逐日拉取。"""
+        mgr = self._range_manager()
+        group = {"t": [("raw_tushare_moneyflow", "sync_raw_moneyflow", "daily", None)]}
+        with patch.dict(DataManager.TABLE_GROUP_MAP, group):
+            result = await mgr.sync_raw_tables("t", DATES[0], DATES[-1], mode="full")
+
+        assert mgr.sync_raw_moneyflow.await_count == len(DATES)
+        mgr._sync_raw_range.assert_not_awaited()
+        assert result["raw_tushare_moneyflow"]["rows"] == 5 * len(DATES)
+
+    @pytest.mark.asyncio
+    async def test_range_unit_fetches_windows_and_writes_once(self):
+        """一组代码逐代码、逐区间拉取，每个接口合并后只写入一次。"""
+        import pandas as pd
+
+        client = MagicMock()
+        client.fetch_raw_frame = AsyncMock(
+            side_effect=lambda api, **kw: pd.DataFrame({"ts_code": [kw["ts_code"]], "trade_date": [kw["start_date"]]}),
+        )
+        session = AsyncMock()
+        ctx = AsyncMock()
+        ctx.__aenter__ = AsyncMock(return_value=session)
+        ctx.__aexit__ = AsyncMock(return_value=False)
+        mgr = DataManager(MagicMock(return_value=ctx), {"tushare": client}, primary="tushare")
+        mgr._upsert_raw_frame = AsyncMock(side_effect=lambda s, table, frame: len(frame))
+
+        windows = ((DATES[0], DATES[1]), (DATES[2], DATES[3]))
+        counts = await mgr._sync_raw_range("raw_tushare_moneyflow", ["600519.SH", "000001.SZ"], windows)
+
+        assert counts == {"moneyflow": 4}
+        assert client.fetch_raw_frame.await_count == 4
+        client.fetch_raw_frame.assert_any_await(
+            "moneyflow", ts_code="000001.SZ", start_date="20250305", end_date="20250306",
+        )
+        mgr._upsert_raw_frame.assert_awaited_once()
+        session.commit.assert_awaited_once()
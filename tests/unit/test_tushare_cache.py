@@ -0,0 +1,170 @@
+"""Tushare 响应缓存（tushare_cache）的单元测试。
+
+验证参数归一化、新鲜度策略、Parquet 读写，以及 TushareClient 的录制/回放行为。
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from app.data.rate_limiter import AdaptiveRateLimiter  # noqa: E402
+from app.data.tushare import TushareClient  # noqa: E402
+from app.data.tushare_cache import (  # noqa: E402
+    PERIOD_TTL,
+    REFERENCE_TTL,
+    SAME_DAY_TTL,
+    TushareResponseCache,
+    cache_key,
+    freshness_ttl,
+)
+from app.exceptions import DataSourceError  # noqa: E402
+
+
+def _daily_df() -> pd.DataFrame:
+    return pd.DataFrame({
+        "ts_code": ["600519.SH", "000001.SZ"],
+        "trade_date": ["20250102", "20250102"],
+        "close": [1500.5, 11.2],
+        "vol": [12345.0, None],
+    })
+
+
+class TestKeyAndFreshness:
+    """测试缓存键与新鲜度策略。"""
+
+    def test_key_ignores_empty_params_and_order(self):
+        """空参数与未传参数、参数顺序不同时命中同一缓存键。"""
+        a = cache_key("daily", {"trade_date": "20250102", "ts_code": ""})
+        b = cache_key("daily", {"trade_date": "20250102"})
+        c = cache_key("daily", {"ts_code": None, "trade_date": "20250102"})
+        assert a == b == c
+        assert a != cache_key("adj_factor", {"trade_date": "20250102"})
+
+    def test_freshness_policy(self):
+        """抓取前已过去的日期永不过期，抓取当日数据/财务报告期/基础信息有各自的有效期。"""
+        today = date(2025, 6, 10)
+        assert freshness_ttl("daily", {"trade_date": "20250609"}, today) is None
+        assert freshness_ttl("daily", {"trade_date": "20250610"}, today) == SAME_DAY_TTL
+        assert freshness_ttl("trade_cal", {"start_date": "20250101", "end_date": "20251231"}, today) == SAME_DAY_TTL
+        assert freshness_ttl("income_vip", {"period": "20241231"}, today) == PERIOD_TTL
+        assert freshness_ttl("stock_basic", {"list_status": "L"}, today) == REFERENCE_TTL
+
+
+class TestResponseCache:
+    """测试磁盘读写与过期判断。"""
+
+    def test_round_trip(self, tmp_path):
+        """写入后读取的 DataFrame 与原始一致，空结果也可缓存。"""
+        cache = TushareResponseCache(tmp_path)
+        cache.put("daily", {"trade_date": "20250102"}, _daily_df())
+        cache.put("top_list", {"trade_date": "20250102"}, pd.DataFrame())
+
+        got = cache.get("daily", {"trade_date": "20250102"})
+        pd.testing.assert_frame_equal(got, _daily_df(), check_dtype=False)
+        assert cache.get("top_list", {"trade_date": "20250102"}).empty
+        assert cache.get("daily", {"trade_date": "20250103"}) is None
+        assert cache.stats["hits"] == 2
+        assert cache.stats["misses"] == 1
+
+    def test_stale_entry_is_miss_except_replay(self, tmp_path):
+        """过期条目在 on 模式下视为未命中，回放模式忽略新鲜度。"""
+        cache = TushareResponseCache(tmp_path)
+        kwargs = {"list_status": "L"}
+        with patch("app.data.tushare_cache.time.time", return_value=time.time() - REFERENCE_TTL - 10):
+            cache.put("stock_basic", kwargs, _daily_df())
+
+        assert cache.get("stock_basic", kwargs) is None
+        assert cache.stats["stale"] == 1
+        assert TushareResponseCache(tmp_path, "replay").get("stock_basic", kwargs) is not None
+
+    def test_same_day_fetch_stays_short_lived_next_day(self, tmp_path):
+        """当天抓取的当天数据，次日读取仍按 SAME_DAY_TTL 过期；数据日期之后抓取的永不过期。"""
+        from datetime import datetime, timedelta
+
+        cache = TushareResponseCache(tmp_path)
+        data_day = datetime.now() - timedelta(days=1)
+        kwargs = {"trade_date": data_day.strftime("%Y%m%d")}
+        intraday = data_day.replace(hour=10, minute=0).timestamp()
+        with patch("app.data.tushare_cache.time.time", return_value=intraday):
+            cache.put("daily", kwargs, _daily_df())
+
+        assert cache.get("daily", kwargs) is None
+        assert cache.stats["stale"] == 1
+
+        cache.put("daily", kwargs, _daily_df())
+        assert cache.get("daily", kwargs) is not None
+
+    def test_empty_same_day_response_not_cached(self, tmp_path):
+        """当天（或未来）日期的空响应不写入缓存。"""
+        cache = TushareResponseCache(tmp_path)
+        kwargs = {"trade_date": date.today().strftime("%Y%m%d")}
+
+        assert cache.put("top_list", kwargs, pd.DataFrame()) is None
+        assert cache.get("top_list", kwargs) is None
+        assert cache.stats["writes"] == 0
+
+    def test_metadata_recorded(self, tmp_path):
+        """文件元数据记录接口名和归一化参数。"""
+        import pyarrow.parquet as pq
+
+        path = TushareResponseCache(tmp_path).put("daily", {"trade_date": "20250102", "ts_code": ""}, _daily_df())
+        meta = json.loads(pq.read_schema(path).metadata[b"tushare_cache"])
+        assert meta["api"] == "daily"
+        assert meta["params"] == {"trade_date": "20250102"}
+
+    def test_invalid_mode(self, tmp_path):
+        """未知模式报错。"""
+        with pytest.raises(ValueError):
+            TushareResponseCache(tmp_path, "bogus")
+
+
+def _client(mock_api: MagicMock, cache: TushareResponseCache) -> TushareClient:
+    with patch("app.data.tushare.ts.pro_api", return_value=mock_api):
+        return TushareClient(
+            token="t", retry_count=0, retry_interval=0.01, qps_limit=60, cache=cache,
+            limiter=AdaptiveRateLimiter(60, backend="local"),
+        )
+
+
+class TestClientRecordReplay:
+    """测试 TushareClient 的缓存集成。"""
+
+    @pytest.mark.asyncio
+    async def test_record_then_replay(self, tmp_path):
+        """录制后回放不访问网络，结果与录制时一致。"""
+        api = MagicMock()
+        api.query.return_value = _daily_df()
+        recorded = await _client(api, TushareResponseCache(tmp_path, "record")).fetch_raw_daily("20250102")
+        assert api.query.call_count == 1
+
+        offline = MagicMock()
+        offline.query.side_effect = AssertionError("回放模式不应访问网络")
+        replayed = await _client(offline, TushareResponseCache(tmp_path, "replay")).fetch_raw_daily("20250102")
+
+        assert pd.DataFrame(replayed).equals(pd.DataFrame(recorded))
+
+    @pytest.mark.asyncio
+    async def test_on_mode_hits_cache(self, tmp_path):
+        """on 模式下重复请求历史日期只访问一次远端。"""
+        api = MagicMock()
+        api.query.return_value = _daily_df()
+        client = _client(api, TushareResponseCache(tmp_path, "on"))
+
+        await client.fetch_raw_adj_factor("20250102")
+        await client.fetch_raw_adj_factor("20250102")
+        assert api.query.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_replay_miss_raises(self, tmp_path):
+        """回放模式缓存未命中时抛出 DataSourceError。"""
+        client = _client(MagicMock(), TushareResponseCache(tmp_path, "replay"))
+        with pytest.raises(DataSourceError, match="回放模式缓存未命中"):
+            await client.fetch_raw_daily("20250102")
@@ -1,7 +1,6 @@
 """TushareClient 单元测试。
 
 测试 Tushare Pro API 客户端的核心功能：
-- 令牌桶限流
 - 异步包装
 - 重试机制
 - DataSourceClient Protocol 方法
@@ -10,7 +9,6 @@
 
 from __future__ import annotations
 
-import asyncio
 from datetime import date
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -18,55 +16,11 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pandas as pd
 import pytest
 
-from app.data.tushare import TushareClient, _TokenBucket
+from app.data.rate_limiter import AdaptiveRateLimiter
+from app.data.tushare import TushareClient
 from app.exceptions import DataSourceError
 
 
-class TestTokenBucket:
-    """令牌桶限流器测试。"""
-
-    @pytest.mark.asyncio
-    async def test_acquire_single_token(self) -> None:
-        """获取单个令牌应立即返回。"""
-        bucket = _TokenBucket(rate_per_minute=60)
-        await bucket.acquire()
-        assert bucket._tokens < 60.0
-
-    @pytest.mark.asyncio
-    async def test_acquire_multiple_tokens_with_wait(self) -> None:
-        """连续获取多个令牌时应等待补充。"""
-        bucket = _TokenBucket(rate_per_minute=6)  # 0.1 token/sec，很慢
-
-        # 快速消耗所有令牌
-        for _ in range(6):
-            await bucket.acquire()
-
-        # 此时桶已空，下一个令牌需要等待
-        start = asyncio.get_event_loop().time()
-        await bucket.acquire()
-        elapsed = asyncio.get_event_loop().time() - start
-
-        # 应该等待了一段时间（至少 0.5 秒）
-        assert elapsed > 0.5
-
-    @pytest.mark.asyncio
-    async def test_refill_over_time(self) -> None:
-        """令牌应随时间自动补充。"""
-        bucket = _TokenBucket(rate_per_minute=60)
-
-        # 消耗一些令牌
-        await bucket.acquire()
-        await bucket.acquire()
-        tokens_after_consume = bucket._tokens
-
-        # 等待 1 秒让令牌补充
-        await asyncio.sleep(1.0)
-        bucket._refill()
-
-        # 令牌数应该增加
-        assert bucket._tokens > tokens_after_consume
-
-
 class TestTushareClient:
     """TushareClient 核心功能测试。"""
 
@@ -85,6 +39,7 @@ class TestTushareClient:
                 retry_count=2,
                 retry_interval=0.1,
                 qps_limit=60,
+                limiter=AdaptiveRateLimiter(60, backend="local"),
             )
 
     @pytest.mark.asyncio
@@ -224,6 +179,21 @@ class TestTushareClient:
         assert result[0]["ts_code"] == "600519.SH"
         assert result[1]["ts_code"] == "000001.SZ"
 
+    @pytest.mark.asyncio
+    async def test_fetch_raw_frame(
+        self, client: TushareClient, mock_pro_api: MagicMock
+    ) -> None:
+        """fetch_raw_frame 返回 DataFrame，字段映射与 fetch_raw_* 一致。"""
+        mock_pro_api.query.return_value = pd.DataFrame({
+            "ts_code": ["600519.SH"], "trade_date": ["20240101"], "suspend_type": ["S"],
+        })
+
+        df = await client.fetch_raw_frame("suspend_d", trade_date="20240101")
+
+        assert isinstance(df, pd.DataFrame)
+        assert list(df.columns) == ["ts_code", "suspend_date", "suspend_type"]
+        mock_pro_api.query.assert_called_once_with("suspend_d", trade_date="20240101")
+
     @pytest.mark.asyncio
     async def test_fetch_raw_fina_indicator(
         self, client: TushareClient, mock_pro_api: MagicMock
@@ -106,3 +106,23 @@ async def test_execute_volume_price_pattern_daily_builds_and_saves_picks(
     assert picks[0].weighted_score == pytest.approx(87.0)
     mock_save_picks.assert_awaited_once()
 
+
+
+@pytest.mark.asyncio
+async def test_fetch_daily_snapshot_falls_back_when_snapshot_missing() -> None:
+    """当日市场快照未构建或已过期时回退到 stock_daily 多表查询。"""
+    from app.strategy.v4_daily_runner import _fetch_daily_snapshot
+
+    not_fresh = MagicMock()
+    not_fresh.fetchall.return_value = []
+    legacy = MagicMock()
+    legacy.fetchall.return_value = [("600519.SH", "贵州茅台", 1.0, 2.0, 0.5, 1.5, 100.0, 3.0, 2.1)]
+    session = AsyncMock()
+    session.execute.side_effect = [not_fresh, legacy]
+
+    df = await _fetch_daily_snapshot(session, date(2026, 3, 7))
+
+    assert df["ts_code"].tolist() == ["600519.SH"]
+    assert df.loc[0, "vol_ratio"] == pytest.approx(2.1)
+    assert "FROM market_snapshot_daily" in str(session.execute.await_args_list[0].args[0])
+    assert "FROM stock_daily sd" in str(session.execute.await_args_list[1].args[0])
@@ -0,0 +1,71 @@
+"""观察池批量写入（T0 事件、洗盘进度）的单元测试。"""
+
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from app.strategy.watchpool import manager as wpm
+
+TD = date(2026, 3, 9)
+
+
+def _row(wid: int, low: float, days: int = 0, vol: int = 1000, min_vol=None, min_low=None):
+    return SimpleNamespace(
+        id=wid, ts_code=f"{wid:06d}.SZ", t0_open=10.0, t0_low=9.5, t0_volume=5000,
+        washout_days=days, min_washout_vol=min_vol, min_washout_low=min_low,
+        close=low + 0.2, low=low, high=low + 0.5, today_vol=vol,
+    )
+
+
+class TestInsertT0Batch:
+    """测试 T0 事件批量写入。"""
+
+    async def test_single_statement_column_arrays(self):
+        """整批事件按列转为数组，一条语句写入。"""
+        session = AsyncMock()
+        entries = [
+            {"ts_code": code, "strategy_name": "volume-price-pattern", "t0_date": TD,
+             "t0_close": 10.0, "t0_open": 9.8, "t0_low": 9.7, "t0_volume": 100,
+             "t0_pct_chg": 9.9, "sector_score": None, "market_score": None}
+            for code in ("600519.SH", "000001.SZ")
+        ]
+
+        n = await wpm.insert_t0_batch(session, entries)
+
+        assert n == 2
+        session.execute.assert_awaited_once()
+        params = session.execute.await_args.args[1]
+        assert params["ts_code"] == ["600519.SH", "000001.SZ"]
+        assert params["t0_date"] == [TD, TD]
+        assert set(params) == set(wpm.T0_COLUMNS)
+
+    async def test_empty_entries(self):
+        """无事件时不访问数据库。"""
+        session = AsyncMock()
+        assert await wpm.insert_t0_batch(session, []) == 0
+        session.execute.assert_not_awaited()
+
+
+class TestUpdateWatchpool:
+    """测试观察池状态流转的批量更新。"""
+
+    async def test_washout_updates_in_one_statement(self):
+        """止损、过期各一条语句；洗盘进度以一条 UPDATE ... FROM unnest 回写。"""
+        rows = [
+            _row(1, low=9.0),                                # 跌破 T0 开盘价 → stopped
+            _row(2, low=10.5, days=8),                       # 超过最大洗盘天数 → expired
+            _row(3, low=10.5, days=1, vol=800, min_vol=900, min_low=10.8),
+            _row(4, low=10.6, days=2, vol=1200, min_vol=900, min_low=10.2),
+        ]
+        result = MagicMock()
+        result.fetchall.return_value = rows
+        session = AsyncMock()
+        session.execute.side_effect = [result, None, None, None]
+
+        stats = await wpm.update_watchpool(session, TD, {"max_washout_days": 8})
+
+        assert stats == {"stopped": 1, "expired": 1, "updated": 2}
+        assert session.execute.await_count == 4
+        stmt, params = session.execute.await_args_list[-1].args
+        assert stmt is wpm.UPDATE_WASHOUT_SQL
+        assert params == {"ids": [3, 4], "days": [2, 3], "vols": [800, 900], "lows": [10.5, 10.2]}
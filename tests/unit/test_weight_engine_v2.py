@@ -10,6 +10,7 @@ from app.strategy.weight_engine import (
     compute_rolling_performance,
     get_signal_group_coefficient,
     get_style_bonus,
+    get_style_bonus_vector,
 )
 
 
@@ -26,6 +27,23 @@ def test_style_bonus_uses_delta_from_one() -> None:
     assert round(bonus, 4) == 0.12
 
 
+def test_style_bonus_vector_matches_scalar() -> None:
+    """批量风格增益与逐行计算一致（含封顶与无关风格）。"""
+    import pandas as pd
+
+    rows = [
+        {"growth": 0.8, "dividend": 0.2},
+        {"growth": 0.0, "dividend": 0.0, "momentum": 0.9},
+        {"dividend": 1.0},
+        {},
+    ]
+    tags = pd.DataFrame(rows).fillna(0.0)
+    for regime in MarketRegime:
+        vector = get_style_bonus_vector(tags, regime)
+        expected = [get_style_bonus({k: v for k, v in r.items() if v > 0}, regime) for r in rows]
+        assert vector == pytest.approx(expected)
+
+
 @pytest.mark.asyncio
 async def test_compute_rolling_performance_clamps_to_micro_adjustment() -> None:
     """滚动绩效应收敛到 [0.8, 1.2]。"""